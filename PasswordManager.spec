@@ -7,7 +7,7 @@ a = Analysis(
     binaries=[],
     # datas=[('resources', 'resources'), ('*.db', '.')],
     datas=[('resources', 'resources')],
-    hiddenimports=['PyQt6', 'PyQt6.QtCore', 'PyQt6.QtGui', 'PyQt6.QtWidgets', 'cryptography', 'cryptography.hazmat.backends.openssl', 'cryptography.hazmat.primitives', 'cryptography.hazmat.primitives.kdf', 'cryptography.hazmat.primitives.ciphers', 'mysql.connector', 'PIL', 'PIL._imaging', 'PIL.Image', 'PIL.ImageDraw', 'PIL.ImageFont'],
+    hiddenimports=['PyQt6', 'PyQt6.QtCore', 'PyQt6.QtGui', 'PyQt6.QtWidgets', 'cryptography', 'cryptography.hazmat.backends.openssl', 'cryptography.hazmat.primitives', 'cryptography.hazmat.primitives.kdf', 'cryptography.hazmat.primitives.ciphers', 'mysql.connector', 'PIL', 'PIL._imaging', 'PIL.Image', 'PIL.ImageDraw', 'PIL.ImageFont', 'cProfile', 'pstats'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -172,6 +172,10 @@ a = Analysis(
         'PIL.Image',
         'PIL.ImageFile',
         'PIL._imaging',
+
+        # 性能剖析（--profile / PASSWDMGR_PROFILE）按需导入
+        'cProfile',
+        'pstats',
     ],
     hookspath=[],
     hooksconfig={{}},
@@ -754,6 +758,15 @@ def test_appimage():
         print(f"❌ 运行测试时出错: {e}")
 
 
+def generate_icon_atlas():
+    """生成图标图集（resources/icons/atlas），失败时运行时回退到图标目录"""
+    try:
+        from utils.generate_icons import build_icon_atlas
+        build_icon_atlas()
+    except Exception as e:
+        print(f"警告: 生成图标图集失败，将直接使用图标文件: {e}")
+
+
 def main():
     """主函数"""
     print("=" * 60)
@@ -774,6 +787,9 @@ def main():
             return
 
     # 构建流程
+    print("\n0. 生成图标图集...")
+    generate_icon_atlas()
+
     print("\n1. 修复PyQt5依赖并构建...")
     if not build_with_pyqt5_fix():
         return
@@ -36,6 +36,15 @@ def get_icon_path():
     return None
 
 
+def generate_icon_atlas():
+    """生成图标图集（resources/icons/atlas），失败时运行时回退到图标目录"""
+    try:
+        from utils.generate_icons import build_icon_atlas
+        build_icon_atlas()
+    except Exception as e:
+        print(f"警告: 生成图标图集失败，将直接使用图标文件: {e}")
+
+
 def build_linux_arm64():
     """构建Linux ARM64可执行文件"""
     print("=" * 60)
@@ -43,6 +52,7 @@ def build_linux_arm64():
     print("=" * 60)
 
     clean_build_dirs()
+    generate_icon_atlas()
     icon_path = get_icon_path()
 
     # 设置交叉编译环境变量
@@ -70,6 +80,9 @@ def build_linux_arm64():
         '--hidden-import=PIL.Image',
         '--hidden-import=PIL.ImageFile',
         '--hidden-import=PIL._imaging',
+        # 性能剖析（--profile / PASSWDMGR_PROFILE）按需导入
+        '--hidden-import=cProfile',
+        '--hidden-import=pstats',
         '--exclude-module=tkinter',
     ]
 
@@ -378,6 +391,7 @@ def build_windows_x86_64():
 def create_and_use_spec_file():
     """创建并使用.spec文件进行构建（推荐方式）"""
     clean_build_dirs()
+    generate_icon_atlas()
     icon_path = get_icon_path()
 
     # 定义需要打包的数据文件
@@ -403,6 +417,9 @@ def create_and_use_spec_file():
         'PIL.Image',
         'PIL.ImageDraw',
         'PIL.ImageFont',
+        # 性能剖析（--profile / PASSWDMGR_PROFILE）按需导入
+        'cProfile',
+        'pstats',
     ]
 
     excludes = ['tkinter', 'test', 'unittest']
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 16:50
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 命令行工具（不依赖 Qt）
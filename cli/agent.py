@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 21:40
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 密码库代理（类似 ssh-agent，解锁一次后通过 Unix 套接字提供查询）
+"""
+代理进程保存解锁后的会话（主密码、子密钥和派生密钥缓存），通过 Unix 域套接字
+响应 list/search/find/get/copy 请求，命令行和脚本不必每次都计算 PBKDF2。
+
+    passwdmgr agent start [--timeout 分钟] [--preload] [--foreground]
+    passwdmgr agent status
+    passwdmgr agent stop
+
+协议：每个连接一个请求，请求和响应都是 4 字节大端长度 + UTF-8 JSON。
+    请求  {"op": "get", "target": "github", "user": null, "password": true}
+    响应  {"ok": true, "result": {...}} 或 {"ok": false, "error": "..."}
+
+套接字放在只有本用户可访问的目录（0700）中，文件权限 0600，并用 SO_PEERCRED 检查对端用户。
+空闲超过 auto_lock_minutes（与图形界面相同的设置）后代理锁定并退出。
+
+本模块顶层只导入标准库，客户端查询时不加载数据库和加密模块。
+"""
+import hashlib
+import json
+import os
+import socket
+import struct
+import sys
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+AGENT_SOCKET_ENV = 'PASSWDMGR_AGENT_SOCK'
+FRAME_HEADER = struct.Struct('>I')
+MAX_MESSAGE_SIZE = 4 * 1024 * 1024
+CLIENT_TIMEOUT = 5.0
+AGENT_OPS = ('ping', 'status', 'list', 'search', 'find', 'get', 'copy', 'lock')
+
+
+class AgentError(Exception):
+    """代理返回的错误或通信错误"""
+
+
+class AgentUnavailable(AgentError):
+    """没有正在运行的代理"""
+
+
+def default_socket_path(config_file: str = 'config.json') -> str:
+    """代理套接字路径：每个配置文件对应一个代理，可用环境变量 PASSWDMGR_AGENT_SOCK 指定"""
+    path = os.environ.get(AGENT_SOCKET_ENV)
+    if path:
+        return path
+    base = os.environ.get('XDG_RUNTIME_DIR')
+    if not base:
+        import tempfile
+        base = tempfile.gettempdir()
+    digest = hashlib.sha256(os.path.abspath(config_file).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(base, f'passwdmgr-{os.getuid()}', f'agent-{digest}.sock')
+
+
+def send_message(sock, message: dict):
+    data = json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    sock.sendall(FRAME_HEADER.pack(len(data)) + data)
+
+
+def recv_message(sock) -> dict:
+    (size,) = FRAME_HEADER.unpack(_recv_exact(sock, FRAME_HEADER.size))
+    if size > MAX_MESSAGE_SIZE:
+        raise AgentError(f"消息过大: {size} 字节")
+    message = json.loads(_recv_exact(sock, size).decode('utf-8'))
+    if not isinstance(message, dict):
+        raise AgentError("消息格式错误")
+    return message
+
+
+def _recv_exact(sock, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            raise AgentError("连接已关闭")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _peer_uid(conn):
+    """对端进程的用户 ID（不支持 SO_PEERCRED 的平台返回 None，只依靠目录权限）"""
+    if not hasattr(socket, 'SO_PEERCRED'):
+        return None
+    credentials = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+    _, uid, _ = struct.unpack('3i', credentials)
+    return uid
+
+
+class AgentClient:
+    """代理客户端（每个请求一个连接）"""
+
+    def __init__(self, socket_path: str, timeout: float = CLIENT_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def request(self, op: str, **params):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise AgentUnavailable("当前平台不支持 Unix 套接字")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                raise AgentUnavailable(f"代理未运行: {e}")
+            send_message(sock, dict(params, op=op))
+            response = recv_message(sock)
+        except OSError as e:
+            raise AgentError(f"与代理通信失败: {e}")
+        finally:
+            sock.close()
+
+        if not response.get('ok'):
+            raise AgentError(response.get('error') or "代理返回错误")
+        return response.get('result')
+
+
+class VaultAgent:
+    """持有已解锁会话的代理服务"""
+
+    def __init__(self, vault, socket_path: str, idle_minutes: int = None, clear_clipboard_seconds: int = None):
+        from core.encryption_manager import DEFAULT_KEY_CACHE_SIZE
+        from core.session_manager import SessionManager
+
+        security_config = vault.config_manager.get_security_config()
+        self.vault = vault
+        self.socket_path = socket_path
+        self.clear_clipboard_seconds = (security_config.get('clear_clipboard_seconds', 30)
+                                        if clear_clipboard_seconds is None else clear_clipboard_seconds)
+
+        # 会话状态与图形界面一致：空闲 auto_lock_minutes 后锁定
+        self.session = SessionManager()
+        self.session.set_auto_lock_minutes(idle_minutes or security_config.get('auto_lock_minutes', 15))
+        self.session.unlock(vault.master_password)
+        self.session.vault_keys = dict(vault.vault_keys)
+
+        self.encryption_manager = vault.encryption_manager
+        self.encryption_manager.key_cache_size = DEFAULT_KEY_CACHE_SIZE
+        self.database_manager = vault.database_manager
+
+        self._sock = None
+        self._clipboard_clear_at = None
+        self._started_at = time.time()
+
+    def bind(self):
+        """创建套接字（已有代理在运行时报错，残留的套接字文件会被删除）"""
+        if not hasattr(socket, 'AF_UNIX'):
+            raise AgentError("当前平台不支持 Unix 套接字")
+
+        directory = os.path.dirname(self.socket_path)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        info = os.stat(directory)
+        if info.st_uid != os.getuid() or info.st_mode & 0o077:
+            raise AgentError(f"套接字目录必须属于当前用户且权限为 0700: {directory}")
+
+        if os.path.exists(self.socket_path):
+            try:
+                AgentClient(self.socket_path, timeout=1).request('ping')
+            except AgentUnavailable:
+                os.unlink(self.socket_path)
+            else:
+                raise AgentError(f"代理已在运行: {self.socket_path}")
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        os.chmod(self.socket_path, 0o600)
+        sock.listen(16)
+        self._sock = sock
+
+    def preload(self) -> int:
+        """预先派生所有记录的密钥，之后每次查询都不再计算 PBKDF2"""
+        entries = self.database_manager.get_all_entries()
+        count = self.encryption_manager.preload_keys([entry.encrypted_password for entry in entries],
+                                                     self.session.get_master_password())
+        logger.info(f"代理已预先派生 {count} 个密钥")
+        return count
+
+    def serve(self):
+        """处理请求直到空闲超时或收到 lock 请求"""
+        logger.info(f"代理已启动: {self.socket_path}，空闲 {self.session.auto_lock_minutes} 分钟后锁定")
+        try:
+            while not self.session.check_auto_lock():
+                self._sock.settimeout(self._next_timeout())
+                try:
+                    conn, _ = self._sock.accept()
+                except socket.timeout:
+                    self._clear_clipboard_if_due()
+                    continue
+                with conn:
+                    self._handle_connection(conn)
+                self._clear_clipboard_if_due()
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """锁定会话、清除密钥缓存并删除套接字"""
+        self.session.lock()
+        self.encryption_manager.clear_key_cache()
+        self.vault.master_password = None
+        self.vault.vault_keys = {}
+        self.database_manager.set_metadata_keys(None)
+        if self._clipboard_clear_at is not None:
+            self._clipboard_clear_at = 0
+            self._clear_clipboard_if_due()
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+        self.database_manager.close()
+        logger.info("代理已锁定并退出")
+
+    def _next_timeout(self) -> float:
+        timeout = self.session.auto_lock_minutes * 60 - (time.time() - self.session.last_activity)
+        if self._clipboard_clear_at is not None:
+            timeout = min(timeout, self._clipboard_clear_at - time.time())
+        return max(timeout, 0.05)
+
+    def _clear_clipboard_if_due(self):
+        if self._clipboard_clear_at is None or time.time() < self._clipboard_clear_at:
+            return
+        self._clipboard_clear_at = None
+        from cli.common import CliError, copy_to_clipboard
+        try:
+            copy_to_clipboard('')
+        except CliError as e:
+            logger.warning(f"清除剪贴板失败: {e}")
+
+    def _handle_connection(self, conn):
+        conn.settimeout(CLIENT_TIMEOUT)
+        try:
+            uid = _peer_uid(conn)
+            if uid is not None and uid != os.getuid():
+                logger.warning(f"拒绝其他用户的连接: uid={uid}")
+                send_message(conn, {'ok': False, 'error': "拒绝访问"})
+                return
+            request = recv_message(conn)
+            send_message(conn, self.handle_request(request))
+        except (OSError, ValueError, AgentError) as e:
+            logger.warning(f"处理代理请求失败: {e}")
+
+    def handle_request(self, request: dict) -> dict:
+        """执行一个请求，返回响应"""
+        from cli.common import CliError
+
+        op = request.get('op')
+        if op not in AGENT_OPS:
+            return {'ok': False, 'error': f"不支持的请求: {op}"}
+        # ping/status 不算作使用，不推迟自动锁定
+        if op not in ('ping', 'status'):
+            self.session.update_activity()
+        try:
+            return {'ok': True, 'result': getattr(self, f'_op_{op}')(request)}
+        except CliError as e:
+            return {'ok': False, 'error': str(e)}
+        except Exception as e:
+            logger.error(f"代理请求 {op} 失败: {e}")
+            return {'ok': False, 'error': f"{op} 失败: {e}"}
+
+    def _op_ping(self, request):
+        return 'pong'
+
+    def _op_status(self, request):
+        idle = time.time() - self.session.last_activity
+        return {
+            'pid': os.getpid(),
+            'socket': self.socket_path,
+            'uptime_seconds': round(time.time() - self._started_at),
+            'lock_in_seconds': max(0, round(self.session.auto_lock_minutes * 60 - idle)),
+            'cached_keys': len(self.encryption_manager._key_cache),
+        }
+
+    def _op_list(self, request):
+        from cli.common import entry_summary
+        entries = self.database_manager.get_all_entries()
+        category = request.get('category')
+        return [entry_summary(entry) for entry in entries if not category or entry.category == category]
+
+    def _op_search(self, request):
+        from cli.common import entry_summary, search_ranked
+        return [entry_summary(entry) for entry in search_ranked(self.database_manager, request.get('keyword', ''))]
+
+    def _op_find(self, request):
+        from cli.common import entry_summary
+        return [entry_summary(entry) for entry in self.database_manager.find_by_domain(request.get('url', ''))]
+
+    def _op_get(self, request):
+        from cli.common import entry_summary, resolve_entry
+        entry = resolve_entry(self.database_manager, str(request.get('target', '')), request.get('user'))
+        record = dict(entry_summary(entry), notes=entry.notes)
+        if request.get('password'):
+            record['password'] = self._decrypt(entry)
+            self.database_manager.record_usage(entry.id)
+        return record
+
+    def _op_copy(self, request):
+        from cli.common import copy_to_clipboard, resolve_entry
+        entry = resolve_entry(self.database_manager, str(request.get('target', '')), request.get('user'))
+        copy_to_clipboard(self._decrypt(entry))
+        self.database_manager.record_usage(entry.id)
+        if self.clear_clipboard_seconds > 0:
+            self._clipboard_clear_at = time.time() + self.clear_clipboard_seconds
+        return {'website_name': entry.website_name, 'clear_seconds': self.clear_clipboard_seconds}
+
+    def _op_lock(self, request):
+        self.session.lock()
+        return 'locked'
+
+    def _decrypt(self, entry) -> str:
+        return self.encryption_manager.decrypt(entry.encrypted_password, self.session.get_master_password())
+
+
+def start_agent(vault, socket_path: str, idle_minutes: int = None, preload: bool = False,
+                foreground: bool = False) -> int:
+    """启动代理：后台运行时父进程返回子进程 PID，前台运行时服务结束后返回 0"""
+    agent = VaultAgent(vault, socket_path, idle_minutes)
+    agent.bind()
+    if not foreground and hasattr(os, 'fork'):
+        # 数据库连接不能跨 fork 使用，子进程重新连接
+        vault.database_manager.close()
+        pid = daemonize()
+        if pid:
+            return pid
+        vault.database_manager.connect(vault.config_manager.get_database_config())
+
+    import signal
+    # 收到 SIGTERM 时也要锁定并删除套接字
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        if preload:
+            agent.preload()
+    except Exception as e:
+        logger.error(f"预先派生密钥失败: {e}")
+    agent.serve()
+    return 0
+
+
+def daemonize():
+    """转入后台：父进程返回子进程 PID，子进程返回 0"""
+    pid = os.fork()
+    if pid:
+        return pid
+    os.setsid()
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.close(devnull)
+    sys.stdin = sys.stdout = sys.stderr = open(os.devnull, 'r+')
+    return 0
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 16:50
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 命令行工具公共部分（打开密码库、进度显示）
+import getpass
+import os
+import shutil
+import subprocess
+import sys
+
+from core.config_manager import ConfigManager
+from core.database_manager import DatabaseManager
+from core.encryption_manager import EncryptionManager
+from core.log_manager import setup_logging
+
+# 非交互使用时可以通过环境变量提供主密码
+MASTER_PASSWORD_ENV = 'PASSWDMGR_MASTER_PASSWORD'
+
+# 按顺序尝试的剪贴板命令（从标准输入读取内容）
+CLIPBOARD_COMMANDS = (
+    ('wl-copy',),
+    ('xclip', '-selection', 'clipboard'),
+    ('xsel', '--clipboard', '--input'),
+    ('pbcopy',),
+    ('clip',),
+)
+
+
+class CliError(Exception):
+    """命令行工具错误（输出消息后以非0状态退出）"""
+
+
+class VaultSession:
+    """已解锁的密码库"""
+
+    def __init__(self, config_manager, database_manager, encryption_manager, master_password, vault_keys=None):
+        self.config_manager = config_manager
+        self.database_manager = database_manager
+        self.encryption_manager = encryption_manager
+        self.master_password = master_password
+        self.vault_keys = vault_keys or {}
+
+    @property
+    def fingerprint_key(self):
+        return self.vault_keys.get('fingerprint')
+
+    def close(self):
+        self.master_password = None
+        self.vault_keys = {}
+        self.database_manager.set_metadata_keys(None)
+        self.database_manager.close()
+
+
+def read_password(prompt: str) -> str:
+    """从终端读取密码（不回显）"""
+    try:
+        return getpass.getpass(prompt)
+    except (EOFError, KeyboardInterrupt):
+        raise CliError("已取消")
+
+
+def open_vault(config_file: str = 'config.json', master_password: str = None,
+               derive_keys: bool = True) -> VaultSession:
+    """读取配置、连接数据库并验证主密码
+
+    derive_keys 为 False 时不派生子密钥（少做一次密钥派生，只读命令使用）；
+    开启了元数据加密的密码库总是需要子密钥才能读取记录。
+    """
+    config_manager = ConfigManager(config_file)
+    # 命令行下日志只写文件，不混入标准输出/错误输出
+    setup_logging(dict(config_manager.get_logging_config(), console=False))
+
+    database_manager = DatabaseManager()
+    if not database_manager.connect(config_manager.get_database_config()):
+        raise CliError("无法连接数据库，请检查配置")
+
+    encryption_manager = EncryptionManager()
+    # 没有验证令牌时 validate_master_password 会用输入的密码初始化密码库，命令行下不允许
+    if not database_manager.check_auth_token_exists():
+        database_manager.close()
+        raise CliError("密码库尚未初始化，请先在图形界面中设置主密码")
+
+    master_password = master_password or os.environ.get(MASTER_PASSWORD_ENV) or read_password("主密码: ")
+    if not database_manager.validate_master_password(master_password, encryption_manager):
+        database_manager.close()
+        raise CliError("主密码错误")
+
+    vault_keys = {}
+    if derive_keys or database_manager.is_metadata_encrypted():
+        vault_keys = encryption_manager.derive_vault_keys(master_password, database_manager.get_vault_salt())
+        database_manager.set_metadata_keys(vault_keys)
+    return VaultSession(config_manager, database_manager, encryption_manager, master_password, vault_keys)
+
+
+def entry_summary(entry) -> dict:
+    """记录的非敏感字段（list/search 输出和代理响应使用）"""
+    return {
+        'id': entry.id,
+        'website_name': entry.website_name,
+        'username': entry.username,
+        'url': entry.url,
+        'category': entry.category,
+        'updated_at': entry.updated_at.isoformat() if entry.updated_at else None,
+    }
+
+
+def search_ranked(database_manager, keyword: str) -> list:
+    """子串搜索，按匹配质量和使用次数排序；没有子串匹配时改为容错匹配（如 githbu -> GitHub）
+
+    按字段的查询（如 category:工作 site:git*）交给 query_entries，结果按名称排序。
+    """
+    from core.fuzzy_search import FuzzyIndex, rank_entries
+    from core.query_language import QuerySyntaxError, parse_search
+    try:
+        query = parse_search(keyword)
+    except QuerySyntaxError as e:
+        raise CliError(f"查询语法错误: {e}")
+    if query is not None:
+        return database_manager.query_entries(query)
+    entries = database_manager.search_entries(keyword)
+    if entries:
+        return rank_entries(keyword, entries)
+    all_entries = {entry.id: entry for batch in database_manager.iter_entries() for entry in batch}
+    distances = FuzzyIndex.build(all_entries.values()).lookup(keyword)
+    return rank_entries(keyword, [all_entries[entry_id] for entry_id in distances], distances)
+
+
+def resolve_entry(database_manager, target: str, user: str = None):
+    """按 ID 或网站名称找到唯一一条记录"""
+    if target.isdigit():
+        entry = database_manager.get_entry(int(target))
+        if entry is None:
+            raise CliError(f"记录不存在: {target}")
+        return entry
+
+    candidates = database_manager.search_entries(target)
+    if user is not None:
+        candidates = [entry for entry in candidates if entry.username.casefold() == user.casefold()]
+    exact = [entry for entry in candidates if entry.website_name.casefold() == target.casefold()]
+    matches = exact or candidates
+    if not matches:
+        raise CliError(f"没有找到记录: {target}")
+    if len(matches) > 1:
+        listing = "\n".join(f"  {entry.id}\t{entry.website_name}\t{entry.username}" for entry in matches[:20])
+        raise CliError(f"有 {len(matches)} 条记录匹配 {target!r}，请使用 ID 或 --user 指定:\n{listing}")
+    return matches[0]
+
+
+def copy_to_clipboard(text: str):
+    """用系统的剪贴板命令复制文本（传入空字符串即清除）"""
+    for command in CLIPBOARD_COMMANDS:
+        if shutil.which(command[0]):
+            try:
+                subprocess.run(command, input=text.encode('utf-8'), check=True, timeout=5,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                return
+            except (OSError, subprocess.SubprocessError):
+                continue
+    raise CliError("没有可用的剪贴板命令（需要 wl-copy、xclip、xsel 或 pbcopy）")
+
+
+def print_progress(label: str):
+    """返回在标准错误输出上刷新进度的回调"""
+    def progress(done, total):
+        if total:
+            sys.stderr.write(f"\r{label}: {done}/{total} ({done * 100 // max(total, 1)}%)")
+        else:
+            sys.stderr.write(f"\r{label}: {done}")
+        sys.stderr.flush()
+    return progress
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 20:10
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 批量生成密码命令
+"""
+用法:
+    python -m cli.gen                                  # 按默认规则生成一个密码
+    python -m cli.gen -n 1000000 --preset service -o service_accounts.txt
+    python -m cli.gen -n 20 -l 12 --no-symbols --min-digits 2 --exclude-lookalikes
+    python -m cli.gen -n 5 --alphabet 0123456789abcdef -l 40
+    python -m cli.gen --passphrase --words 5 --language pinyin --capitalize title --digits 1
+
+不需要打开密码库，每行输出一个密码。--entropy 在标准错误输出中显示每个密码的熵。
+"""
+import argparse
+import os
+import sys
+import time
+from dataclasses import replace
+
+from core.password_generator import (CAPITALIZATION_MODES, POLICY_PRESETS, BulkPasswordGenerator,
+                                     PassphraseGenerator, PassphrasePolicy)
+from core.wordlist import WORDLIST_LANGUAGES, WordlistError
+from utils.helpers import open_private_file
+
+# 每批生成的密码数（控制内存占用）
+CHUNK_SIZE = 100000
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m cli.gen', description='批量生成密码')
+    parser.add_argument('-n', '--count', type=int, default=1, help='生成的密码个数')
+    parser.add_argument('-p', '--preset', choices=sorted(POLICY_PRESETS), default='default', help='预设规则')
+    parser.add_argument('-l', '--length', type=int, help='密码长度')
+    parser.add_argument('--alphabet', help='自定义字母表（忽略字符类型设置）')
+    parser.add_argument('--symbols', help='可用的符号')
+    parser.add_argument('--exclude', help='排除的字符')
+    parser.add_argument('--exclude-lookalikes', action='store_true', help='排除 I l 1 O 0 等容易看错的字符')
+    for name, label in (('lowercase', '小写字母'), ('uppercase', '大写字母'), ('digits', '数字'), ('symbols', '符号')):
+        parser.add_argument(f'--no-{name}', action='store_true', help=f'不使用{label}')
+        parser.add_argument(f'--min-{name}', type=int, help=f'{label}最少个数')
+    parser.add_argument('-o', '--output', help='输出文件（默认标准输出）')
+    parser.add_argument('--entropy', action='store_true', help='显示每个密码的熵')
+
+    passphrase = parser.add_argument_group('密码短语')
+    passphrase.add_argument('--passphrase', action='store_true', help='生成由单词组成的密码短语')
+    passphrase.add_argument('--words', type=int, default=6, help='单词个数')
+    passphrase.add_argument('--language', choices=sorted(WORDLIST_LANGUAGES), default='en', help='词表')
+    passphrase.add_argument('--separator', default='-', help='分隔符（random 表示随机选择一个符号）')
+    passphrase.add_argument('--capitalize', choices=CAPITALIZATION_MODES, default='lower', help='大小写')
+    passphrase.add_argument('--digits', type=int, default=0, help='随机插入的数字个数')
+    return parser
+
+
+def build_policy(args):
+    """在预设规则上应用命令行参数"""
+    changes = {}
+    if args.length is not None:
+        changes['length'] = args.length
+    if args.alphabet is not None:
+        changes['alphabet'] = args.alphabet
+    if args.symbols is not None:
+        changes['symbols'] = args.symbols
+    if args.exclude is not None:
+        changes['exclude'] = args.exclude
+    if args.exclude_lookalikes:
+        changes['exclude_lookalikes'] = True
+    for name in ('lowercase', 'uppercase', 'digits', 'symbols'):
+        if getattr(args, f'no_{name}'):
+            changes[f'use_{name}'] = False
+            changes[f'min_{name}'] = 0
+        minimum = getattr(args, f'min_{name}')
+        if minimum is not None:
+            changes[f'min_{name}'] = minimum
+    return replace(POLICY_PRESETS[args.preset], **changes)
+
+
+def build_passphrase_policy(args):
+    return PassphrasePolicy(words=args.words, language=args.language, separator=args.separator,
+                            capitalization=args.capitalize, digits=args.digits)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        if args.passphrase:
+            generator = PassphraseGenerator(build_passphrase_policy(args))
+            entropy = generator.entropy_bits
+        else:
+            generator = BulkPasswordGenerator(build_policy(args))
+            entropy = generator.entropy_bits
+    except (ValueError, WordlistError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    if args.entropy:
+        print(f"熵: {entropy:.1f} 位", file=sys.stderr)
+
+    # 输出文件只允许所有者读写
+    output = open_private_file(args.output, 'wb') if args.output else sys.stdout.buffer
+    start = time.perf_counter()
+    try:
+        remaining = args.count
+        while remaining > 0:
+            count = min(remaining, CHUNK_SIZE)
+            if args.passphrase:
+                output.write(('\n'.join(generator.generate(count)) + '\n').encode('utf-8'))
+            else:
+                output.write(generator.generate_lines(count))
+            remaining -= count
+        output.flush()
+    except BrokenPipeError:
+        # 输出被 head 等提前关闭，避免退出时再次刷新标准输出报错
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    finally:
+        if args.output:
+            output.close()
+
+    if args.output:
+        elapsed = time.perf_counter() - start
+        print(f"已生成 {args.count} 个密码到 {args.output}，耗时 {elapsed:.2f} 秒", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
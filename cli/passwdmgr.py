@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 21:00
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 命令行客户端（不依赖图形界面）
+"""
+用法:
+    passwdmgr list [--category 工作] [--json]
+    passwdmgr search git
+    passwdmgr search 'category:工作 site:git* -user:bob'   # 按字段查询，语法见 core/query_language.py
+    passwdmgr find https://login.example.co.uk/  # 同一可注册域名（example.co.uk）下的记录
+    passwdmgr get github                     # 只输出密码，便于脚本使用
+    passwdmgr get github --field username
+    passwdmgr get 42 --json
+    passwdmgr copy github
+    passwdmgr add GitHub --url https://github.com --username me --generate
+    printf '%s\\n' "$PASSWORD" | passwdmgr add "Service A" --username svc --password-stdin
+    passwdmgr edit github --username new@example.com --password-prompt
+    passwdmgr rm github -y
+    passwdmgr export -f vault -o backup.pmvault
+    passwdmgr gen -n 10 --preset service
+    passwdmgr agent start                    # 解锁一次，之后 list/search/get/copy 不再输入主密码
+
+记录可以用 ID 或网站名称指定（名称不区分大小写，不完全一致时按关键字搜索），
+有多条匹配时用 --user 按用户名进一步筛选。主密码也可以通过环境变量 PASSWDMGR_MASTER_PASSWORD 提供。
+
+只导入 core/ 中用到的模块，不导入 gui/ 和 PyQt，各命令用到的模块在执行时才导入。
+"""
+import argparse
+import sys
+
+ENTRY_FIELDS = ('password', 'username', 'url', 'notes', 'category', 'website_name')
+
+
+# 与 core.vault_transfer.EXPORT_FORMATS 一致（在这里导入会拖慢通过代理执行的命令）
+EXPORT_FORMATS = ('jsonl', 'csv', 'vault')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='passwdmgr', description='密码管理器命令行客户端')
+    parser.add_argument('--config', default='config.json', help='配置文件路径')
+    parser.add_argument('--no-agent', action='store_true', help='不使用正在运行的代理，直接打开密码库')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subparsers.add_parser('list', help='列出记录（不含密码）')
+    list_parser.add_argument('--category', help='只列出该分类')
+    list_parser.add_argument('--json', action='store_true', help='每行输出一个 JSON 对象')
+
+    search_parser = subparsers.add_parser(
+        'search', help='按网站名称、网址、备注和分类搜索（无结果时容错匹配），或按字段查询',
+        description='关键字或查询，如 category:工作 user:alice site:git* updated:<2025-01-01 -notes:test。'
+                    '字段: site url user category notes domain updated created used；'
+                    'site:git* 前缀，site:=GitHub 完整匹配，- 排除，OR 或者，updated:<1y 超过一年未更新')
+    search_parser.add_argument('keyword')
+    search_parser.add_argument('--json', action='store_true', help='每行输出一个 JSON 对象')
+    search_parser.add_argument('--explain', action='store_true', help='只输出查询的执行计划和 SQL，不打开密码库')
+
+    find_parser = subparsers.add_parser('find', help='按网址查找同一域名下的记录')
+    find_parser.add_argument('url')
+    find_parser.add_argument('--json', action='store_true', help='每行输出一个 JSON 对象')
+
+    get_parser = subparsers.add_parser('get', help='输出一条记录的密码或其他字段')
+    get_parser.add_argument('target', help='记录 ID 或网站名称')
+    get_parser.add_argument('-u', '--user', help='按用户名筛选')
+    get_parser.add_argument('-f', '--field', choices=ENTRY_FIELDS, default='password', help='输出的字段')
+    get_parser.add_argument('--json', action='store_true', help='以 JSON 输出整条记录（含密码）')
+
+    copy_parser = subparsers.add_parser('copy', help='复制密码到剪贴板')
+    copy_parser.add_argument('target', help='记录 ID 或网站名称')
+    copy_parser.add_argument('-u', '--user', help='按用户名筛选')
+
+    add_parser = subparsers.add_parser('add', help='添加记录')
+    add_parser.add_argument('name', help='网站名称')
+    add_entry_arguments(add_parser)
+
+    edit_parser = subparsers.add_parser('edit', help='修改记录')
+    edit_parser.add_argument('target', help='记录 ID 或网站名称')
+    edit_parser.add_argument('-u', '--user', help='按用户名筛选')
+    edit_parser.add_argument('--name', help='新的网站名称')
+    add_entry_arguments(edit_parser)
+
+    rm_parser = subparsers.add_parser('rm', help='删除记录')
+    rm_parser.add_argument('target', help='记录 ID 或网站名称')
+    rm_parser.add_argument('-u', '--user', help='按用户名筛选')
+    rm_parser.add_argument('-y', '--yes', action='store_true', help='不询问直接删除')
+
+    export_parser = subparsers.add_parser('export', help='导出密码库（同 python -m cli.vault export）')
+    export_parser.add_argument('-f', '--format', choices=EXPORT_FORMATS, default='vault', help='导出格式')
+    export_parser.add_argument('-o', '--output', required=True, help='输出文件')
+    export_parser.add_argument('--archive-password', action='store_true',
+                               help='为加密归档单独设置密码（默认使用主密码）')
+    export_parser.add_argument('--batch-size', type=int, help='每批处理的条目数')
+
+    agent_parser = subparsers.add_parser('agent', help='在后台保持解锁，供之后的命令使用')
+    agent_subparsers = agent_parser.add_subparsers(dest='agent_command', required=True)
+    start_parser = agent_subparsers.add_parser('start', help='解锁并启动代理')
+    start_parser.add_argument('--timeout', type=int, help='空闲多少分钟后锁定（默认为设置中的自动锁定时间）')
+    start_parser.add_argument('--preload', action='store_true', help='启动时预先派生所有记录的密钥')
+    start_parser.add_argument('--foreground', action='store_true', help='在前台运行')
+    agent_subparsers.add_parser('status', help='查看代理状态')
+    agent_subparsers.add_parser('stop', help='锁定并停止代理')
+
+    gen_parser = subparsers.add_parser('gen', help='生成密码（参数同 python -m cli.gen）', add_help=False)
+    gen_parser.add_argument('gen_args', nargs=argparse.REMAINDER)
+    return parser
+
+
+def add_entry_arguments(parser):
+    parser.add_argument('--url', help='网址')
+    parser.add_argument('--username', help='用户名')
+    parser.add_argument('--category', help='分类')
+    parser.add_argument('--notes', help='备注')
+    password = parser.add_mutually_exclusive_group()
+    password.add_argument('--password-prompt', action='store_true', help='从终端输入密码')
+    password.add_argument('--password-stdin', action='store_true', help='从标准输入读取密码（第一行）')
+    password.add_argument('--generate', action='store_true', help='生成随机密码（并输出到标准输出）')
+    parser.add_argument('--length', type=int, default=20, help='生成密码的长度')
+
+
+def print_entries(summaries, as_json):
+    if as_json:
+        import json
+        for summary in summaries:
+            print(json.dumps(summary, ensure_ascii=False))
+        return
+    for summary in summaries:
+        print(f"{summary['id']}\t{summary['website_name']}\t{summary['username']}\t"
+              f"{summary['url']}\t{summary['category']}")
+
+
+def print_record(args, record):
+    """按 get 的参数输出记录（record 为 entry_summary 加上 notes 和 password）"""
+    if args.json:
+        import json
+        print(json.dumps(record, ensure_ascii=False))
+    else:
+        print(record[args.field])
+
+
+def read_new_password(args):
+    """按参数获取新密码，没有指定时返回 None"""
+    from cli.common import CliError, read_password
+
+    if args.generate:
+        from core.password_generator import BulkPasswordGenerator, PasswordPolicy
+        policy = PasswordPolicy(length=args.length, min_lowercase=1, min_uppercase=1, min_digits=1, min_symbols=1)
+        return BulkPasswordGenerator(policy).generate(1)[0]
+    if args.password_stdin:
+        password = sys.stdin.readline().rstrip('\r\n')
+        if not password:
+            raise CliError("标准输入中没有密码")
+        return password
+    if args.password_prompt:
+        password = read_password("密码: ")
+        if password != read_password("确认密码: "):
+            raise CliError("两次输入的密码不一致")
+        if not password:
+            raise CliError("密码不能为空")
+        return password
+    return None
+
+
+def set_password(vault, entry, password):
+    from core.encryption_manager import EncryptionManager
+    entry.encrypted_password = vault.encryption_manager.encrypt(password, vault.master_password)
+    entry.password_fingerprint = (EncryptionManager.fingerprint(password, vault.fingerprint_key)
+                                  if vault.fingerprint_key else None)
+
+
+def run_list(args, vault):
+    from cli.common import entry_summary
+    entries = vault.database_manager.get_all_entries()
+    if args.category:
+        entries = [entry for entry in entries if entry.category == args.category]
+    print_entries([entry_summary(entry) for entry in entries], args.json)
+
+
+def run_search(args, vault):
+    from cli.common import entry_summary, search_ranked
+    print_entries([entry_summary(entry) for entry in search_ranked(vault.database_manager, args.keyword)],
+                  args.json)
+
+
+def run_explain(args) -> int:
+    from core.query_language import QuerySyntaxError, compile_query, explain, parse_query, plan_query
+    try:
+        node = plan_query(parse_query(args.keyword))
+    except QuerySyntaxError as e:
+        print(f"错误: 查询语法错误: {e}", file=sys.stderr)
+        return 1
+    compiled = compile_query(node)
+    print('\n'.join(explain(node)))
+    print(f"WHERE {compiled.where}")
+    print(f"参数: {compiled.params}")
+    return 0
+
+
+def run_find(args, vault):
+    from cli.common import entry_summary
+    print_entries([entry_summary(entry) for entry in vault.database_manager.find_by_domain(args.url)], args.json)
+
+
+def run_get(args, vault):
+    from cli.common import entry_summary, resolve_entry
+    entry = resolve_entry(vault.database_manager, args.target, args.user)
+    record = dict(entry_summary(entry), notes=entry.notes)
+    if args.json or args.field == 'password':
+        record['password'] = vault.encryption_manager.decrypt(entry.encrypted_password, vault.master_password)
+        vault.database_manager.record_usage(entry.id)
+    print_record(args, record)
+
+
+def run_copy(args, vault):
+    from cli.common import copy_to_clipboard, resolve_entry
+    entry = resolve_entry(vault.database_manager, args.target, args.user)
+    copy_to_clipboard(vault.encryption_manager.decrypt(entry.encrypted_password, vault.master_password))
+    vault.database_manager.record_usage(entry.id)
+    print(f"已复制 {entry.website_name} 的密码（没有运行代理，剪贴板不会自动清除）", file=sys.stderr)
+
+
+def run_add(args, vault):
+    from cli.common import CliError
+    from models.password_entry import PasswordEntry
+
+    password = read_new_password(args)
+    if password is None:
+        args.password_prompt = True
+        password = read_new_password(args)
+
+    entry = PasswordEntry(website_name=args.name, url=args.url or '', username=args.username or '',
+                          notes=args.notes or '', category=args.category or '默认')
+    set_password(vault, entry, password)
+    if not vault.database_manager.add_entry(entry):
+        raise CliError("添加记录失败")
+    if args.generate:
+        print(password)
+    print(f"已添加: {entry.website_name}", file=sys.stderr)
+
+
+def run_edit(args, vault):
+    from cli.common import CliError, resolve_entry
+
+    entry = resolve_entry(vault.database_manager, args.target, args.user)
+    for field, value in (('website_name', args.name), ('url', args.url), ('username', args.username),
+                         ('category', args.category), ('notes', args.notes)):
+        if value is not None:
+            setattr(entry, field, value)
+    password = read_new_password(args)
+    if password is not None:
+        set_password(vault, entry, password)
+    elif entry.password_fingerprint is None and vault.fingerprint_key:
+        # 顺便补全旧记录的密码指纹
+        set_password(vault, entry, vault.encryption_manager.decrypt(entry.encrypted_password,
+                                                                    vault.master_password))
+
+    if not vault.database_manager.update_entry(entry):
+        raise CliError("修改记录失败")
+    if args.generate:
+        print(password)
+    print(f"已修改: {entry.website_name}", file=sys.stderr)
+
+
+def run_rm(args, vault):
+    from cli.common import CliError, resolve_entry
+
+    entry = resolve_entry(vault.database_manager, args.target, args.user)
+    if not args.yes:
+        if not sys.stdin.isatty():
+            raise CliError("非交互模式下删除需要 -y")
+        answer = input(f"删除 {entry.id} {entry.website_name} ({entry.username})? [y/N] ")
+        if answer.strip().lower() not in ('y', 'yes'):
+            raise CliError("已取消")
+    if not vault.database_manager.delete_entry(entry.id):
+        raise CliError("删除记录失败")
+    print(f"已删除: {entry.website_name}", file=sys.stderr)
+
+
+def run_export(args, vault):
+    from cli.vault import run_export as export
+    from core.vault_transfer import DEFAULT_BATCH_SIZE
+    args.batch_size = args.batch_size or DEFAULT_BATCH_SIZE
+    export(args, vault)
+
+
+def run_agent(args):
+    from cli.agent import AgentClient, AgentUnavailable, default_socket_path
+
+    socket_path = default_socket_path(args.config)
+    if args.agent_command == 'status':
+        try:
+            status = AgentClient(socket_path).request('status')
+        except AgentUnavailable:
+            print("代理未运行")
+            return 1
+        print(f"代理运行中 (pid {status['pid']})，{status['lock_in_seconds']} 秒后自动锁定，"
+              f"已缓存 {status['cached_keys']} 个密钥\n套接字: {status['socket']}")
+        return 0
+    if args.agent_command == 'stop':
+        try:
+            AgentClient(socket_path).request('lock')
+        except AgentUnavailable:
+            print("代理未运行")
+            return 1
+        print("代理已锁定")
+        return 0
+
+    from cli.agent import start_agent
+    from cli.common import open_vault
+    vault = open_vault(args.config)
+    pid = start_agent(vault, socket_path, args.timeout, args.preload, args.foreground)
+    if pid:
+        print(f"代理已启动 (pid {pid})，套接字: {socket_path}")
+    return 0
+
+
+def agent_list(args, client):
+    print_entries(client.request('list', category=args.category), args.json)
+
+
+def agent_search(args, client):
+    print_entries(client.request('search', keyword=args.keyword), args.json)
+
+
+def agent_find(args, client):
+    print_entries(client.request('find', url=args.url), args.json)
+
+
+def agent_get(args, client):
+    record = client.request('get', target=args.target, user=args.user,
+                            password=args.json or args.field == 'password')
+    print_record(args, record)
+
+
+def agent_copy(args, client):
+    result = client.request('copy', target=args.target, user=args.user)
+    message = f"已复制 {result['website_name']} 的密码"
+    if result['clear_seconds'] > 0:
+        message += f"，{result['clear_seconds']} 秒后清除剪贴板"
+    print(message, file=sys.stderr)
+
+
+# 命令 -> (直接打开密码库执行, 是否需要子密钥)
+COMMANDS = {
+    'list': (run_list, False),
+    'search': (run_search, False),
+    'find': (run_find, False),
+    'get': (run_get, False),
+    'copy': (run_copy, False),
+    'add': (run_add, True),
+    'edit': (run_edit, True),
+    'rm': (run_rm, False),
+    'export': (run_export, False),
+}
+
+# 可以交给代理执行的只读命令
+AGENT_COMMANDS = {
+    'list': agent_list,
+    'search': agent_search,
+    'find': agent_find,
+    'get': agent_get,
+    'copy': agent_copy,
+}
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == 'gen':
+        # gen 的参数原样交给 cli.gen
+        from cli.gen import main as gen_main
+        return gen_main(extra + args.gen_args)
+    if extra:
+        parser.error(f"无法识别的参数: {' '.join(extra)}")
+    if args.command == 'search' and args.explain:
+        return run_explain(args)
+
+    if args.command in AGENT_COMMANDS and not args.no_agent:
+        # 有代理在运行时不需要输入主密码，也不导入数据库和加密模块
+        from cli.agent import AgentClient, AgentError, AgentUnavailable, default_socket_path
+        try:
+            AGENT_COMMANDS[args.command](args, AgentClient(default_socket_path(args.config)))
+            return 0
+        except AgentUnavailable:
+            pass
+        except AgentError as e:
+            print(f"错误: {e}", file=sys.stderr)
+            return 1
+
+    from cli.agent import AgentError
+    from cli.common import CliError, open_vault
+    from core.vault_transfer import VaultTransferError
+
+    try:
+        if args.command == 'agent':
+            return run_agent(args)
+        command, needs_keys = COMMANDS[args.command]
+        vault = open_vault(args.config, derive_keys=needs_keys)
+        try:
+            command(args, vault)
+        finally:
+            vault.close()
+    except (CliError, AgentError, VaultTransferError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
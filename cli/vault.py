@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 16:55
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 密码库导出/导入命令
+"""
+用法:
+    python -m cli.vault export -f jsonl -o backup.jsonl
+    python -m cli.vault export -f vault -o backup.pmvault [--archive-password]
+    python -m cli.vault import backup.pmvault
+    python -m cli.vault import passwords.csv
+    python -m cli.vault import "Chrome Passwords.csv" --from chrome
+    python -m cli.vault import keepass.xml
+
+导出的 jsonl / csv 文件包含明文密码，请妥善保管；加密归档默认使用主密码加密。
+"""
+import argparse
+import sys
+
+from cli.common import CliError, open_vault, print_progress, read_password
+from core.vault_transfer import (EXPORT_FORMATS, DEFAULT_BATCH_SIZE, VaultTransferError,
+                                 detect_format, export_vault, import_vault)
+from core.importers import IMPORT_SOURCES, detect_source, import_passwords
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m cli.vault', description='密码库导出/导入')
+    parser.add_argument('--config', default='config.json', help='配置文件路径')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='每批处理的条目数')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='导出密码库')
+    export_parser.add_argument('-f', '--format', choices=EXPORT_FORMATS, default='vault', help='导出格式')
+    export_parser.add_argument('-o', '--output', required=True, help='输出文件')
+    export_parser.add_argument('--archive-password', action='store_true',
+                               help='为加密归档单独设置密码（默认使用主密码）')
+
+    import_parser = subparsers.add_parser('import', help='导入到密码库')
+    import_parser.add_argument('input', help='导入文件')
+    import_parser.add_argument('-f', '--format', choices=EXPORT_FORMATS, help='文件格式（默认自动识别）')
+    import_parser.add_argument('--from', dest='source', choices=IMPORT_SOURCES,
+                               help='从浏览器或 KeePass 导出的文件导入（默认按文件内容识别）')
+    import_parser.add_argument('--archive-password', action='store_true',
+                               help='加密归档使用了单独的密码')
+    return parser
+
+
+def run_export(args, vault):
+    archive_password = None
+    if args.format == 'vault' and args.archive_password:
+        archive_password = read_password("归档密码: ")
+        if archive_password != read_password("确认归档密码: "):
+            raise CliError("两次输入的归档密码不一致")
+    elif args.format != 'vault':
+        print("注意: 导出文件包含明文密码", file=sys.stderr)
+
+    count = export_vault(vault.database_manager, vault.encryption_manager, vault.master_password,
+                         args.output, args.format, archive_password, args.batch_size,
+                         print_progress("导出"))
+    print(f"\n已导出 {count} 条记录到 {args.output}", file=sys.stderr)
+
+
+def run_import(args, vault):
+    source = args.source or (None if args.format else detect_source(args.input))
+    if source:
+        result = import_passwords(vault.database_manager, vault.encryption_manager, vault.master_password,
+                                  args.input, source, vault.config_manager, args.batch_size,
+                                  print_progress("导入"), vault.fingerprint_key)
+        print(f"\n已从 {source} 导入 {result.imported} 条记录，重复 {result.duplicates} 条，"
+              f"跳过 {result.skipped} 条", file=sys.stderr)
+        if result.new_categories:
+            print(f"新增分类: {', '.join(result.new_categories)}", file=sys.stderr)
+        return
+
+    fmt = args.format or detect_format(args.input)
+    archive_password = read_password("归档密码: ") if fmt == 'vault' and args.archive_password else None
+    count = import_vault(vault.database_manager, vault.encryption_manager, vault.master_password,
+                         args.input, fmt, archive_password, args.batch_size,
+                         print_progress("导入"), vault.fingerprint_key)
+    print(f"\n已导入 {count} 条记录", file=sys.stderr)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        vault = open_vault(args.config)
+        try:
+            if args.command == 'export':
+                run_export(args, vault)
+            else:
+                run_import(args, vault)
+        finally:
+            vault.close()
+    except (CliError, VaultTransferError) as e:
+        print(f"\n错误: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 17:45
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 离线泄露密码检查（基于本地 HIBP 哈希数据集）
+"""
+把 Have I Been Pwned 的 Pwned Passwords 数据集（SHA-1 或 NTLM）转换一次为排序的二进制文件，
+之后通过内存映射 + 二分查找检查密码，不需要联网，也不需要把几十GB的数据读入内存。
+
+支持的输入:
+    单个文本文件，每行 "完整哈希:出现次数"（如 pwned-passwords-sha1-ordered-by-hash.txt）
+    范围目录，文件名为5位十六进制前缀，每行 "哈希后缀:出现次数"（PwnedPasswordsDownloader 的输出）
+
+二进制格式（.pmbreach）:
+    头部 32 字节: 魔数 PMBRCH1\\0 + 哈希类型(1字节) + 哈希长度(1字节) + 2字节保留 + 记录数(8字节) + 保留
+    前缀表: 65537 个 8 字节整数，前缀表[p] 为哈希前两字节等于 p 的第一条记录的序号
+    记录: 哈希（20/16字节） + 出现次数（4字节），按哈希排序
+查找时先用前缀表把范围缩小到约 1/65536，再在桶内二分查找。
+"""
+import hashlib
+import heapq
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional
+
+from models.password_entry import PasswordEntry
+
+logger = logging.getLogger(__name__)
+
+CORPUS_MAGIC = b'PMBRCH1\0'
+CORPUS_EXTENSION = '.pmbreach'
+HEADER_FORMAT = '>8sBBxxQ12x'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+PREFIX_COUNT = 65536
+PREFIX_TABLE_SIZE = (PREFIX_COUNT + 1) * 8
+COUNT_SIZE = 4
+
+HASH_SHA1 = 1
+HASH_NTLM = 2
+HASH_SIZES = {HASH_SHA1: 20, HASH_NTLM: 16}
+HASH_NAMES = {HASH_SHA1: 'SHA-1', HASH_NTLM: 'NTLM'}
+
+# 外部排序时每个有序段的记录数（约 100MB 内存）
+RUN_RECORDS = 1_000_000
+# 一次归并同时打开的有序段文件数上限
+MAX_MERGE_FANIN = 128
+
+ProgressCallback = Optional[Callable[[int, Optional[int]], None]]
+
+
+class BreachCorpusError(Exception):
+    """数据集无法转换或打开"""
+
+
+# ---------- 哈希 ----------
+
+def _md4(data: bytes) -> bytes:
+    """纯 Python MD4（OpenSSL 3 默认不再提供 md4 时使用）"""
+    def rotl(x, n):
+        x &= 0xFFFFFFFF
+        return ((x << n) | (x >> (32 - n))) & 0xFFFFFFFF
+
+    message = data + b'\x80' + b'\0' * ((55 - len(data)) % 64) + struct.pack('<Q', len(data) * 8)
+    a, b, c, d = 0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476
+    for offset in range(0, len(message), 64):
+        x = struct.unpack('<16I', message[offset:offset + 64])
+        aa, bb, cc, dd = a, b, c, d
+        for i in (0, 4, 8, 12):
+            a = rotl(a + ((b & c) | (~b & d)) + x[i], 3)
+            d = rotl(d + ((a & b) | (~a & c)) + x[i + 1], 7)
+            c = rotl(c + ((d & a) | (~d & b)) + x[i + 2], 11)
+            b = rotl(b + ((c & d) | (~c & a)) + x[i + 3], 19)
+        for i in (0, 1, 2, 3):
+            a = rotl(a + ((b & c) | (b & d) | (c & d)) + x[i] + 0x5A827999, 3)
+            d = rotl(d + ((a & b) | (a & c) | (b & c)) + x[i + 4] + 0x5A827999, 5)
+            c = rotl(c + ((d & a) | (d & b) | (a & b)) + x[i + 8] + 0x5A827999, 9)
+            b = rotl(b + ((c & d) | (c & a) | (d & a)) + x[i + 12] + 0x5A827999, 13)
+        for i in (0, 2, 1, 3):
+            a = rotl(a + (b ^ c ^ d) + x[i] + 0x6ED9EBA1, 3)
+            d = rotl(d + (a ^ b ^ c) + x[i + 8] + 0x6ED9EBA1, 9)
+            c = rotl(c + (d ^ a ^ b) + x[i + 4] + 0x6ED9EBA1, 11)
+            b = rotl(b + (c ^ d ^ a) + x[i + 12] + 0x6ED9EBA1, 15)
+        a, b, c, d = (a + aa) & 0xFFFFFFFF, (b + bb) & 0xFFFFFFFF, (c + cc) & 0xFFFFFFFF, (d + dd) & 0xFFFFFFFF
+    return struct.pack('<4I', a, b, c, d)
+
+
+def hash_password(password: str, hash_type: int = HASH_SHA1) -> bytes:
+    """计算与数据集一致的密码哈希"""
+    if hash_type == HASH_NTLM:
+        data = password.encode('utf-16-le')
+        try:
+            return hashlib.new('md4', data).digest()
+        except ValueError:
+            return _md4(data)
+    return hashlib.sha1(password.encode('utf-8')).digest()
+
+
+# ---------- 转换 ----------
+
+def _iter_source_lines(source_path: str) -> Iterator[str]:
+    """逐行读取数据集，范围目录中的行补全前缀后返回"""
+    if os.path.isdir(source_path):
+        names = sorted(name for name in os.listdir(source_path)
+                       if len(os.path.splitext(name)[0]) == 5)
+        for name in names:
+            prefix = os.path.splitext(name)[0].upper()
+            try:
+                int(prefix, 16)
+            except ValueError:
+                continue
+            with open(os.path.join(source_path, name), 'r', encoding='ascii', errors='replace') as f:
+                for line in f:
+                    yield prefix + line
+    else:
+        with open(source_path, 'r', encoding='ascii', errors='replace') as f:
+            yield from f
+
+
+def _parse_records(lines: Iterator[str]) -> Iterator[tuple]:
+    """解析 "哈希:次数" 行，返回 (哈希类型, 记录字节)"""
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        hex_hash, _, count = line.partition(':')
+        try:
+            digest = bytes.fromhex(hex_hash)
+            count = min(int(count or 1), 0xFFFFFFFF)
+        except ValueError:
+            raise BreachCorpusError(f"第 {line_number} 行格式错误: {line[:60]}")
+        hash_type = HASH_SHA1 if len(digest) == 20 else HASH_NTLM if len(digest) == 16 else None
+        if hash_type is None:
+            raise BreachCorpusError(f"第 {line_number} 行不是 SHA-1 或 NTLM 哈希: {line[:60]}")
+        yield hash_type, digest + struct.pack('>I', count)
+
+
+def _write_run(records: List[bytes], directory: str) -> str:
+    records.sort()
+    fd, path = tempfile.mkstemp(suffix='.run', dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(b''.join(records))
+    return path
+
+
+def _read_run(path: str, record_size: int) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(record_size * 4096)
+            if not block:
+                return
+            for offset in range(0, len(block), record_size):
+                yield block[offset:offset + record_size]
+
+
+def _merge_runs(paths: List[str], record_size: int, directory: str) -> str:
+    """把多个有序段归并为一个（有序段过多时分层归并，避免同时打开过多文件）"""
+    fd, path = tempfile.mkstemp(suffix='.run', dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+        buffer = []
+        for record in heapq.merge(*(_read_run(run, record_size) for run in paths)):
+            buffer.append(record)
+            if len(buffer) >= 65536:
+                f.write(b''.join(buffer))
+                buffer = []
+        f.write(b''.join(buffer))
+    return path
+
+
+def build_corpus(source_path: str, output_path: str, progress: ProgressCallback = None,
+                 run_records: int = RUN_RECORDS) -> int:
+    """把文本数据集转换为排序的二进制文件，返回记录数
+
+    输入无需有序：按段排序写入临时文件后多路归并（外部排序），内存占用与数据集大小无关。
+    重复的哈希只保留一条（取最大次数）。
+    """
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    hash_type = None
+    runs = []
+    merged = []
+    records = []
+    parsed = 0
+
+    try:
+        for record_type, record in _parse_records(_iter_source_lines(source_path)):
+            if hash_type is None:
+                hash_type = record_type
+            elif record_type != hash_type:
+                raise BreachCorpusError("数据集中混有不同类型的哈希")
+            records.append(record)
+            parsed += 1
+            if len(records) >= run_records:
+                runs.append(_write_run(records, output_dir))
+                records = []
+            if progress and parsed % 100000 == 0:
+                progress(parsed, None)
+
+        if hash_type is None:
+            raise BreachCorpusError("数据集为空")
+        if records:
+            runs.append(_write_run(records, output_dir))
+            records = []
+
+        hash_size = HASH_SIZES[hash_type]
+        record_size = hash_size + COUNT_SIZE
+        while len(runs) > MAX_MERGE_FANIN:
+            merged = []
+            for start in range(0, len(runs), MAX_MERGE_FANIN):
+                group = runs[start:start + MAX_MERGE_FANIN]
+                merged.append(_merge_runs(group, record_size, output_dir))
+                for path in group:
+                    os.remove(path)
+            runs = merged
+            merged = []
+
+        prefix_counts = [0] * PREFIX_COUNT
+        count = 0
+
+        temp_output = output_path + '.tmp'
+        with open(temp_output, 'wb') as out:
+            out.write(b'\0' * (HEADER_SIZE + PREFIX_TABLE_SIZE))
+            buffer = []
+
+            def emit(record):
+                nonlocal buffer, count
+                buffer.append(record)
+                prefix_counts[(record[0] << 8) | record[1]] += 1
+                count += 1
+                if len(buffer) >= 65536:
+                    out.write(b''.join(buffer))
+                    buffer = []
+                if progress and count % 100000 == 0:
+                    progress(count, parsed)
+
+            pending = None
+            for record in heapq.merge(*(_read_run(path, record_size) for path in runs)):
+                if pending is not None and record[:hash_size] == pending[:hash_size]:
+                    pending = max(pending, record)
+                    continue
+                if pending is not None:
+                    emit(pending)
+                pending = record
+            if pending is not None:
+                emit(pending)
+            out.write(b''.join(buffer))
+
+            # 前缀表：每个前缀桶的起始记录序号
+            table = []
+            start = 0
+            for prefix_count in prefix_counts:
+                table.append(start)
+                start += prefix_count
+            table.append(start)
+            out.seek(0)
+            out.write(struct.pack(HEADER_FORMAT, CORPUS_MAGIC, hash_type, hash_size, count))
+            out.write(struct.pack(f'>{PREFIX_COUNT + 1}Q', *table))
+
+        os.replace(temp_output, output_path)
+    finally:
+        for path in runs + merged:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    if progress:
+        progress(count, count)
+    logger.info(f"泄露密码数据集转换完成: {source_path} -> {output_path}，"
+                f"{HASH_NAMES[hash_type]} {count} 条")
+    return count
+
+
+def is_corpus_file(path: str) -> bool:
+    """是否为已转换的二进制数据集"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(CORPUS_MAGIC)) == CORPUS_MAGIC
+    except OSError:
+        return False
+
+
+# ---------- 查找 ----------
+
+class BreachCorpus:
+    """内存映射的泄露密码数据集"""
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            self._file = open(path, 'rb')
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise BreachCorpusError(f"无法打开数据集 {path}: {e}")
+
+        if len(self._mmap) < HEADER_SIZE + PREFIX_TABLE_SIZE:
+            self.close()
+            raise BreachCorpusError("数据集文件不完整")
+        magic, self.hash_type, self.hash_size, self.count = struct.unpack_from(HEADER_FORMAT, self._mmap)
+        self.record_size = self.hash_size + COUNT_SIZE
+        self._data_offset = HEADER_SIZE + PREFIX_TABLE_SIZE
+        if magic != CORPUS_MAGIC or HASH_SIZES.get(self.hash_type) != self.hash_size:
+            self.close()
+            raise BreachCorpusError("不是有效的泄露密码数据集")
+        if len(self._mmap) != self._data_offset + self.count * self.record_size:
+            self.close()
+            raise BreachCorpusError("数据集文件大小与记录数不符")
+
+    @property
+    def hash_name(self) -> str:
+        return HASH_NAMES[self.hash_type]
+
+    def lookup_hash(self, digest: bytes) -> int:
+        """返回哈希在数据集中的出现次数，未泄露返回 0"""
+        mm = self._mmap
+        prefix = (digest[0] << 8) | digest[1]
+        low, high = struct.unpack_from('>2Q', mm, HEADER_SIZE + prefix * 8)
+        size = self.hash_size
+        while low < high:
+            middle = (low + high) // 2
+            offset = self._data_offset + middle * self.record_size
+            current = mm[offset:offset + size]
+            if current < digest:
+                low = middle + 1
+            elif current > digest:
+                high = middle
+            else:
+                return struct.unpack_from('>I', mm, offset + size)[0]
+        return 0
+
+    def lookup(self, password: str) -> int:
+        """返回密码在数据集中的出现次数，未泄露返回 0"""
+        return self.lookup_hash(hash_password(password, self.hash_type))
+
+    def close(self):
+        if getattr(self, '_mmap', None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        if getattr(self, '_file', None) is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# ---------- 检查密码库 ----------
+
+@dataclass
+class BreachResult:
+    """一条已泄露的记录"""
+    entry: PasswordEntry
+    count: int
+
+
+def check_entries(corpus: BreachCorpus, entries: List[PasswordEntry], encryption_manager,
+                  master_password: str, batch_size: int = 64, workers: Optional[int] = None,
+                  progress: ProgressCallback = None,
+                  is_canceled: Optional[Callable[[], bool]] = None) -> List[BreachResult]:
+    """检查条目密码是否出现在数据集中，按出现次数从多到少返回泄露的条目
+
+    解密在线程池中并行进行（PBKDF2 计算期间释放 GIL）；内存映射的查找是只读的，可以在多个线程中同时进行。
+    """
+    results = []
+    total = len(entries)
+
+    def check(item):
+        entry, encrypted_password = item
+        try:
+            password = encryption_manager.decrypt(encrypted_password, master_password)
+        except Exception as e:
+            logger.warning(f"解密条目 {entry.id} 失败，跳过泄露检查: {e}")
+            return entry, 0
+        return entry, corpus.lookup(password) if password else 0
+
+    from core.encryption_manager import DEFAULT_WORKERS
+    with ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS) as executor:
+        for start in range(0, total, batch_size):
+            if is_canceled and is_canceled():
+                break
+            batch = entries[start:start + batch_size]
+            for entry, count in executor.map(check, [(e, e.encrypted_password) for e in batch]):
+                if count:
+                    results.append(BreachResult(entry, count))
+            if progress:
+                progress(min(start + batch_size, total), total)
+
+    results.sort(key=lambda result: result.count, reverse=True)
+    logger.info(f"泄露密码检查完成: {total} 条中 {len(results)} 条已泄露")
+    return results
@@ -35,12 +35,28 @@ class ConfigManager:
             },
             "security": {
                 "auto_lock_minutes": 15,
-                "clear_clipboard_seconds": 30
+                "clear_clipboard_seconds": 30,
+                # 离线泄露密码数据集（.pmbreach），见 core/breach_checker.py
+                "breach_corpus": ""
             },
             "ui": {
                 "theme": "light",
                 "window_width": 1000,
-                "window_height": 600
+                "window_height": 600,
+                # 详情显示方式: text 纯文本 / template HTML模板 / widget 原生控件
+                "detail_view": "text"
+            },
+            # 日志配置，见 core/log_manager.py
+            "logging": {
+                "level": "INFO",
+                "file": "password_manager.log",
+                "max_bytes": 5 * 1024 * 1024,
+                "backup_count": 5,
+                "compress": True,
+                "format": "text",
+                "console": True,
+                # 按模块设置级别，如 {"core.database_manager": "DEBUG"}
+                "modules": {}
             },
             "categories": [  # 新增分类配置
                 "默认",
@@ -58,10 +74,9 @@ class ConfigManager:
 
         try:
             if os.path.exists(self.config_file):
-                print(f"正在读取配置文件: {self.config_file}")
+                logger.debug(f"正在读取配置文件: {self.config_file}")
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     loaded_config = json.load(f)
-                    print(f"读取到的配置: {json.dumps(loaded_config, indent=2)}")
 
                     # 确保数据库配置有 use_sqlite 字段
                     if 'database' in loaded_config and 'use_sqlite' not in loaded_config['database']:
@@ -70,9 +85,10 @@ class ConfigManager:
                     # 合并配置，确保新字段有默认值
                     self._merge_config(default_config, loaded_config)
 
-                    print(f"合并后的配置: {json.dumps(default_config, indent=2)}")
+                    # 输出到日志前隐藏数据库密码
+                    printable = dict(default_config, database=dict(default_config['database'], password='***'))
+                    logger.debug(f"合并后的配置: {json.dumps(printable, indent=2, ensure_ascii=False)}")
         except Exception as e:
-            print(f"加载配置文件失败: {e}")
             logger.error(f"加载配置文件失败: {e}")
 
         return default_config
@@ -81,7 +97,8 @@ class ConfigManager:
         """递归合并配置"""
         for key, value in loaded.items():
             if key in default:
-                if isinstance(value, dict) and isinstance(default[key], dict):
+                # 默认值为空字典时表示键不固定（如 logging.modules），直接使用读取的值
+                if isinstance(value, dict) and isinstance(default[key], dict) and default[key]:
                     self._merge_config(default[key], value)
                 else:
                     default[key] = value
@@ -122,6 +139,10 @@ class ConfigManager:
         self.config["ui"] = config
         self.save_config()
 
+    def get_logging_config(self) -> Dict[str, Any]:
+        """获取日志配置"""
+        return self.config.get("logging", {})
+
     def get_categories_config(self) -> List[str]:
         """获取分类配置"""
         return self.config.get("categories", [])
@@ -7,31 +7,48 @@
 # @Description:
 # core/database_manager.py
 # 完整的 core/database_manager.py
+import base64
 import sqlite3
-import mysql.connector
-from mysql.connector import Error
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 import logging
 import os
 import secrets
 import string
+import time
 from models.password_entry import PasswordEntry
-from core.encryption_manager import EncryptionManager
+from core.perf_monitor import get_perf_monitor
+from utils.validators import registrable_domain
+from core.query_language import compile_query, evaluate, parse_query, plan_query
+from utils.text_keys import (KEY_MAX_LENGTH, TEXT_KEY_COLUMNS, apply_text_keys, entry_sort_key, normalize_query,
+                             text_keys, backend as text_keys_backend)
+from core.metadata_crypto import (BLIND_INDEX_VERSION, ENCRYPTED_FIELDS, LOCKED_PLACEHOLDER, MetadataCrypto,
+                                  chunked, entry_matches)
 
 logger = logging.getLogger(__name__)
+perf_monitor = get_perf_monitor()
+
+
+def _import_mysql_connector():
+    """按需导入 MySQL 驱动，只有使用 MySQL 时才加载（加快启动）"""
+    import mysql.connector
+    return mysql.connector
 
 
 class DatabaseManager:
     def __init__(self):
         self.connection = None
         self.config = None
+        # 元数据加密（解锁后由 set_metadata_keys 设置，锁定时清除）
+        self.metadata_crypto = None
+        self._meta_encrypted = None
 
     def connect(self, config: Dict[str, Any]) -> bool:
         """连接到数据库"""
         self.config = config
+        self._meta_encrypted = None
 
         # 调试信息
-        print(f"数据库配置: use_sqlite={config.get('use_sqlite')}")
+        logger.debug(f"数据库配置: use_sqlite={config.get('use_sqlite')}")
 
         if config.get('use_sqlite', True):  # 默认使用 SQLite
             success = self._connect_sqlite(config)
@@ -48,7 +65,7 @@ class DatabaseManager:
         """连接到 SQLite 数据库"""
         try:
             db_path = config.get('sqlite_path', 'password_manager.db')
-            print(f"正在连接 SQLite 数据库: {db_path}")
+            logger.debug(f"正在连接 SQLite 数据库: {db_path}")
 
             self.connection = sqlite3.connect(db_path)
             self.connection.row_factory = sqlite3.Row
@@ -62,15 +79,20 @@ class DatabaseManager:
 
         except sqlite3.Error as e:
             logger.error(f"SQLite连接错误: {e}")
-            print(f"SQLite连接错误: {e}")
             return False
 
     def _connect_mysql(self, config: Dict[str, Any]) -> bool:
         """连接到 MySQL 数据库"""
         try:
-            print("正在连接 MySQL 数据库")
+            mysql_connector = _import_mysql_connector()
+        except ImportError as e:
+            logger.error(f"MySQL驱动未安装: {e}")
+            return False
+
+        try:
+            logger.debug("正在连接 MySQL 数据库")
 
-            self.connection = mysql.connector.connect(
+            self.connection = mysql_connector.connect(
                 host=config.get('host', 'localhost'),
                 port=config.get('port', 3306),
                 database=config.get('database', 'password_manager'),
@@ -87,9 +109,8 @@ class DatabaseManager:
                 logger.error("MySQL数据库连接失败")
                 return False
 
-        except Error as e:
+        except mysql_connector.Error as e:
             logger.error(f"MySQL连接错误: {e}")
-            print(f"MySQL连接错误: {e}")
             return False
 
     def _initialize_database(self):
@@ -155,20 +176,68 @@ class DatabaseManager:
             cursor.execute(create_password_entries_sql)
             cursor.execute(create_user_config_sql)
 
+            # 旧版本数据库补充新增的列
+            self._ensure_column(cursor, 'password_entries', 'password_fingerprint', 'VARCHAR(64)')
+            if self._ensure_column(cursor, 'password_entries', 'domain', 'VARCHAR(253)'):
+                self._backfill_domains(cursor)
+            self._ensure_column(cursor, 'password_entries', 'meta_encrypted',
+                                'INTEGER DEFAULT 0' if self.config.get('use_sqlite', True) else 'TINYINT DEFAULT 0')
+            self._ensure_column(cursor, 'password_entries', 'usage_count',
+                                'INTEGER DEFAULT 0' if self.config.get('use_sqlite', True) else 'INT DEFAULT 0')
+            # 排序键和搜索键（拼音、首字母），MySQL 的 VARCHAR(191) 可以完整建索引
+            key_type = 'TEXT' if self.config.get('use_sqlite', True) else f'VARCHAR({KEY_MAX_LENGTH})'
+            added = [self._ensure_column(cursor, 'password_entries', column, key_type) for column in TEXT_KEY_COLUMNS]
+            if any(added) or self.get_config_value('text_keys_backend') != text_keys_backend():
+                self._backfill_text_keys(cursor)
+
+            # 元数据加密的盲索引（令牌 -> 记录）
+            if self.config.get('use_sqlite', True):
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS blind_index (
+                        token TEXT NOT NULL,
+                        entry_id INTEGER NOT NULL,
+                        PRIMARY KEY (token, entry_id)
+                    ) WITHOUT ROWID
+                """)
+            else:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS blind_index (
+                        token CHAR(16) NOT NULL,
+                        entry_id INT NOT NULL,
+                        PRIMARY KEY (token, entry_id)
+                    )
+                """)
+
             # 创建索引
             if self.config.get('use_sqlite', True):
                 # SQLite 索引
                 index_sql = [
                     "CREATE INDEX IF NOT EXISTS idx_website_name ON password_entries(website_name)",
                     "CREATE INDEX IF NOT EXISTS idx_category ON password_entries(category)",
-                    "CREATE INDEX IF NOT EXISTS idx_config_key ON user_config(config_key)"
+                    "CREATE INDEX IF NOT EXISTS idx_config_key ON user_config(config_key)",
+                    "CREATE INDEX IF NOT EXISTS idx_password_fingerprint ON password_entries(password_fingerprint)",
+                    "CREATE INDEX IF NOT EXISTS idx_domain ON password_entries(domain)",
+                    "CREATE INDEX IF NOT EXISTS idx_blind_index_entry ON blind_index(entry_id)",
+                    "CREATE INDEX IF NOT EXISTS idx_sort_key ON password_entries(sort_key)",
+                    "CREATE INDEX IF NOT EXISTS idx_search_key ON password_entries(search_key)",
+                    "CREATE INDEX IF NOT EXISTS idx_pinyin_initials ON password_entries(pinyin_initials)",
+                    "CREATE INDEX IF NOT EXISTS idx_username ON password_entries(username)",
+                    "CREATE INDEX IF NOT EXISTS idx_updated_at ON password_entries(updated_at)"
                 ]
             else:
                 # MySQL 索引
                 index_sql = [
                     "CREATE INDEX idx_website_name ON password_entries(website_name)",
                     "CREATE INDEX idx_category ON password_entries(category)",
-                    "CREATE INDEX idx_config_key ON user_config(config_key)"
+                    "CREATE INDEX idx_config_key ON user_config(config_key)",
+                    "CREATE INDEX idx_password_fingerprint ON password_entries(password_fingerprint)",
+                    "CREATE INDEX idx_domain ON password_entries(domain)",
+                    "CREATE INDEX idx_blind_index_entry ON blind_index(entry_id)",
+                    "CREATE INDEX idx_sort_key ON password_entries(sort_key)",
+                    "CREATE INDEX idx_search_key ON password_entries(search_key)",
+                    "CREATE INDEX idx_pinyin_initials ON password_entries(pinyin_initials)",
+                    "CREATE INDEX idx_username ON password_entries(username)",
+                    "CREATE INDEX idx_updated_at ON password_entries(updated_at)"
                 ]
 
             # 执行索引创建
@@ -176,24 +245,230 @@ class DatabaseManager:
                 try:
                     cursor.execute(sql)
                 except Exception as e:
-                    print(f"创建索引时出错 (可能已存在): {e}")
+                    logger.warning(f"创建索引时出错 (可能已存在): {e}")
 
             if hasattr(self.connection, 'commit'):
                 self.connection.commit()
 
             cursor.close()
             logger.info("数据库表初始化完成")
-            print("数据库表初始化完成")
 
         except Exception as e:
             logger.error(f"数据库初始化错误: {e}")
-            print(f"数据库初始化错误: {e}")
             if self.connection and hasattr(self.connection, 'rollback'):
                 self.connection.rollback()
 
+    def _ensure_column(self, cursor, table: str, column: str, definition: str) -> bool:
+        """列不存在时添加（旧版本数据库迁移），返回是否新增了列"""
+        if self.config.get('use_sqlite', True):
+            cursor.execute(f"PRAGMA table_info({table})")
+            columns = {row[1] for row in cursor.fetchall()}
+        else:
+            cursor.execute(f"SHOW COLUMNS FROM {table}")
+            columns = {row[0] for row in cursor.fetchall()}
+
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            logger.info(f"数据库迁移: {table} 表新增列 {column}")
+            return True
+        return False
+
+    def _backfill_domains(self, cursor):
+        """为已有记录计算可注册域名（新增 domain 列后执行一次）"""
+        cursor.execute("SELECT id, url FROM password_entries WHERE url IS NOT NULL AND url <> ''")
+        updates = [(domain, row[0]) for row in cursor.fetchall()
+                   if (domain := registrable_domain(row[1]))]
+        if updates:
+            placeholder = '?' if self.config.get('use_sqlite', True) else '%s'
+            cursor.executemany(f"UPDATE password_entries SET domain = {placeholder} WHERE id = {placeholder}",
+                               updates)
+        logger.info(f"数据库迁移: 已为 {len(updates)} 条记录计算域名")
+
+    def _backfill_text_keys(self, cursor):
+        """为明文记录计算排序键和搜索键（新增列或拼音数据变化后执行一次，加密记录在解密后计算）"""
+        cursor.execute("SELECT id, website_name FROM password_entries WHERE COALESCE(meta_encrypted, 0) = 0")
+        updates = [text_keys(row[1]) + (row[0],) for row in cursor.fetchall()]
+        if updates:
+            placeholder = '?' if self.config.get('use_sqlite', True) else '%s'
+            assignments = ', '.join(f"{column} = {placeholder}" for column in TEXT_KEY_COLUMNS)
+            cursor.executemany(f"UPDATE password_entries SET {assignments}, updated_at = updated_at "
+                               f"WHERE id = {placeholder}", updates)
+        self.set_config_value('text_keys_backend', text_keys_backend())
+        logger.info(f"数据库迁移: 已为 {len(updates)} 条记录计算排序键和拼音（{text_keys_backend()}）")
+
+    def _placeholder(self) -> str:
+        return '?' if self.config.get('use_sqlite', True) else '%s'
+
+    def set_metadata_keys(self, vault_keys: Optional[Dict[str, bytes]]):
+        """设置（解锁后）或清除（锁定时传入 None）元数据加密密钥"""
+        self.metadata_crypto = MetadataCrypto.from_vault_keys(vault_keys)
+        if (self.metadata_crypto is not None and self.is_metadata_encrypted()
+                and self.get_config_value('blind_index_version') != BLIND_INDEX_VERSION):
+            self._rebuild_blind_index()
+
+    def _rebuild_blind_index(self):
+        """令牌的计算方式变化后（如加入拼音），解锁时重建盲索引"""
+        try:
+            cursor = self._dict_cursor()
+            cursor.execute("SELECT * FROM password_entries")
+            entries = [self._row_to_entry(row) for row in cursor.fetchall()]
+            cursor.close()
+
+            cursor = self.connection.cursor()
+            cursor.execute("DELETE FROM blind_index")
+            for entry in entries:
+                self._write_blind_index(cursor, entry.id, entry)
+            cursor.close()
+            # set_config_value 会一并提交上面的修改
+            if not self.set_config_value('blind_index_version', BLIND_INDEX_VERSION):
+                raise RuntimeError("无法保存盲索引版本")
+            logger.info(f"已重建 {len(entries)} 条记录的盲索引")
+        except Exception as e:
+            logger.error(f"重建盲索引失败: {e}")
+            self.rollback()
+
+    def is_metadata_encrypted(self) -> bool:
+        """密码库是否开启了元数据加密（新写入的记录加密存储）"""
+        if self._meta_encrypted is None:
+            self._meta_encrypted = self.get_config_value('meta_encrypted') == '1'
+        return self._meta_encrypted
+
+    def _row_to_entry(self, row) -> PasswordEntry:
+        """数据库行转为记录，加密的元数据在本地解密（没有密钥时显示占位名称）"""
+        data = dict(row)
+        if data.get('meta_encrypted'):
+            crypto = self.metadata_crypto
+            for field in ENCRYPTED_FIELDS:
+                if crypto is None:
+                    data[field] = LOCKED_PLACEHOLDER if field == 'website_name' else ''
+                    continue
+                try:
+                    data[field] = crypto.decrypt(field, data.get(field))
+                except Exception as e:
+                    logger.error(f"解密记录 {data.get('id')} 的 {field} 失败: {e}")
+                    data[field] = LOCKED_PLACEHOLDER if field == 'website_name' else ''
+            # domain 列存的是令牌，不是域名
+            data['domain'] = registrable_domain(data.get('url') or '') if crypto is not None else None
+            # 加密记录不保存排序键和拼音（会泄露名称），解密后在本地计算
+            data.update(zip(TEXT_KEY_COLUMNS, text_keys(data['website_name'])))
+        return PasswordEntry.from_dict(data)
+
+    def _rows_to_entries(self, rows, sort: bool = False) -> List[PasswordEntry]:
+        entries = [self._row_to_entry(row) for row in rows]
+        if sort and self.is_metadata_encrypted():
+            # 密文无法在 SQL 中排序，解密后按排序键排序
+            entries.sort(key=entry_sort_key)
+        return entries
+
+    def _stored_values(self, entry: PasswordEntry) -> tuple:
+        """写入数据库的 (website_name, url, username, notes, domain, meta_encrypted)"""
+        entry.domain = registrable_domain(entry.url)
+        if not self.is_metadata_encrypted():
+            return entry.website_name, entry.url, entry.username, entry.notes, entry.domain, 0
+        crypto = self.metadata_crypto
+        if crypto is None:
+            raise RuntimeError("密码库已开启元数据加密，请先解锁")
+        return (crypto.encrypt('website_name', entry.website_name), crypto.encrypt('url', entry.url),
+                crypto.encrypt('username', entry.username), crypto.encrypt('notes', entry.notes),
+                crypto.domain_token(entry.domain), 1)
+
+    def _text_key_values(self, entry: PasswordEntry) -> tuple:
+        """写入数据库的 (sort_key, search_key, pinyin_full, pinyin_initials)，加密时不保存"""
+        keys = apply_text_keys(entry)
+        return (None,) * len(TEXT_KEY_COLUMNS) if self.is_metadata_encrypted() else keys
+
+    def _write_blind_index(self, cursor, entry_id: int, entry: Optional[PasswordEntry]):
+        """重写一条记录的盲索引令牌（entry 为 None 或未开启加密时只删除）"""
+        placeholder = self._placeholder()
+        cursor.execute(f"DELETE FROM blind_index WHERE entry_id = {placeholder}", (entry_id,))
+        if entry is not None and self.is_metadata_encrypted():
+            cursor.executemany(f"INSERT INTO blind_index (token, entry_id) VALUES ({placeholder}, {placeholder})",
+                               [(token, entry_id) for token in self.metadata_crypto.entry_tokens(entry)])
+
+    def _blind_search_ids(self, keyword: str) -> List[int]:
+        """用盲索引找出包含关键字全部片段令牌的记录 ID（走主键索引）"""
+        tokens = self.metadata_crypto.query_tokens(keyword)
+        if not tokens:
+            return []
+        placeholders = ', '.join([self._placeholder()] * len(tokens))
+        cursor = self.connection.cursor()
+        cursor.execute(f"""
+            SELECT entry_id FROM blind_index WHERE token IN ({placeholders})
+            GROUP BY entry_id HAVING COUNT(*) = {len(tokens)}
+        """, tokens)
+        ids = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        return ids
+
+    def _get_entries_by_ids(self, ids: List[int]) -> List[PasswordEntry]:
+        entries = []
+        cursor = self._dict_cursor()
+        try:
+            # 分批查询，避免超过 SQL 参数个数上限
+            for batch in chunked(ids, 500):
+                placeholders = ', '.join([self._placeholder()] * len(batch))
+                cursor.execute(f"SELECT * FROM password_entries WHERE id IN ({placeholders})", batch)
+                entries.extend(self._row_to_entry(row) for row in cursor.fetchall())
+        finally:
+            cursor.close()
+        return entries
+
+    @perf_monitor.track('db')
+    def set_metadata_encryption(self, enabled: bool, progress=None) -> bool:
+        """开启或关闭元数据加密，并在一个事务中转换所有已有记录
+
+        需要先调用 set_metadata_keys。progress(done, total) 报告进度。
+        """
+        if self.metadata_crypto is None:
+            logger.error("没有元数据密钥，无法切换元数据加密")
+            return False
+        try:
+            cursor = self._dict_cursor()
+            if enabled and not self.config.get('use_sqlite', True):
+                # 密文比明文长，放宽 MySQL 的列长度（768 个字符时索引仍在 InnoDB 的上限内）
+                cursor.execute("""
+                    ALTER TABLE password_entries
+                    MODIFY website_name VARCHAR(768) NOT NULL, MODIFY url TEXT, MODIFY username VARCHAR(768) NOT NULL
+                """)
+
+            # 先按当前状态读出（解密）所有记录，再按新状态写回
+            cursor.execute("SELECT * FROM password_entries")
+            entries = [self._row_to_entry(row) for row in cursor.fetchall()]
+            cursor.close()
+            self._meta_encrypted = enabled
+
+            cursor = self.connection.cursor()
+            placeholder = self._placeholder()
+            cursor.execute("DELETE FROM blind_index")
+            for done, entry in enumerate(entries, 1):
+                cursor.execute(f"""
+                    UPDATE password_entries
+                    SET website_name = {placeholder}, url = {placeholder}, username = {placeholder},
+                        notes = {placeholder}, domain = {placeholder}, meta_encrypted = {placeholder},
+                        sort_key = {placeholder}, search_key = {placeholder}, pinyin_full = {placeholder},
+                        pinyin_initials = {placeholder}, updated_at = updated_at
+                    WHERE id = {placeholder}
+                """, self._stored_values(entry) + self._text_key_values(entry) + (entry.id,))
+                self._write_blind_index(cursor, entry.id, entry)
+                if progress and (done % 100 == 0 or done == len(entries)):
+                    progress(done, len(entries))
+            cursor.close()
+
+            # set_config_value 会一并提交上面的修改
+            if not self.set_config_value('meta_encrypted', '1' if enabled else '0'):
+                raise RuntimeError("无法保存元数据加密设置")
+            self.set_config_value('blind_index_version', BLIND_INDEX_VERSION)
+            logger.info(f"元数据加密已{'开启' if enabled else '关闭'}，转换了 {len(entries)} 条记录")
+            return True
+        except Exception as e:
+            logger.error(f"切换元数据加密失败: {e}")
+            self._meta_encrypted = None
+            self.rollback()
+            return False
+
     def test_connection(self, config: Dict[str, Any]) -> bool:
         """测试数据库连接"""
-        print(f"测试连接: use_sqlite={config.get('use_sqlite')}")
+        logger.debug(f"测试连接: use_sqlite={config.get('use_sqlite')}")
 
         if config.get('use_sqlite', True):
             # 测试 SQLite 连接
@@ -201,15 +476,21 @@ class DatabaseManager:
             try:
                 test_conn = sqlite3.connect(db_path)
                 test_conn.close()
-                print("SQLite 连接测试成功")
+                logger.debug("SQLite 连接测试成功")
                 return True
             except sqlite3.Error as e:
-                print(f"SQLite 连接测试失败: {e}")
+                logger.error(f"SQLite 连接测试失败: {e}")
                 return False
         else:
             # 测试 MySQL 连接
             try:
-                temp_conn = mysql.connector.connect(
+                mysql_connector = _import_mysql_connector()
+            except ImportError as e:
+                logger.warning(f"MySQL驱动未安装: {e}")
+                return False
+
+            try:
+                temp_conn = mysql_connector.connect(
                     host=config.get('host', 'localhost'),
                     port=config.get('port', 3306),
                     database=config.get('database', 'password_manager'),
@@ -220,13 +501,14 @@ class DatabaseManager:
 
                 if temp_conn.is_connected():
                     temp_conn.close()
-                    print("MySQL 连接测试成功")
+                    logger.debug("MySQL 连接测试成功")
                     return True
                 return False
-            except Error as e:
-                print(f"MySQL 连接测试失败: {e}")
+            except mysql_connector.Error as e:
+                logger.error(f"MySQL 连接测试失败: {e}")
                 return False
 
+    @perf_monitor.track('db')
     def search_entries(self, keyword: str = "") -> List[PasswordEntry]:
         """搜索密码记录"""
         entries = []
@@ -239,19 +521,22 @@ class DatabaseManager:
                     query = """
                             SELECT * FROM password_entries 
                             WHERE website_name LIKE ? OR url LIKE ? OR notes LIKE ? OR category LIKE ?
-                            ORDER BY website_name
+                               OR search_key LIKE ? OR pinyin_full LIKE ? OR pinyin_initials LIKE ?
+                            ORDER BY sort_key, website_name
                         """
                 else:
                     # MySQL 版本
                     query = """
                             SELECT * FROM password_entries 
                             WHERE website_name LIKE %s OR url LIKE %s OR notes LIKE %s OR category LIKE %s
-                            ORDER BY website_name
+                               OR search_key LIKE %s OR pinyin_full LIKE %s OR pinyin_initials LIKE %s
+                            ORDER BY sort_key, website_name
                         """
                 search_pattern = f"%{keyword}%"
-                cursor.execute(query, (search_pattern, search_pattern, search_pattern, search_pattern))
+                key_pattern = f"%{normalize_query(keyword)}%"
+                cursor.execute(query, (search_pattern,) * 4 + (key_pattern,) * 3)
             else:
-                query = "SELECT * FROM password_entries ORDER BY website_name"
+                query = "SELECT * FROM password_entries ORDER BY sort_key, website_name"
                 cursor.execute(query)
 
             # 处理结果集
@@ -271,7 +556,6 @@ class DatabaseManager:
 
         except Exception as e:
             logger.error(f"搜索记录错误: {e}")
-            print(f"搜索记录错误: {e}")
 
         return entries
 
@@ -279,6 +563,308 @@ class DatabaseManager:
         """获取所有密码记录"""
         return self.search_entries()
 
+    @perf_monitor.track('db')
+    def get_entry(self, entry_id: int) -> Optional[PasswordEntry]:
+        """按 ID 获取记录"""
+        try:
+            cursor = self._dict_cursor()
+            placeholder = "?" if self.config.get('use_sqlite', True) else "%s"
+            cursor.execute(f"SELECT * FROM password_entries WHERE id = {placeholder}", (entry_id,))
+            row = cursor.fetchone()
+            cursor.close()
+            return self._row_to_entry(row) if row else None
+        except Exception as e:
+            logger.error(f"获取记录错误: {e}")
+            return None
+
+    def _dict_cursor(self):
+        """返回行可以按列名访问的游标"""
+        if self.config.get('use_sqlite', True):
+            return self.connection.cursor()
+        return self.connection.cursor(dictionary=True)
+
+    def count_entries(self) -> int:
+        """记录总数"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT COUNT(*) FROM password_entries")
+            result = cursor.fetchone()
+            cursor.close()
+            return int(result[0]) if result else 0
+        except Exception as e:
+            logger.error(f"统计记录数错误: {e}")
+            return 0
+
+    def iter_entries(self, batch_size: int = 500) -> Iterator[List[PasswordEntry]]:
+        """按批次流式读取所有记录（fetchmany），内存占用与记录总数无关"""
+        cursor = self._dict_cursor()
+        try:
+            cursor.execute("SELECT * FROM password_entries ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [self._row_to_entry(row) for row in rows]
+        finally:
+            cursor.close()
+
+    @perf_monitor.track('db')
+    def bulk_insert_entries(self, entries: List[PasswordEntry], commit: bool = True) -> bool:
+        """批量插入记录（executemany），保留原有的创建/更新时间
+
+        commit=False 时不提交，由调用方在所有批次写完后调用 commit()，使多个批次处于同一事务中；
+        出错时回滚整个未提交的事务。
+        """
+        if not entries:
+            return True
+        try:
+            cursor = self.connection.cursor()
+
+            if self.config.get('use_sqlite', True):
+                # SQLite 版本
+                query = """
+                    INSERT INTO password_entries
+                    (website_name, url, username, encrypted_password, notes, category, password_fingerprint,
+                     domain, meta_encrypted, sort_key, search_key, pinyin_full, pinyin_initials, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                            COALESCE(?, CURRENT_TIMESTAMP), COALESCE(?, CURRENT_TIMESTAMP))
+                """
+            else:
+                # MySQL 版本
+                query = """
+                    INSERT INTO password_entries
+                    (website_name, url, username, encrypted_password, notes, category, password_fingerprint,
+                     domain, meta_encrypted, sort_key, search_key, pinyin_full, pinyin_initials, created_at, updated_at)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                            COALESCE(%s, CURRENT_TIMESTAMP), COALESCE(%s, CURRENT_TIMESTAMP))
+                """
+
+            def timestamp(value):
+                return value.strftime('%Y-%m-%d %H:%M:%S') if value else None
+
+            rows = []
+            for entry in entries:
+                website_name, url, username, notes, domain, meta_encrypted = self._stored_values(entry)
+                rows.append((website_name, url, username, entry.encrypted_password, notes, entry.category,
+                             entry.password_fingerprint, domain, meta_encrypted)
+                            + self._text_key_values(entry)
+                            + (timestamp(entry.created_at), timestamp(entry.updated_at)))
+
+            if self.is_metadata_encrypted():
+                # 盲索引需要每条记录的 ID，逐条插入（仍在同一事务中）
+                for entry, row in zip(entries, rows):
+                    cursor.execute(query, row)
+                    entry.id = cursor.lastrowid
+                    self._write_blind_index(cursor, entry.id, entry)
+            else:
+                cursor.executemany(query, rows)
+
+            if commit and hasattr(self.connection, 'commit'):
+                self.connection.commit()
+
+            cursor.close()
+
+            logger.info(f"批量添加记录: {len(entries)} 条")
+            return True
+
+        except Exception as e:
+            logger.error(f"批量添加记录错误: {e}")
+            if self.connection and hasattr(self.connection, 'rollback'):
+                self.connection.rollback()
+            return False
+
+    def commit(self):
+        """提交当前事务"""
+        if self.connection and hasattr(self.connection, 'commit'):
+            self.connection.commit()
+
+    def rollback(self):
+        """回滚当前事务"""
+        if self.connection and hasattr(self.connection, 'rollback'):
+            self.connection.rollback()
+
+    def iter_dedup_fields(self, batch_size: int = 1000) -> Iterator[tuple]:
+        """流式读取所有记录的 (website_name, url, username)，用于导入时查重"""
+        cursor = self._dict_cursor()
+        try:
+            cursor.execute("SELECT id, website_name, url, username, meta_encrypted FROM password_entries")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    if row['meta_encrypted']:
+                        entry = self._row_to_entry(row)
+                        yield entry.website_name or '', entry.url or '', entry.username or ''
+                    else:
+                        yield row['website_name'] or '', row['url'] or '', row['username'] or ''
+        finally:
+            cursor.close()
+
+    def get_config_value(self, key: str) -> Optional[str]:
+        """读取 user_config 表中的值"""
+        try:
+            cursor = self.connection.cursor()
+            query = "SELECT config_value FROM user_config WHERE config_key = {}".format(
+                '?' if self.config.get('use_sqlite', True) else '%s')
+            cursor.execute(query, (key,))
+            result = cursor.fetchone()
+            cursor.close()
+            return result[0] if result else None
+        except Exception as e:
+            logger.error(f"读取配置 {key} 失败: {e}")
+            return None
+
+    def set_config_value(self, key: str, value: str) -> bool:
+        """写入 user_config 表中的值"""
+        try:
+            cursor = self.connection.cursor()
+            if self.config.get('use_sqlite', True):
+                query = """
+                    INSERT OR REPLACE INTO user_config (config_key, config_value)
+                    VALUES (?, ?)
+                """
+            else:
+                query = """
+                    INSERT INTO user_config (config_key, config_value)
+                    VALUES (%s, %s)
+                    ON DUPLICATE KEY UPDATE config_value = VALUES(config_value)
+                """
+            cursor.execute(query, (key, value))
+            if hasattr(self.connection, 'commit'):
+                self.connection.commit()
+            cursor.close()
+            return True
+        except Exception as e:
+            logger.error(f"写入配置 {key} 失败: {e}")
+            if self.connection and hasattr(self.connection, 'rollback'):
+                self.connection.rollback()
+            return False
+
+    def get_vault_salt(self) -> bytes:
+        """密码库盐（用于派生子密钥），不存在时生成"""
+        value = self.get_config_value('vault_salt')
+        if value:
+            return base64.b64decode(value)
+        salt = os.urandom(16)
+        if not self.set_config_value('vault_salt', base64.b64encode(salt).decode('ascii')):
+            raise RuntimeError("无法保存密码库盐")
+        return salt
+
+    def get_entries_missing_fingerprint(self) -> List[tuple]:
+        """没有密码指纹的记录 [(id, encrypted_password)]"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("""
+                SELECT id, encrypted_password FROM password_entries
+                WHERE password_fingerprint IS NULL OR password_fingerprint = ''
+            """)
+            rows = [(row[0], row[1]) for row in cursor.fetchall()]
+            cursor.close()
+            return rows
+        except Exception as e:
+            logger.error(f"查询缺少指纹的记录失败: {e}")
+            return []
+
+    @perf_monitor.track('db')
+    def update_fingerprints(self, fingerprints: List[tuple]) -> bool:
+        """批量更新密码指纹 [(fingerprint, id)]，不修改 updated_at"""
+        if not fingerprints:
+            return True
+        try:
+            cursor = self.connection.cursor()
+            if self.config.get('use_sqlite', True):
+                query = "UPDATE password_entries SET password_fingerprint = ? WHERE id = ?"
+            else:
+                query = ("UPDATE password_entries SET password_fingerprint = %s, updated_at = updated_at "
+                         "WHERE id = %s")
+            cursor.executemany(query, fingerprints)
+            if hasattr(self.connection, 'commit'):
+                self.connection.commit()
+            cursor.close()
+            return True
+        except Exception as e:
+            logger.error(f"更新密码指纹失败: {e}")
+            if self.connection and hasattr(self.connection, 'rollback'):
+                self.connection.rollback()
+            return False
+
+    @perf_monitor.track('db')
+    def find_reused_passwords(self) -> List[List[PasswordEntry]]:
+        """按密码指纹分组找出使用相同密码的记录（走 idx_password_fingerprint 索引，无需解密）"""
+        groups = []
+        try:
+            cursor = self._dict_cursor()
+            cursor.execute("""
+                SELECT * FROM password_entries
+                WHERE password_fingerprint IN (
+                    SELECT password_fingerprint FROM password_entries
+                    WHERE password_fingerprint IS NOT NULL AND password_fingerprint <> ''
+                    GROUP BY password_fingerprint
+                    HAVING COUNT(*) > 1
+                )
+                ORDER BY password_fingerprint, sort_key, website_name
+            """)
+            current = None
+            for row in cursor.fetchall():
+                entry = self._row_to_entry(row)
+                if entry.password_fingerprint != current:
+                    groups.append([])
+                    current = entry.password_fingerprint
+                groups[-1].append(entry)
+            cursor.close()
+        except Exception as e:
+            logger.error(f"查找重复密码失败: {e}")
+
+        if self.is_metadata_encrypted():
+            for group in groups:
+                group.sort(key=entry_sort_key)
+        groups.sort(key=len, reverse=True)
+        return groups
+
+    def find_entries_by_fingerprint(self, fingerprint: str, exclude_id: Optional[int] = None) -> List[PasswordEntry]:
+        """使用同一密码的其他记录"""
+        if not fingerprint:
+            return []
+        try:
+            cursor = self._dict_cursor()
+            placeholder = '?' if self.config.get('use_sqlite', True) else '%s'
+            cursor.execute(f"""
+                SELECT * FROM password_entries
+                WHERE password_fingerprint = {placeholder} AND id <> {placeholder}
+                ORDER BY sort_key, website_name
+            """, (fingerprint, exclude_id if exclude_id is not None else -1))
+            entries = self._rows_to_entries(cursor.fetchall(), sort=True)
+            cursor.close()
+            return entries
+        except Exception as e:
+            logger.error(f"按指纹查询记录失败: {e}")
+            return []
+
+    @perf_monitor.track('db')
+    def find_by_domain(self, url: str) -> List[PasswordEntry]:
+        """与网址属于同一可注册域名的记录（走 idx_domain 索引），如登录页自动填充"""
+        domain = registrable_domain(url)
+        if not domain:
+            return []
+        if self.is_metadata_encrypted():
+            if self.metadata_crypto is None:
+                return []
+            # 加密记录的 domain 列存的是令牌
+            domain = self.metadata_crypto.domain_token(domain)
+        try:
+            cursor = self._dict_cursor()
+            placeholder = '?' if self.config.get('use_sqlite', True) else '%s'
+            cursor.execute(f"SELECT * FROM password_entries WHERE domain = {placeholder} ORDER BY sort_key, website_name",
+                           (domain,))
+            entries = self._rows_to_entries(cursor.fetchall(), sort=True)
+            cursor.close()
+            return entries
+        except Exception as e:
+            logger.error(f"按域名查询记录失败: {e}")
+            return []
+
+    @perf_monitor.track('db')
     def add_entry(self, entry: PasswordEntry) -> bool:
         """添加新记录"""
         try:
@@ -288,27 +874,35 @@ class DatabaseManager:
                 # SQLite 版本
                 query = """
                     INSERT INTO password_entries 
-                    (website_name, url, username, encrypted_password, notes, category)
-                    VALUES (?, ?, ?, ?, ?, ?)
+                    (website_name, url, username, encrypted_password, notes, category, password_fingerprint, domain,
+                     meta_encrypted, sort_key, search_key, pinyin_full, pinyin_initials)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """
             else:
                 # MySQL 版本
                 query = """
                     INSERT INTO password_entries 
-                    (website_name, url, username, encrypted_password, notes, category)
-                    VALUES (%s, %s, %s, %s, %s, %s)
+                    (website_name, url, username, encrypted_password, notes, category, password_fingerprint, domain,
+                     meta_encrypted, sort_key, search_key, pinyin_full, pinyin_initials)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 """
 
+            website_name, url, username, notes, domain, meta_encrypted = self._stored_values(entry)
             values = (
-                entry.website_name,
-                entry.url,
-                entry.username,
+                website_name,
+                url,
+                username,
                 entry.encrypted_password,
-                entry.notes,
-                entry.category
-            )
+                notes,
+                entry.category,
+                entry.password_fingerprint,
+                domain,
+                meta_encrypted
+            ) + self._text_key_values(entry)
 
             cursor.execute(query, values)
+            entry.id = cursor.lastrowid
+            self._write_blind_index(cursor, entry.id, entry)
 
             if hasattr(self.connection, 'commit'):
                 self.connection.commit()
@@ -320,46 +914,59 @@ class DatabaseManager:
 
         except Exception as e:
             logger.error(f"添加记录错误: {e}")
-            print(f"添加记录错误: {e}")
             if self.connection and hasattr(self.connection, 'rollback'):
                 self.connection.rollback()
             return False
 
-    def update_entry(self, entry: PasswordEntry) -> bool:
-        """更新记录"""
+    @perf_monitor.track('db')
+    def update_entry(self, entry: PasswordEntry, touch: bool = True, commit: bool = True) -> bool:
+        """更新记录
+
+        touch 为 False 时保留原来的 updated_at（例如修改主密码时重新加密，密码本身没有变）；
+        commit 为 False 时不提交，由调用方统一 commit()，出错时回滚整个未提交的事务
+        """
         try:
             cursor = self.connection.cursor()
+            updated_at = "CURRENT_TIMESTAMP" if touch else "updated_at"
+            website_name, url, username, notes, domain, meta_encrypted = self._stored_values(entry)
 
             if self.config.get('use_sqlite', True):
                 # SQLite 版本
-                query = """
+                query = f"""
                     UPDATE password_entries 
                     SET website_name = ?, url = ?, username = ?, 
-                        encrypted_password = ?, notes = ?, category = ?
+                        encrypted_password = ?, notes = ?, category = ?, password_fingerprint = ?,
+                        domain = ?, meta_encrypted = ?, sort_key = ?, search_key = ?, pinyin_full = ?,
+                        pinyin_initials = ?, updated_at = {updated_at}
                     WHERE id = ?
                 """
             else:
                 # MySQL 版本
-                query = """
+                query = f"""
                     UPDATE password_entries 
                     SET website_name = %s, url = %s, username = %s, 
-                        encrypted_password = %s, notes = %s, category = %s
+                        encrypted_password = %s, notes = %s, category = %s, password_fingerprint = %s,
+                        domain = %s, meta_encrypted = %s, sort_key = %s, search_key = %s, pinyin_full = %s,
+                        pinyin_initials = %s, updated_at = {updated_at}
                     WHERE id = %s
                 """
 
             values = (
-                entry.website_name,
-                entry.url,
-                entry.username,
+                website_name,
+                url,
+                username,
                 entry.encrypted_password,
-                entry.notes,
+                notes,
                 entry.category,
-                entry.id
-            )
+                entry.password_fingerprint,
+                domain,
+                meta_encrypted
+            ) + self._text_key_values(entry) + (entry.id,)
 
             cursor.execute(query, values)
+            self._write_blind_index(cursor, entry.id, entry)
 
-            if hasattr(self.connection, 'commit'):
+            if commit and hasattr(self.connection, 'commit'):
                 self.connection.commit()
 
             cursor.close()
@@ -369,11 +976,11 @@ class DatabaseManager:
 
         except Exception as e:
             logger.error(f"更新记录错误: {e}")
-            print(f"更新记录错误: {e}")
             if self.connection and hasattr(self.connection, 'rollback'):
                 self.connection.rollback()
             return False
 
+    @perf_monitor.track('db')
     def delete_entry(self, entry_id: int) -> bool:
         """删除记录"""
         try:
@@ -387,6 +994,7 @@ class DatabaseManager:
                 query = "DELETE FROM password_entries WHERE id = %s"
 
             cursor.execute(query, (entry_id,))
+            self._write_blind_index(cursor, entry_id, None)
 
             if hasattr(self.connection, 'commit'):
                 self.connection.commit()
@@ -398,11 +1006,26 @@ class DatabaseManager:
 
         except Exception as e:
             logger.error(f"删除记录错误: {e}")
-            print(f"删除记录错误: {e}")
             if self.connection and hasattr(self.connection, 'rollback'):
                 self.connection.rollback()
             return False
 
+    def record_usage(self, entry_id: int) -> bool:
+        """使用次数加一（复制或读取密码时调用，用于搜索排序），不修改 updated_at"""
+        try:
+            cursor = self.connection.cursor()
+            placeholder = self._placeholder()
+            cursor.execute("UPDATE password_entries SET usage_count = COALESCE(usage_count, 0) + 1, "
+                           f"updated_at = updated_at WHERE id = {placeholder}", (entry_id,))
+            if hasattr(self.connection, 'commit'):
+                self.connection.commit()
+            cursor.close()
+            return True
+        except Exception as e:
+            logger.error(f"记录使用次数失败: {e}")
+            return False
+
+    @perf_monitor.track('db')
     def get_categories(self, config_manager=None) -> List[str]:
         """获取所有分类（结合数据库中的分类和配置文件中的分类）"""
         # 从配置文件中获取默认分类
@@ -439,7 +1062,6 @@ class DatabaseManager:
 
         except Exception as e:
             logger.error(f"获取数据库分类错误: {e}")
-            print(f"获取数据库分类错误: {e}")
 
         # 合并分类：配置分类 + 数据库中的分类（去重）
         all_categories = list(set(config_categories + db_categories))
@@ -461,8 +1083,12 @@ class DatabaseManager:
             except Exception as e:
                 logger.error(f"关闭数据库连接时出错: {e}")
 
+    @perf_monitor.track('db')
     def search_entries(self, keyword: str = "", limit: int = None) -> List[PasswordEntry]:
         """搜索密码记录"""
+        if self.is_metadata_encrypted():
+            return self._search_encrypted(keyword, limit)
+
         entries = []
         try:
             cursor = self.connection.cursor()
@@ -473,7 +1099,8 @@ class DatabaseManager:
                     query = """
                         SELECT * FROM password_entries 
                         WHERE website_name LIKE ? OR url LIKE ? OR notes LIKE ? OR category LIKE ?
-                        ORDER BY website_name
+                           OR search_key LIKE ? OR pinyin_full LIKE ? OR pinyin_initials LIKE ?
+                        ORDER BY sort_key, website_name
                     """
                     if limit:
                         query += " LIMIT ?"
@@ -482,19 +1109,22 @@ class DatabaseManager:
                     query = """
                         SELECT * FROM password_entries 
                         WHERE website_name LIKE %s OR url LIKE %s OR notes LIKE %s OR category LIKE %s
-                        ORDER BY website_name
+                           OR search_key LIKE %s OR pinyin_full LIKE %s OR pinyin_initials LIKE %s
+                        ORDER BY sort_key, website_name
                     """
                     if limit:
                         query += " LIMIT %s"
 
+                # 排序键和拼音列按同样的规则归一（全角转半角、小写、去掉空白）后匹配
                 search_pattern = f"%{keyword}%"
-                params = (search_pattern, search_pattern, search_pattern, search_pattern)
+                key_pattern = f"%{normalize_query(keyword)}%"
+                params = (search_pattern,) * 4 + (key_pattern,) * 3
                 if limit:
                     params = params + (limit,)
 
                 cursor.execute(query, params)
             else:
-                query = "SELECT * FROM password_entries ORDER BY website_name"
+                query = "SELECT * FROM password_entries ORDER BY sort_key, website_name"
                 if limit:
                     query += " LIMIT ?" if self.config.get('use_sqlite', True) else " LIMIT %s"
                     cursor.execute(query, (limit,))
@@ -516,10 +1146,67 @@ class DatabaseManager:
 
         except Exception as e:
             logger.error(f"搜索记录错误: {e}")
-            print(f"搜索记录错误: {e}")
 
         return entries
 
+    @perf_monitor.track('db')
+    def query_entries(self, query, limit: int = None) -> List[PasswordEntry]:
+        """按查询语言搜索（core/query_language.py），query 为查询文本或语法树，按排序键排序
+
+        条件编译为带参数的 WHERE 子句，按代价排好顺序，能走索引的条件在前。元数据加密时
+        密文列的条件改查盲索引或无法在 SQL 中表达，取出候选记录解密后再逐条确认。
+        语法错误时抛出 QuerySyntaxError。
+        """
+        node = plan_query(parse_query(query) if isinstance(query, str) else query)
+        encrypted = self.is_metadata_encrypted()
+        if encrypted and self.metadata_crypto is None:
+            return []
+        crypto = self.metadata_crypto if encrypted else None
+        compiled = compile_query(node, self._placeholder(), encrypted=encrypted,
+                                 blind_tokens=crypto.query_tokens if crypto else None,
+                                 domain_token=crypto.domain_token if crypto else None)
+
+        sql = "SELECT * FROM password_entries"
+        if compiled.where:
+            sql += f" WHERE {compiled.where}"
+        params = list(compiled.params)
+        if not encrypted:
+            sql += " ORDER BY sort_key, website_name"
+            if limit and compiled.exact:
+                sql += f" LIMIT {self._placeholder()}"
+                params.append(limit)
+        try:
+            cursor = self._dict_cursor()
+            cursor.execute(sql, params)
+            entries = self._rows_to_entries(cursor.fetchall(), sort=True)
+            cursor.close()
+        except Exception as e:
+            logger.error(f"查询记录错误: {e}")
+            return []
+        if not compiled.exact:
+            entries = [entry for entry in entries if evaluate(node, entry)]
+        return entries[:limit] if limit else entries
+
+    def _search_encrypted(self, keyword: str, limit: int = None) -> List[PasswordEntry]:
+        """元数据加密时的搜索：盲索引找候选记录，本地解密后确认并排序"""
+        try:
+            if not keyword:
+                cursor = self._dict_cursor()
+                cursor.execute("SELECT * FROM password_entries")
+                entries = self._rows_to_entries(cursor.fetchall(), sort=True)
+                cursor.close()
+            elif self.metadata_crypto is None:
+                return []
+            else:
+                entries = [entry for entry in self._get_entries_by_ids(self._blind_search_ids(keyword))
+                           if entry_matches(entry, keyword)]
+                entries.sort(key=entry_sort_key)
+        except Exception as e:
+            logger.error(f"搜索记录错误: {e}")
+            return []
+        return entries[:limit] if limit else entries
+
+    @perf_monitor.track('db')
     def create_auth_token(self, master_password: str, encryption_manager) -> bool:
         """创建验证令牌 - 修复版本"""
         try:
@@ -527,12 +1214,12 @@ class DatabaseManager:
             import secrets
             auth_token = secrets.token_hex(32)
 
-            print(f"创建验证令牌，令牌长度: {len(auth_token)}")
+            logger.debug(f"创建验证令牌，令牌长度: {len(auth_token)}")
 
             # 加密令牌
             encrypted_token = encryption_manager.encrypt(auth_token, master_password)
 
-            print(f"令牌加密成功，加密后长度: {len(encrypted_token)}")
+            logger.debug(f"令牌加密成功，加密后长度: {len(encrypted_token)}")
 
             # 存储到数据库
             cursor = self.connection.cursor()
@@ -556,16 +1243,16 @@ class DatabaseManager:
 
             cursor.close()
 
-            print("验证令牌创建成功")
+            logger.debug("验证令牌创建成功")
             return True
 
         except Exception as e:
             logger.error(f"创建验证令牌失败: {e}")
-            print(f"创建验证令牌失败: {e}")
             import traceback
             traceback.print_exc()
             return False
 
+    @perf_monitor.track('db')
     def validate_master_password(self, master_password: str, encryption_manager) -> bool:
         """验证主密码"""
         try:
@@ -584,7 +1271,7 @@ class DatabaseManager:
 
             if not result:
                 # 没有验证令牌，需要创建（首次使用）
-                print("首次使用，创建验证令牌")
+                logger.debug("首次使用，创建验证令牌")
                 return self.create_auth_token(master_password, encryption_manager)
 
             # 获取加密的令牌
@@ -594,27 +1281,30 @@ class DatabaseManager:
                 encrypted_token = result['config_value']
 
             if not encrypted_token:
-                print("验证令牌为空，重新创建")
+                logger.debug("验证令牌为空，重新创建")
                 return self.create_auth_token(master_password, encryption_manager)
 
             # 尝试解密令牌
             try:
+                unlock_start = time.perf_counter()
                 decrypted_token = encryption_manager.decrypt(encrypted_token, master_password)
+                perf_monitor.set_value('last_unlock_kdf_ms',
+                                       round((time.perf_counter() - unlock_start) * 1000, 2))
                 # 如果解密成功，密码正确
-                print("主密码验证成功")
+                logger.debug("主密码验证成功")
                 return True
             except Exception as e:
                 # 解密失败，密码错误
-                print(f"主密码验证失败: {e}")
+                logger.warning(f"主密码验证失败: {e}")
                 return False
 
         except Exception as e:
             logger.error(f"验证主密码失败: {e}")
-            print(f"验证主密码失败: {e}")
             import traceback
             traceback.print_exc()
             return False
 
+    @perf_monitor.track('db')
     def check_auth_token_exists(self) -> bool:
         """检查验证令牌是否存在"""
         try:
@@ -652,7 +1342,7 @@ class DatabaseManager:
             return False
 
         except Exception as e:
-            print(f"检查验证令牌失败: {e}")
+            logger.error(f"检查验证令牌失败: {e}")
             return False
 
     def ensure_tables_exist(self):
@@ -672,12 +1362,12 @@ class DatabaseManager:
 
             if not result:
                 # 表不存在，重新初始化数据库
-                print("user_config 表不存在，重新初始化数据库")
+                logger.warning("user_config 表不存在，重新初始化数据库")
                 self._initialize_database()
             else:
-                print("所有数据库表已存在")
+                logger.debug("所有数据库表已存在")
 
         except Exception as e:
-            print(f"检查数据库表错误: {e}")
+            logger.error(f"检查数据库表错误: {e}")
             # 出错时尝试重新初始化
             self._initialize_database()
\ No newline at end of file
@@ -6,38 +6,83 @@
 # @Python:  3.12
 # @Description:
 import base64
+import hashlib
+import hmac
 import os
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.backends import default_backend
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from core.perf_monitor import get_perf_monitor
 
 logger = logging.getLogger(__name__)
+perf_monitor = get_perf_monitor()
+
+# PBKDF2 迭代次数（修改会导致已有数据无法解密）
+KDF_ITERATIONS = 100000
+
+# 由主密码派生的密码库子密钥（用途标签 -> 密钥）
+VAULT_KEY_LABELS = ('fingerprint', 'metadata', 'blind_index')
+
+# 批量加解密的默认线程数（hashlib 的 PBKDF2 计算期间会释放 GIL）
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+# 解锁期间缓存的派生密钥数（每条记录有独立的盐，缓存后重复解密不再计算 PBKDF2）
+DEFAULT_KEY_CACHE_SIZE = 4096
+
+_cipher_modules = None
+
+
+def _load_cipher_modules():
+    """按需导入 cryptography 的 AES 实现，避免启动时加载 hazmat 模块"""
+    global _cipher_modules
+    if _cipher_modules is None:
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+        _cipher_modules = (Cipher, algorithms, modes)
+    return _cipher_modules
 
 
 class EncryptionManager:
     """加密管理器"""
 
-    def __init__(self):
-        self.backend = default_backend()
+    def __init__(self, key_cache_size: int = 0):
+        # cryptography 新版本已不再需要显式指定 backend，保留属性以兼容旧代码
+        self.backend = None
+        # (密码, 盐) -> 密钥 的 LRU 缓存，0 表示不缓存；锁定时必须调用 clear_key_cache
+        self.key_cache_size = key_cache_size
+        self._key_cache = OrderedDict()
+        self._key_cache_lock = threading.Lock()
 
+    @perf_monitor.track('crypto')
     def derive_key(self, password: str, salt: bytes) -> bytes:
-        """从密码派生密钥"""
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-            backend=self.backend
-        )
-        return kdf.derive(password.encode('utf-8'))
-
+        """从密码派生密钥（PBKDF2-HMAC-SHA256，与 cryptography 的 PBKDF2HMAC 结果一致）"""
+        if not self.key_cache_size:
+            return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt,
+                                       KDF_ITERATIONS, dklen=32)
+
+        cache_key = (password, bytes(salt))
+        with self._key_cache_lock:
+            key = self._key_cache.get(cache_key)
+            if key is not None:
+                self._key_cache.move_to_end(cache_key)
+                return key
+        key = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, KDF_ITERATIONS, dklen=32)
+        with self._key_cache_lock:
+            self._key_cache[cache_key] = key
+            while len(self._key_cache) > self.key_cache_size:
+                self._key_cache.popitem(last=False)
+        return key
+
+    def clear_key_cache(self):
+        """清空派生密钥缓存（锁定或修改主密码时调用）"""
+        with self._key_cache_lock:
+            self._key_cache.clear()
+
+    @perf_monitor.track('crypto')
     def encrypt(self, plaintext: str, password: str) -> str:
         """加密文本"""
         try:
-            print(f"加密: 明文长度={len(plaintext)}, 密码长度={len(password)}")
-
             # 生成随机盐和IV
             salt = os.urandom(16)
             iv = os.urandom(16)
@@ -46,7 +91,8 @@ class EncryptionManager:
             key = self.derive_key(password, salt)
 
             # 加密
-            cipher = Cipher(algorithms.AES(key), modes.GCM(iv), backend=self.backend)
+            Cipher, algorithms, modes = _load_cipher_modules()
+            cipher = Cipher(algorithms.AES(key), modes.GCM(iv))
             encryptor = cipher.encryptor()
             ciphertext = encryptor.update(plaintext.encode('utf-8')) + encryptor.finalize()
 
@@ -56,18 +102,16 @@ class EncryptionManager:
             # Base64编码
             result = base64.b64encode(encrypted_data).decode('utf-8')
 
-            print(f"加密成功: 结果长度={len(result)}")
             return result
 
         except Exception as e:
             logger.error(f"加密失败: {e}")
             raise
 
+    @perf_monitor.track('crypto')
     def decrypt(self, encrypted_data: str, password: str) -> str:
         """解密文本"""
         try:
-            print(f"解密: 加密数据长度={len(encrypted_data)}, 密码长度={len(password)}")
-
             # Base64解码
             encrypted_bytes = base64.b64decode(encrypted_data.encode('utf-8'))
 
@@ -81,17 +125,64 @@ class EncryptionManager:
             key = self.derive_key(password, salt)
 
             # 解密
-            cipher = Cipher(algorithms.AES(key), modes.GCM(iv, tag), backend=self.backend)
+            Cipher, algorithms, modes = _load_cipher_modules()
+            cipher = Cipher(algorithms.AES(key), modes.GCM(iv, tag))
             decryptor = cipher.decryptor()
             plaintext = decryptor.update(ciphertext) + decryptor.finalize()
 
             result = plaintext.decode('utf-8')
-            print(f"解密成功: 结果长度={len(result)}")
             return result
         except Exception as e:
             logger.error(f"解密失败: {e}")
             raise
 
+    def encrypt_many(self, plaintexts: List[str], password: str,
+                     workers: Optional[int] = None) -> List[str]:
+        """批量加密（多线程并行派生密钥），结果顺序与输入一致"""
+        return self._map_parallel(lambda text: self.encrypt(text, password), plaintexts, workers)
+
+    def decrypt_many(self, encrypted_items: List[str], password: str,
+                     workers: Optional[int] = None) -> List[str]:
+        """批量解密（多线程并行派生密钥），结果顺序与输入一致"""
+        return self._map_parallel(lambda data: self.decrypt(data, password), encrypted_items, workers)
+
+    def preload_keys(self, encrypted_items: List[str], password: str,
+                     workers: Optional[int] = None) -> int:
+        """预先派生这些密文的密钥放入缓存（之后解密不再计算 PBKDF2），返回派生的个数"""
+        if not self.key_cache_size:
+            return 0
+        salts = []
+        for data in encrypted_items[:self.key_cache_size]:
+            try:
+                salts.append(base64.b64decode(data.encode('utf-8'))[:16])
+            except (ValueError, AttributeError):
+                continue
+        self._map_parallel(lambda salt: self.derive_key(password, salt), salts, workers)
+        return len(salts)
+
+    @staticmethod
+    def _map_parallel(func, items, workers=None):
+        items = list(items)
+        workers = workers or DEFAULT_WORKERS
+        if workers <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+            return list(executor.map(func, items))
+
+    @perf_monitor.track('crypto')
+    def derive_vault_keys(self, password: str, salt: bytes) -> Dict[str, bytes]:
+        """解锁时派生一次密码库主密钥，再用 HMAC 按用途标签派生互相独立的子密钥"""
+        vault_key = self.derive_key(password, salt)
+        return {
+            label: hmac.new(vault_key, b'passwdmgr/' + label.encode('ascii'), hashlib.sha256).digest()
+            for label in VAULT_KEY_LABELS
+        }
+
+    @staticmethod
+    def fingerprint(plaintext: str, key: bytes) -> str:
+        """密码指纹（HMAC-SHA256）：相同密码得到相同指纹，没有密钥无法用字典反推"""
+        return hmac.new(key, plaintext.encode('utf-8'), hashlib.sha256).hexdigest()
+
     def validate_password(self, encrypted_data: str, password: str) -> bool:
         """验证密码是否正确"""
         try:
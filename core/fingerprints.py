@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 18:45
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 密码指纹（HMAC）补全
+"""
+每条记录保存密码的 HMAC-SHA256 指纹（password_fingerprint 列，有索引），密钥由主密码在解锁时派生，
+查找重复密码只需要按指纹分组，不用逐条解密。新增、编辑、修改主密码时同步更新指纹；
+旧版本数据库中的记录没有指纹，第一次查找重复密码时补全（需要逐条解密，只做一次）。
+"""
+import logging
+from typing import Callable, Optional
+
+from core.encryption_manager import EncryptionManager
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_fingerprints(database_manager, encryption_manager, master_password: str, fingerprint_key: bytes,
+                          batch_size: int = 64,
+                          progress: Optional[Callable[[int, int], None]] = None,
+                          is_canceled: Optional[Callable[[], bool]] = None) -> int:
+    """为没有指纹的记录计算指纹，返回补全的条数"""
+    missing = database_manager.get_entries_missing_fingerprint()
+    total = len(missing)
+    done = 0
+    updated = 0
+
+    for start in range(0, total, batch_size):
+        if is_canceled and is_canceled():
+            break
+        batch = missing[start:start + batch_size]
+        try:
+            passwords = encryption_manager.decrypt_many([encrypted for _, encrypted in batch], master_password)
+        except Exception as e:
+            # 有记录无法解密时逐条处理，跳过失败的记录
+            logger.warning(f"批量解密失败，逐条处理: {e}")
+            passwords = []
+            for _, encrypted in batch:
+                try:
+                    passwords.append(encryption_manager.decrypt(encrypted, master_password))
+                except Exception:
+                    passwords.append(None)
+
+        fingerprints = [(EncryptionManager.fingerprint(password, fingerprint_key), entry_id)
+                        for (entry_id, _), password in zip(batch, passwords) if password]
+        if database_manager.update_fingerprints(fingerprints):
+            updated += len(fingerprints)
+
+        done += len(batch)
+        if progress:
+            progress(done, total)
+
+    if total:
+        logger.info(f"补全密码指纹: {updated}/{total}")
+    return updated
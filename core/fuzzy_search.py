@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 23:40
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 容错（模糊）搜索与结果排序
+"""
+对网站名称和域名做容错匹配，输入 "githbu"、"gogle" 也能找到 GitHub、Google。
+
+候选词:
+    网站名称中不少于 3 个字符的单词、可注册域名去掉后缀的部分（accounts.google.com -> google），
+    统一小写，超过 MAX_TERM_LENGTH 的部分截断
+
+索引采用对称删除（FastSS / SymSpell）:
+    每个候选词及其删去 1 个字符的所有变体，按 40 位哈希和词编号打包为 64 位整数，排序后存入
+    array('Q')；查询时对关键字本身及其删去 1 个（长关键字再加 2 个）字符的变体做二分查找。
+    变体相同说明两者的编辑距离很小，候选再用有界的 Damerau-Levenshtein（OSA，允许相邻交换）
+    确认。查询只做几十次二分查找，与记录总数基本无关，10 万条记录也在毫秒以内。
+    构建后新增的词放在字典中，积累到一定数量再整体重建排序数组。
+    构建的开销与候选词总长度成正比（10 万条记录约一到数秒），主窗口在解锁后放到后台线程中构建
+    （SearchIndex.begin_fuzzy_build / finish_fuzzy_build），构建完成前只做子串匹配。
+
+排序（rank_entries）:
+    匹配质量  完全相同 > 前缀 > 子串 > 编辑距离 1 > 编辑距离 2
+    使用次数  同一档内常用的记录在前（usage_count，复制密码时累加）
+    其次按三字符片段相似度、排序键（汉字按拼音）排序
+    网站名称的全拼和首字母视同名称，输入 "zsyh" 时招商银行属于完全相同一档
+"""
+import logging
+import re
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set
+
+from models.password_entry import PasswordEntry
+from utils.text_keys import entry_sort_key, normalize
+
+logger = logging.getLogger(__name__)
+
+MIN_FUZZY_LENGTH = 3
+MAX_TERM_LENGTH = 24
+# 关键字长度超过该值时允许编辑距离 2
+LONG_QUERY_LENGTH = 5
+
+HASH_BITS = 40
+TERM_BITS = 24
+HASH_MASK = (1 << HASH_BITS) - 1
+TERM_MASK = (1 << TERM_BITS) - 1
+# 构建后新增的变体数超过该值且超过排序数组的 1/4 时重建
+MIN_REBUILD_KEYS = 4096
+
+# 匹配质量档次
+TIER_EXACT = 0
+TIER_PREFIX = 1
+TIER_SUBSTRING = 2
+TIER_FUZZY = 3
+
+_WORD_SPLIT = re.compile(r'[\s\-_./·|()（）]+')
+
+
+def normalize_term(text: Optional[str]) -> str:
+    """归一（全角转半角、小写）并去掉空白"""
+    return ''.join(normalize(text).split())
+
+
+def domain_label(domain: Optional[str]) -> str:
+    """可注册域名去掉公共后缀：google.com -> google，example.co.uk -> example"""
+    return (domain or '').split('.', 1)[0].casefold()
+
+
+def entry_terms(entry: PasswordEntry) -> Set[str]:
+    """记录参与模糊匹配的候选词"""
+    terms = set(_WORD_SPLIT.split((entry.website_name or '').casefold()))
+    terms.add(domain_label(entry.domain))
+    return {term[:MAX_TERM_LENGTH] for term in terms if len(term) >= MIN_FUZZY_LENGTH}
+
+
+def deletes(term: str, depth: int) -> Set[str]:
+    """删去不超过 depth 个字符得到的所有变体（含自身）"""
+    result = {term}
+    frontier = {term}
+    for _ in range(depth):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        result |= frontier
+    return result
+
+
+def osa_distance(a: str, b: str, max_distance: int) -> int:
+    """有界的 Damerau-Levenshtein 距离（相邻交换算一次编辑），超过 max_distance 时返回 max_distance + 1"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if a == b:
+        return 0
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+def trigram_similarity(a: str, b: str) -> float:
+    """两端补空格后三字符片段的 Jaccard 相似度"""
+    a, b = f'  {a} ', f'  {b} '
+    grams_a = {a[i:i + 3] for i in range(len(a) - 2)}
+    grams_b = {b[i:i + 3] for i in range(len(b) - 2)}
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+
+def max_distance_for(query: str) -> int:
+    return 1 if len(query) <= LONG_QUERY_LENGTH else 2
+
+
+def _key_hash(text: str) -> int:
+    return hash(text) & HASH_MASK
+
+
+class FuzzyIndex:
+    """候选词的对称删除索引"""
+
+    def __init__(self):
+        self._terms: List[str] = []
+        self._term_ids: Dict[str, int] = {}
+        self._term_entries: List[Set[int]] = []
+        self._entry_terms: Dict[int, List[int]] = {}
+        # 排序后的 (哈希 << TERM_BITS | 词编号)
+        self._keys = array('Q')
+        # 构建后新增：哈希 -> 词编号
+        self._pending: Dict[int, List[int]] = {}
+        self._pending_count = 0
+
+    @classmethod
+    def build(cls, entries: Iterable[PasswordEntry]) -> 'FuzzyIndex':
+        index = cls()
+        packed = []
+        for entry in entries:
+            for term_id in index._register(entry):
+                packed.extend(index._term_keys(term_id))
+        packed.sort()
+        index._keys = array('Q', packed)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entry_terms)
+
+    def add(self, entry: PasswordEntry):
+        """新增或修改一条记录"""
+        self.remove(entry.id)
+        for term_id in self._register(entry):
+            for key in self._term_keys(term_id):
+                self._pending.setdefault(key >> TERM_BITS, []).append(term_id)
+                self._pending_count += 1
+        if self._pending_count > MIN_REBUILD_KEYS and self._pending_count * 4 > len(self._keys):
+            self._rebuild()
+
+    def remove(self, entry_id: int):
+        for term_id in self._entry_terms.pop(entry_id, ()):
+            self._term_entries[term_id].discard(entry_id)
+
+    def lookup(self, query: str) -> Dict[int, int]:
+        """容错匹配，返回 记录ID -> 编辑距离（只包含不超过允许距离的记录）"""
+        query = normalize_term(query)[:MAX_TERM_LENGTH]
+        if len(query) < MIN_FUZZY_LENGTH:
+            return {}
+        max_distance = max_distance_for(query)
+
+        candidates = set()
+        for variant in deletes(query, max_distance):
+            candidates.update(self._lookup_hash(_key_hash(variant)))
+
+        result = {}
+        for term_id in candidates:
+            entry_ids = self._term_entries[term_id]
+            if not entry_ids:
+                continue
+            distance = osa_distance(query, self._terms[term_id], max_distance)
+            if distance > max_distance:
+                continue
+            for entry_id in entry_ids:
+                if distance < result.get(entry_id, max_distance + 1):
+                    result[entry_id] = distance
+        return result
+
+    def _register(self, entry: PasswordEntry) -> List[int]:
+        """登记记录的候选词，返回其中新出现的词编号（需要写入变体）"""
+        if entry.id is None:
+            return []
+        term_ids = []
+        new_term_ids = []
+        for term in entry_terms(entry):
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                term_id = self._term_ids[term] = len(self._terms)
+                self._terms.append(term)
+                self._term_entries.append(set())
+                new_term_ids.append(term_id)
+            self._term_entries[term_id].add(entry.id)
+            term_ids.append(term_id)
+        self._entry_terms[entry.id] = term_ids
+        return new_term_ids
+
+    def _term_keys(self, term_id: int) -> List[int]:
+        # 词本身及删去 1 个字符的变体（构建时的热点，不经过 deletes 以免反复创建集合）
+        term = self._terms[term_id]
+        variants = [term] + [term[:i] + term[i + 1:] for i in range(len(term))]
+        return [((hash(variant) & HASH_MASK) << TERM_BITS) | term_id for variant in variants]
+
+    def _lookup_hash(self, key_hash: int) -> List[int]:
+        keys = self._keys
+        low = key_hash << TERM_BITS
+        i = bisect_left(keys, low)
+        term_ids = []
+        while i < len(keys) and keys[i] >> TERM_BITS == key_hash:
+            term_ids.append(keys[i] & TERM_MASK)
+            i += 1
+        term_ids.extend(self._pending.get(key_hash, ()))
+        return term_ids
+
+    def _rebuild(self):
+        # 已没有记录的词不再写入变体，再次出现时按新词登记
+        for term_id, entry_ids in enumerate(self._term_entries):
+            if not entry_ids and self._term_ids.get(self._terms[term_id]) == term_id:
+                del self._term_ids[self._terms[term_id]]
+        packed = [key for term_id, entry_ids in enumerate(self._term_entries) if entry_ids
+                  for key in self._term_keys(term_id)]
+        packed.sort()
+        self._keys = array('Q', packed)
+        self._pending = {}
+        self._pending_count = 0
+
+
+def rank_entries(query: str, entries: Iterable[PasswordEntry],
+                 distances: Dict[int, int] = None) -> List[PasswordEntry]:
+    """按匹配质量、使用次数排序
+
+    entries 为子串匹配和模糊匹配的记录，distances 为 FuzzyIndex.lookup 的结果
+    （不在其中的记录视为子串匹配）。
+    """
+    distances = distances or {}
+    term = normalize_term(query)[:MAX_TERM_LENGTH]
+
+    def sort_key(entry: PasswordEntry):
+        name = normalize_term(entry.website_name)
+        # 名称、域名和拼音的各种读法
+        aliases = [name, domain_label(entry.domain)]
+        aliases += f'{entry.pinyin_full or ""} {entry.pinyin_initials or ""}'.split()
+        if term in aliases:
+            tier = TIER_EXACT
+        elif any(alias.startswith(term) for alias in aliases):
+            tier = TIER_PREFIX
+        elif entry.id in distances and term not in name:
+            tier = TIER_FUZZY + distances[entry.id] - 1
+        else:
+            tier = TIER_SUBSTRING
+        similarity = trigram_similarity(term, name) if tier >= TIER_FUZZY else 0.0
+        return (tier, -(entry.usage_count or 0), -similarity) + entry_sort_key(entry)
+
+    return sorted(entries, key=sort_key)
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 17:20
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 从浏览器（Chrome / Edge / Firefox）和 KeePass 2.x 导出文件导入密码
+"""
+支持的文件:
+    chrome / edge   浏览器"导出密码"得到的 CSV（name,url,username,password[,note]）
+    firefox         about:logins 导出的 CSV（url,username,password,...,timeCreated,...）
+    keepass         KeePass 2.x "导出 -> KeePass XML (2.x)" 得到的 XML
+
+文件逐条解析（XML 使用 iterparse，处理完的条目立即释放），按批次并行加密，
+所有批次在同一个事务中写入，任何一步失败都会回滚。
+与已有记录或文件中前面的记录 (URL的源, 用户名) 相同的条目视为重复，不会导入；
+没有 URL 的条目按 (标题, 用户名) 查重。
+KeePass 的分组映射为分类，新分类会追加到配置的分类列表中。
+"""
+import base64
+import csv
+import logging
+import os
+import struct
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+from xml.etree import ElementTree
+
+from models.password_entry import PasswordEntry
+from core.vault_transfer import DEFAULT_BATCH_SIZE, ProgressCallback, VaultTransferError, batched, encrypt_entries
+
+logger = logging.getLogger(__name__)
+
+IMPORT_SOURCES = ('chrome', 'edge', 'firefox', 'keepass')
+
+DEFAULT_CATEGORY = '默认'
+
+# KeePass 默认分组名 -> 内置分类
+CATEGORY_ALIASES = {
+    'general': '默认',
+    'email': '邮箱',
+    'e-mail': '邮箱',
+    'homebanking': '金融',
+    'banking': '金融',
+    'finance': '金融',
+    'social': '社交',
+    'work': '工作',
+    'personal': '个人',
+    'shopping': '购物',
+    'entertainment': '娱乐',
+    'education': '教育',
+    'internet': '其他',
+    'network': '其他',
+    'windows': '其他',
+}
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443, 'ftp': 21}
+
+# KeePass KDBX4 中的时间为自 0001-01-01 起的秒数（Base64 编码的 int64）
+_KEEPASS_EPOCH = datetime(1, 1, 1)
+
+
+class ImporterError(VaultTransferError):
+    """导入文件无法识别或解析失败"""
+
+
+@dataclass
+class ImportResult:
+    """导入结果统计"""
+    source: str
+    imported: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+    new_categories: List[str] = field(default_factory=list)
+
+
+def normalize_url(url: str, keep_path: bool = True) -> str:
+    """规范化URL：补全协议，小写协议和主机名，去掉默认端口、查询参数、锚点和末尾斜杠
+
+    浏览器保存的登录地址常带有会话相关的查询参数（如 ?continue=...），去掉后才能正确查重。
+    keep_path=False 时只保留源（协议+主机+端口）。
+    http/https/ftp 以外的地址（如 android://）只去掉首尾空白。
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+    if '://' not in url:
+        url = 'https://' + url
+
+    try:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in _DEFAULT_PORTS:
+            return url
+        host = (parts.hostname or '').rstrip('.')
+        port = parts.port
+    except ValueError:
+        return url
+
+    netloc = host
+    if port and port != _DEFAULT_PORTS[scheme]:
+        netloc = f'{host}:{port}'
+    path = parts.path.rstrip('/') if keep_path else ''
+    return urlunsplit((scheme, netloc, path, '', ''))
+
+
+def dedup_key(url: str, username: str, title: str = '') -> Optional[tuple]:
+    """查重用的键：(URL的源, 忽略大小写的用户名, 标题)
+
+    Firefox 只保存源，Chrome 保存完整登录页地址，按源比较才能发现同一站点的重复登录。
+    没有 URL 时（KeePass 中常见）源无法区分站点，改用忽略大小写的标题区分；
+    URL 和标题都为空时无法判断是否重复，返回 None（不查重）。
+    """
+    origin = normalize_url(url, keep_path=False)
+    title = '' if origin else (title or '').strip().casefold()
+    if not origin and not title:
+        return None
+    return origin, (username or '').strip().casefold(), title
+
+
+def site_name_from_url(url: str) -> str:
+    """没有标题时用主机名作为网站名称"""
+    try:
+        host = urlsplit(url if '://' in url else 'https://' + url).hostname or ''
+    except ValueError:
+        host = ''
+    if host.startswith('www.'):
+        host = host[4:]
+    return host or url
+
+
+def map_category(group_name: Optional[str]) -> str:
+    """KeePass 分组名 -> 分类"""
+    name = (group_name or '').strip()
+    if not name:
+        return DEFAULT_CATEGORY
+    return CATEGORY_ALIASES.get(name.casefold(), name)
+
+
+def detect_source(file_path: str) -> Optional[str]:
+    """根据扩展名和 CSV 表头判断导出来源，无法识别时返回 None"""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == '.xml':
+        return 'keepass'
+    if extension != '.csv':
+        return None
+    try:
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            header = next(csv.reader(f), [])
+    except (OSError, UnicodeDecodeError) as e:
+        raise ImporterError(f"无法读取文件: {e}")
+    fields = {name.strip().lower() for name in header}
+    if {'url', 'username', 'password'} <= fields and ('guid' in fields or 'httprealm' in fields):
+        return 'firefox'
+    if {'name', 'url', 'username', 'password'} <= fields:
+        return 'chrome'
+    return None
+
+
+def _make_entry(title, url, username, password, notes='', category=DEFAULT_CATEGORY,
+                created_at=None, updated_at=None) -> PasswordEntry:
+    url = normalize_url(url)
+    entry = PasswordEntry(
+        website_name=(title or '').strip() or site_name_from_url(url),
+        url=url,
+        username=(username or '').strip(),
+        notes=notes or '',
+        category=category,
+        created_at=created_at,
+        updated_at=updated_at,
+    )
+    entry.decrypted_password = password or ''
+    return entry
+
+
+def _from_epoch_ms(value) -> Optional[datetime]:
+    """Firefox 的毫秒时间戳 -> UTC 时间（与 SQLite 的 CURRENT_TIMESTAMP 一致）"""
+    try:
+        return datetime.fromtimestamp(int(value) / 1000, timezone.utc).replace(tzinfo=None)
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
+
+def _read_csv_rows(file_path: str) -> Iterator[dict]:
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            yield {(key or '').strip().lower(): value or '' for key, value in row.items()}
+
+
+def read_chrome_csv(file_path: str) -> Iterator[PasswordEntry]:
+    """Chrome / Edge 导出的 CSV"""
+    for row in _read_csv_rows(file_path):
+        yield _make_entry(row.get('name'), row.get('url'), row.get('username'), row.get('password'),
+                          row.get('note') or row.get('notes'))
+
+
+def read_firefox_csv(file_path: str) -> Iterator[PasswordEntry]:
+    """Firefox 导出的 CSV"""
+    for row in _read_csv_rows(file_path):
+        created_at = _from_epoch_ms(row.get('timecreated'))
+        updated_at = _from_epoch_ms(row.get('timepasswordchanged')) or created_at
+        yield _make_entry('', row.get('url'), row.get('username'), row.get('password'),
+                          created_at=created_at, updated_at=updated_at)
+
+
+def _parse_keepass_time(value: Optional[str]) -> Optional[datetime]:
+    """KeePass 时间：XML 导出为 ISO 8601（UTC），KDBX4 内部为 Base64 编码的秒数"""
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        if 'T' in value:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if parsed.tzinfo:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            return parsed
+        seconds = struct.unpack('<q', base64.b64decode(value))[0]
+        parsed = _KEEPASS_EPOCH + timedelta(seconds=seconds)
+        # 未设置的时间为 0001-01-01，视为没有时间
+        return parsed if parsed.year >= 1970 else None
+    except (ValueError, struct.error, OverflowError):
+        return None
+
+
+def read_keepass_xml(file_path: str) -> Iterator[PasswordEntry]:
+    """KeePass 2.x XML（增量解析，跳过历史版本和回收站中的条目）"""
+    path = []          # 当前元素的标签路径
+    groups = []        # 当前所在的分组 [{'name': ..., 'uuid': ...}]
+    recycle_bin_uuid = None
+
+    try:
+        for event, elem in ElementTree.iterparse(file_path, events=('start', 'end')):
+            tag = elem.tag
+            if event == 'start':
+                path.append(tag)
+                if tag == 'Group':
+                    groups.append({'name': None, 'uuid': None})
+                continue
+
+            parent = path[-2] if len(path) > 1 else None
+            if tag == 'RecycleBinUUID' and parent == 'Meta':
+                recycle_bin_uuid = (elem.text or '').strip() or None
+            elif parent == 'Group' and tag in ('Name', 'UUID'):
+                groups[-1]['name' if tag == 'Name' else 'uuid'] = (elem.text or '').strip()
+            elif tag == 'Entry' and parent == 'Group':
+                in_recycle_bin = recycle_bin_uuid and any(g['uuid'] == recycle_bin_uuid for g in groups)
+                if not in_recycle_bin:
+                    yield _keepass_entry(elem, groups)
+                elem.clear()
+            elif tag == 'Group':
+                groups.pop()
+                elem.clear()
+            path.pop()
+    except ElementTree.ParseError as e:
+        raise ImporterError(f"KeePass XML 解析失败: {e}")
+
+
+def _keepass_entry(elem, groups) -> PasswordEntry:
+    fields = {}
+    for string in elem.findall('String'):
+        fields[string.findtext('Key') or ''] = string.findtext('Value') or ''
+    # 根分组通常是数据库名称，只有子分组才映射为分类
+    category = map_category(groups[-1]['name']) if len(groups) > 1 else DEFAULT_CATEGORY
+    created_at = _parse_keepass_time(elem.findtext('Times/CreationTime'))
+    updated_at = _parse_keepass_time(elem.findtext('Times/LastModificationTime')) or created_at
+    return _make_entry(fields.get('Title'), fields.get('URL'), fields.get('UserName'),
+                       fields.get('Password'), fields.get('Notes'), category, created_at, updated_at)
+
+
+_READERS = {
+    'chrome': read_chrome_csv,
+    'edge': read_chrome_csv,
+    'firefox': read_firefox_csv,
+    'keepass': read_keepass_xml,
+}
+
+
+def read_entries(file_path: str, source: Optional[str] = None) -> Iterator[PasswordEntry]:
+    """逐条读取导出文件中的条目（密码尚未加密）"""
+    source = source or detect_source(file_path)
+    if source not in _READERS:
+        raise ImporterError("无法识别的导出文件，请指定来源（chrome / edge / firefox / keepass）")
+    try:
+        yield from _READERS[source](file_path)
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        raise ImporterError(f"读取文件失败: {e}")
+
+
+def import_passwords(database_manager, encryption_manager, master_password: str, file_path: str,
+                     source: Optional[str] = None, config_manager=None,
+                     batch_size: int = DEFAULT_BATCH_SIZE, progress: ProgressCallback = None,
+                     fingerprint_key: Optional[bytes] = None) -> ImportResult:
+    """导入浏览器或 KeePass 导出的密码，返回统计结果"""
+    source = source or detect_source(file_path)
+    if source not in _READERS:
+        raise ImporterError("无法识别的导出文件，请指定来源（chrome / edge / firefox / keepass）")
+
+    result = ImportResult(source)
+    seen = {dedup_key(url, username, name) for name, url, username in database_manager.iter_dedup_fields()}
+    known_categories = list(config_manager.get_categories_config()) if config_manager else []
+
+    def unique_entries():
+        for entry in read_entries(file_path, source):
+            if not entry.username and not entry.decrypted_password:
+                result.skipped += 1
+                continue
+            key = dedup_key(entry.url, entry.username, entry.website_name)
+            if key is not None:
+                if key in seen:
+                    result.duplicates += 1
+                    continue
+                seen.add(key)
+            if entry.category not in known_categories and entry.category not in result.new_categories:
+                result.new_categories.append(entry.category)
+            yield entry
+
+    try:
+        for entries in batched(unique_entries(), batch_size):
+            encrypt_entries(entries, encryption_manager, master_password, fingerprint_key)
+
+            # 所有批次处于同一事务中，最后统一提交
+            if not database_manager.bulk_insert_entries(entries, commit=False):
+                raise ImporterError("写入数据库失败，已回滚")
+
+            result.imported += len(entries)
+            if progress:
+                progress(result.imported + result.duplicates + result.skipped, None)
+
+        database_manager.commit()
+    except Exception:
+        database_manager.rollback()
+        raise
+
+    if config_manager and result.new_categories:
+        config_manager.update_categories_config(known_categories + result.new_categories)
+
+    logger.info(f"从 {source} 导入完成: {file_path} -> 导入 {result.imported} 条，"
+                f"重复 {result.duplicates} 条，跳过 {result.skipped} 条")
+    return result
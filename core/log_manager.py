@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 15:50
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 日志管理（异步队列写入、按大小轮转并压缩、按模块设置级别、JSON格式）
+"""
+config.json 中的 logging 配置:
+
+    "logging": {
+        "level": "INFO",                  # 根级别
+        "file": "password_manager.log",   # 为空则不写文件
+        "max_bytes": 5242880,             # 单个日志文件上限，超出后轮转
+        "backup_count": 5,                # 保留的历史文件数
+        "compress": true,                 # 历史文件使用 gzip 压缩
+        "format": "text",                 # text / json
+        "console": true,                  # 同时输出到控制台
+        "modules": {"core.database_manager": "DEBUG"}
+    }
+
+业务代码只把日志记录放入队列，格式化和磁盘写入都在后台线程中完成。
+"""
+import atexit
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import time
+
+DEFAULT_LOGGING_CONFIG = {
+    "level": "INFO",
+    "file": "password_manager.log",
+    "max_bytes": 5 * 1024 * 1024,
+    "backup_count": 5,
+    "compress": True,
+    "format": "text",
+    "console": True,
+    "modules": {}
+}
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """每条日志输出为一行JSON"""
+
+    def format(self, record):
+        data = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created))
+                    + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class GzipRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """按大小轮转，历史文件压缩为 .gz"""
+
+    def __init__(self, filename, max_bytes, backup_count, compress=True):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding='utf-8', delay=True)
+        if compress:
+            self.namer = self._gzip_namer
+            self.rotator = self._gzip_rotator
+
+    @staticmethod
+    def _gzip_namer(name):
+        return name + '.gz'
+
+    @staticmethod
+    def _gzip_rotator(source, dest):
+        with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(source)
+
+
+class LogManager:
+    """日志管理器"""
+
+    def __init__(self):
+        self.queue = queue.SimpleQueue()
+        self.listener = None
+        self.queue_handler = None
+        self.config = dict(DEFAULT_LOGGING_CONFIG)
+        self._module_levels = {}
+
+    def setup(self, config=None):
+        """按配置（重新）建立日志管道，可多次调用"""
+        merged = dict(DEFAULT_LOGGING_CONFIG)
+        merged.update(config or {})
+        self.config = merged
+
+        self._stop_listener()
+
+        formatter = JsonFormatter() if merged.get('format') == 'json' else logging.Formatter(TEXT_FORMAT)
+        handlers = []
+        if merged.get('file'):
+            try:
+                file_handler = GzipRotatingFileHandler(merged['file'],
+                                                       int(merged.get('max_bytes') or 0),
+                                                       int(merged.get('backup_count') or 0),
+                                                       bool(merged.get('compress')))
+                file_handler.setFormatter(formatter)
+                handlers.append(file_handler)
+            except OSError as e:
+                print(f"无法打开日志文件 {merged['file']}: {e}")
+        if merged.get('console', True):
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(formatter)
+            handlers.append(console_handler)
+
+        root = logging.getLogger()
+        if self.queue_handler is None:
+            # 替换掉其他方式添加的处理器，所有记录都经过队列
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            self.queue_handler = logging.handlers.QueueHandler(self.queue)
+            root.addHandler(self.queue_handler)
+        root.setLevel(self._parse_level(merged.get('level'), logging.INFO))
+
+        # 按模块设置级别（先恢复上次设置过的模块）
+        for name in self._module_levels:
+            logging.getLogger(name).setLevel(logging.NOTSET)
+        self._module_levels = {}
+        for name, level in (merged.get('modules') or {}).items():
+            parsed = self._parse_level(level, None)
+            if parsed is not None:
+                logging.getLogger(name).setLevel(parsed)
+                self._module_levels[name] = parsed
+
+        self.listener = logging.handlers.QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+
+    @staticmethod
+    def _parse_level(level, default):
+        if isinstance(level, int):
+            return level
+        if isinstance(level, str) and isinstance(logging.getLevelName(level.upper()), int):
+            return logging.getLevelName(level.upper())
+        return default
+
+    def _stop_listener(self):
+        if self.listener is not None:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+
+    def shutdown(self):
+        """写完队列中剩余的日志并关闭文件"""
+        self._stop_listener()
+
+    def _after_fork(self):
+        """fork 出的子进程中没有写日志的线程，换一个新队列重新建立管道（如命令行代理转入后台）"""
+        if self.listener is None:
+            return
+        self.queue = queue.SimpleQueue()
+        self.queue_handler.queue = self.queue
+        self.listener = None
+        self.setup(self.config)
+
+
+# 全局日志管理器实例
+_log_manager = None
+
+
+def get_log_manager():
+    """获取全局日志管理器实例"""
+    global _log_manager
+    if _log_manager is None:
+        _log_manager = LogManager()
+        atexit.register(_log_manager.shutdown)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_log_manager._after_fork)
+    return _log_manager
+
+
+def setup_logging(config=None):
+    """建立或按新配置重建日志管道"""
+    log_manager = get_log_manager()
+    log_manager.setup(config)
+    return log_manager
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 22:30
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 记录元数据加密与盲索引
+"""
+开启元数据加密后，网站名称、网址、用户名和备注用密码库子密钥 'metadata' 以 AES-256-GCM 加密后存储
+（附加数据为列名，密文不能在列之间互换），数据库里只剩密文。
+
+为了让搜索仍然走索引，写入时把可搜索字段（网站名称、网址、备注、分类，与 search_entries 的范围一致）
+转为小写后的 1~3 字符片段，用子密钥 'blind_index' 计算 HMAC 截断为 64 位，写入 blind_index 表
+(token, entry_id)。搜索时对关键字做同样的计算：
+
+    关键字不少于 3 个字符  取其所有 3 字符片段，要求记录包含全部令牌
+    关键字 1~2 个字符      直接取关键字本身的令牌
+
+网站名称的拼音和首字母（utils/text_keys.py）也写入令牌，加密后仍可用 "zsyh" 搜索招商银行；
+文本先做 NFKC 归一（全角转半角）再转小写。令牌的计算方式变化时递增 BLIND_INDEX_VERSION，
+解锁后由数据库管理器重建盲索引。
+
+候选记录在本地解密后再做一次子串比较，排除不同字段拼出来的片段和截断带来的误报。
+服务器只能看到令牌出现的频率，看不到明文。domain 列同样改存 HMAC 令牌。
+"""
+import base64
+import hashlib
+import hmac
+import os
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+from utils.text_keys import normalize, normalize_query
+
+logger = logging.getLogger(__name__)
+
+# 加密存储的列
+ENCRYPTED_FIELDS = ('website_name', 'url', 'username', 'notes')
+# 建立盲索引的列（search_entries 搜索的范围）
+INDEXED_FIELDS = ('website_name', 'url', 'notes', 'category')
+# 由网站名称计算的拼音列（不存储，只参与盲索引）
+PINYIN_FIELDS = ('pinyin_full', 'pinyin_initials')
+BLIND_INDEX_VERSION = '2'
+MAX_NGRAM = 3
+TOKEN_BYTES = 8
+NONCE_SIZE = 12
+TAG_SIZE = 16
+# 没有密钥（锁定）时加密记录显示的名称
+LOCKED_PLACEHOLDER = '（已加密）'
+
+
+def ngrams(text: str, max_n: int = MAX_NGRAM) -> Set[str]:
+    """文本（归一、小写）中所有长度为 1 到 max_n 的片段"""
+    text = normalize(text)
+    return {text[i:i + n] for n in range(1, max_n + 1) for i in range(len(text) - n + 1)}
+
+
+def query_ngrams(keyword: str) -> Set[str]:
+    """搜索关键字对应的片段：长关键字取 3 字符片段，短关键字取自身"""
+    keyword = normalize_query(keyword)
+    if len(keyword) < MAX_NGRAM:
+        return {keyword} if keyword else set()
+    return {keyword[i:i + MAX_NGRAM] for i in range(len(keyword) - MAX_NGRAM + 1)}
+
+
+class MetadataCrypto:
+    """用密码库子密钥加解密元数据并计算盲索引令牌"""
+
+    def __init__(self, metadata_key: bytes, blind_index_key: bytes):
+        self._metadata_key = metadata_key
+        self._blind_index_key = blind_index_key
+
+    @classmethod
+    def from_vault_keys(cls, vault_keys: Optional[Dict[str, bytes]]) -> Optional['MetadataCrypto']:
+        if not vault_keys or 'metadata' not in vault_keys or 'blind_index' not in vault_keys:
+            return None
+        return cls(vault_keys['metadata'], vault_keys['blind_index'])
+
+    def encrypt(self, field: str, value: Optional[str]) -> str:
+        """加密一个字段，结果为 base64(nonce + tag + 密文)"""
+        from core.encryption_manager import _load_cipher_modules
+        Cipher, algorithms, modes = _load_cipher_modules()
+        nonce = os.urandom(NONCE_SIZE)
+        encryptor = Cipher(algorithms.AES(self._metadata_key), modes.GCM(nonce)).encryptor()
+        encryptor.authenticate_additional_data(field.encode('ascii'))
+        ciphertext = encryptor.update((value or '').encode('utf-8')) + encryptor.finalize()
+        return base64.b64encode(nonce + encryptor.tag + ciphertext).decode('ascii')
+
+    def decrypt(self, field: str, data: Optional[str]) -> str:
+        if not data:
+            return ''
+        from core.encryption_manager import _load_cipher_modules
+        Cipher, algorithms, modes = _load_cipher_modules()
+        raw = base64.b64decode(data)
+        nonce, tag, ciphertext = raw[:NONCE_SIZE], raw[NONCE_SIZE:NONCE_SIZE + TAG_SIZE], raw[NONCE_SIZE + TAG_SIZE:]
+        decryptor = Cipher(algorithms.AES(self._metadata_key), modes.GCM(nonce, tag)).decryptor()
+        decryptor.authenticate_additional_data(field.encode('ascii'))
+        return (decryptor.update(ciphertext) + decryptor.finalize()).decode('utf-8')
+
+    def token(self, text: str) -> str:
+        return hmac.new(self._blind_index_key, text.encode('utf-8'), hashlib.sha256).digest()[:TOKEN_BYTES].hex()
+
+    def entry_tokens(self, entry) -> Set[str]:
+        """一条记录的全部盲索引令牌"""
+        grams = set()
+        for field in INDEXED_FIELDS:
+            grams |= ngrams(getattr(entry, field) or '')
+        for field in PINYIN_FIELDS:
+            # 多音字的各种读法以空格分隔，分别取片段
+            for variant in (getattr(entry, field) or '').split():
+                grams |= ngrams(variant)
+        return {self.token(gram) for gram in grams}
+
+    def query_tokens(self, keyword: str) -> List[str]:
+        return sorted({self.token(gram) for gram in query_ngrams(keyword)})
+
+    def domain_token(self, domain: Optional[str]) -> Optional[str]:
+        """domain 列存储的令牌（与片段令牌用不同前缀区分）"""
+        if not domain:
+            return None
+        return 'd' + hmac.new(self._blind_index_key, b'domain\0' + domain.encode('utf-8'),
+                              hashlib.sha256).hexdigest()[:31]
+
+
+def entry_matches(entry, keyword: str) -> bool:
+    """解密后的记录是否真的包含关键字（排除盲索引的误报）"""
+    keyword = normalize_query(keyword)
+    return any(keyword in normalize(getattr(entry, field)) for field in INDEXED_FIELDS + PINYIN_FIELDS)
+
+
+def chunked(items: Iterable, size: int):
+    """按固定大小分批（SQL 参数个数有上限）"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -5,78 +5,314 @@
 # @Updated: 2025/11/27 8:04
 # @Python:  3.12
 # @Description:
-import random
-import string
+import math
+import os
+from fractions import Fraction
 import secrets
-from typing import List
+import string
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+CHARACTER_SETS = {
+    'lowercase': string.ascii_lowercase,
+    'uppercase': string.ascii_uppercase,
+    'digits': string.digits,
+    'symbols': '!@#$%^&*()_+-=[]{}|;:,.<>?'
+}
+
+# 容易看错的字符（手工抄写、口述时）
+LOOKALIKE_CHARACTERS = "Il1|O0o`'\",.;:"
+
+
+@dataclass(frozen=True)
+class PasswordPolicy:
+    """密码规则
+
+    min_* 为该类字符的最少个数（该类未启用时必须为 0）；设置 alphabet 后只从自定义字母表中取字符，
+    忽略字符类型和最少个数。
+    """
+    length: int = 16
+    use_lowercase: bool = True
+    use_uppercase: bool = True
+    use_digits: bool = True
+    use_symbols: bool = True
+    min_lowercase: int = 0
+    min_uppercase: int = 0
+    min_digits: int = 0
+    min_symbols: int = 0
+    symbols: str = CHARACTER_SETS['symbols']
+    alphabet: str = ''
+    exclude: str = ''
+    exclude_lookalikes: bool = False
+
+    def character_classes(self) -> Dict[str, tuple]:
+        """启用的字符类 -> (去掉排除字符后的字符, 最少个数)"""
+        excluded = set(self.exclude) | (set(LOOKALIKE_CHARACTERS) if self.exclude_lookalikes else set())
+        if self.alphabet:
+            return {'alphabet': (''.join(dict.fromkeys(c for c in self.alphabet if c not in excluded)), 0)}
+
+        classes = {}
+        for name, enabled, minimum, chars in (
+                ('lowercase', self.use_lowercase, self.min_lowercase, CHARACTER_SETS['lowercase']),
+                ('uppercase', self.use_uppercase, self.min_uppercase, CHARACTER_SETS['uppercase']),
+                ('digits', self.use_digits, self.min_digits, CHARACTER_SETS['digits']),
+                ('symbols', self.use_symbols, self.min_symbols, self.symbols)):
+            if enabled:
+                classes[name] = (''.join(dict.fromkeys(c for c in chars if c not in excluded)), minimum)
+            elif minimum:
+                raise ValueError(f"字符类型 {name} 未启用，不能要求最少个数")
+        return classes
+
+
+# 预设规则
+POLICY_PRESETS = {
+    'default': PasswordPolicy(min_lowercase=1, min_uppercase=1, min_digits=1, min_symbols=1),
+    'strong': PasswordPolicy(length=24, min_lowercase=2, min_uppercase=2, min_digits=2, min_symbols=2),
+    'alphanumeric': PasswordPolicy(length=20, use_symbols=False,
+                                   min_lowercase=1, min_uppercase=1, min_digits=1),
+    'readable': PasswordPolicy(length=12, exclude_lookalikes=True,
+                               min_lowercase=1, min_uppercase=1, min_digits=1, min_symbols=1),
+    'service': PasswordPolicy(length=32, use_symbols=False, exclude_lookalikes=True),
+    'pin': PasswordPolicy(length=6, use_lowercase=False, use_uppercase=False, use_symbols=False),
+    'hex': PasswordPolicy(length=32, alphabet='0123456789abcdef'),
+}
+
+
+class BulkPasswordGenerator:
+    """批量密码生成器
+
+    每次从 os.urandom 取一大块随机字节，用 bytes.translate 一次完成拒绝采样和字符映射:
+    字母表大小为 n 时只接受小于 256 - 256 % n 的字节（每个字符出现概率完全相同），
+    再按 b % n 映射到字母表。有最少个数要求时整条密码不满足就丢弃重取，结果在满足规则的密码中均匀分布。
+    """
+
+    def __init__(self, policy: Optional[PasswordPolicy] = None):
+        self.policy = policy or POLICY_PRESETS['default']
+        classes = self.policy.character_classes()
+        alphabet = ''.join(dict.fromkeys(''.join(chars for chars, _ in classes.values())))
+        length = self.policy.length
+
+        if length < 1:
+            raise ValueError("密码长度必须大于 0")
+        if not 2 <= len(alphabet) <= 256:
+            raise ValueError(f"可用字符数必须在 2 到 256 之间，当前为 {len(alphabet)}")
+        for name, (chars, minimum) in classes.items():
+            if minimum and not chars:
+                raise ValueError(f"字符类型 {name} 的字符全部被排除")
+        if sum(minimum for _, minimum in classes.values()) > length:
+            raise ValueError("各类字符的最少个数之和超过了密码长度")
+
+        size = len(alphabet)
+        self.alphabet = alphabet
+        self._ascii = alphabet.isascii()
+        # ASCII 字母表直接映射成字符编码；否则先映射成下标，最后再转换成字符
+        if self._ascii:
+            symbols = [ord(c) for c in alphabet]
+        else:
+            symbols = list(range(size))
+            self._decode_table = {index: ord(c) for index, c in enumerate(alphabet)}
+        limit = 256 - 256 % size
+        self._table = bytes(symbols[b % size] for b in range(256))
+        self._reject = bytes(range(limit, 256))
+        self._acceptance = limit / 256
+        # 最少个数检查：先把每个字符换成所属字符类的标记字节，再按标记计数
+        tags = bytearray(b'.' * 256)
+        self._minimum_tags = []
+        for index, (chars, minimum) in enumerate(classes.values()):
+            if not minimum:
+                continue
+            tag = ord('A') + index
+            for c in chars:
+                tags[symbols[alphabet.index(c)]] = tag
+            self._minimum_tags.append((bytes([tag]), minimum))
+        self._tag_table = bytes(tags)
+        self._class_sizes = [(len(chars), minimum) for chars, minimum in classes.values() if minimum]
+
+    @property
+    def entropy_bits(self) -> float:
+        """熵（位）：log2(满足规则的密码个数)"""
+        length = self.policy.length
+        if not self._class_sizes:
+            return length * math.log2(len(self.alphabet))
+
+        # 指数生成函数: 个数 = L! * [x^L] 各类 sum_{j>=min} (size*x)^j/j! * e^(其余字符数*x)
+        def series(size, minimum):
+            return [Fraction(size ** j, math.factorial(j)) if j >= minimum else Fraction(0)
+                    for j in range(length + 1)]
+
+        product = series(len(self.alphabet) - sum(size for size, _ in self._class_sizes), 0)
+        for size, minimum in self._class_sizes:
+            factor = series(size, minimum)
+            product = [sum(product[i] * factor[k - i] for i in range(k + 1)) for k in range(length + 1)]
+        return math.log2(product[length] * math.factorial(length))
+
+    def _random_symbols(self, count: int) -> bytes:
+        """count 个均匀分布的字符（映射后的字节）"""
+        chunks = []
+        remaining = count
+        while remaining > 0:
+            block = os.urandom(int(remaining / self._acceptance * 1.02) + 64)
+            chunk = block.translate(self._table, self._reject)
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        data = b''.join(chunks)
+        return data[:count] if len(data) > count else data
+
+    def _rejected(self, data: bytes, length: int) -> set:
+        """不满足最少个数要求的候选密码下标"""
+        tags = data.translate(self._tag_table)
+        records = [tags[i:i + length] for i in range(0, len(tags), length)]
+        rejected = set()
+        for tag, minimum in self._minimum_tags:
+            if minimum == 1:
+                rejected |= {index for index, record in enumerate(records) if tag not in record}
+            else:
+                rejected |= {index for index, record in enumerate(records) if record.count(tag) < minimum}
+        return rejected
+
+    def generate_raw(self, count: int) -> List[bytes]:
+        """生成 count 个密码（映射后的字节串，ASCII 字母表时即为 ASCII 编码）"""
+        length = self.policy.length
+        passwords = []
+        acceptance = 1.0
+        while len(passwords) < count:
+            missing = count - len(passwords)
+            # 按上一轮的通过率多取一些候选，减少重取轮数
+            candidates_count = min(int(missing / acceptance * 1.1) + 1, max(missing * 64, 1024))
+            data = self._random_symbols(candidates_count * length)
+            candidates = [data[i:i + length] for i in range(0, len(data), length)]
+            if self._minimum_tags:
+                rejected = self._rejected(data, length)
+                if rejected:
+                    candidates = [candidate for index, candidate in enumerate(candidates)
+                                  if index not in rejected]
+                acceptance = max(len(candidates) / candidates_count, 1e-4)
+            passwords.extend(candidates[:missing])
+        return passwords
+
+    def generate(self, count: int = 1) -> List[str]:
+        """生成 count 个密码"""
+        raw = self.generate_raw(count)
+        text = b''.join(raw).decode('latin-1')
+        if not self._ascii:
+            text = text.translate(self._decode_table)
+        length = self.policy.length
+        return [text[i:i + length] for i in range(0, len(text), length)]
+
+    def generate_lines(self, count: int) -> bytes:
+        """生成 count 个密码，每行一个（UTF-8），用于命令行批量输出"""
+        if self._ascii:
+            return b'\n'.join(self.generate_raw(count)) + b'\n'
+        return ('\n'.join(self.generate(count)) + '\n').encode('utf-8')
+
+
+def generate_passwords(count: int, policy: Optional[PasswordPolicy] = None) -> List[str]:
+    """按规则批量生成密码"""
+    return BulkPasswordGenerator(policy).generate(count)
+
+
+CAPITALIZATION_MODES = ('lower', 'title', 'upper', 'random')
+# separator 为 'random' 时从中随机选一个
+RANDOM_SEPARATORS = '-_.,;:!@#$%^&*+=~'
+
+
+@dataclass(frozen=True)
+class PassphrasePolicy:
+    """密码短语规则
+
+    capitalization: lower 全小写、title 首字母大写、upper 全大写、random 每个词随机选择全小写或首字母大写
+    digits: 随机插入的数字个数（每个数字接在随机选中的词后面）
+    """
+    words: int = 6
+    language: str = 'en'
+    separator: str = '-'
+    capitalization: str = 'lower'
+    digits: int = 0
+
+
+class PassphraseGenerator:
+    """Diceware 风格的密码短语生成器（词表为内存映射文件，按下标随机取词）"""
+
+    def __init__(self, policy: Optional[PassphrasePolicy] = None):
+        from core.wordlist import get_wordlist
+        self.policy = policy or PassphrasePolicy()
+        if self.policy.words < 1:
+            raise ValueError("词数必须大于 0")
+        if self.policy.digits < 0:
+            raise ValueError("数字个数不能为负数")
+        if self.policy.capitalization not in CAPITALIZATION_MODES:
+            raise ValueError(f"不支持的大小写方式: {self.policy.capitalization}")
+        self.wordlist = get_wordlist(self.policy.language)
+
+    @property
+    def entropy_bits(self) -> float:
+        """熵（位），假设攻击者知道词表和规则"""
+        policy = self.policy
+        bits = policy.words * math.log2(len(self.wordlist))
+        if policy.capitalization == 'random':
+            bits += policy.words
+        if policy.separator == 'random':
+            bits += math.log2(len(RANDOM_SEPARATORS))
+        # 每个数字: 0-9 及接在哪个词后面（多个数字落在同一个词后时略有高估）
+        bits += policy.digits * math.log2(10 * policy.words)
+        return bits
+
+    def generate(self, count: int = 1) -> List[str]:
+        return [self._generate_one() for _ in range(count)]
+
+    def _generate_one(self) -> str:
+        policy = self.policy
+        size = len(self.wordlist)
+        words = [self.wordlist[secrets.randbelow(size)] for _ in range(policy.words)]
+
+        if policy.capitalization == 'title':
+            words = [word[:1].upper() + word[1:] for word in words]
+        elif policy.capitalization == 'upper':
+            words = [word.upper() for word in words]
+        elif policy.capitalization == 'random':
+            words = [word[:1].upper() + word[1:] if secrets.randbelow(2) else word for word in words]
+
+        for _ in range(policy.digits):
+            index = secrets.randbelow(len(words))
+            words[index] += str(secrets.randbelow(10))
+
+        separator = secrets.choice(RANDOM_SEPARATORS) if policy.separator == 'random' else policy.separator
+        return separator.join(words)
+
+
+def generate_passphrase(policy: Optional[PassphrasePolicy] = None) -> str:
+    """按规则生成一个密码短语"""
+    return PassphraseGenerator(policy).generate(1)[0]
 
 
 class PasswordGenerator:
     """密码生成器"""
 
     def __init__(self):
-        self.character_sets = {
-            'lowercase': string.ascii_lowercase,
-            'uppercase': string.ascii_uppercase,
-            'digits': string.digits,
-            'symbols': '!@#$%^&*()_+-=[]{}|;:,.<>?'
-        }
+        self.character_sets = dict(CHARACTER_SETS)
 
     def generate_password(self, length: int = 16,
                           use_uppercase: bool = True,
                           use_digits: bool = True,
                           use_symbols: bool = True) -> str:
-        """生成安全密码"""
-        characters = self.character_sets['lowercase']
-
-        if use_uppercase:
-            characters += self.character_sets['uppercase']
-        if use_digits:
-            characters += self.character_sets['digits']
-        if use_symbols:
-            characters += self.character_sets['symbols']
-
-        # 确保每种类型的字符至少有一个
-        password_chars = []
-        if use_uppercase:
-            password_chars.append(secrets.choice(self.character_sets['uppercase']))
-        if use_digits:
-            password_chars.append(secrets.choice(self.character_sets['digits']))
-        if use_symbols:
-            password_chars.append(secrets.choice(self.character_sets['symbols']))
-
-        # 填充剩余长度
-        remaining_length = length - len(password_chars)
-        if remaining_length > 0:
-            password_chars.extend(secrets.choice(characters) for _ in range(remaining_length))
-
-        # 随机打乱
-        secrets.SystemRandom().shuffle(password_chars)
-
-        return ''.join(password_chars)
+        """生成安全密码（每种启用的字符类型至少一个）"""
+        policy = PasswordPolicy(length=length, use_uppercase=use_uppercase, use_digits=use_digits,
+                                use_symbols=use_symbols, symbols=self.character_sets['symbols'],
+                                min_uppercase=int(use_uppercase), min_digits=int(use_digits),
+                                min_symbols=int(use_symbols))
+        return BulkPasswordGenerator(policy).generate(1)[0]
 
-    def check_password_strength(self, password: str) -> dict:
-        """检查密码强度"""
-        strength = {
-            'length': len(password) >= 8,
-            'uppercase': any(c.isupper() for c in password),
-            'lowercase': any(c.islower() for c in password),
-            'digit': any(c.isdigit() for c in password),
-            'symbol': any(not c.isalnum() for c in password)
-        }
-
-        score = sum(strength.values())
-        if score == 5:
-            level = "非常强"
-        elif score == 4:
-            level = "强"
-        elif score == 3:
-            level = "中等"
-        else:
-            level = "弱"
+    def generate_passwords(self, count: int, policy: Optional[PasswordPolicy] = None) -> List[str]:
+        """按规则批量生成密码"""
+        return generate_passwords(count, policy)
+
+    def generate_passphrase(self, policy: Optional[PassphrasePolicy] = None) -> str:
+        """生成密码短语"""
+        return generate_passphrase(policy)
 
-        return {
-            'score': score,
-            'level': level,
-            'details': strength
-        }
\ No newline at end of file
+    def check_password_strength(self, password: str) -> dict:
+        """检查密码强度（score 为 0-4，见 core.strength_estimator）"""
+        from core.strength_estimator import character_checks, estimate_strength
+        result = estimate_strength(password)
+        result['details'] = character_checks(password)
+        return result
\ No newline at end of file
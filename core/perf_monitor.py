@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 09:10
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 运行时性能指标收集（诊断面板使用）
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 进程启动的参考时间点，用于计算启动阶段的相对时间
+PROCESS_START = time.perf_counter()
+
+
+class PerfMonitor:
+    """性能监视器 - 收集耗时、计数、缓存命中率等运行指标"""
+
+    # 每个指标保留的最近样本数，用于计算 p50/p95
+    MAX_SAMPLES = 512
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=self.MAX_SAMPLES))
+        self._counts = defaultdict(int)
+        self._totals = defaultdict(float)
+        self._cache_hits = defaultdict(int)
+        self._cache_misses = defaultdict(int)
+        self._gauges = {}
+        self._phases = []
+
+    # ---------- 耗时指标 ----------
+
+    def record(self, category: str, name: str, seconds: float):
+        """记录一次耗时"""
+        key = f"{category}.{name}"
+        with self._lock:
+            self._samples[key].append(seconds)
+            self._counts[key] += 1
+            self._totals[key] += seconds
+
+    @contextmanager
+    def timed(self, category: str, name: str):
+        """计时上下文管理器"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(category, name, time.perf_counter() - start)
+
+    def track(self, category: str, name: Optional[str] = None):
+        """计时装饰器，默认使用函数名作为指标名"""
+        def decorator(func):
+            metric_name = name or func.__name__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(category, metric_name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    # ---------- 缓存与数值指标 ----------
+
+    def cache_hit(self, cache_name: str):
+        """记录缓存命中"""
+        with self._lock:
+            self._cache_hits[cache_name] += 1
+
+    def cache_miss(self, cache_name: str):
+        """记录缓存未命中"""
+        with self._lock:
+            self._cache_misses[cache_name] += 1
+
+    def set_value(self, name: str, value: Any):
+        """设置数值指标（如最近一次解锁的KDF耗时、已加载条目数）"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def get_value(self, name: str, default: Any = None) -> Any:
+        """获取数值指标"""
+        with self._lock:
+            return self._gauges.get(name, default)
+
+    # ---------- 启动阶段 ----------
+
+    def record_phase(self, name: str, start: float, end: float):
+        """记录启动阶段（perf_counter 时间点）"""
+        with self._lock:
+            self._phases.append({
+                'name': name,
+                'start_ms': round((start - PROCESS_START) * 1000, 2),
+                'duration_ms': round((end - start) * 1000, 2)
+            })
+
+    @contextmanager
+    def phase(self, name: str):
+        """启动阶段计时上下文管理器"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, start, time.perf_counter())
+
+    def get_phases(self) -> list:
+        """获取已记录的启动阶段"""
+        with self._lock:
+            return list(self._phases)
+
+    # ---------- 汇总 ----------
+
+    @staticmethod
+    def _percentile(sorted_values, percent: float) -> float:
+        """计算百分位数（最近邻法）"""
+        if not sorted_values:
+            return 0.0
+        index = min(len(sorted_values) - 1, int(round(percent / 100 * (len(sorted_values) - 1))))
+        return sorted_values[index]
+
+    def get_timings(self, category: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """获取耗时统计（毫秒），可按类别过滤"""
+        result = {}
+        with self._lock:
+            items = [(key, list(samples)) for key, samples in self._samples.items()]
+            counts = dict(self._counts)
+            totals = dict(self._totals)
+
+        for key, samples in items:
+            metric_category, _, metric_name = key.partition('.')
+            if category and metric_category != category:
+                continue
+            samples.sort()
+            count = counts.get(key, 0)
+            result[key if not category else metric_name] = {
+                'count': count,
+                'avg_ms': round(totals.get(key, 0.0) / count * 1000, 3) if count else 0.0,
+                'p50_ms': round(self._percentile(samples, 50) * 1000, 3),
+                'p95_ms': round(self._percentile(samples, 95) * 1000, 3),
+            }
+        return result
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取缓存命中率"""
+        with self._lock:
+            names = set(self._cache_hits) | set(self._cache_misses)
+            stats = {}
+            for name in names:
+                hits = self._cache_hits.get(name, 0)
+                misses = self._cache_misses.get(name, 0)
+                total = hits + misses
+                stats[name] = {
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_rate': round(hits / total, 4) if total else 0.0
+                }
+        return stats
+
+    @staticmethod
+    def get_rss_bytes() -> int:
+        """获取进程常驻内存（RSS），无法获取时返回0"""
+        try:
+            if sys.platform.startswith('linux'):
+                with open('/proc/self/statm', 'r') as f:
+                    pages = int(f.read().split()[1])
+                return pages * os.sysconf('SC_PAGE_SIZE')
+            if sys.platform == 'win32':
+                import ctypes
+                from ctypes import wintypes
+
+                class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                    _fields_ = [('cb', wintypes.DWORD),
+                                ('PageFaultCount', wintypes.DWORD),
+                                ('PeakWorkingSetSize', ctypes.c_size_t),
+                                ('WorkingSetSize', ctypes.c_size_t),
+                                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                                ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                                ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                                ('PagefileUsage', ctypes.c_size_t),
+                                ('PeakPagefileUsage', ctypes.c_size_t)]
+
+                counters = PROCESS_MEMORY_COUNTERS()
+                counters.cb = ctypes.sizeof(counters)
+                handle = ctypes.windll.kernel32.GetCurrentProcess()
+                if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                    return counters.WorkingSetSize
+                return 0
+            # macOS 等平台：ru_maxrss 为峰值（字节）
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except Exception as e:
+            logger.debug(f"获取内存占用失败: {e}")
+            return 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """生成完整的指标快照"""
+        with self._lock:
+            gauges = dict(self._gauges)
+        return {
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'uptime_s': round(time.perf_counter() - PROCESS_START, 3),
+            'platform': sys.platform,
+            'python': sys.version.split()[0],
+            'frozen': bool(getattr(sys, 'frozen', False)),
+            'rss_bytes': self.get_rss_bytes(),
+            'values': gauges,
+            'timings': self.get_timings(),
+            'caches': self.get_cache_stats(),
+            'startup_phases': self.get_phases(),
+        }
+
+    def export_snapshot(self, file_path: str) -> bool:
+        """导出指标快照为JSON文件"""
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(self.snapshot(), f, indent=2, ensure_ascii=False)
+            logger.info(f"性能快照已导出: {file_path}")
+            return True
+        except Exception as e:
+            logger.error(f"导出性能快照失败: {e}")
+            return False
+
+    def reset(self):
+        """清空耗时和缓存指标（保留启动阶段）"""
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._totals.clear()
+            self._cache_hits.clear()
+            self._cache_misses.clear()
+
+
+# 全局性能监视器实例
+_perf_monitor = None
+
+
+def get_perf_monitor():
+    """获取全局性能监视器实例"""
+    global _perf_monitor
+    if _perf_monitor is None:
+        _perf_monitor = PerfMonitor()
+    return _perf_monitor
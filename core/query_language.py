@@ -0,0 +1,536 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-20 01:20
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 按字段搜索的查询语言：解析、规划、编译为 SQL、在内存中求值
+"""
+搜索框和命令行 search 支持按字段查询，例如:
+
+    category:工作 user:alice site:git* updated:<2025-01-01 -notes:test
+
+语法:
+    词之间是"并且"，OR 表示"或者"（优先级低于并且），括号分组，词前加 - 表示排除
+    字段:值      网站名称、网址、用户名、备注为包含匹配；分类、域名为完整匹配
+    字段:值*     前缀匹配（走索引）
+    字段:=值     完整匹配（走索引）
+    日期/数字    updated:<2025-01-01、created:>=2024-06-01、used:>5，可用 < <= > >= =
+    相对日期     updated:<1y 表示一年前之前更新（即超过一年未更新），单位 d/w/m/y
+    不带字段的词 与普通搜索相同（网站名称、网址、备注、分类及拼音）
+    带空格的值用双引号："site:bank of america"
+
+字段: site(name)、url、user(username)、category(cat)、notes(note)、domain、updated、created、used
+
+网站名称按归一后的搜索键（utils/text_keys.py）匹配，不区分大小写和全角/半角，site:zs* 也会按拼音首字母
+匹配；其余列的前缀和完整匹配直接比较原值（与数据库索引一致）。
+
+查询先解析为语法树（Term / Not / And / Or），plan_query 按代价重排"并且"的各项：索引上的等值比较、
+索引上的范围（前缀、日期）、无索引的比较、包含匹配（LIKE '%..%'）、排除，便宜且能缩小范围的条件在前。
+compile_query 把规划后的语法树编译为带占位符的 WHERE 子句；evaluate 在内存中对记录求值
+（主窗口的内存索引、元数据加密时解密后的确认），两者结果一致。
+
+元数据加密时网站名称、网址、用户名和备注是密文：包含匹配改为查盲索引（结果是超集），用户名无法在
+SQL 中过滤，编译结果标记为不精确，由数据库管理器解密后再用 evaluate 确认。
+"""
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+from models.password_entry import PasswordEntry
+from utils.text_keys import normalize, normalize_query
+from utils.validators import registrable_domain
+
+logger = logging.getLogger(__name__)
+
+FIELD_ALIASES = {
+    'site': 'website_name', 'name': 'website_name',
+    'url': 'url',
+    'user': 'username', 'username': 'username',
+    'category': 'category', 'cat': 'category',
+    'notes': 'notes', 'note': 'notes',
+    'domain': 'domain',
+    'updated': 'updated_at',
+    'created': 'created_at',
+    'used': 'usage_count',
+}
+# 不带 * 和 = 时按完整值匹配的列
+EXACT_FIELDS = ('category', 'domain')
+DATE_FIELDS = ('updated_at', 'created_at')
+NUMBER_FIELDS = ('usage_count',)
+# 有索引的列（website_name 的比较走 search_key / pinyin_initials）
+INDEXED_FIELDS = ('website_name', 'username', 'category', 'domain', 'updated_at')
+# 元数据加密时存为密文的列
+ENCRYPTED_FIELDS = ('website_name', 'url', 'username', 'notes')
+
+OPERATORS = ('<=', '>=', '<', '>', '=')
+SQL_OPERATORS = {'lt': '<', 'le': '<', 'gt': '>=', 'ge': '>=', 'eq': '='}
+COMPARISONS = {'<=': 'le', '>=': 'ge', '<': 'lt', '>': 'gt', '=': 'eq'}
+RELATIVE_UNITS = {'d': 1, 'w': 7, 'm': 30, 'y': 365}
+LIKE_ESCAPE = '!'
+
+# 规划代价，越小越靠前
+COST_INDEX_EQ = 0
+COST_INDEX_RANGE = 1
+COST_SCAN_COMPARE = 2
+COST_CONTAINS = 3
+COST_NEGATION = 4
+
+_RELATIVE_DATE = re.compile(r'^(\d+)([dwmy])$')
+_ABSOLUTE_DATE = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})$')
+_FIELD_PREFIX = re.compile(r'(?:^|[\s(])-?(' + '|'.join(FIELD_ALIASES) + r'):', re.IGNORECASE)
+
+
+class QuerySyntaxError(ValueError):
+    """查询语法错误"""
+
+
+@dataclass(frozen=True)
+class Term:
+    """一个匹配条件，field 为 None 时是不带字段的词
+
+    op: contains / prefix / eq / lt / le / gt / ge
+    """
+    field: Optional[str]
+    op: str
+    value: str
+
+
+@dataclass(frozen=True)
+class Not:
+    child: 'Node'
+
+
+@dataclass(frozen=True)
+class And:
+    children: Tuple['Node', ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    children: Tuple['Node', ...]
+
+
+Node = Union[Term, Not, And, Or]
+
+
+@dataclass
+class CompiledQuery:
+    """编译结果：WHERE 子句（可能为空）、参数，以及结果是否精确（否则需要 evaluate 确认）"""
+    where: str
+    params: list
+    exact: bool = True
+
+
+# ---------- 词法与语法分析 ----------
+
+def tokenize(text: str) -> List[str]:
+    """切分为词、'('、')'、'-'（紧跟在词或括号前的排除符号）；双引号内的空白属于同一个词"""
+    tokens = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char.isspace():
+            i += 1
+        elif char in '()':
+            tokens.append(char)
+            i += 1
+        elif char == '-' and i + 1 < len(text) and not text[i + 1].isspace():
+            tokens.append('-')
+            i += 1
+        else:
+            word = []
+            quoted = False
+            while i < len(text) and (quoted or not (text[i].isspace() or text[i] in '()')):
+                if text[i] == '"':
+                    quoted = not quoted
+                else:
+                    word.append(text[i])
+                i += 1
+            if quoted:
+                raise QuerySyntaxError("引号没有闭合")
+            tokens.append(''.join(word))
+    return tokens
+
+
+def parse_query(text: str) -> Node:
+    """解析查询文本为语法树"""
+    parser = _Parser(tokenize(text))
+    node = parser.parse_or()
+    if parser.peek() is not None:
+        raise QuerySyntaxError(f"多余的 {parser.peek()!r}")
+    return node
+
+
+def parse_search(text: str) -> Optional[Node]:
+    """搜索框/命令行的输入：按字段的查询返回语法树，普通关键字返回 None（走原来的搜索）"""
+    if not text or not text.strip():
+        return None
+    try:
+        node = parse_query(text)
+    except QuerySyntaxError:
+        # 没有使用字段的输入（如不成对的引号）按普通关键字处理
+        if _FIELD_PREFIX.search(text):
+            raise
+        return None
+    return node if is_structured(node) else None
+
+
+def is_structured(node: Node) -> bool:
+    """是否用到了字段、排除或 OR（只有普通词时与原来的关键字搜索相同）"""
+    if isinstance(node, Term):
+        return node.field is not None
+    if isinstance(node, And):
+        return any(is_structured(child) for child in node.children)
+    return True
+
+
+class _Parser:
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self) -> str:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse_or(self) -> Node:
+        children = [self.parse_and()]
+        while self.peek() == 'OR':
+            self.take()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else Or(tuple(children))
+
+    def parse_and(self) -> Node:
+        children = []
+        while self.peek() not in (None, ')', 'OR'):
+            children.append(self.parse_unary())
+        if not children:
+            raise QuerySyntaxError("缺少搜索条件")
+        return children[0] if len(children) == 1 else And(tuple(children))
+
+    def parse_unary(self) -> Node:
+        token = self.take()
+        if token == '-':
+            if self.peek() in (None, ')', 'OR'):
+                raise QuerySyntaxError("- 后面缺少搜索条件")
+            return Not(self.parse_unary())
+        if token == '(':
+            node = self.parse_or()
+            if self.peek() != ')':
+                raise QuerySyntaxError("括号没有闭合")
+            self.take()
+            return node
+        if token == ')':
+            raise QuerySyntaxError("多余的 )")
+        return parse_term(token)
+
+
+def parse_term(word: str) -> Term:
+    """解析单个词：字段:运算符值"""
+    name, separator, value = word.partition(':')
+    field = FIELD_ALIASES.get(name.casefold()) if separator else None
+    if field is None:
+        # 不是已知字段（如网址 https://...）时整体作为普通词
+        return Term(None, 'contains', word)
+    if not value:
+        raise QuerySyntaxError(f"{name}: 后面缺少值")
+
+    if field in DATE_FIELDS or field in NUMBER_FIELDS:
+        op = 'eq'
+        for operator in OPERATORS:
+            if value.startswith(operator):
+                op, value = COMPARISONS[operator], value[len(operator):]
+                break
+        if field in DATE_FIELDS:
+            resolve_date(value)
+        elif not value.isdigit():
+            raise QuerySyntaxError(f"{name}: 的值必须是整数: {value}")
+        return Term(field, op, value)
+
+    if value.startswith('='):
+        op, value = 'eq', value[1:]
+    elif value.endswith('*') and '*' not in value[:-1]:
+        op, value = 'prefix', value[:-1]
+    else:
+        op = 'eq' if field in EXACT_FIELDS else 'contains'
+    if not value:
+        raise QuerySyntaxError(f"{name}: 后面缺少值")
+    return Term(field, op, value)
+
+
+def resolve_date(value: str, today: date = None) -> date:
+    """2025-01-01 或相对日期 30d / 2w / 6m / 1y（今天往前推）"""
+    match = _ABSOLUTE_DATE.match(value)
+    if match:
+        try:
+            return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        except ValueError:
+            raise QuerySyntaxError(f"无效的日期: {value}") from None
+    match = _RELATIVE_DATE.match(value)
+    if match:
+        return (today or date.today()) - timedelta(days=int(match.group(1)) * RELATIVE_UNITS[match.group(2)])
+    raise QuerySyntaxError(f"无效的日期（应为 2025-01-01 或 30d、6m、1y）: {value}")
+
+
+def _date_range(term: Term, today: date = None) -> Tuple[datetime, datetime]:
+    """日期条件对应的一天 [开始, 结束)"""
+    day = resolve_date(term.value, today)
+    start = datetime(day.year, day.month, day.day)
+    return start, start + timedelta(days=1)
+
+
+def is_relative(node: Node) -> bool:
+    """是否包含相对日期（结果随时间变化）"""
+    if isinstance(node, Term):
+        return node.field in DATE_FIELDS and bool(_RELATIVE_DATE.match(node.value))
+    if isinstance(node, Not):
+        return is_relative(node.child)
+    return any(is_relative(child) for child in node.children)
+
+
+# ---------- 规划 ----------
+
+def cost(node: Node) -> int:
+    """条件的代价：能走索引、能缩小范围的在前"""
+    if isinstance(node, Term):
+        if node.field in INDEXED_FIELDS and node.op == 'eq':
+            return COST_INDEX_EQ
+        if node.field in INDEXED_FIELDS and node.op != 'contains':
+            return COST_INDEX_RANGE
+        if node.field in DATE_FIELDS or node.field in NUMBER_FIELDS:
+            return COST_SCAN_COMPARE
+        return COST_CONTAINS
+    if isinstance(node, Not):
+        return COST_NEGATION
+    if isinstance(node, Or):
+        # 各分支都走索引时可以按索引合并
+        return max(cost(child) for child in node.children)
+    return min(cost(child) for child in node.children)
+
+
+def plan_query(node: Node) -> Node:
+    """展开嵌套的并且/或者、消去双重否定，并按代价重排"并且"的各项（稳定排序）"""
+    if isinstance(node, Term):
+        return node
+    if isinstance(node, Not):
+        child = plan_query(node.child)
+        return child.child if isinstance(child, Not) else Not(child)
+    children = []
+    for child in (plan_query(child) for child in node.children):
+        children.extend(child.children if type(child) is type(node) else (child,))
+    if isinstance(node, And):
+        return And(tuple(sorted(children, key=cost)))
+    return Or(tuple(children))
+
+
+def explain(node: Node, indent: int = 0) -> List[str]:
+    """规划结果的文字说明（命令行 search --explain）"""
+    prefix = '  ' * indent
+    if isinstance(node, Term):
+        labels = {COST_INDEX_EQ: '索引等值', COST_INDEX_RANGE: '索引范围', COST_SCAN_COMPARE: '比较',
+                  COST_CONTAINS: '包含'}
+        field = node.field or '(关键字)'
+        return [f"{prefix}{labels[cost(node)]}  {field} {node.op} {node.value!r}"]
+    if isinstance(node, Not):
+        return [f"{prefix}排除"] + explain(node.child, indent + 1)
+    title = '并且' if isinstance(node, And) else '或者'
+    return [f"{prefix}{title}"] + [line for child in node.children for line in explain(child, indent + 1)]
+
+
+# ---------- 编译为 SQL ----------
+
+def escape_like(value: str) -> str:
+    return (value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace('%', LIKE_ESCAPE + '%')
+            .replace('_', LIKE_ESCAPE + '_'))
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """前缀范围的上界：以 prefix 开头的字符串都满足 prefix <= s < 上界"""
+    return prefix + '\U0010ffff'
+
+
+def compile_query(node: Node, placeholder: str = '?', encrypted: bool = False,
+                  blind_tokens: Callable[[str], Sequence[str]] = None,
+                  domain_token: Callable[[str], Optional[str]] = None,
+                  today: date = None) -> CompiledQuery:
+    """把（规划后的）语法树编译为 WHERE 子句
+
+    encrypted 为 True 时按元数据加密的列编译：blind_tokens(关键字) 返回盲索引令牌，
+    domain_token(域名) 返回 domain 列中的令牌。
+    """
+    compiler = _Compiler(placeholder, encrypted, blind_tokens, domain_token, today)
+    result = compiler.compile(node)
+    if result is None:
+        return CompiledQuery('', [], exact=False)
+    where, params, exact = result
+    return CompiledQuery(where, params, exact)
+
+
+class _Compiler:
+    def __init__(self, placeholder, encrypted, blind_tokens, domain_token, today):
+        self.placeholder = placeholder
+        self.encrypted = encrypted
+        self.blind_tokens = blind_tokens
+        self.domain_token = domain_token
+        self.today = today
+
+    def compile(self, node: Node) -> Optional[Tuple[str, list, bool]]:
+        """返回 (SQL, 参数, 是否精确)，None 表示无法在 SQL 中表达（需要全部取出后求值）"""
+        if isinstance(node, Term):
+            return self.compile_term(node)
+        if isinstance(node, Not):
+            child = self.compile(node.child)
+            # 超集取反不再是超集
+            if child is None or not child[2]:
+                return None
+            # 列为 NULL 时条件的值为 NULL，按不满足处理（与 evaluate 一致）
+            return f"NOT COALESCE(({child[0]}), 0)", child[1], True
+        parts = [self.compile(child) for child in node.children]
+        if isinstance(node, Or):
+            if any(part is None for part in parts):
+                return None
+            return (' OR '.join(f"({sql})" for sql, _, _ in parts), [p for _, params, _ in parts for p in params],
+                    all(exact for _, _, exact in parts))
+        # 并且：无法表达的项去掉（结果为超集）
+        known = [part for part in parts if part is not None]
+        if not known:
+            return None
+        return (' AND '.join(f"({sql})" for sql, _, _ in known), [p for _, params, _ in known for p in params],
+                len(known) == len(parts) and all(exact for _, _, exact in known))
+
+    def compile_term(self, term: Term) -> Optional[Tuple[str, list, bool]]:
+        ph = self.placeholder
+        field, op, value = term.field, term.op, term.value
+
+        if field in DATE_FIELDS:
+            start, end = _date_range(term, self.today)
+            bound = {'lt': start, 'le': end, 'gt': end, 'ge': start}
+            if op == 'eq':
+                return (f"{field} >= {ph} AND {field} < {ph}",
+                        [_timestamp(start), _timestamp(end)], True)
+            return f"{field} {SQL_OPERATORS[op]} {ph}", [_timestamp(bound[op])], True
+        if field in NUMBER_FIELDS:
+            operator = {'lt': '<', 'le': '<=', 'gt': '>', 'ge': '>=', 'eq': '='}[op]
+            return f"COALESCE({field}, 0) {operator} {ph}", [int(value)], True
+
+        if self.encrypted and (field is None or field in ENCRYPTED_FIELDS or field == 'domain'):
+            return self.compile_encrypted(term)
+
+        if field is None:
+            # 与 DatabaseManager.search_entries 的范围相同
+            pattern = f"%{escape_like(value)}%"
+            key_pattern = f"%{escape_like(normalize_query(value))}%"
+            columns = ['website_name', 'url', 'notes', 'category']
+            sql = ' OR '.join([f"{column} LIKE {ph} ESCAPE '{LIKE_ESCAPE}'" for column in columns]
+                              + [f"{column} LIKE {ph} ESCAPE '{LIKE_ESCAPE}'"
+                                 for column in ('search_key', 'pinyin_full', 'pinyin_initials')])
+            return sql, [pattern] * len(columns) + [key_pattern] * 3, True
+
+        if field == 'website_name':
+            key = normalize_query(value)
+            if op == 'eq':
+                return f"search_key = {ph}", [key], True
+            if op == 'prefix':
+                upper = prefix_upper_bound(key)
+                return (f"(search_key >= {ph} AND search_key < {ph}) OR "
+                        f"(pinyin_initials >= {ph} AND pinyin_initials < {ph})", [key, upper, key, upper], True)
+            pattern = f"%{escape_like(key)}%"
+            return (' OR '.join(f"{column} LIKE {ph} ESCAPE '{LIKE_ESCAPE}'"
+                                for column in ('search_key', 'pinyin_full', 'pinyin_initials')),
+                    [pattern] * 3, True)
+
+        if field == 'domain':
+            value = (registrable_domain(value) or value.casefold()) if op == 'eq' else value.casefold()
+        if op == 'eq':
+            return f"{field} = {ph}", [value], True
+        if op == 'prefix':
+            if field in INDEXED_FIELDS:
+                return f"{field} >= {ph} AND {field} < {ph}", [value, prefix_upper_bound(value)], True
+            return f"{field} LIKE {ph} ESCAPE '{LIKE_ESCAPE}'", [f"{escape_like(value)}%"], True
+        return f"COALESCE({field}, '') LIKE {ph} ESCAPE '{LIKE_ESCAPE}'", [f"%{escape_like(value)}%"], True
+
+    def compile_encrypted(self, term: Term) -> Optional[Tuple[str, list, bool]]:
+        ph = self.placeholder
+        if term.field == 'domain':
+            if term.op != 'eq' or self.domain_token is None:
+                return None
+            token = self.domain_token(registrable_domain(term.value) or term.value.casefold())
+            return f"domain = {ph}", [token], True
+        if term.field == 'username' or self.blind_tokens is None:
+            return None
+        tokens = list(self.blind_tokens(term.value))
+        if not tokens:
+            return None
+        placeholders = ', '.join([ph] * len(tokens))
+        return (f"id IN (SELECT entry_id FROM blind_index WHERE token IN ({placeholders}) "
+                f"GROUP BY entry_id HAVING COUNT(*) = {len(tokens)})", tokens, False)
+
+
+def _timestamp(value: datetime) -> str:
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+# ---------- 内存中求值 ----------
+
+def evaluate(node: Node, entry: PasswordEntry, today: date = None) -> bool:
+    """记录是否满足条件（与 compile_query 的 SQL 语义一致）"""
+    if isinstance(node, Term):
+        return _evaluate_term(node, entry, today)
+    if isinstance(node, Not):
+        return not evaluate(node.child, entry, today)
+    if isinstance(node, And):
+        return all(evaluate(child, entry, today) for child in node.children)
+    return any(evaluate(child, entry, today) for child in node.children)
+
+
+def _name_keys(entry: PasswordEntry) -> Tuple[str, str, str]:
+    search_key = entry.search_key if entry.search_key is not None else normalize(entry.website_name)
+    return search_key, entry.pinyin_full or '', entry.pinyin_initials or ''
+
+
+def _evaluate_term(term: Term, entry: PasswordEntry, today: date = None) -> bool:
+    field, op, value = term.field, term.op, term.value
+
+    if field in DATE_FIELDS:
+        stored = getattr(entry, field)
+        if stored is None:
+            return False
+        start, end = _date_range(term, today)
+        return {'lt': stored < start, 'le': stored < end, 'gt': stored >= end, 'ge': stored >= start,
+                'eq': start <= stored < end}[op]
+    if field in NUMBER_FIELDS:
+        stored, number = getattr(entry, field) or 0, int(value)
+        return {'lt': stored < number, 'le': stored <= number, 'gt': stored > number, 'ge': stored >= number,
+                'eq': stored == number}[op]
+
+    if field is None:
+        keyword = normalize_query(value)
+        return (any(keyword in normalize(getattr(entry, column))
+                    for column in ('website_name', 'url', 'notes', 'category'))
+                or any(keyword in key for key in _name_keys(entry)))
+
+    if field == 'website_name':
+        key = normalize_query(value)
+        search_key, pinyin_full, pinyin_initials = _name_keys(entry)
+        if op == 'eq':
+            return search_key == key
+        if op == 'prefix':
+            return search_key.startswith(key) or pinyin_initials.startswith(key)
+        return key in search_key or key in pinyin_full or key in pinyin_initials
+
+    stored = getattr(entry, field) or ''
+    if field == 'domain':
+        value = (registrable_domain(value) or value.casefold()) if op == 'eq' else value.casefold()
+    if op == 'eq':
+        return stored == value
+    if op == 'prefix':
+        return stored.startswith(value)
+    # LIKE 不区分大小写
+    return normalize(value) in normalize(stored)
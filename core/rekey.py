@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-20 03:50
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 修改主密码时重新加密所有记录
+"""
+修改主密码时，每条记录的密码用新主密码重新加密，密码指纹和（开启了元数据加密时）名称、网址、用户名、
+备注及盲索引令牌改用新主密码派生的子密钥。
+
+所有记录在同一个事务中写回：
+    - 取消时回滚，主密码保持不变；
+    - 开启了元数据加密时，任何一条记录失败都会回滚并恢复原来的元数据密钥。否则未写回的记录
+      仍是旧密钥加密的元数据，切换到新密钥后无法解密，盲索引也对不上；
+    - 未开启元数据加密时，密码无法解密的记录跳过（保留原样），其余记录照常提交。
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RekeyError(Exception):
+    """重新加密失败，所有修改已回滚"""
+
+
+@dataclass
+class RekeyResult:
+    """重新加密结果"""
+    total: int
+    reencrypted: int = 0
+    failed: List[str] = field(default_factory=list)
+    # 新主密码派生的子密钥（派生失败时为 None，指纹在之后补全）
+    vault_keys: Optional[Dict[str, bytes]] = None
+    canceled: bool = False
+
+
+def reencrypt_entries(database_manager, encryption_manager, current_password: str, new_password: str,
+                      progress: Optional[Callable[[int, int], None]] = None,
+                      is_canceled: Optional[Callable[[], bool]] = None) -> RekeyResult:
+    """用新主密码重新加密所有记录并提交
+
+    取消时回滚并返回 canceled=True；开启了元数据加密且有记录失败时回滚并抛出 RekeyError。
+    """
+    entries = database_manager.search_entries()
+    result = RekeyResult(len(entries))
+    metadata_encrypted = database_manager.is_metadata_encrypted()
+
+    # 指纹密钥由主密码派生，修改主密码后需要用新密钥重新计算所有指纹
+    try:
+        result.vault_keys = encryption_manager.derive_vault_keys(new_password, database_manager.get_vault_salt())
+    except Exception as e:
+        if metadata_encrypted:
+            raise RekeyError(f"无法派生新的元数据加密密钥: {e}")
+        logger.error(f"派生新的指纹密钥失败，指纹将在之后补全: {e}")
+    fingerprint_key = result.vault_keys['fingerprint'] if result.vault_keys else None
+
+    # 写回的记录改用新主密码派生的元数据密钥加密，失败时恢复
+    old_metadata_crypto = database_manager.metadata_crypto
+    if result.vault_keys:
+        database_manager.set_metadata_keys(result.vault_keys)
+
+    def abort():
+        database_manager.rollback()
+        database_manager.metadata_crypto = old_metadata_crypto
+
+    for done, entry in enumerate(entries, 1):
+        if is_canceled and is_canceled():
+            abort()
+            result.canceled = True
+            result.reencrypted = 0
+            logger.info("修改主密码已取消，所有修改已回滚")
+            return result
+
+        try:
+            password = encryption_manager.decrypt(entry.encrypted_password, current_password)
+            entry.encrypted_password = encryption_manager.encrypt(password, new_password)
+            entry.password_fingerprint = (encryption_manager.fingerprint(password, fingerprint_key)
+                                          if fingerprint_key else None)
+            # 记录写失败时 update_entry 已回滚整个事务，不能再跳过
+            if not database_manager.update_entry(entry, touch=False, commit=False):
+                abort()
+                raise RekeyError(f"写入记录 {entry.website_name} 失败，所有修改已回滚")
+        except RekeyError:
+            raise
+        except Exception as e:
+            logger.error(f"重新加密记录 {entry.website_name} 失败: {e}")
+            if metadata_encrypted:
+                abort()
+                raise RekeyError(f"记录 {entry.website_name} 无法重新加密，所有修改已回滚: {e}")
+            result.failed.append(entry.website_name)
+        else:
+            result.reencrypted += 1
+
+        if progress:
+            progress(done, result.total)
+
+    database_manager.commit()
+    logger.info(f"重新加密完成: {result.reencrypted}/{result.total}，失败 {len(result.failed)}")
+    return result
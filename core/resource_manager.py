@@ -8,13 +8,20 @@
 import os
 import sys
 from pathlib import Path
+import logging
+from core.perf_monitor import get_perf_monitor
+
+logger = logging.getLogger(__name__)
+perf_monitor = get_perf_monitor()
+
+
 class ResourceManager:
     """资源管理器"""
 
     def __init__(self, base_path=None):
         self.base_path = base_path or self.get_base_path()
         self.resource_cache = {}
-        print(f"资源管理器初始化，基础路径: {self.base_path}")
+        logger.debug(f"资源管理器初始化，基础路径: {self.base_path}")
 
     def get_base_path(self):
         """获取项目根目录路径"""
@@ -66,7 +73,7 @@ class ResourceManager:
                 return exe_path
 
         # 如果都没找到，返回None
-        print(f"警告: 未找到资源文件: {relative_path}")
+        logger.warning(f"未找到资源文件: {relative_path}")
         return None
 
     def load_resource(self, relative_path):
@@ -74,7 +81,9 @@ class ResourceManager:
         cache_key = relative_path
 
         if cache_key in self.resource_cache:
+            perf_monitor.cache_hit('resource')
             return self.resource_cache[cache_key]
+        perf_monitor.cache_miss('resource')
 
         resource_path = self.get_resource_path(relative_path)
         if resource_path:
@@ -82,10 +91,10 @@ class ResourceManager:
                 with open(resource_path, 'r', encoding='utf-8') as f:
                     content = f.read()
                     self.resource_cache[cache_key] = content
-                    print(f"资源文件加载成功: {relative_path}")
+                    logger.debug(f"资源文件加载成功: {relative_path}")
                     return content
             except Exception as e:
-                print(f"加载资源文件失败: {relative_path}, 错误: {e}")
+                logger.error(f"加载资源文件失败: {relative_path}, 错误: {e}")
                 return None
         else:
             return None
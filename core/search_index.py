@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 23:10
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 解锁期间的内存搜索索引
+"""
+解锁后把所有记录读入一次，之后主窗口的列表和搜索都在内存中完成，不再查询数据库
+（元数据加密或 MySQL 远程数据库时每次搜索都要解密或走网络）。
+
+存储按列组织：每一行对应一条记录，website_name / url / username / category / notes
+各占一列，保存归一（NFKC、小写）后的字符串；另有一列合并后的文本用于最终的子串比较，
+其中还包含网站名称的全拼和首字母（utils/text_keys.py），与数据库的搜索范围一致。
+列表按排序键（汉字按拼音）排序。
+删除或修改时只把旧行标记为空，新内容追加到末尾，空行过多时整体重建。
+
+倒排索引为 三字符片段 -> 行号数组（行号递增，array('I') 保存）。关键字不少于 3 个字符时
+取其片段中行数最少的一个作为候选，再逐行做子串比较；1~2 个字符的关键字直接扫描合并列。
+
+ranked_search 在子串匹配之外加入容错匹配（core.fuzzy_search），按匹配质量和使用次数排序；
+容错索引的构建较慢（10 万条记录约一到数秒），可以在后台线程中构建：begin_fuzzy_build 取出记录快照，
+后台线程调用 FuzzyIndex.build，完成后在主线程调用 finish_fuzzy_build 安装，期间的增删改先记下，
+安装时补上；构建完成前 ranked_search 只做子串匹配。没有后台构建时在第一次使用时构建。
+
+query 按查询语言（core.query_language）过滤：规划后的条件中不带字段的词用倒排索引取候选行，
+其余条件逐行求值，与 DatabaseManager.query_entries 的结果一致。
+
+智能文件夹（core.smart_folders）的成员集合挂在索引上，随 upsert / remove 增量更新。
+
+索引里保存了解锁后的完整记录（含密文），锁定时必须丢弃。
+"""
+import logging
+from array import array
+from typing import Dict, Iterable, List, Optional, Set
+
+from core.fuzzy_search import FuzzyIndex, rank_entries
+from core.query_language import And, Term, evaluate, parse_query, plan_query
+from core.smart_folders import SmartFolder, SmartFolderIndex
+from models.password_entry import PasswordEntry
+from utils.text_keys import apply_text_keys, entry_sort_key, normalize
+
+logger = logging.getLogger(__name__)
+
+# 参与搜索的列（在 search_entries 的基础上加入用户名）
+SEARCH_FIELDS = ('website_name', 'url', 'username', 'category', 'notes')
+# 只参与合并列匹配的拼音列
+PINYIN_FIELDS = ('pinyin_full', 'pinyin_initials')
+GRAM_SIZE = 3
+# 合并列中字段之间的分隔符（不会出现在搜索框输入的关键字中）
+FIELD_SEPARATOR = '\x1f'
+# 空行数超过该值且超过有效行数时重建
+MIN_COMPACT_ROWS = 64
+
+
+def trigrams(text: str):
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class SearchIndex:
+    """列式存储 + 三字符片段倒排索引"""
+
+    def __init__(self):
+        self._entries: List[Optional[PasswordEntry]] = []
+        self._columns: Dict[str, List[Optional[str]]] = {field: [] for field in SEARCH_FIELDS}
+        self._haystack: List[Optional[str]] = []
+        # 每行的排序键（写入时计算一次，排序时直接取用）
+        self._sort_keys: List[Optional[tuple]] = []
+        self._postings: Dict[str, array] = {}
+        self._row_of: Dict[int, int] = {}
+        self._dead_rows = 0
+        # 按排序键排序的有效行号，修改后重新计算
+        self._sorted_rows: Optional[List[int]] = None
+        self._fuzzy: Optional[FuzzyIndex] = None
+        # 后台构建容错索引期间的增删改 [(记录, 记录ID)]，记录为 None 表示删除；不在构建中时为 None
+        self._fuzzy_changes: Optional[list] = None
+        self._folders = SmartFolderIndex()
+
+    @classmethod
+    def build(cls, entries: Iterable[PasswordEntry], fuzzy: bool = True) -> 'SearchIndex':
+        """由记录构建索引，entries 可以是 iter_entries() 产生的批次
+
+        fuzzy 为 False 时不构建容错索引（之后在后台构建，或在第一次 ranked_search 时构建）
+        """
+        index = cls()
+        for item in entries:
+            for entry in (item if isinstance(item, list) else [item]):
+                index._append(entry)
+        if fuzzy:
+            index._fuzzy = FuzzyIndex.build(index._live_entries())
+        return index
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, entry_id: int) -> bool:
+        return entry_id in self._row_of
+
+    def get(self, entry_id: int) -> Optional[PasswordEntry]:
+        row = self._row_of.get(entry_id)
+        return self._entries[row] if row is not None else None
+
+    def upsert(self, entry: PasswordEntry):
+        """新增或修改一条记录"""
+        self._remove_row(entry.id)
+        self._append(entry)
+        if self._fuzzy is not None:
+            self._fuzzy.add(entry)
+        elif self._fuzzy_changes is not None:
+            self._fuzzy_changes.append((entry, entry.id))
+        self._folders.update(entry)
+        self._maybe_compact()
+
+    def remove(self, entry_id: int):
+        """删除一条记录"""
+        if self._remove_row(entry_id):
+            if self._fuzzy is not None:
+                self._fuzzy.remove(entry_id)
+            elif self._fuzzy_changes is not None:
+                self._fuzzy_changes.append((None, entry_id))
+            self._folders.remove(entry_id)
+            self._maybe_compact()
+
+    def search(self, keyword: str = '', limit: int = None,
+               fields: Iterable[str] = None) -> List[PasswordEntry]:
+        """与 DatabaseManager.search_entries 相同：按排序键排序，关键字为空时返回全部
+
+        fields 指定时只在这些列中匹配（取值见 SEARCH_FIELDS）
+        """
+        rows = self._sorted()
+        keyword = normalize(keyword)
+        if keyword:
+            rows = self._ordered(self._match(keyword, fields))
+        if limit:
+            rows = rows[:limit]
+        return [self._entries[row] for row in rows]
+
+    def ranked_search(self, keyword: str, limit: int = None) -> List[PasswordEntry]:
+        """子串匹配加容错匹配，按匹配质量和使用次数排序（关键字为空时同 search）"""
+        normalized = normalize(keyword)
+        if not normalized:
+            return self.search('', limit)
+        entries = [self._entries[row] for row in self._match(normalized)]
+        matched_ids = {entry.id for entry in entries}
+        fuzzy = self.fuzzy_index()
+        distances = fuzzy.lookup(keyword) if fuzzy is not None else {}
+        entries.extend(self._entries[self._row_of[entry_id]] for entry_id in distances
+                       if entry_id not in matched_ids and entry_id in self._row_of)
+        entries = rank_entries(keyword, entries, distances)
+        return entries[:limit] if limit else entries
+
+    def query(self, query, limit: int = None) -> List[PasswordEntry]:
+        """按查询语言搜索，query 为查询文本或语法树，按排序键排序（语法错误时抛出 QuerySyntaxError）"""
+        node = plan_query(parse_query(query) if isinstance(query, str) else query)
+        rows = self._sorted()
+        # "并且"中不带字段的词（不少于 3 个字符）必须匹配，先用倒排索引缩小范围
+        terms = node.children if isinstance(node, And) else (node,)
+        keywords = [normalize(term.value) for term in terms
+                    if isinstance(term, Term) and term.field is None and len(term.value) >= GRAM_SIZE]
+        if keywords:
+            rows = self._ordered(self._match(keywords[0]))
+        entries = [self._entries[row] for row in rows if evaluate(node, self._entries[row])]
+        return entries[:limit] if limit else entries
+
+    def set_smart_folders(self, folders: Iterable[SmartFolder]):
+        """设置智能文件夹并计算成员（替换原有的文件夹）"""
+        self._folders = SmartFolderIndex.build(folders, self._live_entries())
+
+    def add_smart_folder(self, folder: SmartFolder):
+        """新增或替换一个智能文件夹（查询语法错误时抛出 QuerySyntaxError）"""
+        self._folders.add_folder(folder, self._live_entries())
+
+    def remove_smart_folder(self, name: str):
+        self._folders.remove_folder(name)
+
+    @property
+    def smart_folders(self) -> SmartFolderIndex:
+        return self._folders
+
+    def folder_entries(self, name: str, limit: int = None) -> List[PasswordEntry]:
+        """智能文件夹中的记录，按排序键排序（直接取物化的成员，不执行查询）"""
+        members = self.folder_members(name)
+        rows = self._ordered({self._row_of[entry_id] for entry_id in members if entry_id in self._row_of})
+        if limit:
+            rows = rows[:limit]
+        return [self._entries[row] for row in rows]
+
+    def folder_members(self, name: str) -> Set[int]:
+        return self._folders.members(name, self._live_entries)
+
+    def folder_counts(self) -> Dict[str, int]:
+        return self._folders.counts(self._live_entries)
+
+    def fuzzy_index(self) -> Optional[FuzzyIndex]:
+        """容错索引（后台构建尚未完成时为 None）"""
+        if self._fuzzy is None and self._fuzzy_changes is None:
+            self._fuzzy = FuzzyIndex.build(self._live_entries())
+        return self._fuzzy
+
+    @property
+    def fuzzy_ready(self) -> bool:
+        return self._fuzzy is not None
+
+    def begin_fuzzy_build(self) -> List[PasswordEntry]:
+        """开始后台构建容错索引，返回交给 FuzzyIndex.build 的记录快照"""
+        self._fuzzy = None
+        self._fuzzy_changes = []
+        return self._live_entries()
+
+    def finish_fuzzy_build(self, fuzzy: Optional[FuzzyIndex]):
+        """安装后台构建好的容错索引，并补上构建期间的增删改（须在修改索引的线程中调用）
+
+        fuzzy 为 None（后台构建失败）时改为在第一次 ranked_search 时构建
+        """
+        changes, self._fuzzy_changes = self._fuzzy_changes or [], None
+        if fuzzy is None:
+            return
+        for entry, entry_id in changes:
+            if entry is None:
+                fuzzy.remove(entry_id)
+            else:
+                fuzzy.add(entry)
+        self._fuzzy = fuzzy
+        logger.debug(f"容错索引已构建: {len(fuzzy)} 条记录，补上 {len(changes)} 次修改")
+
+    def _live_entries(self) -> List[PasswordEntry]:
+        return [entry for entry in self._entries if entry is not None]
+
+    def _match(self, keyword: str, fields: Iterable[str] = None) -> set:
+        haystack = self._haystack
+        if len(keyword) < GRAM_SIZE:
+            candidates = range(len(haystack))
+        else:
+            postings = [self._postings.get(gram) for gram in trigrams(keyword)]
+            if not all(postings):
+                return set()
+            candidates = min(postings, key=len)
+        rows = {row for row in candidates if haystack[row] is not None and keyword in haystack[row]}
+        if fields is not None:
+            columns = [self._columns[field] for field in fields]
+            rows = {row for row in rows if any(keyword in column[row] for column in columns)}
+        return rows
+
+    def _append(self, entry: PasswordEntry):
+        if entry.id is None:
+            return
+        if entry.sort_key is None:
+            apply_text_keys(entry)
+        row = len(self._entries)
+        self._entries.append(entry)
+        values = []
+        grams = set()
+        for field in SEARCH_FIELDS:
+            value = normalize(getattr(entry, field))
+            self._columns[field].append(value)
+            values.append(value)
+            grams |= trigrams(value)
+        for field in PINYIN_FIELDS:
+            value = getattr(entry, field)
+            if value:
+                values.append(value)
+                for variant in value.split():
+                    grams |= trigrams(variant)
+        self._haystack.append(FIELD_SEPARATOR.join(values))
+        self._sort_keys.append(entry_sort_key(entry))
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array('I')
+            posting.append(row)
+        self._row_of[entry.id] = row
+        self._sorted_rows = None
+
+    def _remove_row(self, entry_id: int) -> bool:
+        row = self._row_of.pop(entry_id, None)
+        if row is None:
+            return False
+        # 倒排索引中的旧行号保留，查询时按合并列为空跳过
+        self._entries[row] = None
+        self._haystack[row] = None
+        self._sort_keys[row] = None
+        for field in SEARCH_FIELDS:
+            self._columns[field][row] = None
+        self._dead_rows += 1
+        self._sorted_rows = None
+        return True
+
+    def _maybe_compact(self):
+        if self._dead_rows > MIN_COMPACT_ROWS and self._dead_rows > len(self._row_of):
+            entries = self._live_entries()
+            fuzzy, fuzzy_changes, folders = self._fuzzy, self._fuzzy_changes, self._folders
+            self.__init__()
+            for entry in entries:
+                self._append(entry)
+            # 容错索引和智能文件夹按记录ID组织，不受行号变化影响
+            self._fuzzy, self._fuzzy_changes, self._folders = fuzzy, fuzzy_changes, folders
+            logger.debug(f"搜索索引已重建: {len(entries)} 条记录")
+
+    def _sort_key(self, row: int):
+        return self._sort_keys[row]
+
+    def _ordered(self, matched: set) -> List[int]:
+        """按排序键排列匹配的行：匹配较少时直接排序，否则按已排好的全部行过滤"""
+        rows = self._sorted()
+        if len(matched) * 8 < len(rows):
+            return sorted(matched, key=self._sort_key)
+        return [row for row in rows if row in matched]
+
+    def _sorted(self) -> List[int]:
+        if self._sorted_rows is None:
+            self._sorted_rows = sorted(self._row_of.values(), key=self._sort_keys.__getitem__)
+        return self._sorted_rows
@@ -6,8 +6,11 @@
 # @Python:  3.12
 # @Description:
 import time
+import logging
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 
 class SessionManager:
     """会话管理器"""
@@ -17,6 +20,8 @@ class SessionManager:
         self.last_activity = None
         self.auto_lock_minutes = 15
         self.is_locked = True  # 初始状态为锁定
+        # 解锁后派生的子密钥（用途标签 -> 密钥），锁定时清除
+        self.vault_keys = {}
 
     def unlock(self, master_password: str) -> bool:
         """解锁会话"""
@@ -24,10 +29,10 @@ class SessionManager:
             self.master_password = master_password
             self.last_activity = time.time()
             self.is_locked = False
-            print(f"会话已解锁，主密码长度: {len(master_password)}")
+            logger.debug("会话已解锁")
             return True
         except Exception as e:
-            print(f"解锁会话失败: {e}")
+            logger.error(f"解锁会话失败: {e}")
             self.lock()
             return False
 
@@ -36,6 +41,35 @@ class SessionManager:
         self.master_password = None
         self.last_activity = None
         self.is_locked = True
+        self.vault_keys = {}
+
+    def derive_vault_keys(self, database_manager, encryption_manager) -> bool:
+        """用主密码和密码库盐派生子密钥（解锁或修改主密码后调用）"""
+        if self.is_locked:
+            return False
+        try:
+            salt = database_manager.get_vault_salt()
+            self.vault_keys = encryption_manager.derive_vault_keys(self.master_password, salt)
+            database_manager.set_metadata_keys(self.vault_keys)
+            return True
+        except Exception as e:
+            logger.error(f"派生密码库密钥失败: {e}")
+            self.vault_keys = {}
+            return False
+
+    def get_vault_key(self, label: str) -> Optional[bytes]:
+        """获取子密钥，锁定或尚未派生时返回 None"""
+        if self.is_locked:
+            return None
+        return self.vault_keys.get(label)
+
+    def fingerprint(self, password: str) -> Optional[str]:
+        """计算密码指纹，没有指纹密钥时返回 None（之后由补全流程生成）"""
+        key = self.get_vault_key('fingerprint')
+        if key is None or not password:
+            return None
+        from core.encryption_manager import EncryptionManager
+        return EncryptionManager.fingerprint(password, key)
 
     def update_activity(self):
         """更新最后活动时间"""
@@ -57,12 +91,10 @@ class SessionManager:
     def get_master_password(self) -> str:
         """获取主密码 - 添加调试信息"""
         if self.is_locked:
-            print("会话已锁定，无法获取主密码")
+            logger.warning("会话已锁定，无法获取主密码")
             return None
 
-        password = self.master_password
-        print(f"获取主密码，长度: {len(password) if password else 0}")
-        return password
+        return self.master_password
 
     def set_auto_lock_minutes(self, minutes: int):
         """设置自动锁定时间"""
@@ -73,18 +105,18 @@ class SessionManager:
         try:
             # 验证新密码
             if not new_password or len(new_password) < 8:
-                print("新密码无效")
+                logger.warning("新密码无效")
                 return False
 
-            print(f"正在更新会话管理器的主密码，新密码长度: {len(new_password)}")
+            logger.debug("正在更新会话管理器的主密码")
 
             # 更新主密码
             self.master_password = new_password
             self.update_activity()
 
-            print("会话管理器主密码更新成功")
+            logger.debug("会话管理器主密码更新成功")
             return True
 
         except Exception as e:
-            print(f"更新主密码失败: {e}")
+            logger.error(f"更新主密码失败: {e}")
             return False
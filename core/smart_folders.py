@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-20 02:20
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 智能文件夹（保存的查询）及其物化的成员集合
+"""
+智能文件夹是起了名字的查询（语法见 core/query_language.py），如
+"一年未更新的金融账号" = category:金融 updated:<1y，显示在主窗口左侧的列表中。
+
+定义以 JSON 保存在 user_config 表的 smart_folders 中，随密码库一起（共享的 MySQL 密码库所有
+客户端看到同样的文件夹）:
+
+    [{"name": "一年未更新的金融账号", "query": "category:金融 updated:<1y"}, ...]
+
+成员集合在内存中物化（SmartFolderIndex）：解锁后随内存搜索索引构建一次，之后每条记录新增、
+修改或删除时只对这一条记录求值各文件夹的条件并更新集合，切换文件夹时直接取集合，不再执行查询。
+条件中有相对日期（如 updated:<1y）的文件夹，成员会随日期变化，跨天后第一次访问时重新求值。
+"""
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from core.query_language import Node, QuerySyntaxError, evaluate, is_relative, parse_query, plan_query
+from models.password_entry import PasswordEntry
+
+logger = logging.getLogger(__name__)
+
+CONFIG_KEY = 'smart_folders'
+
+
+@dataclass
+class SmartFolder:
+    """一个智能文件夹的定义"""
+    name: str
+    query: str
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'query': self.query}
+
+
+def load_folders(database_manager) -> List[SmartFolder]:
+    """读取保存的智能文件夹，无效的定义记录日志后跳过"""
+    raw = database_manager.get_config_value(CONFIG_KEY)
+    if not raw:
+        return []
+    try:
+        items = json.loads(raw)
+    except ValueError as e:
+        logger.error(f"智能文件夹配置无法解析: {e}")
+        return []
+    folders = []
+    for item in items:
+        try:
+            folder = SmartFolder(str(item['name']), str(item['query']))
+            parse_query(folder.query)
+        except (KeyError, TypeError, QuerySyntaxError) as e:
+            logger.warning(f"跳过无效的智能文件夹 {item!r}: {e}")
+            continue
+        folders.append(folder)
+    return folders
+
+
+def save_folders(database_manager, folders: Iterable[SmartFolder]) -> bool:
+    return database_manager.set_config_value(
+        CONFIG_KEY, json.dumps([folder.to_dict() for folder in folders], ensure_ascii=False))
+
+
+class _Materialized:
+    """一个文件夹的条件和当前成员"""
+
+    def __init__(self, folder: SmartFolder):
+        self.folder = folder
+        self.node: Node = plan_query(parse_query(folder.query))
+        self.relative = is_relative(self.node)
+        self.members: Set[int] = set()
+        self.evaluated_on: Optional[date] = None
+
+    def matches(self, entry: PasswordEntry) -> bool:
+        return evaluate(self.node, entry, self.evaluated_on)
+
+    def fill(self, entries: Iterable[PasswordEntry], today: date):
+        self.evaluated_on = today
+        self.members = {entry.id for entry in entries if self.matches(entry)}
+
+
+class SmartFolderIndex:
+    """各智能文件夹物化的成员（记录ID集合），随记录增量更新"""
+
+    def __init__(self):
+        self._folders: Dict[str, _Materialized] = {}
+
+    @classmethod
+    def build(cls, folders: Iterable[SmartFolder], entries: Iterable[PasswordEntry]) -> 'SmartFolderIndex':
+        index = cls()
+        entries = list(entries)
+        for folder in folders:
+            index.add_folder(folder, entries)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._folders)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._folders
+
+    def folders(self) -> List[SmartFolder]:
+        return [materialized.folder for materialized in self._folders.values()]
+
+    def add_folder(self, folder: SmartFolder, entries: Iterable[PasswordEntry]):
+        """新增或替换一个文件夹并计算其成员（查询语法错误时抛出 QuerySyntaxError）"""
+        materialized = _Materialized(folder)
+        materialized.fill(entries, date.today())
+        self._folders[folder.name] = materialized
+
+    def remove_folder(self, name: str):
+        self._folders.pop(name, None)
+
+    def update(self, entry: PasswordEntry):
+        """一条记录新增或修改后更新各文件夹的成员"""
+        for materialized in self._folders.values():
+            if materialized.matches(entry):
+                materialized.members.add(entry.id)
+            else:
+                materialized.members.discard(entry.id)
+
+    def remove(self, entry_id: int):
+        for materialized in self._folders.values():
+            materialized.members.discard(entry_id)
+
+    def members(self, name: str, entries: Callable[[], Iterable[PasswordEntry]]) -> Set[int]:
+        """文件夹的成员；有相对日期且跨天时先用 entries() 重新求值"""
+        materialized = self._folders.get(name)
+        if materialized is None:
+            return set()
+        today = date.today()
+        if materialized.relative and materialized.evaluated_on != today:
+            materialized.fill(entries(), today)
+        return materialized.members
+
+    def counts(self, entries: Callable[[], Iterable[PasswordEntry]]) -> Dict[str, int]:
+        return {name: len(self.members(name, entries)) for name in self._folders}
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 13:05
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 启动时间线（各启动阶段耗时、首次绘制时间）
+import json
+import time
+import logging
+from core.perf_monitor import get_perf_monitor, PROCESS_START
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimeline:
+    """启动时间线
+
+    阶段数据保存在 PerfMonitor 中，诊断面板可以直接显示；
+    启动完成（首次绘制且数据库已连接，登录框弹出前）时写入日志，
+    并按需输出报告或直接退出（用于启动耗时基准测试）。
+    """
+
+    def __init__(self):
+        self.perf_monitor = get_perf_monitor()
+        self.print_report = False
+        self.report_path = None
+        self.exit_after_startup = False
+        self.completed = False
+        self.total_ms = None
+
+    def configure(self, print_report=False, report_path=None, exit_after_startup=False):
+        """设置启动报告选项"""
+        self.print_report = print_report
+        self.report_path = report_path
+        self.exit_after_startup = exit_after_startup
+
+    def phase(self, name):
+        """启动阶段计时上下文管理器"""
+        return self.perf_monitor.phase(name)
+
+    def mark(self, name):
+        """记录一个时间点（耗时为0的阶段）"""
+        now = time.perf_counter()
+        self.perf_monitor.record_phase(name, now, now)
+
+    def complete(self) -> bool:
+        """标记启动完成，返回 True 表示应当直接退出程序"""
+        if self.completed:
+            return False
+        self.completed = True
+        self.total_ms = round((time.perf_counter() - PROCESS_START) * 1000, 2)
+        self.mark('startup_complete')
+
+        report = self.format_report()
+        logger.info(report)
+        if self.print_report:
+            print(report)
+        if self.report_path:
+            self.write_report(self.report_path)
+
+        return self.exit_after_startup
+
+    def to_dict(self) -> dict:
+        """启动时间线数据"""
+        return {
+            'total_ms': self.total_ms,
+            'phases': self.perf_monitor.get_phases()
+        }
+
+    def format_report(self) -> str:
+        """格式化启动报告"""
+        lines = ["启动时间线（相对 main.py 开始执行）:",
+                 f"{'阶段':<24}{'开始(ms)':>12}{'耗时(ms)':>12}"]
+        for phase in self.perf_monitor.get_phases():
+            lines.append(f"{phase['name']:<24}{phase['start_ms']:>12}{phase['duration_ms']:>12}")
+        if self.total_ms is not None:
+            lines.append(f"启动总耗时: {self.total_ms} ms")
+        return "\n".join(lines)
+
+    def write_report(self, file_path: str):
+        """以JSON格式写出启动报告"""
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"写入启动报告失败: {e}")
+
+
+# 全局启动时间线实例
+_startup_timeline = None
+
+
+def get_startup_timeline():
+    """获取全局启动时间线实例"""
+    global _startup_timeline
+    if _startup_timeline is None:
+        _startup_timeline = StartupTimeline()
+    return _startup_timeline
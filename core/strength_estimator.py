@@ -0,0 +1,582 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 19:40
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 密码强度估计（参考 zxcvbn：词典、键盘路径、日期、重复、序列、l33t 替换）
+"""
+估计攻击者按"先试常见模式"的策略需要猜测多少次才能猜中密码:
+
+1. 找出密码中所有可识别的片段（词典单词及其反写/大小写/l33t 变体、键盘相邻按键路径、
+   重复、abc/123 序列、日期和年份），估计每个片段的猜测次数；
+2. 用动态规划选出覆盖整个密码、猜测次数乘积最小的片段组合，未被覆盖的字符按每字符 10 种可能计算；
+3. 按猜测次数分为 0-4 分，对应 弱/弱/中等/强/非常强。
+
+词典在 resources/dict/*.txt 中（一行一个词，按常见程度排序，# 开头为注释），第一次估计时才加载，
+每个词典存为有序数组（相当于压缩的前缀树），按前缀二分查找。
+"""
+import logging
+import math
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import product
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DICTIONARY_DIR = os.path.join('resources', 'dict')
+DICTIONARY_NAMES = ('passwords', 'english', 'pinyin', 'names')
+
+# 猜测次数阈值（与 zxcvbn 一致），对应 0-4 分
+SCORE_THRESHOLDS = (1e3, 1e6, 1e8, 1e10)
+STRENGTH_LEVELS = ('弱', '弱', '中等', '强', '非常强')
+# 界面中各强度等级的颜色
+STRENGTH_COLORS = {'弱': 'red', '中等': 'orange', '强': 'blue', '非常强': 'green'}
+
+BRUTEFORCE_CARDINALITY = 10
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+MIN_YEAR_SPACE = 20
+REFERENCE_YEAR = 2026
+# 离线破解、慢哈希（每秒 1 万次）
+GUESSES_PER_SECOND = 1e4
+
+L33T_TABLE = {
+    '4': 'a', '@': 'a', '8': 'b', '(': 'c', '{': 'c', '[': 'c', '<': 'c', '3': 'e', '6': 'g', '9': 'g',
+    '1': 'il', '!': 'i', '|': 'il', '0': 'o', '$': 's', '5': 's', '7': 'lt', '+': 't', '%': 'x', '2': 'z',
+}
+MAX_L33T_VARIANTS = 16
+
+QWERTY_ROWS = (
+    ('`~', '1!', '2@', '3#', '4$', '5%', '6^', '7&', '8*', '9(', '0)', '-_', '=+'),
+    (None, 'qQ', 'wW', 'eE', 'rR', 'tT', 'yY', 'uU', 'iI', 'oO', 'pP', '[{', ']}', '\\|'),
+    (None, 'aA', 'sS', 'dD', 'fF', 'gG', 'hH', 'jJ', 'kK', 'lL', ';:', '\'"'),
+    (None, 'zZ', 'xX', 'cC', 'vV', 'bB', 'nN', 'mM', ',<', '.>', '/?'),
+)
+KEYPAD_ROWS = (
+    (None, '/', '*', '-'),
+    ('7', '8', '9', '+'),
+    ('4', '5', '6'),
+    ('1', '2', '3'),
+    (None, '0', '.'),
+)
+# 斜排键盘（每行比上一行右移半个键）的 6 个方向和小键盘的 8 个方向
+SLANTED_DIRECTIONS = ((0, -1), (-1, 0), (-1, 1), (0, 1), (1, 0), (1, -1))
+ALIGNED_DIRECTIONS = ((0, -1), (-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1))
+
+DATE_WITH_SEPARATOR = re.compile(r'^(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})$')
+YEAR_PATTERN = re.compile(r'19\d\d|20\d\d')
+REPEAT_GREEDY = re.compile(r'(.+)\1+')
+REPEAT_LAZY = re.compile(r'(.+?)\1+')
+REPEAT_LAZY_ANCHORED = re.compile(r'^(.+?)\1+$')
+
+WARNINGS = {
+    'passwords': '这是非常常见的密码',
+    'english': '单个英文单词很容易被猜出',
+    'pinyin': '常见拼音很容易被猜出',
+    'names': '姓名很容易被猜出',
+    'spatial': '键盘上相邻按键的组合很容易被猜出',
+    'repeat': '重复的字符或片段很容易被猜出',
+    'sequence': 'abc、123 这样的序列很容易被猜出',
+    'date': '日期和年份很容易被猜出',
+}
+
+
+@dataclass
+class Match:
+    """密码中识别出的一个片段，i、j 为起止位置（含 j）"""
+    pattern: str
+    i: int
+    j: int
+    token: str
+    guesses: float
+    dictionary: str = ''
+    reversed: bool = False
+    l33t: bool = False
+
+
+class RankedDictionary:
+    """按常见程度排序的词典，存为有序数组加排名数组（紧凑的前缀树）"""
+
+    def __init__(self, name: str, words: Iterable[str]):
+        ranks = {}
+        for word in words:
+            ranks.setdefault(word, len(ranks) + 1)
+        self.name = name
+        self.words = sorted(ranks)
+        self.ranks = array('I', (ranks[word] for word in self.words))
+        self.max_length = max(map(len, self.words), default=0)
+
+    def __len__(self):
+        return len(self.words)
+
+    def prefixes(self, text: str, start: int):
+        """text[start:] 在词典中的所有前缀，返回 [(结束位置, 排名)]"""
+        words = self.words
+        found = []
+        low = 0
+        for end in range(start + 1, min(len(text), start + self.max_length) + 1):
+            prefix = text[start:end]
+            # 前缀变长时二分位置只会右移
+            low = bisect_left(words, prefix, low)
+            if low == len(words) or not words[low].startswith(prefix):
+                break
+            if words[low] == prefix:
+                found.append((end - 1, self.ranks[low]))
+        return found
+
+
+def _build_adjacency(rows, directions) -> Dict[str, list]:
+    """按键 -> 各方向相邻按键（没有按键的方向为 None）"""
+    positions = {}
+    for row, keys in enumerate(rows):
+        for column, key in enumerate(keys):
+            if key:
+                positions[(row, column)] = key
+    graph = {}
+    for (row, column), key in positions.items():
+        neighbours = [positions.get((row + dr, column + dc)) for dr, dc in directions]
+        for char in key:
+            graph[char] = neighbours
+    return graph
+
+
+def _nck(n: int, k: int) -> int:
+    if k > n:
+        return 0
+    return math.comb(n, k)
+
+
+class StrengthEstimator:
+    """密码强度估计器（词典在第一次使用时加载）"""
+
+    def __init__(self, dictionary_dir: Optional[str] = None):
+        self.dictionary_dir = dictionary_dir
+        self._dictionaries: Optional[List[RankedDictionary]] = None
+        self._lock = threading.Lock()
+        self._graphs = {
+            'qwerty': _build_adjacency(QWERTY_ROWS, SLANTED_DIRECTIONS),
+            'keypad': _build_adjacency(KEYPAD_ROWS, ALIGNED_DIRECTIONS),
+        }
+        self._graph_stats = {
+            name: (len(graph), sum(sum(1 for n in neighbours if n) for neighbours in graph.values()) / len(graph))
+            for name, graph in self._graphs.items()
+        }
+
+    # ---------- 词典 ----------
+
+    def _resolve_dictionary_dir(self) -> Optional[str]:
+        if self.dictionary_dir:
+            return self.dictionary_dir
+        from core.resource_manager import get_resource_manager
+        return get_resource_manager().get_resource_path(DICTIONARY_DIR)
+
+    @property
+    def dictionaries(self) -> List[RankedDictionary]:
+        if self._dictionaries is None:
+            with self._lock:
+                if self._dictionaries is None:
+                    self._dictionaries = self._load_dictionaries()
+        return self._dictionaries
+
+    def _load_dictionaries(self) -> List[RankedDictionary]:
+        directory = self._resolve_dictionary_dir()
+        dictionaries = []
+        for name in DICTIONARY_NAMES:
+            path = os.path.join(directory, f"{name}.txt") if directory else None
+            if not path or not os.path.exists(path):
+                logger.warning(f"未找到强度词典: {name}")
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                words = (line.strip().lower() for line in f)
+                dictionaries.append(RankedDictionary(name, (w for w in words if w and not w.startswith('#'))))
+        logger.debug(f"强度词典加载完成: {', '.join(f'{d.name}={len(d)}' for d in dictionaries)}")
+        return dictionaries
+
+    # ---------- 估计 ----------
+
+    def estimate(self, password: str, user_inputs: Iterable[str] = ()) -> dict:
+        """估计密码强度
+
+        user_inputs 为与账号相关的词（网站名、用户名等），出现在密码中时按排名最靠前的词典词计算。
+        """
+        extra = [RankedDictionary('user_inputs', (word.lower() for word in user_inputs if word))] \
+            if user_inputs else []
+        matches = self.find_matches(password, extra)
+        guesses_log10, sequence = self._most_guessable(password, matches)
+
+        score = sum(1 for threshold in SCORE_THRESHOLDS if guesses_log10 >= math.log10(threshold))
+        warning, suggestions = self._feedback(score, sequence)
+        return {
+            'score': score,
+            'level': STRENGTH_LEVELS[score],
+            'guesses_log10': round(guesses_log10, 2),
+            'crack_time': format_crack_time(guesses_log10),
+            'warning': warning,
+            'suggestions': suggestions,
+            'sequence': sequence,
+        }
+
+    def estimate_many(self, passwords: Iterable[str]) -> List[dict]:
+        """批量估计（词典只加载一次）"""
+        return [self.estimate(password) for password in passwords]
+
+    def find_matches(self, password: str, extra_dictionaries=()) -> List[Match]:
+        if not password:
+            return []
+        matches = self._dictionary_matches(password, extra_dictionaries)
+        matches += self._spatial_matches(password)
+        matches += self._repeat_matches(password)
+        matches += self._sequence_matches(password)
+        matches += self._date_matches(password)
+        return matches
+
+    def _dictionary_matches(self, password: str, extra_dictionaries=()) -> List[Match]:
+        lower = password.lower()
+        length = len(password)
+        dictionaries = list(extra_dictionaries) + self.dictionaries
+        matches = []
+        seen = set()
+
+        def scan(text, reverse, l33t):
+            for dictionary in dictionaries:
+                for start in range(length):
+                    for end, rank in dictionary.prefixes(text, start):
+                        i, j = (length - 1 - end, length - 1 - start) if reverse else (start, end)
+                        word = text[start:end + 1]
+                        token = password[i:j + 1]
+                        if l33t and word == token.lower():
+                            continue
+                        key = (i, j, dictionary.name, reverse)
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        guesses = rank * self._uppercase_variations(token)
+                        if l33t:
+                            guesses *= self._l33t_variations(token, word)
+                        if reverse:
+                            guesses *= 2
+                        matches.append(Match('dictionary', i, j, token, guesses, dictionary.name, reverse, l33t))
+
+        scan(lower, False, False)
+        scan(lower[::-1], True, False)
+        for variant in self._l33t_variants(lower):
+            scan(variant, False, True)
+        return matches
+
+    @staticmethod
+    def _l33t_variants(lower: str) -> List[str]:
+        """把 l33t 字符替换回字母得到的候选（最多 MAX_L33T_VARIANTS 个）"""
+        choices = [L33T_TABLE.get(char, char) for char in lower]
+        if all(len(choice) == 1 and choice == char for choice, char in zip(choices, lower)):
+            return []
+        variants = []
+        for combination in product(*choices):
+            variants.append(''.join(combination))
+            if len(variants) >= MAX_L33T_VARIANTS:
+                break
+        return variants
+
+    @staticmethod
+    def _uppercase_variations(token: str) -> int:
+        if token.islower() or not any(char.isalpha() for char in token):
+            return 1
+        if token.isupper() or (token[0].isupper() and token[1:].islower()) \
+                or (token[-1].isupper() and token[:-1].islower()):
+            return 2
+        upper = sum(1 for char in token if char.isupper())
+        lower = sum(1 for char in token if char.islower())
+        return sum(_nck(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+    @staticmethod
+    def _l33t_variations(token: str, word: str) -> int:
+        variations = 1
+        substitutions = {}
+        for char, letter in zip(token.lower(), word):
+            if char != letter:
+                substitutions.setdefault((char, letter), 0)
+        for char, letter in substitutions:
+            subbed = token.lower().count(char)
+            unsubbed = word.count(letter) - subbed
+            if subbed == 0 or unsubbed <= 0:
+                variations *= 2
+            else:
+                variations *= sum(_nck(subbed + unsubbed, i) for i in range(1, min(subbed, unsubbed) + 1))
+        return variations
+
+    def _spatial_matches(self, password: str) -> List[Match]:
+        matches = []
+        for name, graph in self._graphs.items():
+            starting_positions, average_degree = self._graph_stats[name]
+            i = 0
+            while i < len(password) - 1:
+                j = i + 1
+                turns = 0
+                shifted = 0
+                last_direction = None
+                while j < len(password):
+                    neighbours = graph.get(password[j - 1])
+                    direction = None
+                    if neighbours:
+                        for index, key in enumerate(neighbours):
+                            if key and password[j] in key:
+                                direction = index
+                                if name == 'qwerty' and key.index(password[j]) == 1:
+                                    shifted += 1
+                                break
+                    if direction is None:
+                        break
+                    if direction != last_direction:
+                        turns += 1
+                        last_direction = direction
+                    j += 1
+                if j - i >= 3:
+                    token = password[i:j]
+                    guesses = self._spatial_guesses(len(token), turns, shifted, starting_positions, average_degree)
+                    matches.append(Match('spatial', i, j - 1, token, guesses, name))
+                i = j
+        return matches
+
+    @staticmethod
+    def _spatial_guesses(length, turns, shifted, starting_positions, average_degree) -> float:
+        guesses = 0
+        for i in range(2, length + 1):
+            for j in range(1, min(turns, i - 1) + 1):
+                guesses += _nck(i - 1, j - 1) * starting_positions * average_degree ** j
+        if shifted:
+            unshifted = length - shifted
+            if unshifted == 0:
+                guesses *= 2
+            else:
+                guesses *= sum(_nck(shifted + unshifted, i) for i in range(1, min(shifted, unshifted) + 1))
+        return guesses
+
+    def _repeat_matches(self, password: str) -> List[Match]:
+        matches = []
+        position = 0
+        while position < len(password):
+            greedy = REPEAT_GREEDY.search(password, position)
+            if not greedy:
+                break
+            lazy = REPEAT_LAZY.search(password, position)
+            # 取覆盖更长的匹配，重复单元取最短的（如 abcabc 按 abc 重复两次计）
+            if len(greedy.group(0)) > len(lazy.group(0)):
+                found = greedy
+                base = REPEAT_LAZY_ANCHORED.match(found.group(0)).group(1)
+            else:
+                found = lazy
+                base = lazy.group(1)
+            token = found.group(0)
+            base_guesses = 10 ** self._most_guessable(base, self.find_matches(base))[0] \
+                if len(base) > 1 else BRUTEFORCE_CARDINALITY
+            matches.append(Match('repeat', found.start(), found.end() - 1, token,
+                                 base_guesses * (len(token) // len(base))))
+            position = found.end()
+        return matches
+
+    @staticmethod
+    def _sequence_matches(password: str) -> List[Match]:
+        matches = []
+        if len(password) < 3:
+            return matches
+
+        def add(i, j, delta):
+            if j - i < 2 or not 0 < abs(delta) <= 5:
+                return
+            token = password[i:j + 1]
+            first = token[0]
+            if first in 'aAzZ019':
+                base = 4
+            elif first.isdigit():
+                base = 10
+            else:
+                base = 26
+            matches.append(Match('sequence', i, j, token, base * len(token) * (1 if delta > 0 else 2)))
+
+        start = 0
+        last_delta = None
+        for k in range(1, len(password)):
+            delta = ord(password[k]) - ord(password[k - 1])
+            if last_delta is None:
+                last_delta = delta
+            if delta != last_delta:
+                add(start, k - 1, last_delta)
+                start = k - 1
+                last_delta = delta
+        add(start, len(password) - 1, last_delta)
+        return matches
+
+    def _date_matches(self, password: str) -> List[Match]:
+        matches = []
+        for found in YEAR_PATTERN.finditer(password):
+            year = int(found.group(0))
+            matches.append(Match('date', found.start(), found.end() - 1, found.group(0), self._year_space(year)))
+
+        length = len(password)
+        for i in range(length - 3):
+            for j in range(i + 3, min(i + 10, length)):
+                token = password[i:j + 1]
+                if token.isdigit():
+                    year = self._split_date(token) if len(token) <= 8 else None
+                    if year:
+                        matches.append(Match('date', i, j, token, self._year_space(year) * 365))
+                else:
+                    separated = DATE_WITH_SEPARATOR.match(token)
+                    if separated:
+                        year = self._parse_date((int(separated.group(1)), int(separated.group(3)),
+                                                 int(separated.group(4))))
+                        if year:
+                            matches.append(Match('date', i, j, token, self._year_space(year) * 365 * 4))
+        return matches
+
+    def _split_date(self, digits: str) -> Optional[int]:
+        """不带分隔符的数字能否拆成日期，返回年份"""
+        splits = {
+            4: ((1, 2), (2, 3)),
+            5: ((1, 3), (2, 3)),
+            6: ((1, 2), (2, 4), (4, 5)),
+            7: ((1, 3), (2, 3), (4, 5), (4, 6)),
+            8: ((2, 4), (4, 6)),
+        }.get(len(digits), ())
+        for first, second in splits:
+            year = self._parse_date((int(digits[:first]), int(digits[first:second]), int(digits[second:])))
+            if year:
+                return year
+        return None
+
+    @staticmethod
+    def _parse_date(parts) -> Optional[int]:
+        """三段数字按 年月日/月日年/日月年 尝试解析，返回年份"""
+        if parts[1] > 31 or parts[1] <= 0:
+            return None
+        orders = ((parts[0], parts[1], parts[2]), (parts[2], parts[0], parts[1]), (parts[2], parts[1], parts[0]))
+        for year, month, day in orders:
+            if year < 100:
+                year += 1900 if year > 50 else 2000
+            if 1000 <= year <= 2050 and 1 <= month <= 12 and 1 <= day <= 31:
+                return year
+        return None
+
+    @staticmethod
+    def _year_space(year: int) -> int:
+        return max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE)
+
+    @staticmethod
+    def _most_guessable(password: str, matches: List[Match]):
+        """动态规划选出猜测次数最少的片段组合，返回 (log10(猜测次数), 片段列表)
+
+        按位置做最短路：未被覆盖的字符按暴力破解计，每个片段按 log10(猜测次数) 计；
+        最后按片段个数的阶乘修正（攻击者不知道密码由几段组成）。
+        """
+        length = len(password)
+        if not length:
+            return 0.0, []
+
+        ending = [[] for _ in range(length)]
+        for match in matches:
+            ending[match.j].append(match)
+
+        bruteforce_cost = math.log10(BRUTEFORCE_CARDINALITY)
+        best = [0.0] * (length + 1)
+        choice: List[Optional[Match]] = [None] * (length + 1)
+        for k in range(1, length + 1):
+            best[k] = best[k - 1] + bruteforce_cost
+            choice[k] = None
+            for match in ending[k - 1]:
+                minimum = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if match.j == match.i \
+                    else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+                cost = best[match.i] + math.log10(max(match.guesses, minimum))
+                if cost < best[k]:
+                    best[k] = cost
+                    choice[k] = match
+
+        sequence = []
+        k = length
+        while k > 0:
+            match = choice[k]
+            if match is None:
+                start = k - 1
+                while start > 0 and choice[start] is None:
+                    start -= 1
+                token = password[start:k]
+                sequence.append(Match('bruteforce', start, k - 1, token,
+                                      BRUTEFORCE_CARDINALITY ** len(token)))
+                k = start
+            else:
+                sequence.append(match)
+                k = match.i
+        sequence.reverse()
+
+        return best[length] + math.log10(math.factorial(len(sequence))), sequence
+
+    @staticmethod
+    def _feedback(score: int, sequence: List[Match]):
+        if score >= 3:
+            return '', []
+        suggestions = ['增加长度，可以使用几个不常见的单词组成的短语']
+        patterns = [match for match in sequence if match.pattern != 'bruteforce']
+        if not patterns:
+            return '', suggestions + ['混合使用大小写字母、数字和符号']
+
+        longest = max(patterns, key=lambda match: len(match.token))
+        key = longest.dictionary if longest.pattern == 'dictionary' else longest.pattern
+        warning = WARNINGS.get(key, '')
+        if longest.pattern == 'dictionary':
+            if longest.reversed:
+                suggestions.append('把单词反过来写并不能增加多少难度')
+            if longest.l33t:
+                suggestions.append('用 @ 代替 a 这类替换并不能增加多少难度')
+            if longest.token[:1].isupper():
+                suggestions.append('首字母大写并不能增加多少难度')
+        elif longest.pattern == 'date':
+            suggestions.append('避免使用生日等与自己相关的日期和年份')
+        elif longest.pattern == 'spatial':
+            suggestions.append('避免使用键盘上连续的按键')
+        return warning, suggestions
+
+
+def format_crack_time(guesses_log10: float) -> str:
+    """离线破解（慢哈希）所需时间"""
+    seconds = 10 ** max(guesses_log10 - math.log10(GUESSES_PER_SECOND), -10)
+    if seconds < 1:
+        return "瞬间"
+    for unit, size in (("年", 31536000), ("个月", 2592000), ("天", 86400), ("小时", 3600), ("分钟", 60)):
+        if seconds >= size:
+            value = seconds / size
+            if unit == "年" and value >= 100:
+                return "数百年以上"
+            return f"{int(value)} {unit}"
+    return f"{int(seconds)} 秒"
+
+
+def character_checks(password: str) -> dict:
+    """字符类型检查（界面提示用，不参与评分）"""
+    return {
+        'length': len(password) >= 8,
+        'lowercase': any(c.islower() for c in password),
+        'uppercase': any(c.isupper() for c in password),
+        'digit': any(c.isdigit() for c in password),
+        'symbol': any(not c.isalnum() for c in password)
+    }
+
+
+# 全局强度估计器实例
+_strength_estimator = None
+
+
+def get_strength_estimator() -> StrengthEstimator:
+    """获取全局强度估计器实例"""
+    global _strength_estimator
+    if _strength_estimator is None:
+        _strength_estimator = StrengthEstimator()
+    return _strength_estimator
+
+
+def estimate_strength(password: str, user_inputs: Iterable[str] = ()) -> dict:
+    """估计密码强度（使用全局估计器）"""
+    return get_strength_estimator().estimate(password, user_inputs)
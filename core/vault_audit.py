@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 19:10
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 密码库健康检查（弱密码、重复密码、长期未更新、信息缺失）
+"""
+检查项:
+    weak              密码强度为"弱"或"中等"
+    reused            与其他记录使用相同密码（按密码指纹判断）
+    old               超过 max_age_days 天未更新（按 updated_at）
+    missing_url       没有网址
+    missing_username  没有用户名
+    undecryptable     无法用当前主密码解密
+
+只有密码强度需要解密。强度结果按记录ID缓存在内存中（以 updated_at 和密文判断是否变化），
+再次检查时只解密新增或修改过的记录，其余检查项都是对已读取的行做简单计算。
+缓存只在本次会话中有效，锁定时清空，不会把"哪些密码弱"写到磁盘。
+"""
+import logging
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from models.password_entry import PasswordEntry
+from core.encryption_manager import EncryptionManager
+
+logger = logging.getLogger(__name__)
+
+AUDIT_ISSUES = {
+    'weak': '弱密码',
+    'reused': '重复使用',
+    'old': '长期未更新',
+    'missing_url': '缺少网址',
+    'missing_username': '缺少用户名',
+    'undecryptable': '无法解密',
+}
+
+WEAK_LEVELS = ('弱', '中等')
+DEFAULT_MAX_AGE_DAYS = 365
+
+
+@dataclass
+class EntryAudit:
+    """单条记录的检查结果"""
+    entry_id: int
+    website_name: str
+    username: str
+    category: str
+    strength_level: Optional[str]
+    age_days: Optional[int]
+    issues: List[str] = field(default_factory=list)
+
+
+@dataclass
+class AuditReport:
+    """一次检查的汇总"""
+    results: List[EntryAudit]
+    issue_counts: Dict[str, int]
+    category_counts: Dict[str, Dict[str, int]]
+    rescored: int
+    elapsed_ms: float
+    # 检查过程中为缺少指纹的记录算出的指纹 [(fingerprint, id)]，由调用方写回数据库
+    new_fingerprints: List[tuple] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return len(self.results)
+
+    @property
+    def entries_with_issues(self) -> int:
+        return sum(1 for result in self.results if result.issues)
+
+
+def _strength_level(password: str) -> str:
+    from core.strength_estimator import estimate_strength
+    return estimate_strength(password)['level']
+
+
+class VaultAuditor:
+    """密码库健康检查（带按记录的增量缓存）"""
+
+    def __init__(self, encryption_manager, max_age_days: int = DEFAULT_MAX_AGE_DAYS, batch_size: int = 64):
+        self.encryption_manager = encryption_manager
+        self.max_age_days = max_age_days
+        self.batch_size = batch_size
+        # 记录ID -> (缓存键, 强度等级, 指纹)
+        self._cache: Dict[int, tuple] = {}
+        # 无法解密的记录ID -> 缓存键
+        self._failed: Dict[int, tuple] = {}
+
+    @staticmethod
+    def _cache_key(entry: PasswordEntry) -> tuple:
+        return entry.updated_at, entry.encrypted_password
+
+    def invalidate(self):
+        """清空缓存（锁定或修改主密码时调用）"""
+        self._cache.clear()
+        self._failed.clear()
+
+    def audit(self, entries: List[PasswordEntry], master_password: str,
+              fingerprint_key: Optional[bytes] = None, now: Optional[datetime] = None,
+              progress: Optional[Callable[[int, int], None]] = None,
+              is_canceled: Optional[Callable[[], bool]] = None) -> AuditReport:
+        """检查所有记录，只解密缓存中没有或已变化的记录"""
+        start = time.perf_counter()
+        now = now or datetime.now()
+
+        stale = [entry for entry in entries
+                 if self._cache.get(entry.id, (None,))[0] != self._cache_key(entry)
+                 and self._failed.get(entry.id) != self._cache_key(entry)]
+        self._rescore(stale, master_password, fingerprint_key, progress, is_canceled)
+
+        # 删除的记录不再保留缓存
+        live_ids = {entry.id for entry in entries}
+        for entry_id in [entry_id for entry_id in self._cache if entry_id not in live_ids]:
+            del self._cache[entry_id]
+        for entry_id in [entry_id for entry_id in self._failed if entry_id not in live_ids]:
+            del self._failed[entry_id]
+
+        new_fingerprints = []
+        fingerprints = {}
+        for entry in entries:
+            cached = self._cache.get(entry.id)
+            fingerprint = entry.password_fingerprint or (cached[2] if cached else None)
+            if fingerprint:
+                fingerprints[entry.id] = fingerprint
+                if not entry.password_fingerprint:
+                    new_fingerprints.append((fingerprint, entry.id))
+        fingerprint_counts = Counter(fingerprints.values())
+
+        results = []
+        issue_counts = Counter()
+        category_counts = defaultdict(Counter)
+        for entry in entries:
+            cached = self._cache.get(entry.id)
+            level = cached[1] if cached else None
+            age_days = (now - entry.updated_at).days if entry.updated_at else None
+
+            issues = []
+            if entry.id in self._failed:
+                issues.append('undecryptable')
+            elif level in WEAK_LEVELS:
+                issues.append('weak')
+            if fingerprint_counts.get(fingerprints.get(entry.id), 0) > 1:
+                issues.append('reused')
+            if age_days is not None and age_days > self.max_age_days:
+                issues.append('old')
+            if not (entry.url or '').strip():
+                issues.append('missing_url')
+            if not (entry.username or '').strip():
+                issues.append('missing_username')
+
+            issue_counts.update(issues)
+            category_counts[entry.category or '默认'].update(issues)
+            results.append(EntryAudit(entry.id, entry.website_name, entry.username, entry.category,
+                                      level, age_days, issues))
+
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        logger.info(f"密码库检查完成: {len(entries)} 条，重新评估 {len(stale)} 条，耗时 {elapsed_ms} ms")
+        return AuditReport(results, dict(issue_counts),
+                           {category: dict(counts) for category, counts in category_counts.items()},
+                           len(stale), elapsed_ms, new_fingerprints)
+
+    def _rescore(self, entries, master_password, fingerprint_key, progress, is_canceled):
+        """批量并行解密并评估密码强度"""
+        total = len(entries)
+        for offset in range(0, total, self.batch_size):
+            if is_canceled and is_canceled():
+                break
+            batch = entries[offset:offset + self.batch_size]
+            try:
+                passwords = self.encryption_manager.decrypt_many(
+                    [entry.encrypted_password for entry in batch], master_password)
+            except Exception:
+                passwords = []
+                for entry in batch:
+                    try:
+                        passwords.append(self.encryption_manager.decrypt(entry.encrypted_password,
+                                                                         master_password))
+                    except Exception as e:
+                        logger.warning(f"记录 {entry.id} 解密失败: {e}")
+                        passwords.append(None)
+
+            for entry, password in zip(batch, passwords):
+                if password is None:
+                    self._cache.pop(entry.id, None)
+                    self._failed[entry.id] = self._cache_key(entry)
+                    continue
+                self._failed.pop(entry.id, None)
+                fingerprint = entry.password_fingerprint
+                if not fingerprint and fingerprint_key:
+                    fingerprint = EncryptionManager.fingerprint(password, fingerprint_key)
+                self._cache[entry.id] = (self._cache_key(entry), _strength_level(password), fingerprint)
+
+            if progress:
+                progress(min(offset + self.batch_size, total), total)
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 16:30
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 密码库流式导出/导入（JSON Lines、CSV、加密归档）
+"""
+导出时按批次从数据库读取（fetchmany）、并行解密后写出；导入时按批次读取文件、
+并行加密后在一个事务中批量写入。任何时候内存中只有一个批次的数据。
+
+加密归档格式（.pmvault）:
+    PMVAULT1\\n
+    {"version": 1, "kdf": "pbkdf2-sha256", "iterations": ..., "salt": ..., "cipher": "aes-256-gcm"}\\n
+    数据块: 4字节长度（大端） + 12字节随机数 + 密文 + 16字节认证标签
+    每个数据块是一批 JSON Lines 记录；最后一块为空的结束块。
+    认证附加数据 = SHA256(头部) + 块序号 + 是否结束块，可以发现块被截断、重排或替换。
+    整个归档只做一次 PBKDF2，比逐条派生密钥快得多。
+"""
+import base64
+import csv
+import hashlib
+import json
+import os
+import struct
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import logging
+
+from models.password_entry import PasswordEntry
+from core.encryption_manager import KDF_ITERATIONS, EncryptionManager, _load_cipher_modules
+from utils.helpers import open_private_file
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('jsonl', 'csv', 'vault')
+EXPORT_FIELDS = ['website_name', 'url', 'username', 'password', 'notes', 'category',
+                 'created_at', 'updated_at']
+
+ARCHIVE_MAGIC = b'PMVAULT1\n'
+ARCHIVE_NONCE_SIZE = 12
+ARCHIVE_TAG_SIZE = 16
+
+DEFAULT_BATCH_SIZE = 500
+
+ProgressCallback = Optional[Callable[[int, Optional[int]], None]]
+
+
+class VaultTransferError(Exception):
+    """导入/导出失败"""
+
+
+def detect_format(file_path: str) -> str:
+    """根据文件头和扩展名判断格式"""
+    try:
+        with open(file_path, 'rb') as f:
+            if f.read(len(ARCHIVE_MAGIC)) == ARCHIVE_MAGIC:
+                return 'vault'
+    except OSError as e:
+        raise VaultTransferError(f"无法读取文件: {e}")
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    return 'jsonl'
+
+
+def _format_time(value) -> str:
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
+
+
+def entry_to_record(entry: PasswordEntry, password: str) -> Dict[str, str]:
+    """条目 -> 导出记录（明文密码）"""
+    return {
+        'website_name': entry.website_name or '',
+        'url': entry.url or '',
+        'username': entry.username or '',
+        'password': password,
+        'notes': entry.notes or '',
+        'category': entry.category or '默认',
+        'created_at': _format_time(entry.created_at),
+        'updated_at': _format_time(entry.updated_at),
+    }
+
+
+def record_to_entry(record: Dict[str, str]) -> PasswordEntry:
+    """导入记录 -> 条目（密码尚未加密）"""
+    entry = PasswordEntry.from_dict({
+        'website_name': (record.get('website_name') or '').strip(),
+        'url': (record.get('url') or '').strip(),
+        'username': (record.get('username') or '').strip(),
+        'notes': record.get('notes') or '',
+        'category': (record.get('category') or '').strip() or '默认',
+        'created_at': record.get('created_at') or None,
+        'updated_at': record.get('updated_at') or None,
+    })
+    entry.decrypted_password = record.get('password') or ''
+    return entry
+
+
+def batched(items: Iterable, batch_size: int) -> Iterator[List]:
+    """把可迭代对象切分为批次"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ---------- 加密归档 ----------
+
+class ArchiveWriter:
+    """加密归档写入器"""
+
+    def __init__(self, stream, password: str, iterations: int = KDF_ITERATIONS):
+        self.stream = stream
+        salt = os.urandom(16)
+        header = json.dumps({
+            'version': 1,
+            'kdf': 'pbkdf2-sha256',
+            'iterations': iterations,
+            'salt': base64.b64encode(salt).decode('ascii'),
+            'cipher': 'aes-256-gcm',
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }).encode('utf-8') + b'\n'
+        self._header_digest = hashlib.sha256(header).digest()
+        self._key = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations, dklen=32)
+        self._index = 0
+        self.stream.write(ARCHIVE_MAGIC + header)
+
+    def _write_chunk(self, plaintext: bytes, last: bool):
+        Cipher, algorithms, modes = _load_cipher_modules()
+        nonce = os.urandom(ARCHIVE_NONCE_SIZE)
+        encryptor = Cipher(algorithms.AES(self._key), modes.GCM(nonce)).encryptor()
+        encryptor.authenticate_additional_data(self._header_digest + struct.pack('>QB', self._index, last))
+        ciphertext = encryptor.update(plaintext) + encryptor.finalize()
+        frame = nonce + ciphertext + encryptor.tag
+        self.stream.write(struct.pack('>I', len(frame)) + frame)
+        self._index += 1
+
+    def write_records(self, records: List[Dict[str, str]]):
+        """写入一批记录"""
+        payload = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        self._write_chunk(payload.encode('utf-8'), last=False)
+
+    def close(self):
+        """写入结束块"""
+        self._write_chunk(b'', last=True)
+
+
+def read_archive(stream, password: str) -> Iterator[Dict[str, str]]:
+    """逐块解密加密归档并逐条返回记录"""
+    if stream.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+        raise VaultTransferError("不是有效的加密归档")
+    header = stream.readline()
+    try:
+        meta = json.loads(header)
+        salt = base64.b64decode(meta['salt'])
+        iterations = int(meta['iterations'])
+    except (ValueError, KeyError) as e:
+        raise VaultTransferError(f"归档头部损坏: {e}")
+    if meta.get('kdf') != 'pbkdf2-sha256' or meta.get('cipher') != 'aes-256-gcm':
+        raise VaultTransferError("不支持的归档加密方式")
+
+    header_digest = hashlib.sha256(header).digest()
+    key = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations, dklen=32)
+    Cipher, algorithms, modes = _load_cipher_modules()
+
+    index = 0
+    while True:
+        size_bytes = stream.read(4)
+        if len(size_bytes) < 4:
+            raise VaultTransferError("归档不完整（缺少结束块）")
+        frame = stream.read(struct.unpack('>I', size_bytes)[0])
+        if len(frame) < ARCHIVE_NONCE_SIZE + ARCHIVE_TAG_SIZE:
+            raise VaultTransferError("归档数据块损坏")
+        nonce = frame[:ARCHIVE_NONCE_SIZE]
+        ciphertext = frame[ARCHIVE_NONCE_SIZE:-ARCHIVE_TAG_SIZE]
+        tag = frame[-ARCHIVE_TAG_SIZE:]
+
+        # 先按普通块验证，失败再按结束块验证
+        plaintext = None
+        for last in (False, True):
+            decryptor = Cipher(algorithms.AES(key), modes.GCM(nonce, tag)).decryptor()
+            decryptor.authenticate_additional_data(header_digest + struct.pack('>QB', index, last))
+            try:
+                plaintext = decryptor.update(ciphertext) + decryptor.finalize()
+            except Exception:
+                continue
+            break
+        else:
+            raise VaultTransferError("归档解密失败：密码错误或数据已被修改")
+
+        if last:
+            return
+        # 只按 \n 分行（记录中可能含有 U+2028 等字符）
+        for line in plaintext.decode('utf-8').split('\n'):
+            if line.strip():
+                yield json.loads(line)
+        index += 1
+
+
+# ---------- 导出 ----------
+
+def export_vault(database_manager, encryption_manager, master_password: str, file_path: str,
+                 fmt: str = 'jsonl', archive_password: Optional[str] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, progress: ProgressCallback = None) -> int:
+    """导出整个密码库，返回导出的条目数"""
+    if fmt not in EXPORT_FORMATS:
+        raise VaultTransferError(f"不支持的导出格式: {fmt}")
+
+    total = database_manager.count_entries()
+    done = 0
+
+    # 明文导出包含所有密码，只允许所有者读写
+    if fmt == 'vault':
+        f = open_private_file(file_path, 'wb')
+    else:
+        f = open_private_file(file_path, 'w', encoding='utf-8', newline='')
+
+    try:
+        writer = None
+        if fmt == 'csv':
+            writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+        elif fmt == 'vault':
+            writer = ArchiveWriter(f, archive_password or master_password)
+
+        for entries in database_manager.iter_entries(batch_size):
+            passwords = encryption_manager.decrypt_many(
+                [entry.encrypted_password for entry in entries], master_password)
+            records = [entry_to_record(entry, password) for entry, password in zip(entries, passwords)]
+
+            if fmt == 'jsonl':
+                f.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records))
+            elif fmt == 'csv':
+                writer.writerows(records)
+            else:
+                writer.write_records(records)
+
+            done += len(records)
+            if progress:
+                progress(done, total)
+
+        if fmt == 'vault':
+            writer.close()
+    finally:
+        f.close()
+
+    logger.info(f"导出完成: {done} 条 -> {file_path} ({fmt})")
+    return done
+
+
+# ---------- 导入 ----------
+
+def read_records(file_path: str, fmt: Optional[str] = None,
+                 archive_password: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """逐条读取导入文件中的记录"""
+    fmt = fmt or detect_format(file_path)
+    if fmt == 'vault':
+        if archive_password is None:
+            raise VaultTransferError("导入加密归档需要归档密码")
+        with open(file_path, 'rb') as f:
+            yield from read_archive(f, archive_password)
+    elif fmt == 'csv':
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            yield from csv.DictReader(f)
+    elif fmt == 'jsonl':
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise VaultTransferError(f"第 {line_number} 行不是有效的JSON: {e}")
+    else:
+        raise VaultTransferError(f"不支持的导入格式: {fmt}")
+
+
+def encrypt_entries(entries: List[PasswordEntry], encryption_manager, master_password: str,
+                    fingerprint_key: Optional[bytes] = None):
+    """并行加密条目的明文密码（decrypted_password），加密后清除明文"""
+    encrypted = encryption_manager.encrypt_many(
+        [entry.decrypted_password for entry in entries], master_password)
+    for entry, encrypted_password in zip(entries, encrypted):
+        if fingerprint_key and entry.decrypted_password:
+            entry.password_fingerprint = EncryptionManager.fingerprint(entry.decrypted_password, fingerprint_key)
+        entry.encrypted_password = encrypted_password
+        entry.decrypted_password = ""
+
+
+def import_records(database_manager, encryption_manager, master_password: str,
+                   records: Iterable[Dict[str, str]], batch_size: int = DEFAULT_BATCH_SIZE,
+                   progress: ProgressCallback = None, fingerprint_key: Optional[bytes] = None) -> int:
+    """按批次加密并写入记录，返回导入的条目数（提供 fingerprint_key 时同时计算密码指纹）"""
+    done = 0
+    for batch in batched(records, batch_size):
+        entries = [record_to_entry(record) for record in batch]
+        entries = [entry for entry in entries if entry.website_name and entry.username]
+        if not entries:
+            continue
+
+        encrypt_entries(entries, encryption_manager, master_password, fingerprint_key)
+
+        if not database_manager.bulk_insert_entries(entries):
+            raise VaultTransferError(f"写入数据库失败（已导入 {done} 条）")
+
+        done += len(entries)
+        if progress:
+            progress(done, None)
+
+    return done
+
+
+def import_vault(database_manager, encryption_manager, master_password: str, file_path: str,
+                 fmt: Optional[str] = None, archive_password: Optional[str] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, progress: ProgressCallback = None,
+                 fingerprint_key: Optional[bytes] = None) -> int:
+    """导入文件中的所有条目，返回导入的条目数"""
+    fmt = fmt or detect_format(file_path)
+    if fmt == 'vault' and archive_password is None:
+        archive_password = master_password
+
+    records = read_records(file_path, fmt, archive_password)
+    done = import_records(database_manager, encryption_manager, master_password,
+                          records, batch_size, progress, fingerprint_key)
+
+    logger.info(f"导入完成: {file_path} ({fmt}) -> {done} 条")
+    return done
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 20:35
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 密码短语词表（内存映射的二进制格式）
+"""
+词表文件格式（.pmwords，整数均为大端）:
+
+    文件头 16 字节  magic "PMWORD1\\0"、词数 N (u32)、保留 (u32)
+    偏移表          (N + 1) x u32，第 i 个词为数据区 [offset[i], offset[i+1])
+    数据区          UTF-8 编码的词依次拼接
+
+打开时只做内存映射和检查文件头，按下标取词是 O(1)，不会读取整个文件。
+文本词表（一行一个词，或 diceware 的 "11111<TAB>word" 格式）用 utils/build_wordlists.py 转换。
+"""
+import logging
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+WORDLIST_MAGIC = b'PMWORD1\0'
+HEADER_FORMAT = '>8sII'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+WORDLIST_EXTENSION = '.pmwords'
+WORDLIST_DIR = os.path.join('resources', 'wordlists')
+
+# 内置词表
+WORDLIST_LANGUAGES = {
+    'en': 'English',
+    'pinyin': '拼音',
+    'es': 'Español',
+}
+
+
+class WordlistError(Exception):
+    """词表文件错误"""
+
+
+class Wordlist:
+    """内存映射的词表"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise WordlistError(f"词表文件为空: {path}")
+
+        if len(self._mmap) < HEADER_SIZE:
+            self.close()
+            raise WordlistError(f"不是有效的词表文件: {path}")
+        magic, self._count, _ = struct.unpack_from(HEADER_FORMAT, self._mmap)
+        self._data_offset = HEADER_SIZE + 4 * (self._count + 1)
+        if magic != WORDLIST_MAGIC or len(self._mmap) < self._data_offset:
+            self.close()
+            raise WordlistError(f"不是有效的词表文件: {path}")
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        start, end = struct.unpack_from('>II', self._mmap, HEADER_SIZE + 4 * index)
+        return self._mmap[self._data_offset + start:self._data_offset + end].decode('utf-8')
+
+    def __iter__(self):
+        return (self[index] for index in range(self._count))
+
+    def close(self):
+        if getattr(self, '_mmap', None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def write_wordlist(words: Iterable[str], path: str) -> int:
+    """写出二进制词表（去掉重复词，保持原顺序），返回词数"""
+    unique = list(dict.fromkeys(word.strip() for word in words if word.strip()))
+    if len(unique) < 2:
+        raise WordlistError("词表至少需要两个词")
+    for word in unique:
+        if any(char.isspace() for char in word):
+            raise WordlistError(f"词中不能包含空白字符: {word!r}")
+
+    encoded = [word.encode('utf-8') for word in unique]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(struct.pack(HEADER_FORMAT, WORDLIST_MAGIC, len(unique), 0))
+        f.write(struct.pack(f'>{len(offsets)}I', *offsets))
+        f.writelines(encoded)
+    os.replace(temp_path, path)
+    return len(unique)
+
+
+def read_text_wordlist(path: str) -> List[str]:
+    """读取文本词表（一行一个词，# 开头为注释；diceware 格式取最后一列）"""
+    words = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                words.append(line.split()[-1])
+    return words
+
+
+def _resolve_wordlist_dir():
+    from core.resource_manager import get_resource_manager
+    return get_resource_manager().get_resource_path(WORDLIST_DIR)
+
+
+def available_wordlists() -> Dict[str, str]:
+    """已安装的内置词表 {语言: 名称}"""
+    directory = _resolve_wordlist_dir()
+    if not directory:
+        return {}
+    return {language: name for language, name in WORDLIST_LANGUAGES.items()
+            if os.path.exists(os.path.join(directory, language + WORDLIST_EXTENSION))}
+
+
+_wordlists: Dict[str, Wordlist] = {}
+_wordlists_lock = threading.Lock()
+
+
+def get_wordlist(language: str = 'en') -> Wordlist:
+    """获取内置词表（第一次使用时映射，之后复用）"""
+    with _wordlists_lock:
+        wordlist = _wordlists.get(language)
+        if wordlist is None:
+            if language not in WORDLIST_LANGUAGES:
+                raise WordlistError(f"不支持的词表: {language}")
+            directory = _resolve_wordlist_dir()
+            path = os.path.join(directory, language + WORDLIST_EXTENSION) if directory else None
+            if not path or not os.path.exists(path):
+                raise WordlistError(f"未找到词表: {language}")
+            wordlist = _wordlists[language] = Wordlist(path)
+            logger.debug(f"词表已加载: {language} ({len(wordlist)} 个词)")
+        return wordlist
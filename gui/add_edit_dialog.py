@@ -19,6 +19,10 @@ except ImportError:
 
 from models.password_entry import PasswordEntry
 from gui.icon_manager import get_icon_manager
+from core.strength_estimator import STRENGTH_COLORS, estimate_strength
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class AddEditDialog(QDialog):
@@ -34,6 +38,8 @@ class AddEditDialog(QDialog):
         self.config_manager = config_manager
         self.entry = entry
         self.is_edit = entry is not None
+        # 保存成功的记录ID（主窗口据此增量更新搜索索引）
+        self.saved_entry_id = None
 
 
 
@@ -59,7 +65,7 @@ class AddEditDialog(QDialog):
         icon_manager = get_icon_manager()
         icon_manager.set_window_icon(self, "favicon")
 
-        print("AddEditDialog 初始化完成")
+        logger.debug("AddEditDialog 初始化完成")
 
     def setup_ui(self):
         """初始化UI"""
@@ -106,6 +112,11 @@ class AddEditDialog(QDialog):
         password_layout.addWidget(self.show_password_check)
         password_layout.addWidget(self.generate_password_button)
 
+        # 输入时实时显示密码强度
+        self.password_strength_label = QLabel("")
+        self.password_strength_label.setStyleSheet("color: gray; font-size: 12px;")
+        self.password_strength_label.setWordWrap(True)
+
         # 分类
         category_layout = QHBoxLayout()
         category_layout.addWidget(QLabel("分类:"))
@@ -117,6 +128,7 @@ class AddEditDialog(QDialog):
         form_layout.addLayout(url_layout)
         form_layout.addLayout(username_layout)
         form_layout.addLayout(password_layout)
+        form_layout.addWidget(self.password_strength_label)
         form_layout.addLayout(category_layout)
 
         basic_layout.addLayout(form_layout)
@@ -146,8 +158,26 @@ class AddEditDialog(QDialog):
         type_layout.addWidget(self.digits_check)
         type_layout.addWidget(self.symbols_check)
 
+        # 密码短语（由随机单词组成，便于记忆）
+        passphrase_layout = QHBoxLayout()
+        self.passphrase_check = QCheckBox("密码短语")
+        self.words_spin = QSpinBox()
+        self.words_spin.setRange(3, 12)
+        self.words_spin.setValue(6)
+        self.wordlist_combo = QComboBox()
+        from core.wordlist import available_wordlists
+        for language, name in available_wordlists().items():
+            self.wordlist_combo.addItem(name, language)
+        self.passphrase_check.setEnabled(self.wordlist_combo.count() > 0)
+        passphrase_layout.addWidget(self.passphrase_check)
+        passphrase_layout.addWidget(QLabel("单词数:"))
+        passphrase_layout.addWidget(self.words_spin)
+        passphrase_layout.addWidget(self.wordlist_combo)
+        passphrase_layout.addStretch()
+
         generate_layout.addLayout(length_layout)
         generate_layout.addLayout(type_layout)
+        generate_layout.addLayout(passphrase_layout)
 
         # 备注
         notes_group = QGroupBox("备注")
@@ -173,6 +203,7 @@ class AddEditDialog(QDialog):
 
         # 信号连接
         self.show_password_check.toggled.connect(self.on_show_password)
+        self.password_input.textChanged.connect(self.update_password_strength)
         self.generate_password_button.clicked.connect(self.on_generate_password)
         self.save_button.clicked.connect(self.on_save)
         self.cancel_button.clicked.connect(self.reject)
@@ -189,7 +220,7 @@ class AddEditDialog(QDialog):
             else:
                 # 使用默认分类
                 categories = ["默认", "工作", "个人", "金融", "社交"]
-                print("使用默认分类列表")
+                logger.debug("使用默认分类列表")
 
             # 清空并添加分类
             self.category_combo.clear()
@@ -202,7 +233,7 @@ class AddEditDialog(QDialog):
             self.category_combo.setCurrentText("默认")
 
         except Exception as e:
-            print(f"加载分类错误: {e}")
+            logger.error(f"加载分类错误: {e}", exc_info=True)
             # 使用默认分类
             self.category_combo.clear()
             default_categories = ["默认", "工作", "个人", "金融", "社交"]
@@ -243,17 +274,15 @@ class AddEditDialog(QDialog):
                         )
                         self.password_input.setText(decrypted_password)
                     else:
-                        print("无法获取主密码或加密密码为空")
+                        logger.debug("无法获取主密码或加密密码为空")
                 except Exception as e:
-                    print(f"解密密码错误: {e}")
+                    logger.error(f"解密密码错误: {e}")
                     QMessageBox.warning(self, "警告", "无法解密密码，请检查主密码是否正确")
             else:
-                print("会话已锁定，无法解密密码")
+                logger.debug("会话已锁定，无法解密密码")
 
         except Exception as e:
-            print(f"加载条目数据错误: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"加载条目数据错误: {e}", exc_info=True)
             QMessageBox.critical(self, "错误", f"加载条目数据失败: {str(e)}")
 
     def on_show_password(self, checked):
@@ -263,16 +292,38 @@ class AddEditDialog(QDialog):
         else:
             self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
 
+    def update_password_strength(self):
+        """按当前输入估计密码强度（网站名和用户名也算作容易猜到的词）"""
+        password = self.password_input.text()
+        if not password:
+            self.password_strength_label.setText("")
+            return
+        strength = estimate_strength(password, (self.website_input.text(), self.username_input.text()))
+        text = f"密码强度: {strength['level']}（破解约需 {strength['crack_time']}）"
+        if strength['warning']:
+            text += f"  {strength['warning']}"
+        self.password_strength_label.setText(text)
+        color = STRENGTH_COLORS.get(strength['level'], 'gray')
+        self.password_strength_label.setStyleSheet(f"color: {color}; font-size: 12px;")
+
     def on_generate_password(self):
         """生成密码"""
-        length = self.length_spin.value()
+        from core.password_generator import (BulkPasswordGenerator, PassphraseGenerator, PassphrasePolicy,
+                                             PasswordPolicy)
         use_uppercase = self.uppercase_check.isChecked()
         use_digits = self.digits_check.isChecked()
         use_symbols = self.symbols_check.isChecked()
 
-        password = self.password_generator.generate_password(
-            length, use_uppercase, use_digits, use_symbols
-        )
+        if self.passphrase_check.isChecked():
+            generator = PassphraseGenerator(PassphrasePolicy(
+                words=self.words_spin.value(), language=self.wordlist_combo.currentData(),
+                capitalization='title' if use_uppercase else 'lower', digits=int(use_digits)))
+        else:
+            generator = BulkPasswordGenerator(PasswordPolicy(
+                length=self.length_spin.value(), use_uppercase=use_uppercase, use_digits=use_digits,
+                use_symbols=use_symbols, min_uppercase=int(use_uppercase), min_digits=int(use_digits),
+                min_symbols=int(use_symbols)))
+        password = generator.generate(1)[0]
 
         self.password_input.setText(password)
         self.show_password_check.setChecked(True)
@@ -280,7 +331,8 @@ class AddEditDialog(QDialog):
         # 检查密码强度
         strength = self.password_generator.check_password_strength(password)
         QMessageBox.information(self, "密码生成",
-                                f"新密码已生成!\n\n强度: {strength['level']}")
+                                f"新密码已生成!\n\n强度: {strength['level']}\n"
+                                f"熵: {generator.entropy_bits:.0f} 位")
 
     def on_save(self):
         """保存记录"""
@@ -300,19 +352,18 @@ class AddEditDialog(QDialog):
                 QMessageBox.critical(self, "错误", "无法获取主密码，请重新登录")
                 return
 
-            print(f"开始加密密码，密码长度: {len(self.password_input.text())}")
-
             encrypted_password = self.encryption_manager.encrypt(
                 self.password_input.text(), master_password
             )
 
-            print(f"密码加密成功，加密后长度: {len(encrypted_password)}")
-
         except Exception as e:
             QMessageBox.critical(self, "错误", f"加密密码失败: {e}")
-            print(f"加密密码详细错误: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"加密密码失败: {e}", exc_info=True)
+            return
+
+        # 密码指纹：检查是否与其他记录重复（按索引查询，无需解密）
+        fingerprint = self.session_manager.fingerprint(self.password_input.text())
+        if fingerprint and not self.confirm_reused_password(fingerprint):
             return
 
         # 创建或更新条目
@@ -323,8 +374,10 @@ class AddEditDialog(QDialog):
             self.entry.encrypted_password = encrypted_password
             self.entry.notes = self.notes_text.toPlainText().strip()
             self.entry.category = self.category_combo.currentText().strip()
+            self.entry.password_fingerprint = fingerprint
 
             success = self.database_manager.update_entry(self.entry)
+            self.saved_entry_id = self.entry.id
         else:
             new_entry = PasswordEntry(
                 website_name=self.website_input.text().strip(),
@@ -332,12 +385,31 @@ class AddEditDialog(QDialog):
                 username=self.username_input.text().strip(),
                 encrypted_password=encrypted_password,
                 notes=self.notes_text.toPlainText().strip(),
-                category=self.category_combo.currentText().strip()
+                category=self.category_combo.currentText().strip(),
+                password_fingerprint=fingerprint
             )
             success = self.database_manager.add_entry(new_entry)
+            self.saved_entry_id = new_entry.id
 
         if success:
-            print("记录保存成功")
+            logger.debug("记录保存成功")
             self.accept()
         else:
-            QMessageBox.critical(self, "错误", "保存记录失败")
\ No newline at end of file
+            QMessageBox.critical(self, "错误", "保存记录失败")
+
+    def confirm_reused_password(self, fingerprint) -> bool:
+        """密码已被其他记录使用时提示，返回是否继续保存"""
+        exclude_id = self.entry.id if self.is_edit else None
+        others = self.database_manager.find_entries_by_fingerprint(fingerprint, exclude_id)
+        if not others:
+            return True
+
+        names = "\n".join(f"  {entry.website_name} ({entry.username})" for entry in others[:10])
+        if len(others) > 10:
+            names += f"\n  ... 共 {len(others)} 条"
+        reply = QMessageBox.question(
+            self, "密码重复",
+            f"该密码已被以下记录使用:\n{names}\n\n重复使用密码会扩大泄露的影响，仍然保存吗？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        return reply == QMessageBox.StandardButton.Yes
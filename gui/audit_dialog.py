@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 19:10
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 密码健康检查对话框
+import logging
+
+try:
+    from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                                 QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView,
+                                 QMessageBox, QAbstractItemView, QSplitter)
+    from PyQt6.QtCore import Qt, QThread, pyqtSignal
+except ImportError:
+    from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                                 QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView,
+                                 QMessageBox, QAbstractItemView, QSplitter)
+    from PyQt5.QtCore import Qt, QThread, pyqtSignal
+
+from core.vault_audit import AUDIT_ISSUES
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWorker(QThread):
+    """后台线程：解密有变化的记录并评估（条目由主线程读取后传入）"""
+
+    progress = pyqtSignal(int, int)
+    finished_with_report = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, auditor, entries, master_password, fingerprint_key, parent=None):
+        super().__init__(parent)
+        self.auditor = auditor
+        self.entries = entries
+        self.master_password = master_password
+        self.fingerprint_key = fingerprint_key
+        self._canceled = False
+
+    def cancel(self):
+        self._canceled = True
+
+    @property
+    def canceled(self):
+        return self._canceled
+
+    def run(self):
+        try:
+            report = self.auditor.audit(self.entries, self.master_password, self.fingerprint_key,
+                                        progress=self.progress.emit,
+                                        is_canceled=lambda: self._canceled)
+            self.finished_with_report.emit(report)
+        except Exception as e:
+            logger.error(f"密码健康检查失败: {e}")
+            self.failed.emit(str(e))
+        finally:
+            self.master_password = None
+
+
+class AuditDialog(QDialog):
+    """密码健康检查报告：各问题的数量、按分类统计和有问题的记录"""
+
+    def __init__(self, database_manager, session_manager, auditor, parent=None):
+        super().__init__(parent)
+        self.database_manager = database_manager
+        self.session_manager = session_manager
+        self.auditor = auditor
+        self.worker = None
+        self.report = None
+        self.setup_ui()
+        self.on_start()
+
+    def setup_ui(self):
+        """初始化UI"""
+        self.setWindowTitle("密码健康检查")
+        self.resize(760, 560)
+        self.setModal(True)
+
+        layout = QVBoxLayout(self)
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+        self.progress_bar = QProgressBar()
+        layout.addWidget(self.progress_bar)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+
+        # 问题汇总：点击某一行只显示该问题的记录
+        self.summary_table = QTableWidget(len(AUDIT_ISSUES), 2)
+        self.summary_table.setHorizontalHeaderLabels(["问题", "数量"])
+        self.summary_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.summary_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.summary_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.summary_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        for row, label in enumerate(AUDIT_ISSUES.values()):
+            self.summary_table.setItem(row, 0, QTableWidgetItem(label))
+            self.summary_table.setItem(row, 1, QTableWidgetItem("-"))
+        splitter.addWidget(self.summary_table)
+
+        # 按分类统计
+        self.category_table = QTableWidget(0, len(AUDIT_ISSUES))
+        self.category_table.setHorizontalHeaderLabels(list(AUDIT_ISSUES.values()))
+        self.category_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        splitter.addWidget(self.category_table)
+        layout.addWidget(splitter)
+
+        self.entries_table = QTableWidget(0, 5)
+        self.entries_table.setHorizontalHeaderLabels(["网站名称", "用户名", "分类", "强度", "问题"])
+        self.entries_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.entries_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.entries_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        layout.addWidget(self.entries_table, 1)
+
+        button_layout = QHBoxLayout()
+        self.start_button = QPushButton("重新检查")
+        self.close_button = QPushButton("关闭")
+        button_layout.addStretch()
+        button_layout.addWidget(self.start_button)
+        button_layout.addWidget(self.close_button)
+        layout.addLayout(button_layout)
+
+        self.summary_table.itemSelectionChanged.connect(self.show_entries)
+        self.start_button.clicked.connect(self.on_start)
+        self.close_button.clicked.connect(self.reject)
+
+    def on_start(self):
+        """读取条目并在后台线程中检查"""
+        master_password = self.session_manager.get_master_password()
+        if not master_password:
+            QMessageBox.warning(self, "警告", "请先解锁应用程序")
+            return
+
+        entries = self.database_manager.get_all_entries()
+        self.set_running(True)
+        self.status_label.setText("正在检查...")
+
+        self.worker = AuditWorker(self.auditor, entries, master_password,
+                                  self.session_manager.get_vault_key('fingerprint'), self)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished_with_report.connect(self.on_finished)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.start()
+
+    def set_running(self, running):
+        self.start_button.setEnabled(not running)
+        self.close_button.setText("取消" if running else "关闭")
+
+    def on_progress(self, done, total):
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"正在评估密码强度... {done}/{total}")
+
+    def on_finished(self, report):
+        self.set_running(False)
+        if self.worker is not None and self.worker.canceled:
+            return
+        self.report = report
+        self.progress_bar.setMaximum(1)
+        self.progress_bar.setValue(1)
+
+        # 顺便写回检查中算出的指纹，之后查找重复密码不必再解密
+        if report.new_fingerprints:
+            self.database_manager.update_fingerprints(report.new_fingerprints)
+
+        self.status_label.setText(
+            f"共 {report.total} 条记录，{report.entries_with_issues} 条存在问题"
+            f"（重新评估 {report.rescored} 条，耗时 {report.elapsed_ms:.0f} ms）")
+
+        for row, issue in enumerate(AUDIT_ISSUES):
+            self.summary_table.item(row, 1).setText(str(report.issue_counts.get(issue, 0)))
+
+        categories = sorted(report.category_counts)
+        self.category_table.setRowCount(len(categories))
+        self.category_table.setVerticalHeaderLabels(categories)
+        for row, category in enumerate(categories):
+            counts = report.category_counts[category]
+            for column, issue in enumerate(AUDIT_ISSUES):
+                self.category_table.setItem(row, column, QTableWidgetItem(str(counts.get(issue, 0))))
+
+        self.show_entries()
+
+    def show_entries(self):
+        """显示有问题的记录，汇总表选中某个问题时只显示该问题"""
+        if self.report is None:
+            return
+        selected = self.summary_table.selectionModel().selectedRows()
+        issue = list(AUDIT_ISSUES)[selected[0].row()] if selected else None
+        results = [result for result in self.report.results
+                   if (issue in result.issues if issue else result.issues)]
+
+        self.entries_table.setRowCount(len(results))
+        for row, result in enumerate(results):
+            self.entries_table.setItem(row, 0, QTableWidgetItem(result.website_name))
+            self.entries_table.setItem(row, 1, QTableWidgetItem(result.username))
+            self.entries_table.setItem(row, 2, QTableWidgetItem(result.category))
+            self.entries_table.setItem(row, 3, QTableWidgetItem(result.strength_level or "-"))
+            self.entries_table.setItem(row, 4, QTableWidgetItem(
+                "、".join(AUDIT_ISSUES[name] for name in result.issues)))
+
+    def on_failed(self, message):
+        self.set_running(False)
+        if self.worker is not None and self.worker.canceled:
+            return
+        self.status_label.setText("检查失败")
+        QMessageBox.critical(self, "错误", f"密码健康检查失败: {message}")
+
+    def reject(self):
+        """检查进行中时先取消并等待后台线程结束"""
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        super().reject()
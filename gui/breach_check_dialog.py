@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 18:05
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 离线泄露密码检查对话框
+import logging
+import os
+
+try:
+    from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                                 QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView,
+                                 QFileDialog, QMessageBox, QAbstractItemView)
+    from PyQt6.QtCore import QThread, pyqtSignal
+except ImportError:
+    from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                                 QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView,
+                                 QFileDialog, QMessageBox, QAbstractItemView)
+    from PyQt5.QtCore import QThread, pyqtSignal
+
+from core.breach_checker import (CORPUS_EXTENSION, BreachCorpus, BreachCorpusError, build_corpus,
+                                 check_entries, is_corpus_file)
+
+logger = logging.getLogger(__name__)
+
+
+class BreachCheckWorker(QThread):
+    """后台线程：必要时先转换数据集，再用线程池检查所有条目
+
+    数据库连接不能跨线程使用，条目由主线程读取后传入。
+    """
+
+    progress = pyqtSignal(str, int, int)
+    corpus_ready = pyqtSignal(str)
+    finished_with_results = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+    def __init__(self, corpus_path, entries, encryption_manager, master_password, parent=None):
+        super().__init__(parent)
+        self.corpus_path = corpus_path
+        self.entries = entries
+        self.encryption_manager = encryption_manager
+        self.master_password = master_password
+        self._canceled = False
+
+    def cancel(self):
+        self._canceled = True
+
+    @property
+    def canceled(self):
+        return self._canceled
+
+    def _conversion_progress(self, done, total):
+        # 转换可能需要很长时间，通过进度回调响应取消（临时文件由 build_corpus 清理）
+        if self._canceled:
+            raise BreachCorpusError("已取消")
+        self.progress.emit("正在转换数据集", done, 0)
+
+    def run(self):
+        try:
+            corpus_path = self.corpus_path
+            if not is_corpus_file(corpus_path):
+                source_path = corpus_path.rstrip('/\\')
+                corpus_path = os.path.splitext(source_path)[0] + CORPUS_EXTENSION
+                build_corpus(source_path, corpus_path, progress=self._conversion_progress)
+                self.corpus_ready.emit(corpus_path)
+
+            with BreachCorpus(corpus_path) as corpus:
+                results = check_entries(
+                    corpus, self.entries, self.encryption_manager, self.master_password,
+                    progress=lambda done, total: self.progress.emit("正在检查密码", done, total),
+                    is_canceled=lambda: self._canceled)
+            self.finished_with_results.emit(results)
+        except Exception as e:
+            logger.error(f"泄露密码检查失败: {e}")
+            self.failed.emit(str(e))
+        finally:
+            self.master_password = None
+
+
+class BreachCheckDialog(QDialog):
+    """泄露密码检查对话框"""
+
+    def __init__(self, database_manager, encryption_manager, session_manager, config_manager, parent=None):
+        super().__init__(parent)
+        self.database_manager = database_manager
+        self.encryption_manager = encryption_manager
+        self.session_manager = session_manager
+        self.config_manager = config_manager
+        self.worker = None
+        self.setup_ui()
+        self.set_corpus_path(self.config_manager.get_security_config().get('breach_corpus', ''))
+
+    def setup_ui(self):
+        """初始化UI"""
+        self.setWindowTitle("泄露密码检查")
+        self.resize(560, 460)
+        self.setModal(True)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("使用本地下载的 Have I Been Pwned 密码哈希数据集（SHA-1 或 NTLM）离线检查，"
+                                "密码不会离开本机。首次使用文本数据集时会转换为二进制格式。"))
+
+        corpus_layout = QHBoxLayout()
+        self.corpus_label = QLabel()
+        self.corpus_label.setWordWrap(True)
+        self.choose_file_button = QPushButton("选择文件...")
+        self.choose_dir_button = QPushButton("选择目录...")
+        corpus_layout.addWidget(self.corpus_label, 1)
+        corpus_layout.addWidget(self.choose_file_button)
+        corpus_layout.addWidget(self.choose_dir_button)
+        layout.addLayout(corpus_layout)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+        self.progress_bar = QProgressBar()
+        layout.addWidget(self.progress_bar)
+
+        self.results_table = QTableWidget(0, 4)
+        self.results_table.setHorizontalHeaderLabels(["网站名称", "用户名", "分类", "泄露次数"])
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.results_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.results_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        layout.addWidget(self.results_table)
+
+        button_layout = QHBoxLayout()
+        self.start_button = QPushButton("开始检查")
+        self.close_button = QPushButton("关闭")
+        button_layout.addStretch()
+        button_layout.addWidget(self.start_button)
+        button_layout.addWidget(self.close_button)
+        layout.addLayout(button_layout)
+
+        self.choose_file_button.clicked.connect(self.on_choose_file)
+        self.choose_dir_button.clicked.connect(self.on_choose_dir)
+        self.start_button.clicked.connect(self.on_start)
+        self.close_button.clicked.connect(self.reject)
+
+    def set_corpus_path(self, path):
+        self.corpus_path = path or ''
+        self.corpus_label.setText(self.corpus_path or "未选择数据集")
+        self.start_button.setEnabled(bool(self.corpus_path))
+
+    def on_choose_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "选择泄露密码数据集", os.path.dirname(self.corpus_path),
+            f"数据集 (*{CORPUS_EXTENSION} *.txt);;所有文件 (*)")
+        if path:
+            self.set_corpus_path(path)
+
+    def on_choose_dir(self):
+        path = QFileDialog.getExistingDirectory(self, "选择范围数据集目录", os.path.dirname(self.corpus_path))
+        if path:
+            self.set_corpus_path(path)
+
+    def on_start(self):
+        """读取条目并在后台线程中检查"""
+        master_password = self.session_manager.get_master_password()
+        if not master_password:
+            QMessageBox.warning(self, "警告", "请先解锁应用程序")
+            return
+        if not os.path.exists(self.corpus_path):
+            QMessageBox.warning(self, "警告", f"数据集不存在: {self.corpus_path}")
+            return
+
+        entries = self.database_manager.get_all_entries()
+        self.results_table.setRowCount(0)
+        self.set_running(True)
+
+        self.worker = BreachCheckWorker(self.corpus_path, entries, self.encryption_manager,
+                                        master_password, self)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.corpus_ready.connect(self.on_corpus_ready)
+        self.worker.finished_with_results.connect(self.on_finished)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.start()
+
+    def set_running(self, running):
+        self.start_button.setEnabled(not running)
+        self.choose_file_button.setEnabled(not running)
+        self.choose_dir_button.setEnabled(not running)
+        self.close_button.setText("取消" if running else "关闭")
+
+    def on_progress(self, stage, done, total):
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(done if total else 0)
+        self.status_label.setText(f"{stage}... {done}" + (f"/{total}" if total else ""))
+
+    def on_corpus_ready(self, corpus_path):
+        """转换完成后记住二进制数据集，下次直接使用"""
+        self.set_corpus_path(corpus_path)
+        security_config = dict(self.config_manager.get_security_config())
+        security_config['breach_corpus'] = corpus_path
+        self.config_manager.update_security_config(security_config)
+
+    def on_finished(self, results):
+        self.set_running(False)
+        if self.worker is not None and self.worker.canceled:
+            return
+        self.progress_bar.setMaximum(1)
+        self.progress_bar.setValue(1)
+        security_config = self.config_manager.get_security_config()
+        if security_config.get('breach_corpus') != self.corpus_path:
+            self.on_corpus_ready(self.corpus_path)
+
+        self.results_table.setRowCount(len(results))
+        for row, result in enumerate(results):
+            self.results_table.setItem(row, 0, QTableWidgetItem(result.entry.website_name))
+            self.results_table.setItem(row, 1, QTableWidgetItem(result.entry.username))
+            self.results_table.setItem(row, 2, QTableWidgetItem(result.entry.category))
+            self.results_table.setItem(row, 3, QTableWidgetItem(f"{result.count:,}"))
+
+        if results:
+            self.status_label.setText(f"发现 {len(results)} 条记录的密码出现在泄露数据中，请尽快修改")
+        else:
+            self.status_label.setText("未发现已泄露的密码")
+
+    def on_failed(self, message):
+        self.set_running(False)
+        if self.worker is not None and self.worker.canceled:
+            return
+        self.status_label.setText("检查失败")
+        QMessageBox.critical(self, "错误", f"泄露密码检查失败: {message}")
+
+    def reject(self):
+        """检查进行中时先取消并等待后台线程结束"""
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        super().reject()
@@ -17,6 +17,10 @@ except ImportError:
                                  QProgressDialog)
     from PyQt5.QtCore import Qt, QTimer
 import logging
+from utils.profiler import profile_operation
+from utils.validators import validate_password_strength
+from core.rekey import RekeyError, reencrypt_entries
+from core.strength_estimator import STRENGTH_COLORS
 
 logger = logging.getLogger(__name__)
 
@@ -105,7 +109,7 @@ class ChangeMasterPasswordDialog(QDialog):
         try:
             self.on_password_changed()
         except Exception as e:
-            print(f"密码变化处理异常: {e}")
+            logger.error(f"密码变化处理异常: {e}", exc_info=True)
             # 出错时禁用按钮
             try:
                 self.change_button.setEnabled(False)
@@ -125,19 +129,16 @@ class ChangeMasterPasswordDialog(QDialog):
             if new_password:
                 try:
                     strength = self.check_password_strength(new_password)
-                    self.password_strength_label.setText(f"密码强度: {strength['level']}")
+                    text = f"密码强度: {strength['level']}（破解约需 {strength['crack_time']}）"
+                    if strength['warning']:
+                        text += f"\n{strength['warning']}"
+                    self.password_strength_label.setText(text)
 
                     # 根据强度设置颜色
-                    if strength['level'] == "弱":
-                        self.password_strength_label.setStyleSheet("color: red; font-size: 12px;")
-                    elif strength['level'] == "中等":
-                        self.password_strength_label.setStyleSheet("color: orange; font-size: 12px;")
-                    elif strength['level'] == "强":
-                        self.password_strength_label.setStyleSheet("color: blue; font-size: 12px;")
-                    else:
-                        self.password_strength_label.setStyleSheet("color: green; font-size: 12px;")
+                    color = STRENGTH_COLORS.get(strength['level'], 'gray')
+                    self.password_strength_label.setStyleSheet(f"color: {color}; font-size: 12px;")
                 except Exception as e:
-                    print(f"检查密码强度错误: {e}")
+                    logger.error(f"检查密码强度错误: {e}")
                     self.password_strength_label.setText("")
                     self.password_strength_label.setStyleSheet("color: gray; font-size: 12px;")
             else:
@@ -165,9 +166,7 @@ class ChangeMasterPasswordDialog(QDialog):
             self.change_button.setEnabled(enable_button)
 
         except Exception as e:
-            print(f"密码输入变化处理错误: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"密码输入变化处理错误: {e}", exc_info=True)
             # 出错时安全地禁用按钮
             try:
                 self.change_button.setEnabled(False)
@@ -178,29 +177,7 @@ class ChangeMasterPasswordDialog(QDialog):
 
     def check_password_strength(self, password: str) -> dict:
         """检查密码强度"""
-        checks = {
-            'length': len(password) >= 8,
-            'lowercase': any(c.islower() for c in password),
-            'uppercase': any(c.isupper() for c in password),
-            'digit': any(c.isdigit() for c in password),
-            'symbol': any(not c.isalnum() for c in password)
-        }
-
-        score = sum(checks.values())
-        if score == 5:
-            level = "非常强"
-        elif score >= 4:
-            level = "强"
-        elif score >= 3:
-            level = "中等"
-        else:
-            level = "弱"
-
-        return {
-            'score': score,
-            'level': level,
-            'checks': checks
-        }
+        return validate_password_strength(password)
 
     def on_change_password(self):
         """修改主密码 - 修复版本"""
@@ -238,7 +215,7 @@ class ChangeMasterPasswordDialog(QDialog):
                     return
             else:
                 # 如果没有条目，直接创建验证令牌
-                print("没有密码条目，直接创建验证令牌")
+                logger.debug("没有密码条目，直接创建验证令牌")
         except Exception as e:
             logger.error(f"验证当前密码失败: {e}")
             QMessageBox.critical(self, "错误", f"验证当前密码失败: {str(e)}")
@@ -262,51 +239,40 @@ class ChangeMasterPasswordDialog(QDialog):
         progress.show()
 
         try:
-            # 获取所有密码条目
-            all_entries = self.database_manager.search_entries()
-            total_entries = len(all_entries)
-
-            # 重新加密所有密码条目
-            success_count = 0
-            for i, entry in enumerate(all_entries):
-                # 检查是否取消
-                if progress.wasCanceled():
-                    break
-
-                # 更新进度
-                progress.setValue(int((i / total_entries) * 100))
-
-                try:
-                    # 用旧密码解密
-                    decrypted_password = self.encryption_manager.decrypt(
-                        entry.encrypted_password, current_password
-                    )
-
-                    # 用新密码加密
-                    new_encrypted_password = self.encryption_manager.encrypt(
-                        decrypted_password, new_password
-                    )
-
-                    # 更新条目
-                    entry.encrypted_password = new_encrypted_password
-                    if self.database_manager.update_entry(entry):
-                        success_count += 1
-                        print(f"成功重新加密条目: {entry.website_name}")
+            with profile_operation('rekey'):
+                self.reencrypt_entries(current_password, new_password, progress)
+        finally:
+            progress.close()
 
-                except Exception as e:
-                    logger.error(f"重新加密条目 {entry.website_name} 失败: {e}")
-                    print(f"重新加密条目失败: {e}")
-                    continue
+    def reencrypt_entries(self, current_password: str, new_password: str, progress):
+        """使用新主密码重新加密所有密码记录"""
+        try:
+            # 所有记录在同一个事务中重新加密，取消或（元数据加密时）失败会回滚，主密码保持不变
+            try:
+                result = reencrypt_entries(
+                    self.database_manager, self.encryption_manager, current_password, new_password,
+                    progress=lambda done, total: progress.setValue(int(done / total * 100)),
+                    is_canceled=progress.wasCanceled)
+            except RekeyError as e:
+                logger.error(f"重新加密失败: {e}")
+                QMessageBox.critical(self, "错误", f"{e}\n主密码未修改。")
+                return
+            if result.canceled:
+                QMessageBox.information(self, "已取消", "已取消修改，主密码未修改。")
+                return
+            total_entries = result.total
+            success_count = result.reencrypted
+            new_vault_keys = result.vault_keys
 
             # 关键修复：更新验证令牌和会话管理器
-            print("开始更新验证令牌和会话管理器...")
+            logger.debug("开始更新验证令牌和会话管理器")
 
             # 1. 首先更新数据库中的验证令牌
             if hasattr(self.database_manager, 'create_auth_token'):
                 token_success = self.database_manager.create_auth_token(new_password, self.encryption_manager)
-                print(f"验证令牌更新: {'成功' if token_success else '失败'}")
+                logger.debug(f"验证令牌更新: {'成功' if token_success else '失败'}")
             else:
-                print("数据库管理器没有 create_auth_token 方法")
+                logger.error("数据库管理器没有 create_auth_token 方法")
                 token_success = False
 
             # 2. 更新会话管理器的主密码
@@ -314,13 +280,19 @@ class ChangeMasterPasswordDialog(QDialog):
                 session_success = self.session_manager.update_master_password(new_password)
             else:
                 # 回退方法
-                print("使用回退方法更新会话管理器")
+                logger.debug("使用回退方法更新会话管理器")
                 self.session_manager.master_password = new_password
                 self.session_manager.is_locked = False
                 self.session_manager.update_activity()
                 session_success = True
 
-            print(f"会话管理器更新: {'成功' if session_success else '失败'}")
+            logger.debug(f"会话管理器更新: {'成功' if session_success else '失败'}")
+
+            # 会话中的子密钥改为新主密码派生的密钥
+            if session_success and new_vault_keys:
+                self.session_manager.vault_keys = new_vault_keys
+            # 缓存中旧主密码派生的密钥不再需要
+            self.encryption_manager.clear_key_cache()
 
             # 3. 立即验证新密码是否有效
             verification_success = False
@@ -335,9 +307,9 @@ class ChangeMasterPasswordDialog(QDialog):
                             test_entry.encrypted_password, new_password
                         )
                         verification_success = bool(decrypted)
-                        print(f"新密码验证: {'成功' if verification_success else '失败'}")
+                        logger.debug(f"新密码验证: {'成功' if verification_success else '失败'}")
                 except Exception as e:
-                    print(f"新密码验证失败: {e}")
+                    logger.error(f"新密码验证失败: {e}")
                     verification_success = False
 
             # 显示结果
@@ -367,10 +339,5 @@ class ChangeMasterPasswordDialog(QDialog):
                     QTimer.singleShot(0, self.parent().lock_application)
 
         except Exception as e:
-            logger.error(f"修改主密码失败: {e}")
-            print(f"修改主密码失败: {e}")
-            import traceback
-            traceback.print_exc()
-            QMessageBox.critical(self, "错误", f"修改主密码失败: {str(e)}")
-        finally:
-            progress.close()
\ No newline at end of file
+            logger.error(f"修改主密码失败: {e}", exc_info=True)
+            QMessageBox.critical(self, "错误", f"修改主密码失败: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 14:50
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 原生控件详情面板（只更新发生变化的字段，不解析HTML/CSS）
+try:
+    from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QFormLayout, QLabel,
+                                 QGroupBox, QPlainTextEdit, QStackedWidget)
+    from PyQt6.QtCore import Qt
+except ImportError:
+    from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QFormLayout, QLabel,
+                                 QGroupBox, QPlainTextEdit, QStackedWidget)
+    from PyQt5.QtCore import Qt
+from core.perf_monitor import get_perf_monitor
+
+perf_monitor = get_perf_monitor()
+
+
+class DetailPanel(QWidget):
+    """详情面板
+
+    各字段使用常驻的 QLabel，切换条目时逐项比较显示值，只对变化的字段
+    调用 setText；所有文本都以纯文本方式显示。
+    """
+
+    # 字段名 -> 标签文字
+    FIELDS = [
+        ('website_name', '🌐 网站名称'),
+        ('url', '🔗 网站地址'),
+        ('username', '👤 用户名'),
+        ('category', '📁 分类'),
+        ('created_at', '📅 创建时间'),
+        ('updated_at', '🔄 更新时间'),
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.field_labels = {}
+        # 当前显示的值，用于判断哪些字段需要更新
+        self._values = {}
+        self.setup_ui()
+
+    def setup_ui(self):
+        """初始化界面"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.stack = QStackedWidget()
+
+        # 无选择状态
+        self.no_selection_label = QLabel("🔐 请从左侧列表选择一个密码条目查看详细信息")
+        self.no_selection_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.no_selection_label.setWordWrap(True)
+
+        # 详情内容
+        content = QWidget()
+        content_layout = QVBoxLayout(content)
+        content_layout.setContentsMargins(0, 0, 0, 0)
+
+        info_group = QGroupBox("📋 基本信息")
+        info_layout = QFormLayout(info_group)
+        for field, title in self.FIELDS:
+            label = QLabel()
+            label.setTextFormat(Qt.TextFormat.PlainText)
+            label.setWordWrap(True)
+            label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+            info_layout.addRow(f"{title}:", label)
+            self.field_labels[field] = label
+
+        notes_group = QGroupBox("📝 备注信息")
+        notes_layout = QVBoxLayout(notes_group)
+        self.notes_edit = QPlainTextEdit()
+        self.notes_edit.setReadOnly(True)
+        notes_layout.addWidget(self.notes_edit)
+
+        content_layout.addWidget(info_group)
+        content_layout.addWidget(notes_group, 1)
+
+        self.stack.addWidget(self.no_selection_label)
+        self.stack.addWidget(content)
+        layout.addWidget(self.stack)
+
+    @staticmethod
+    def display_values(entry) -> dict:
+        """计算条目各字段的显示文本"""
+        return {
+            'website_name': entry.website_name or '',
+            'url': entry.url if entry.url and entry.url.strip() else '未设置',
+            'username': entry.username or '',
+            'category': entry.category or '默认',
+            'created_at': entry.created_at.strftime('%Y-%m-%d %H:%M') if entry.created_at else '未知',
+            'updated_at': entry.updated_at.strftime('%Y-%m-%d %H:%M') if entry.updated_at else '未知',
+            'notes': entry.notes if entry.notes else '无备注信息',
+        }
+
+    @perf_monitor.track('ui', 'detail_panel')
+    def set_entry(self, entry):
+        """显示条目（为 None 时显示无选择状态），返回更新的字段数"""
+        if entry is None:
+            self.stack.setCurrentIndex(0)
+            return 0
+
+        values = self.display_values(entry)
+        changed = 0
+        for field, value in values.items():
+            if self._values.get(field) == value:
+                continue
+            if field == 'notes':
+                self.notes_edit.setPlainText(value)
+            else:
+                self.field_labels[field].setText(value)
+            changed += 1
+        self._values = values
+
+        if self.stack.currentIndex() != 1:
+            self.stack.setCurrentIndex(1)
+        return changed
+
+    def clear(self):
+        """清空显示"""
+        self._values = {}
+        for label in self.field_labels.values():
+            label.clear()
+        self.notes_edit.clear()
+        self.stack.setCurrentIndex(0)
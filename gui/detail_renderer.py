@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 14:10
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 详情模板渲染器（模板只编译一次，按条目缓存渲染结果）
+import html
+import re
+from collections import OrderedDict
+from string import Template
+try:
+    from PyQt6.QtGui import QTextDocument
+except ImportError:
+    from PyQt5.QtGui import QTextDocument
+import logging
+from core.perf_monitor import get_perf_monitor
+
+logger = logging.getLogger(__name__)
+perf_monitor = get_perf_monitor()
+
+# 模板中的占位元素 id -> 插槽名
+DETAIL_SLOTS = {
+    'website-name': 'website_name',
+    'url': 'url',
+    'username': 'username',
+    'category': 'category',
+    'created-at': 'created_at',
+    'updated-at': 'updated_at',
+    'notes': 'notes',
+}
+
+# 匹配 id="xxx"></div> 或 id="xxx"></span> 形式的空占位元素
+_SLOT_PATTERN = re.compile(r'id="(%s)"></(div|span)>' % '|'.join(re.escape(key) for key in DETAIL_SLOTS))
+
+_EMPTY_FIELD = '<span style="color: #6c757d; font-style: italic;">{}</span>'
+
+
+class DetailRenderer:
+    """详情模板渲染器
+
+    模板在构造时编译为 string.Template（静态片段 + 插槽），之后每次渲染
+    只做一次替换；渲染好的 QTextDocument 按 (条目ID, 更新时间) 做 LRU 缓存，
+    切换选中项时直接 setDocument，不再重新解析 HTML。
+
+    没有在同一个文档中逐字段替换：Qt 导入 HTML 时会丢弃元素 id，要定位字段只能遍历文本块
+    查找锚点，而且原地修改会使已缓存的文档失效。缓存命中时整份文档切换不需要任何渲染和解析，
+    比逐字段更新更省；未命中时也只有一次替换和一次解析。
+    """
+
+    def __init__(self, template_html: str, cache_size: int = 128):
+        self.cache_size = cache_size
+        self._documents = OrderedDict()
+        self._no_selection_document = None
+        self.no_selection_html, self.compiled = self.compile(template_html)
+
+    @staticmethod
+    def compile(template_html: str):
+        """编译模板，返回 (无选择状态HTML, 详情 string.Template)"""
+        # 无选择状态：保持模板原样（详情内容默认隐藏）
+        no_selection_html = template_html
+
+        # 详情状态：显示详情内容、隐藏提示，并把占位元素替换为插槽
+        content = template_html.replace('$', '$$')
+        content = content.replace('id="no-selection"', 'id="no-selection" style="display: none;"', 1)
+        content = content.replace('id="detail-content" style="display: none;"', 'id="detail-content"', 1)
+        content = _SLOT_PATTERN.sub(
+            lambda match: f'id="{match.group(1)}">${{{DETAIL_SLOTS[match.group(1)]}}}</{match.group(2)}>',
+            content)
+        return no_selection_html, Template(content)
+
+    @staticmethod
+    def escape(text) -> str:
+        """转义HTML特殊字符（换行转为 <br>）"""
+        if not text:
+            return ""
+        return html.escape(str(text)).replace('\n', '<br>')
+
+    def slot_values(self, entry) -> dict:
+        """计算条目各插槽的HTML"""
+        if entry.url and entry.url.strip():
+            url_text = entry.url.strip()
+            # 确保URL有协议前缀
+            if not url_text.startswith(('http://', 'https://')):
+                url_text = 'https://' + url_text
+            url = f'<a href="{self.escape(url_text)}" class="info-value url">{self.escape(entry.url)}</a>'
+        else:
+            url = _EMPTY_FIELD.format('未设置')
+
+        if entry.notes and entry.notes.strip():
+            notes = self.escape(entry.notes)
+        else:
+            notes = '<div class="empty-note">暂无备注信息</div>'
+
+        return {
+            'website_name': self.escape(entry.website_name),
+            'url': url,
+            'username': self.escape(entry.username),
+            'category': self.escape(entry.category) if entry.category else '默认',
+            'created_at': entry.created_at.strftime('%Y-%m-%d %H:%M') if entry.created_at else _EMPTY_FIELD.format('未知'),
+            'updated_at': entry.updated_at.strftime('%Y-%m-%d %H:%M') if entry.updated_at else _EMPTY_FIELD.format('未知'),
+            'notes': notes,
+        }
+
+    def render_html(self, entry) -> str:
+        """渲染条目详情HTML"""
+        return self.compiled.safe_substitute(self.slot_values(entry))
+
+    @staticmethod
+    def cache_key(entry):
+        return entry.id, entry.updated_at
+
+    def document(self, entry) -> QTextDocument:
+        """获取条目详情文档（命中缓存时不再渲染和解析HTML）"""
+        if entry is None:
+            if self._no_selection_document is None:
+                self._no_selection_document = QTextDocument()
+                self._no_selection_document.setHtml(self.no_selection_html)
+            return self._no_selection_document
+
+        key = self.cache_key(entry)
+        document = self._documents.get(key)
+        if document is not None:
+            perf_monitor.cache_hit('detail')
+            self._documents.move_to_end(key)
+            return document
+        perf_monitor.cache_miss('detail')
+
+        with perf_monitor.timed('ui', 'render_detail'):
+            document = QTextDocument()
+            document.setHtml(self.render_html(entry))
+
+        self._documents[key] = document
+        while len(self._documents) > self.cache_size:
+            self._documents.popitem(last=False)
+        return document
+
+    def invalidate(self, entry_id=None):
+        """清除缓存（不指定ID时全部清除）"""
+        if entry_id is None:
+            self._documents.clear()
+            return
+        for key in [key for key in self._documents if key[0] == entry_id]:
+            del self._documents[key]
@@ -10,6 +10,7 @@
 """
 修复版图标管理器 - 包含所有必要的方法
 """
+import json
 import os
 import sys
 from pathlib import Path
@@ -22,8 +23,16 @@ except ImportError:
     from PyQt5.QtWidgets import QStyle, QApplication
     from PyQt5.QtCore import Qt
 import logging
+from core.perf_monitor import get_perf_monitor
 
 logger = logging.getLogger(__name__)
+perf_monitor = get_perf_monitor()
+
+# 图标文件扩展名（按优先级排列）
+ICON_EXTENSIONS = ('.svg', '.png', '.ico', '.jpg', '.jpeg')
+# 预编译图集（由 utils/generate_icons.py 的 build_icon_atlas 生成）
+ATLAS_DIR_NAME = 'atlas'
+ATLAS_INDEX_NAME = 'icons.json'
 
 
 class IconManager:
@@ -32,8 +41,14 @@ class IconManager:
     def __init__(self):
         self.icon_cache = {}
         self.resource_base = self.get_resource_base()
-        print(f"图标管理器初始化，资源基础路径: {self.resource_base}")
-        self.test_all_icons()
+        # 图集索引和图标文件索引都只在首次使用时加载一次
+        self._atlas_loaded = False
+        self._atlas_index = {}
+        self._atlas_image_path = None
+        self._atlas_pixmap = None
+        self._file_index = None
+        logger.debug(f"图标管理器初始化，资源基础路径: {self.resource_base}")
+        # 图标自检较慢，改为由主窗口在首次绘制后调用 test_all_icons()
 
     def get_resource_base(self):
         """获取资源基础路径"""
@@ -42,63 +57,107 @@ class IconManager:
             if hasattr(sys, '_MEIPASS'):
                 # 临时解压目录（单文件模式）
                 base = sys._MEIPASS
-                print(f"单文件模式，临时目录: {base}")
+                logger.debug(f"单文件模式，临时目录: {base}")
             else:
                 # 文件夹模式
                 base = os.path.dirname(sys.executable)
-                print(f"文件夹模式，可执行文件目录: {base}")
+                logger.debug(f"文件夹模式，可执行文件目录: {base}")
         else:
             # 开发环境
             base = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            print(f"开发环境，项目根目录: {base}")
+            logger.debug(f"开发环境，项目根目录: {base}")
 
         return base
 
-    def get_icon_path(self, icon_name):
-        """获取图标文件路径"""
-        # 尝试不同的扩展名
-        extensions = ['.svg', '.png', '.ico', '.jpg', '.jpeg']
-
-        # 尝试不同的路径
-        possible_paths = []
-
-        # 1. 在打包资源的临时目录中查找
+    def get_icon_dirs(self):
+        """图标目录候选列表（按优先级排列，不检查是否存在）"""
+        dirs = []
+        # 1. 打包资源的临时目录
         if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
-            base = sys._MEIPASS
-            for ext in extensions:
-                path = os.path.join(base, 'resources', 'icons', f"{icon_name}{ext}")
-                possible_paths.append(path)
-
-        # 2. 在可执行文件所在目录的资源中查找
+            dirs.append(os.path.join(sys._MEIPASS, 'resources', 'icons'))
+        # 2. 可执行文件所在目录
         if getattr(sys, 'frozen', False):
-            base = os.path.dirname(sys.executable)
-            for ext in extensions:
-                path = os.path.join(base, 'resources', 'icons', f"{icon_name}{ext}")
-                possible_paths.append(path)
-
-        # 3. 在当前工作目录中查找
-        for ext in extensions:
-            path = os.path.join(os.getcwd(), 'resources', 'icons', f"{icon_name}{ext}")
-            possible_paths.append(path)
-
-        # 4. 在项目根目录中查找（开发环境）
-        for ext in extensions:
-            path = os.path.join(self.resource_base, 'resources', 'icons', f"{icon_name}{ext}")
-            possible_paths.append(path)
-
-        # 5. 直接查找（可能图标文件就在根目录）
-        for ext in extensions:
-            path = os.path.join(self.resource_base, f"{icon_name}{ext}")
-            possible_paths.append(path)
-
-        # 去重
-        possible_paths = list(dict.fromkeys(possible_paths))
-
-        # 查找存在的文件
-        for path in possible_paths:
-            if os.path.exists(path):
-                logger.debug(f"找到图标: {icon_name} -> {path}")
-                return path
+            dirs.append(os.path.join(os.path.dirname(sys.executable), 'resources', 'icons'))
+        # 3. 当前工作目录
+        dirs.append(os.path.join(os.getcwd(), 'resources', 'icons'))
+        # 4. 项目根目录（开发环境）
+        dirs.append(os.path.join(self.resource_base, 'resources', 'icons'))
+        # 5. 项目根目录本身（图标文件可能就在根目录）
+        dirs.append(self.resource_base)
+        return list(dict.fromkeys(dirs))
+
+    def _load_atlas(self):
+        """加载预编译图集索引（只执行一次）"""
+        if self._atlas_loaded:
+            return
+        self._atlas_loaded = True
+
+        for icons_dir in self.get_icon_dirs()[:-1]:
+            index_path = os.path.join(icons_dir, ATLAS_DIR_NAME, ATLAS_INDEX_NAME)
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.error(f"读取图标图集索引失败: {index_path}, 错误: {e}")
+                continue
+
+            self._atlas_index = index.get('icons', {})
+            self._atlas_image_path = os.path.join(os.path.dirname(index_path), index.get('image', 'icons.png'))
+            logger.debug(f"已加载图标图集: {index_path}（{len(self._atlas_index)} 个图标）")
+            return
+
+        logger.debug("未找到图标图集，使用图标目录")
+
+    def _icon_from_atlas(self, icon_name):
+        """从图集中切出各尺寸的像素图组成图标，图集中没有时返回 None"""
+        self._load_atlas()
+        entry = self._atlas_index.get(icon_name)
+        if not entry:
+            return None
+
+        if self._atlas_pixmap is None:
+            self._atlas_pixmap = QPixmap(self._atlas_image_path)
+            if self._atlas_pixmap.isNull():
+                logger.error(f"加载图标图集失败: {self._atlas_image_path}")
+                self._atlas_index = {}
+                return None
+
+        icon = QIcon()
+        for x, y, width, height in entry.get('rects', {}).values():
+            icon.addPixmap(self._atlas_pixmap.copy(x, y, width, height))
+        return icon if not icon.isNull() else None
+
+    def _build_file_index(self):
+        """扫描一次图标目录，建立 名称 -> 路径 的索引"""
+        index = {}
+        for icons_dir in self.get_icon_dirs():
+            try:
+                entries = list(os.scandir(icons_dir))
+            except OSError:
+                continue
+            icons = []
+            for item in entries:
+                stem, ext = os.path.splitext(item.name)
+                if ext.lower() in ICON_EXTENSIONS and item.is_file():
+                    icons.append((ICON_EXTENSIONS.index(ext.lower()), stem, item))
+            # 同一目录中按扩展名优先级排列，先出现的目录优先
+            icons.sort(key=lambda icon: icon[0])
+            for _rank, stem, item in icons:
+                index.setdefault(stem, item.path)
+                index.setdefault(item.name, item.path)
+        logger.debug(f"图标文件索引已建立: {len(index)} 项")
+        return index
+
+    def get_icon_path(self, icon_name):
+        """获取图标文件路径（支持 "lock" 和 "lock.svg" 两种写法）"""
+        if self._file_index is None:
+            self._file_index = self._build_file_index()
+
+        path = self._file_index.get(icon_name)
+        if path:
+            return path
 
         logger.warning(f"未找到图标文件: {icon_name}")
         return None
@@ -107,9 +166,17 @@ class IconManager:
         """获取图标"""
         # 检查缓存
         if icon_name in self.icon_cache:
+            perf_monitor.cache_hit('icon')
             return self.icon_cache[icon_name]
+        perf_monitor.cache_miss('icon')
+
+        # 1. 优先从预编译图集加载（无需访问图标目录）
+        icon = self._icon_from_atlas(icon_name)
+        if icon is not None:
+            self.icon_cache[icon_name] = icon
+            return icon
 
-        # 1. 首先尝试从文件加载
+        # 2. 从图标文件加载
         icon_path = self.get_icon_path(icon_name)
         if icon_path:
             try:
@@ -120,13 +187,13 @@ class IconManager:
             except Exception as e:
                 logger.error(f"加载图标文件失败: {icon_name}, 错误: {e}")
 
-        # 2. 使用系统标准图标作为备选
+        # 3. 使用系统标准图标作为备选
         system_icon = self.get_system_icon(icon_name)
         if system_icon and not system_icon.isNull():
             self.icon_cache[icon_name] = system_icon
             return system_icon
 
-        # 3. 创建简单的彩色图标
+        # 4. 创建简单的彩色图标
         fallback_icon = self.create_simple_icon(icon_name)
         self.icon_cache[icon_name] = fallback_icon
         return fallback_icon
@@ -245,13 +312,13 @@ class IconManager:
             icon = self.get_icon(icon_name)
             if not icon.isNull():
                 window.setWindowIcon(icon)
-                print(f"窗口图标设置成功: {icon_name}")
+                logger.debug(f"窗口图标设置成功: {icon_name}")
                 return True
             else:
-                print(f"窗口图标设置失败，图标为空: {icon_name}")
+                logger.warning(f"窗口图标设置失败，图标为空: {icon_name}")
                 return False
         except Exception as e:
-            print(f"设置窗口图标时出错: {e}")
+            logger.error(f"设置窗口图标时出错: {e}")
             return False
 
     def set_action_icon(self, action, icon_name, fallback_text=""):
@@ -300,7 +367,7 @@ class IconManager:
 
     def test_all_icons(self):
         """测试所有图标"""
-        print("\n=== 图标测试 ===")
+        logger.debug("=== 图标测试 ===")
 
         test_icons = [
             ('sync', '同步'),
@@ -317,12 +384,16 @@ class IconManager:
             ('favicon', '程序图标'),
         ]
 
+        self._load_atlas()
         for icon_name, description in test_icons:
+            if icon_name in self._atlas_index:
+                logger.debug(f"✅ {description} [{icon_name}] - 图集")
+                continue
             icon_path = self.get_icon_path(icon_name)
             if icon_path and os.path.exists(icon_path):
-                print(f"✅ {description} [{icon_name}] - 文件: {os.path.basename(icon_path)}")
+                logger.debug(f"✅ {description} [{icon_name}] - 文件: {os.path.basename(icon_path)}")
             else:
-                print(f"⚠️ {description} [{icon_name}] - 使用备用图标")
+                logger.warning(f"⚠️ {description} [{icon_name}] - 使用备用图标")
 
     def load_svg_icon(self, icon_name, default_size=(32, 32)):
         """加载SVG图标并将其转换为QIcon"""
@@ -346,9 +417,9 @@ class IconManager:
                     self.icon_cache[icon_name] = icon
                     return icon
         except ImportError:
-            print("cairosvg 未安装，无法处理SVG图标")
+            logger.warning("cairosvg 未安装，无法处理SVG图标")
         except Exception as e:
-            print(f"SVG图标加载失败: {icon_name}, 错误: {e}")
+            logger.error(f"SVG图标加载失败: {icon_name}, 错误: {e}")
 
         return QIcon()
 
@@ -388,7 +459,7 @@ class IconManager:
                     self.icon_cache[icon_name] = icon
                     return icon
         except Exception as e:
-            print(f"从SVG创建图标失败: {e}")
+            logger.error(f"从SVG创建图标失败: {e}")
 
         return self.create_simple_icon(icon_name)
 
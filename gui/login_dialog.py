@@ -16,6 +16,7 @@ except ImportError:
                              QLineEdit, QPushButton, QMessageBox, QWidget)
     from PyQt5.QtCore import Qt
 from gui.icon_manager import get_icon_manager
+from utils.profiler import profile_operation
 import logging
 
 logger = logging.getLogger(__name__)
@@ -206,12 +207,12 @@ class LoginDialog(QDialog):
                 self.first_use_label.setVisible(True)
                 self.setWindowTitle("设置主密码")
                 self.login_button.setText("设置密码")
-                print("检测到首次使用")
+                logger.debug("检测到首次使用")
             else:
-                print("检测到已有验证令牌，需要验证主密码")
+                logger.debug("检测到已有验证令牌，需要验证主密码")
 
         except Exception as e:
-            print(f"检查首次使用状态错误: {e}")
+            logger.error(f"检查首次使用状态错误: {e}", exc_info=True)
             # 如果出错，假设是首次使用
             self.is_first_use = True
             self.first_use_label.setVisible(True)
@@ -231,12 +232,13 @@ class LoginDialog(QDialog):
 
         try:
             password = self.password_input.text().strip()
-            if self.is_first_use:
-                # 首次使用，设置主密码
-                self.setup_master_password(password)
-            else:
-                # 正常登录，验证主密码
-                self.verify_master_password(password)
+            with profile_operation('unlock'):
+                if self.is_first_use:
+                    # 首次使用，设置主密码
+                    self.setup_master_password(password)
+                else:
+                    # 正常登录，验证主密码
+                    self.verify_master_password(password)
             if not password:
                 QMessageBox.warning(self, "错误", "请输入主密码")
                 return
@@ -260,11 +262,11 @@ class LoginDialog(QDialog):
                     # 解锁会话
                     if self.session_manager.unlock(password):
                         QMessageBox.information(self, "成功", "主密码设置成功！")
-                        print("首次使用主密码设置成功")
+                        logger.debug("首次使用主密码设置成功")
                         self.accept()
                     else:
                         QMessageBox.critical(self, "错误", "设置主密码失败")
-                        print("首次使用主密码设置失败")
+                        logger.error("首次使用主密码设置失败")
                 else:
                     QMessageBox.critical(self, "错误", "创建验证令牌失败")
             else:
@@ -276,8 +278,7 @@ class LoginDialog(QDialog):
                     QMessageBox.critical(self, "错误", "设置主密码失败")
 
         except Exception as e:
-            logger.error(f"设置主密码失败: {e}")
-            print(f"设置主密码失败: {e}")
+            logger.error(f"设置主密码失败: {e}", exc_info=True)
             QMessageBox.critical(self, "错误", f"设置主密码失败: {str(e)}")
 
     def verify_master_password(self, password: str):
@@ -288,19 +289,19 @@ class LoginDialog(QDialog):
                 if self.database_manager.validate_master_password(password, self.encryption_manager):
                     # 解锁会话
                     if self.session_manager.unlock(password):
-                        print("主密码验证成功，解锁成功")
+                        logger.debug("主密码验证成功，解锁成功")
                         self.accept()
                         return
                     else:
-                        print("解锁失败")
+                        logger.error("解锁失败")
                         QMessageBox.critical(self, "错误", "解锁失败，请重试")
                         return
                 else:
-                    print("主密码不正确")
+                    logger.debug("主密码不正确")
                     QMessageBox.warning(self, "错误", "主密码不正确")
             else:
                 # 如果完整验证方法不存在，回退到简单验证
-                print("使用备用验证方法")
+                logger.debug("使用备用验证方法")
                 entries = self.database_manager.search_entries(limit=1)
                 if entries:
                     try:
@@ -327,8 +328,7 @@ class LoginDialog(QDialog):
                         return
 
         except Exception as e:
-            logger.error(f"验证主密码失败: {e}")
-            print(f"验证主密码失败: {e}")
+            logger.error(f"验证主密码失败: {e}", exc_info=True)
             QMessageBox.critical(self, "错误", f"验证密码失败: {str(e)}")
 
     def on_password_changed(self):
@@ -7,34 +7,66 @@
 # @Description:
 import logging
 import os
+import sys
 try:
     from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
                              QHeaderView, QTextEdit, QStatusBar,
-                             QToolBar, QMessageBox, QSplitter, QLabel, QApplication, QDialog)
-    from PyQt6.QtCore import Qt, QTimer, QSize
+                             QToolBar, QMessageBox, QSplitter, QLabel, QApplication, QDialog,
+                             QStackedWidget, QFileDialog, QProgressDialog, QListWidget, QListWidgetItem,
+                             QInputDialog, QMenu)
+    from PyQt6.QtCore import Qt, QTimer, QSize, QThread, pyqtSignal
     from PyQt6.QtGui import QAction
 except ImportError:
     from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
                              QHeaderView, QTextEdit, QStatusBar,
-                             QToolBar, QMessageBox, QSplitter, QLabel, QApplication, QDialog)
-    from PyQt5.QtCore import Qt, QTimer, QSize
+                             QToolBar, QMessageBox, QSplitter, QLabel, QApplication, QDialog,
+                             QStackedWidget, QFileDialog, QProgressDialog, QListWidget, QListWidgetItem,
+                             QInputDialog, QMenu)
+    from PyQt5.QtCore import Qt, QTimer, QSize, QThread, pyqtSignal
     from PyQt5.QtWidgets import QAction
 
 from core.database_manager import DatabaseManager
-from core.encryption_manager import EncryptionManager
+from core.encryption_manager import DEFAULT_KEY_CACHE_SIZE, EncryptionManager
 from core.config_manager import ConfigManager
 from core.session_manager import SessionManager
 from core.password_generator import PasswordGenerator
 from core.resource_manager import get_resource_manager
-from gui.login_dialog import LoginDialog
-from gui.settings_dialog import SettingsDialog
-from gui.add_edit_dialog import AddEditDialog
+from core.fuzzy_search import FuzzyIndex
+from core.search_index import SearchIndex
+from core.query_language import QuerySyntaxError, parse_query, parse_search
+from core.smart_folders import SmartFolder, load_folders, save_folders
+from core.perf_monitor import get_perf_monitor
+from core.startup_timeline import get_startup_timeline
+from utils.profiler import profile_operation
 from gui.icon_manager import get_icon_manager
 from gui.menu_manager import MenuManager
 
 logger = logging.getLogger(__name__)
+perf_monitor = get_perf_monitor()
+startup_timeline = get_startup_timeline()
+
+
+class FuzzyIndexWorker(QThread):
+    """后台线程：构建容错索引（记录快照由主线程取出后传入）"""
+
+    built = pyqtSignal(object, object)
+
+    def __init__(self, search_index, entries, parent=None):
+        super().__init__(parent)
+        self.search_index = search_index
+        self.entries = entries
+
+    def run(self):
+        fuzzy = None
+        try:
+            fuzzy = FuzzyIndex.build(self.entries)
+        except Exception as e:
+            logger.error(f"构建容错索引失败: {e}", exc_info=True)
+        finally:
+            self.entries = None
+        self.built.emit(self.search_index, fuzzy)
 
 
 class  MainWindow(QMainWindow):
@@ -45,7 +77,7 @@ class  MainWindow(QMainWindow):
         self.config_manager = config_manager
         self.session_manager = session_manager
         self.database_manager = DatabaseManager()
-        self.encryption_manager = EncryptionManager()
+        self.encryption_manager = EncryptionManager(key_cache_size=DEFAULT_KEY_CACHE_SIZE)
         self.password_generator = PasswordGenerator()
 
 
@@ -60,19 +92,43 @@ class  MainWindow(QMainWindow):
         # 当前选中的条目
         self.current_entry = None
 
-        # 加载模板
-        self.detail_template = self.load_detail_template()
-
-        self.setup_ui()
-        self.setup_menu()
-        self.setup_toolbar()
+        # 详情模板和渲染器在首次使用时加载
+        self._detail_template = None
+        self._detail_renderer = None
+        # 原生控件详情面板（ui.detail_view = "widget" 时创建）
+        self.detail_panel = None
+        # 当前显示的详情文档（持有引用，避免被缓存淘汰后释放）
+        self._detail_document = None
+
+        # 当前列表中的条目（ID -> 条目），切换选中项时不再查询数据库
+        self._entries_by_id = {}
+
+        # 解锁期间的内存搜索索引（列表和搜索不再查询数据库），锁定时丢弃
+        self._search_index = None
+        # 在后台构建容错索引的线程（构建完成前搜索只做子串匹配）
+        self._fuzzy_worker = None
+
+        # 智能文件夹（保存在数据库中的查询）及当前选中的文件夹名称（None 为全部记录）
+        self._smart_folders = []
+        self._current_folder = None
+
+        # 密码健康检查（首次使用时创建，保留强度缓存直到锁定）
+        self._vault_auditor = None
+
+        # 首次绘制后才执行的初始化（连接数据库、图标检查）
+        self._first_paint_done = False
+
+        with startup_timeline.phase('setup_ui'):
+            self.setup_ui()
+        with startup_timeline.phase('setup_menu'):
+            self.setup_menu()
+        with startup_timeline.phase('setup_toolbar'):
+            self.setup_toolbar()
         self.setup_signals()
 
         # 设置窗口图标
-        self.setup_icons()
-
-        # 检查菜单图标可用性
-        self.check_menu_icon_availability()
+        with startup_timeline.phase('setup_icons'):
+            self.setup_icons()
 
         # 自动锁定定时器
         self.auto_lock_timer = QTimer()
@@ -83,18 +139,46 @@ class  MainWindow(QMainWindow):
         self.session_manager.lock()
         self.update_lock_action_text()
 
+    def paintEvent(self, event):
+        """首次绘制后再进行耗时的初始化，让窗口尽快显示"""
+        super().paintEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            startup_timeline.mark('first_paint')
+            QTimer.singleShot(0, self.on_first_paint)
+
+    def on_first_paint(self):
+        """首次绘制后的延迟初始化"""
         # 尝试连接数据库
         self.connect_to_database()
 
+        # 检查菜单图标可用性（仅输出诊断信息，放到最后）
+        QTimer.singleShot(0, self.check_menu_icon_availability)
+
+    @property
+    def detail_template(self):
+        """详情模板（首次访问时加载）"""
+        if self._detail_template is None:
+            self._detail_template = self.load_detail_template()
+        return self._detail_template
+
+    @property
+    def detail_renderer(self):
+        """详情渲染器（首次访问时编译模板）"""
+        if self._detail_renderer is None:
+            from gui.detail_renderer import DetailRenderer
+            self._detail_renderer = DetailRenderer(self.detail_template)
+        return self._detail_renderer
+
     def load_detail_template(self):
         """加载详情模板"""
         template = self.resource_manager.get_template("detail_template.html")
         if template is None:
             # 如果模板文件不存在，使用内联的默认模板
             template = self.get_default_detail_template()
-            print("使用默认详情模板")
+            logger.debug("使用默认详情模板")
         else:
-            print("详情模板加载成功")
+            logger.debug("详情模板加载成功")
         return template
 
     def get_default_detail_template(self):
@@ -250,10 +334,10 @@ class  MainWindow(QMainWindow):
             alternative_names = ["icon", "app", "logo", "password", "lock"]
             for name in alternative_names:
                 if icon_manager.set_window_icon(self, name):
-                    print(f"使用备选图标: {name}")
+                    logger.debug(f"使用备选图标: {name}")
                     break
             else:
-                print("警告: 无法设置任何窗口图标")
+                logger.warning("无法设置任何窗口图标")
                 # 使用默认系统图标
                 from PyQt5.QtWidgets import QStyle
                 app_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_ComputerIcon)
@@ -283,18 +367,30 @@ class  MainWindow(QMainWindow):
         # 搜索栏
         search_layout = QHBoxLayout()
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("搜索网站名、URL、备注或分类...")
+        self.search_input.setPlaceholderText("搜索网站名、URL、备注或分类，或按字段查询，如 category:工作 site:git* -user:bob")
+        self.search_input.setToolTip(
+            "字段: site、url、user、category、notes、domain、updated、created、used\n"
+            "site:git* 前缀匹配，site:=GitHub 完整匹配，-notes:test 排除，OR 表示或者\n"
+            "updated:<2025-01-01 按日期比较，updated:<1y 表示超过一年未更新")
         self.search_button = QPushButton("搜索")
         self.clear_search_button = QPushButton("清除")
+        self.save_folder_button = QPushButton("保存为智能文件夹")
+        self.save_folder_button.setToolTip("把当前搜索保存为左侧的智能文件夹")
 
         search_layout.addWidget(QLabel("搜索:"))
         search_layout.addWidget(self.search_input)
         search_layout.addWidget(self.search_button)
         search_layout.addWidget(self.clear_search_button)
+        search_layout.addWidget(self.save_folder_button)
 
         # 分割器
         splitter = QSplitter(Qt.Orientation.Horizontal)
 
+        # 最左侧：智能文件夹
+        self.folder_list = QListWidget()
+        self.folder_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.update_folder_list()
+
         # 左侧：密码列表
         self.entries_table = QTableWidget()
         self.entries_table.setColumnCount(4)
@@ -309,6 +405,11 @@ class  MainWindow(QMainWindow):
 
         self.details_text = QTextEdit()
         self.details_text.setReadOnly(True)
+        self._default_document = self.details_text.document()
+
+        # 文本/模板视图与原生控件面板共用一个位置
+        self.details_stack = QStackedWidget()
+        self.details_stack.addWidget(self.details_text)
 
         # 操作按钮
         button_layout = QHBoxLayout()
@@ -321,12 +422,13 @@ class  MainWindow(QMainWindow):
         button_layout.addWidget(self.show_password_button)
 
         details_layout.addWidget(QLabel("详情:"))
-        details_layout.addWidget(self.details_text)
+        details_layout.addWidget(self.details_stack)
         details_layout.addLayout(button_layout)
 
+        splitter.addWidget(self.folder_list)
         splitter.addWidget(self.entries_table)
         splitter.addWidget(details_widget)
-        splitter.setSizes([400, 300])
+        splitter.setSizes([150, 400, 300])
 
         # 添加到主布局
         layout.addLayout(search_layout)
@@ -561,6 +663,12 @@ class  MainWindow(QMainWindow):
                 'icon': 'unlock' if self.session_manager.is_locked else 'lock',
                 'enabled': True
             },
+            {
+                'text': '导入...',
+                'icon': 'folder',
+                'enabled': True,
+                'tooltip': '从 Chrome / Edge / Firefox 或 KeePass 导出的文件导入'
+            },
             {'separator': True},
             {
                 'text': '退出',
@@ -575,7 +683,8 @@ class  MainWindow(QMainWindow):
         # 获取文件菜单中的动作
         self.sync_action = file_menu.actions()[0]
         self.lock_action = file_menu.actions()[1]
-        self.exit_action = file_menu.actions()[3]  # 跳过分隔符
+        self.import_action = file_menu.actions()[2]
+        self.exit_action = file_menu.actions()[4]  # 跳过分隔符
 
         # 编辑菜单
         edit_menu_data = [
@@ -611,6 +720,30 @@ class  MainWindow(QMainWindow):
                 'icon': 'key',
                 'enabled': True
             },
+            {
+                'text': '泄露密码检查',
+                'icon': 'lock',
+                'enabled': True,
+                'tooltip': '使用本地泄露密码数据集离线检查所有密码'
+            },
+            {
+                'text': '重复密码检查',
+                'icon': 'key',
+                'enabled': True,
+                'tooltip': '查找多个网站使用的相同密码'
+            },
+            {
+                'text': '密码健康检查',
+                'icon': 'lock',
+                'enabled': True,
+                'tooltip': '检查弱密码、重复密码、长期未更新和信息不完整的记录'
+            },
+            {
+                'text': '加密网站信息',
+                'icon': 'admin_password',
+                'enabled': True,
+                'tooltip': '在数据库中加密网站名称、网址、用户名和备注（或取消加密）'
+            },
             {
                 'text': '管理分类',
                 'icon': 'category',
@@ -633,9 +766,13 @@ class  MainWindow(QMainWindow):
 
         # 获取工具菜单中的动作
         self.generate_password_action = tools_menu.actions()[0]
-        self.manage_categories_action = tools_menu.actions()[1]
-        self.change_password_action = tools_menu.actions()[2]
-        self.settings_action = tools_menu.actions()[3]
+        self.breach_check_action = tools_menu.actions()[1]
+        self.reused_passwords_action = tools_menu.actions()[2]
+        self.audit_action = tools_menu.actions()[3]
+        self.metadata_encryption_action = tools_menu.actions()[4]
+        self.manage_categories_action = tools_menu.actions()[5]
+        self.change_password_action = tools_menu.actions()[6]
+        self.settings_action = tools_menu.actions()[7]
 
     def update_lock_action_text(self):
         """根据锁定状态更新锁定/解锁菜单项文本和图标"""
@@ -753,6 +890,11 @@ class  MainWindow(QMainWindow):
         self.search_button.clicked.connect(self.on_search)
         self.clear_search_button.clicked.connect(self.on_clear_search)
         self.search_input.returnPressed.connect(self.on_search)
+        self.save_folder_button.clicked.connect(self.on_save_smart_folder)
+
+        # 智能文件夹
+        self.folder_list.currentItemChanged.connect(self.on_folder_changed)
+        self.folder_list.customContextMenuRequested.connect(self.on_folder_context_menu)
 
         # 表格选择
         self.entries_table.itemSelectionChanged.connect(self.on_selection_changed)
@@ -768,8 +910,13 @@ class  MainWindow(QMainWindow):
         self.delete_action.triggered.connect(self.on_delete_entry)
         self.sync_action.triggered.connect(self.on_sync)
         self.lock_action.triggered.connect(self.on_lock)
+        self.import_action.triggered.connect(self.on_import_passwords)
         self.exit_action.triggered.connect(self.close)
         self.generate_password_action.triggered.connect(self.on_generate_password)
+        self.breach_check_action.triggered.connect(self.on_check_breaches)
+        self.reused_passwords_action.triggered.connect(self.on_find_reused_passwords)
+        self.audit_action.triggered.connect(self.on_audit_vault)
+        self.metadata_encryption_action.triggered.connect(self.on_toggle_metadata_encryption)
         self.manage_categories_action.triggered.connect(self.on_manage_categories)
         self.change_password_action.triggered.connect(self.on_change_password)
         self.settings_action.triggered.connect(self.on_settings)
@@ -780,32 +927,32 @@ class  MainWindow(QMainWindow):
         sqlite_path = db_config.get('sqlite_path', 'password_manager.db')
 
         # 调试信息
-        print(f"主窗口获取的数据库配置: use_sqlite={db_config.get('use_sqlite')}")
-        print(f"SQLite文件路径: {sqlite_path}")
+        logger.debug(f"主窗口获取的数据库配置: use_sqlite={db_config.get('use_sqlite')}")
+        logger.debug(f"SQLite文件路径: {sqlite_path}")
 
         # 情况1：如果配置文件明确要求使用SQLite，则直接连接SQLite
         if db_config.get('use_sqlite', True):
-            print("配置要求使用 SQLite 数据库")
+            logger.debug("配置要求使用 SQLite 数据库")
 
             # 检查SQLite文件是否存在
             if not os.path.exists(sqlite_path):
-                print(f"SQLite数据库文件不存在: {sqlite_path}")
+                logger.info(f"SQLite数据库文件不存在: {sqlite_path}")
 
                 # 检查是否配置了MySQL（作为备选）
                 mysql_configured = self._is_mysql_configured(db_config)
                 if mysql_configured:
-                    print("检测到MySQL配置，尝试连接MySQL...")
+                    logger.debug("检测到MySQL配置，尝试连接MySQL...")
                     # 询问用户是否使用已配置的MySQL
                     if self._ask_use_mysql():
                         # 临时切换到MySQL连接
-                        success = self.database_manager.connect(db_config)
+                        success = self._connect_database(db_config)
                         if success:
                             self.status_bar.showMessage("MySQL 数据库连接成功")
-                            print("MySQL 连接成功")
+                            logger.debug("MySQL 连接成功")
                             self.show_login_dialog()
                             return
                         else:
-                            print("MySQL 连接失败，继续SQLite流程")
+                            logger.warning("MySQL 连接失败，继续SQLite流程")
 
                 # 没有MySQL配置或连接失败，创建新的SQLite数据库
                 QMessageBox.information(self, "首次使用",
@@ -821,11 +968,11 @@ class  MainWindow(QMainWindow):
                     sys.exit(1)
             else:
                 # SQLite文件存在，直接静默连接
-                print(f"SQLite数据库文件已存在，直接连接")
+                logger.debug(f"SQLite数据库文件已存在，直接连接")
                 success = self._connect_with_retry(db_config)
                 if success:
                     self.status_bar.showMessage("SQLite 数据库已连接")
-                    print("SQLite 连接成功")
+                    logger.debug("SQLite 连接成功")
                     self.show_login_dialog()
                 else:
                     QMessageBox.critical(self, "错误", "无法连接SQLite数据库")
@@ -833,22 +980,22 @@ class  MainWindow(QMainWindow):
 
         # 情况2：配置要求使用MySQL
         else:
-            print("配置要求使用 MySQL 数据库")
+            logger.debug("配置要求使用 MySQL 数据库")
 
             # 检查MySQL配置是否完整
             if not self._is_mysql_configured(db_config):
-                print("MySQL配置不完整，显示设置窗口")
+                logger.warning("MySQL配置不完整，显示设置窗口")
                 self.show_database_settings()
                 return
 
             # 尝试连接MySQL
-            success = self.database_manager.connect(db_config)
+            success = self._connect_database(db_config)
             if success:
                 self.status_bar.showMessage("MySQL 数据库连接成功")
-                print("MySQL 连接成功")
+                logger.debug("MySQL 连接成功")
                 self.show_login_dialog()
             else:
-                print("MySQL 连接失败")
+                logger.error("MySQL 连接失败")
                 QMessageBox.warning(self, "连接失败",
                                     "无法连接到MySQL数据库，请检查配置和网络连接")
                 # 询问是否切换到SQLite
@@ -887,22 +1034,30 @@ class  MainWindow(QMainWindow):
         )
         return reply == QMessageBox.StandardButton.Yes
 
+    def _connect_database(self, db_config):
+        """连接数据库，启动期间的连接计入启动时间线"""
+        self._search_index = None
+        if startup_timeline.completed:
+            return self.database_manager.connect(db_config)
+        with startup_timeline.phase('connect_to_database'):
+            return self.database_manager.connect(db_config)
+
     def _connect_with_retry(self, db_config, max_retries=2):
         """带重试的数据库连接"""
         for attempt in range(max_retries):
             try:
-                success = self.database_manager.connect(db_config)
+                success = self._connect_database(db_config)
                 if success:
                     return True
 
                 # 如果连接失败，可能是数据库文件被占用
                 if attempt < max_retries - 1:
-                    print(f"连接失败，重试 {attempt + 1}/{max_retries}")
+                    logger.warning(f"连接失败，重试 {attempt + 1}/{max_retries}")
                     import time
                     time.sleep(1)  # 等待1秒后重试
 
             except Exception as e:
-                print(f"连接异常: {e}")
+                logger.error(f"连接异常: {e}")
                 if attempt < max_retries - 1:
                     import time
                     time.sleep(1)
@@ -919,12 +1074,23 @@ class  MainWindow(QMainWindow):
     def lock_application(self):
         """锁定应用程序"""
         self.session_manager.lock()
+        self.encryption_manager.clear_key_cache()
+        self.database_manager.set_metadata_keys(None)
         self.update_lock_action_text()
         self.status_bar.showMessage("应用程序已锁定")
         # 清空当前选择
         self.current_entry = None
-        self.details_text.clear()
+        self.clear_details()
         self.entries_table.clearSelection()
+        self._entries_by_id = {}
+        self._search_index = None
+        self._smart_folders = []
+        self._current_folder = None
+        self.update_folder_list()
+        if self._detail_renderer is not None:
+            self._detail_renderer.invalidate()
+        if self._vault_auditor is not None:
+            self._vault_auditor.invalidate()
 
     def show_login_dialog(self):
         """显示登录对话框"""
@@ -933,6 +1099,12 @@ class  MainWindow(QMainWindow):
             QMessageBox.warning(self, "错误", "数据库未连接")
             return
 
+        # 首次弹出登录框即视为启动完成
+        if startup_timeline.complete():
+            QTimer.singleShot(0, QApplication.instance().quit)
+            return
+
+        from gui.login_dialog import LoginDialog
         dialog = LoginDialog(
             self.session_manager,
             self.encryption_manager,
@@ -941,28 +1113,211 @@ class  MainWindow(QMainWindow):
         )
 
         if dialog.exec():
+            # 派生密码指纹等子密钥（一次 PBKDF2）
+            self.session_manager.derive_vault_keys(self.database_manager, self.encryption_manager)
             self.status_bar.showMessage("已解锁")
             self.update_lock_action_text()
+            self.rebuild_search_index()
             self.load_entries()
         else:
             # 如果取消登录，保持锁定状态
             self.update_lock_action_text()
 
+    @perf_monitor.track('ui')
+    def rebuild_search_index(self):
+        """从数据库读取全部记录重建内存搜索索引（解锁、导入、同步后调用）"""
+        self._search_index = None
+        if self.session_manager.is_locked:
+            return
+        self._smart_folders = load_folders(self.database_manager)
+        try:
+            # 容错索引构建较慢，放到后台线程，避免解锁时卡住界面
+            self._search_index = SearchIndex.build(self.database_manager.iter_entries(), fuzzy=False)
+            self._search_index.set_smart_folders(self._smart_folders)
+            self.start_fuzzy_index_build()
+            logger.debug(f"搜索索引已构建: {len(self._search_index)} 条记录，{len(self._smart_folders)} 个智能文件夹")
+        except Exception as e:
+            # 构建失败时列表和搜索回退到直接查询数据库
+            logger.error(f"构建搜索索引失败: {e}")
+        self.update_folder_list()
+
+    def start_fuzzy_index_build(self):
+        """在后台线程中构建当前搜索索引的容错索引"""
+        if self._fuzzy_worker is not None and self._fuzzy_worker.isRunning():
+            # 上一次构建的结果会因索引已更换而丢弃
+            self._fuzzy_worker.built.disconnect(self.on_fuzzy_index_built)
+        index = self._search_index
+        self._fuzzy_worker = FuzzyIndexWorker(index, index.begin_fuzzy_build(), self)
+        self._fuzzy_worker.built.connect(self.on_fuzzy_index_built)
+        self._fuzzy_worker.start()
+
+    def on_fuzzy_index_built(self, index, fuzzy):
+        """容错索引构建完成（主线程），索引已更换或已锁定时丢弃"""
+        if index is not self._search_index:
+            return
+        index.finish_fuzzy_build(fuzzy)
+
+    def refresh_index_entry(self, entry_id):
+        """记录新增、修改或删除后增量更新搜索索引"""
+        if self._search_index is None or entry_id is None:
+            return
+        entry = self.database_manager.get_entry(entry_id)
+        if entry is None:
+            self._search_index.remove(entry_id)
+        else:
+            self._search_index.upsert(entry)
+
+    @perf_monitor.track('ui')
     def load_entries(self, keyword: str = ""):
         """加载密码条目"""
         if self.session_manager.is_locked:
             return
 
         try:
-            entries = self.database_manager.search_entries(keyword)
+            query = parse_search(keyword)
+        except QuerySyntaxError as e:
+            self.status_bar.showMessage(f"查询语法错误: {e}")
+            return
+
+        try:
+            folder = self._current_folder
+            if folder is not None and not keyword and self._search_index is not None:
+                # 智能文件夹的成员已物化，直接取出
+                entries = self._search_index.folder_entries(folder)
+            elif query is not None:
+                # 按字段查询，结果按名称排序
+                if self._search_index is not None:
+                    entries = self._search_index.query(query)
+                else:
+                    entries = self.database_manager.query_entries(query)
+            elif self._search_index is not None:
+                # 有关键字时加入容错匹配，按匹配质量和使用次数排序
+                entries = self._search_index.ranked_search(keyword)
+            else:
+                entries = self.database_manager.search_entries(keyword)
+            if folder is not None and (keyword or self._search_index is None):
+                # 在智能文件夹中搜索
+                members = self._folder_members(folder)
+                entries = [entry for entry in entries if entry.id in members]
             self.populate_table(entries)
+            self.update_folder_counts()
+            perf_monitor.set_value('entries_loaded', len(entries))
             self.status_bar.showMessage(f"加载了 {len(entries)} 条记录")
         except Exception as e:
             logger.error(f"加载条目错误: {e}")
             self.status_bar.showMessage("加载记录失败")
 
+    def _folder_members(self, name: str) -> set:
+        """智能文件夹的成员 ID（没有内存索引时查询数据库）"""
+        if self._search_index is not None:
+            return self._search_index.folder_members(name)
+        folder = next((folder for folder in self._smart_folders if folder.name == name), None)
+        if folder is None:
+            return set()
+        return {entry.id for entry in self.database_manager.query_entries(folder.query)}
+
+    def update_folder_list(self):
+        """重建左侧的智能文件夹列表（解锁、锁定、文件夹增删后调用）"""
+        self.folder_list.blockSignals(True)
+        self.folder_list.clear()
+        all_item = QListWidgetItem("全部记录")
+        all_item.setData(Qt.ItemDataRole.UserRole, None)
+        self.folder_list.addItem(all_item)
+        current = all_item
+        for folder in self._smart_folders:
+            item = QListWidgetItem(folder.name)
+            item.setData(Qt.ItemDataRole.UserRole, folder.name)
+            item.setToolTip(folder.query)
+            self.folder_list.addItem(item)
+            if folder.name == self._current_folder:
+                current = item
+        if current is all_item:
+            self._current_folder = None
+        self.folder_list.setCurrentItem(current)
+        self.folder_list.blockSignals(False)
+        self.update_folder_counts()
+
+    def update_folder_counts(self):
+        """在文件夹名称后显示成员数（取物化集合的大小）"""
+        if self._search_index is None:
+            return
+        counts = self._search_index.folder_counts()
+        for row in range(1, self.folder_list.count()):
+            item = self.folder_list.item(row)
+            name = item.data(Qt.ItemDataRole.UserRole)
+            item.setText(f"{name} ({counts.get(name, 0)})")
+        self.folder_list.item(0).setText(f"全部记录 ({len(self._search_index)})")
+
+    def on_folder_changed(self, current, previous=None):
+        """切换智能文件夹"""
+        self._current_folder = current.data(Qt.ItemDataRole.UserRole) if current is not None else None
+        with profile_operation('search'):
+            self.load_entries(self.search_input.text().strip())
+
+    def on_save_smart_folder(self):
+        """把搜索框中的内容保存为智能文件夹"""
+        if self.session_manager.is_locked:
+            QMessageBox.warning(self, "警告", "请先解锁")
+            return
+        text = self.search_input.text().strip()
+        if not text:
+            QMessageBox.warning(self, "警告", "请先在搜索框中输入查询，如 category:金融 updated:<1y")
+            return
+        try:
+            parse_query(text)
+        except QuerySyntaxError as e:
+            QMessageBox.warning(self, "查询语法错误", str(e))
+            return
+
+        name, ok = QInputDialog.getText(self, "保存为智能文件夹", f"文件夹名称（查询: {text}）:")
+        name = name.strip()
+        if not ok or not name:
+            return
+        if any(folder.name == name for folder in self._smart_folders):
+            reply = QMessageBox.question(self, "智能文件夹", f"已有名为 '{name}' 的文件夹，是否替换？",
+                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+
+        folders = [folder for folder in self._smart_folders if folder.name != name] + [SmartFolder(name, text)]
+        if not save_folders(self.database_manager, folders):
+            QMessageBox.critical(self, "错误", "保存智能文件夹失败")
+            return
+        self._smart_folders = folders
+        if self._search_index is not None:
+            self._search_index.add_smart_folder(folders[-1])
+        self._current_folder = name
+        self.search_input.clear()
+        self.update_folder_list()
+        self.load_entries()
+        self.status_bar.showMessage(f"已保存智能文件夹: {name}")
+
+    def on_folder_context_menu(self, position):
+        """智能文件夹的右键菜单"""
+        item = self.folder_list.itemAt(position)
+        name = item.data(Qt.ItemDataRole.UserRole) if item is not None else None
+        if name is None:
+            return
+        menu = QMenu(self)
+        delete_action = menu.addAction("删除智能文件夹")
+        if menu.exec(self.folder_list.mapToGlobal(position)) is not delete_action:
+            return
+
+        folders = [folder for folder in self._smart_folders if folder.name != name]
+        if not save_folders(self.database_manager, folders):
+            QMessageBox.critical(self, "错误", "删除智能文件夹失败")
+            return
+        self._smart_folders = folders
+        if self._search_index is not None:
+            self._search_index.remove_smart_folder(name)
+        if self._current_folder == name:
+            self._current_folder = None
+        self.update_folder_list()
+        self.load_entries(self.search_input.text().strip())
+
     def populate_table(self, entries: list):
         """填充表格数据"""
+        self._entries_by_id = {entry.id: entry for entry in entries}
         self.entries_table.setRowCount(len(entries))
 
         for row, entry in enumerate(entries):
@@ -977,82 +1332,74 @@ class  MainWindow(QMainWindow):
             self.entries_table.setItem(row, 0, QTableWidgetItem(entry.website_name))
             self.entries_table.item(row, 0).setData(Qt.ItemDataRole.UserRole, entry.id)
 
+    @perf_monitor.track('ui')
     def on_selection_changed(self):
         """选中项改变"""
         selected_items = self.entries_table.selectedItems()
         if not selected_items:
             self.current_entry = None
-            self.details_text.clear()
+            self.clear_details()
             return
 
         row = selected_items[0].row()
         entry_id = self.entries_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
 
-        # 查找条目详情
-        entries = self.database_manager.search_entries()
-        for entry in entries:
-            if entry.id == entry_id:
-                self.current_entry = entry
-                self.update_details_display()
-                break
+        # 查找条目详情（使用填充表格时保存的条目）
+        entry = self._entries_by_id.get(entry_id)
+        if entry is None:
+            entry = self.database_manager.get_entry(entry_id)
+        if entry is not None:
+            self.current_entry = entry
+            self.update_details_display()
+
+    def get_detail_view(self):
+        """当前的详情显示方式"""
+        return self.config_manager.get_ui_config().get('detail_view', 'text')
+
+    def clear_details(self):
+        """清空详情显示"""
+        if self.detail_panel is not None:
+            self.detail_panel.clear()
+        self._show_detail_document(self._default_document)
+        self.details_text.clear()
 
-    def update_details_display_with_template(self):
-        """更新详情显示 - 使用模板"""
-        if not self.current_entry:
-            # 显示无选择状态
-            html = self.detail_template
-            # 确保显示无选择状态，隐藏详情内容
-            html = self.ensure_no_selection_display(html)
-            self.details_text.setHtml(html)
+    def _show_detail_document(self, document):
+        """切换详情文档"""
+        if self.details_text.document() is not document:
+            self.details_text.setDocument(document)
+        self._detail_document = document
+
+    def update_details_display(self):
+        """更新详情显示（ui.detail_view: text 纯文本 / template HTML模板 / widget 原生控件）"""
+        detail_view = self.get_detail_view()
+        if detail_view == 'widget':
+            self.update_details_display_with_panel()
             return
 
-        # 准备数据
-        website_name = self.escape_html(self.current_entry.website_name)
-
-        # URL处理：如果是空URL，显示"未设置"，否则创建可点击链接
-        if self.current_entry.url and self.current_entry.url.strip():
-            url_text = self.current_entry.url.strip()
-            # 确保URL有协议前缀
-            if not url_text.startswith(('http://', 'https://')):
-                url_text = 'https://' + url_text
-            url = f'<a href="{url_text}" target="_blank" class="info-value url">{self.escape_html(self.current_entry.url)}</a>'
+        if self.details_stack.currentWidget() is not self.details_text:
+            self.details_stack.setCurrentWidget(self.details_text)
+        if detail_view == 'template':
+            self.update_details_display_with_template()
         else:
-            url = '<span style="color: #6c757d; font-style: italic;">未设置</span>'
-
-        username = self.escape_html(self.current_entry.username)
-        category = self.escape_html(self.current_entry.category) if self.current_entry.category else '默认'
-        created_at = self.current_entry.created_at.strftime(
-            '%Y-%m-%d %H:%M') if self.current_entry.created_at else '<span style="color: #6c757d; font-style: italic;">未知</span>'
-        updated_at = self.current_entry.updated_at.strftime(
-            '%Y-%m-%d %H:%M') if self.current_entry.updated_at else '<span style="color: #6c757d; font-style: italic;">未知</span>'
-
-        # 备注处理：如果是空备注，显示特定提示
-        if self.current_entry.notes and self.current_entry.notes.strip():
-            notes = self.escape_html(self.current_entry.notes)
-        else:
-            notes = '<div class="empty-note">暂无备注信息</div>'
-
-        # 使用直接HTML替换的方法
-        html = self.detail_template
-
-        # 替换显示状态
-        html = html.replace('id="no-selection"', 'id="no-selection" style="display: none;"')
-        html = html.replace('id="detail-content" style="display: none;"', 'id="detail-content"')
+            self.update_details_display_text()
+
+    def update_details_display_with_panel(self):
+        """更新详情显示 - 使用原生控件面板，只更新变化的字段"""
+        if self.detail_panel is None:
+            from gui.detail_panel import DetailPanel
+            self.detail_panel = DetailPanel()
+            self.details_stack.addWidget(self.detail_panel)
+        if self.details_stack.currentWidget() is not self.detail_panel:
+            self.details_stack.setCurrentWidget(self.detail_panel)
+        self.detail_panel.set_entry(self.current_entry)
 
-        # 直接替换数据占位符
-        html = html.replace('id="website-name"></div>', f'id="website-name">{website_name}</div>')
-        html = html.replace('id="url"></div>', f'id="url">{url}</div>')
-        html = html.replace('id="username"></div>', f'id="username">{username}</div>')
-        html = html.replace('id="category"></span>', f'id="category">{category}</span>')
-        html = html.replace('id="created-at"></div>', f'id="created-at">{created_at}</div>')
-        html = html.replace('id="updated-at"></div>', f'id="updated-at">{updated_at}</div>')
-        html = html.replace('id="notes"></div>', f'id="notes">{notes}</div>')
-
-        self.details_text.setHtml(html)
-        print("详情数据填充完成")
+    def update_details_display_with_template(self):
+        """更新详情显示 - 使用预编译模板和按条目缓存的文档"""
+        self._show_detail_document(self.detail_renderer.document(self.current_entry))
 
-    def update_details_display(self):
+    def update_details_display_text(self):
         """更新详情显示 - 使用纯文本美化格式"""
+        self._show_detail_document(self._default_document)
         if not self.current_entry:
             # 显示无选择状态
             self.details_text.setPlainText("""
@@ -1111,29 +1458,11 @@ class  MainWindow(QMainWindow):
 
         self.details_text.setPlainText(details)
 
-
-    def ensure_no_selection_display(self, html):
-        """确保显示无选择状态"""
-        # 隐藏详情内容，显示无选择提示
-        html = html.replace('id="no-selection"', 'id="no-selection"')
-        html = html.replace('id="detail-content"', 'id="detail-content" style="display: none;"')
-        return html
-
-    def escape_html(self, text):
-        """转义HTML特殊字符"""
-        if not text:
-            return ""
-        return (text.replace('&', '&amp;')
-                .replace('<', '&lt;')
-                .replace('>', '&gt;')
-                .replace('"', '&quot;')
-                .replace("'", '&#39;')
-                .replace('\n', '<br>'))
-
     def on_search(self):
         """搜索处理"""
         keyword = self.search_input.text().strip()
-        self.load_entries(keyword)
+        with profile_operation('search'):
+            self.load_entries(keyword)
 
     def on_clear_search(self):
         """清除搜索"""
@@ -1143,13 +1472,14 @@ class  MainWindow(QMainWindow):
     def on_add_entry(self):
         """添加新条目"""
         try:
-            print("开始添加新条目...")
+            logger.debug("开始添加新条目...")
 
             if self.session_manager.is_locked:
                 QMessageBox.warning(self, "警告", "请先解锁应用程序")
                 return
 
-            print("创建 AddEditDialog...")
+            logger.debug("创建 AddEditDialog...")
+            from gui.add_edit_dialog import AddEditDialog
             # 传递 config_manager 参数
             dialog = AddEditDialog(
                 database_manager=self.database_manager,
@@ -1160,12 +1490,12 @@ class  MainWindow(QMainWindow):
                 parent=self
             )
 
-            print("显示对话框...")
+            logger.debug("显示对话框...")
             # 使用 QTimer 单次定时器来延迟对话框显示，避免栈问题
             QTimer.singleShot(0, lambda: self.safe_show_dialog(dialog))
 
         except Exception as e:
-            print(f"添加条目时出错: {e}")
+            logger.error(f"添加条目时出错: {e}")
             import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"打开添加对话框失败: {e}")
@@ -1180,6 +1510,7 @@ class  MainWindow(QMainWindow):
             QMessageBox.warning(self, "警告", "请先选择一个记录")
             return
 
+        from gui.add_edit_dialog import AddEditDialog
         # 传递 config_manager 参数
         dialog = AddEditDialog(
             database_manager=self.database_manager,
@@ -1191,6 +1522,7 @@ class  MainWindow(QMainWindow):
             entry=self.current_entry
         )
         if dialog.exec():
+            self.refresh_index_entry(dialog.saved_entry_id)
             self.load_entries()
             self.status_bar.showMessage("成功更新记录")
 
@@ -1199,15 +1531,16 @@ class  MainWindow(QMainWindow):
         try:
             result = dialog.exec()
             if result == QDialog.DialogCode.Accepted:
-                print("对话框接受，重新加载条目...")
+                logger.debug("对话框接受，重新加载条目...")
+                self.refresh_index_entry(dialog.saved_entry_id)
                 self.load_entries()
                 self.status_bar.showMessage("成功添加新记录")
             else:
-                print("对话框取消")
+                logger.debug("对话框取消")
             # 显式删除对话框
             dialog.deleteLater()
         except Exception as e:
-            print(f"显示对话框时出错: {e}")
+            logger.error(f"显示对话框时出错: {e}")
             import traceback
             traceback.print_exc()
 
@@ -1221,12 +1554,14 @@ class  MainWindow(QMainWindow):
             QMessageBox.warning(self, "警告", "请先选择一个记录")
             return
 
-            # 传递 config_manager 参数
+        from gui.add_edit_dialog import AddEditDialog
+        # 传递 config_manager 参数
         dialog = AddEditDialog(self.database_manager, self.encryption_manager,
                                self.session_manager, self.password_generator,
                                self.config_manager, self,  # 新增 config_manager
                                self.current_entry)
         if dialog.exec():
+            self.refresh_index_entry(dialog.saved_entry_id)
             self.load_entries()
             self.status_bar.showMessage("成功更新记录")
 
@@ -1248,6 +1583,8 @@ class  MainWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             if self.database_manager.delete_entry(self.current_entry.id):
+                if self._search_index is not None:
+                    self._search_index.remove(self.current_entry.id)
                 self.load_entries()
                 self.status_bar.showMessage("成功删除记录")
             else:
@@ -1267,7 +1604,7 @@ class  MainWindow(QMainWindow):
 
         except Exception as e:
             logger.error(f"复制用户名错误: {e}")
-            print(f"复制用户名详细错误: {e}")
+            logger.error(f"复制用户名详细错误: {e}")
             import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"复制用户名失败: {str(e)}")
@@ -1288,7 +1625,7 @@ class  MainWindow(QMainWindow):
                 QMessageBox.warning(self, "警告", "无法获取主密码，请重新登录")
                 return
 
-            print(f"尝试解密密码，加密数据长度: {len(self.current_entry.encrypted_password)}")
+            logger.debug(f"尝试解密密码，加密数据长度: {len(self.current_entry.encrypted_password)}")
 
             # 解密密码
             decrypted_password = self.encryption_manager.decrypt(
@@ -1299,6 +1636,12 @@ class  MainWindow(QMainWindow):
             clipboard = QApplication.clipboard()
             clipboard.setText(decrypted_password)
             self.status_bar.showMessage("密码已复制到剪贴板")
+            if self.database_manager.record_usage(self.current_entry.id):
+                self.current_entry.usage_count += 1
+                # 使用次数变化后更新索引，used: 条件的智能文件夹随之更新成员
+                if self._search_index is not None:
+                    self._search_index.upsert(self.current_entry)
+                    self.update_folder_counts()
 
             # 设置定时清除剪贴板
             security_config = self.config_manager.get_security_config()
@@ -1308,7 +1651,7 @@ class  MainWindow(QMainWindow):
 
         except Exception as e:
             logger.error(f"复制密码错误: {e}")
-            print(f"复制密码详细错误: {e}")
+            logger.error(f"复制密码详细错误: {e}")
             import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"解密密码失败: {str(e)}")
@@ -1321,7 +1664,6 @@ class  MainWindow(QMainWindow):
             self.status_bar.showMessage("剪贴板已清除")
         except Exception as e:
             logger.error(f"清除剪贴板错误: {e}")
-            print(f"清除剪贴板错误: {e}")
 
     def on_show_password(self):
         """显示密码"""
@@ -1339,7 +1681,7 @@ class  MainWindow(QMainWindow):
                 QMessageBox.warning(self, "警告", "无法获取主密码，请重新登录")
                 return
 
-            print(f"尝试显示密码，加密数据长度: {len(self.current_entry.encrypted_password)}")
+            logger.debug(f"尝试显示密码，加密数据长度: {len(self.current_entry.encrypted_password)}")
 
             # 解密密码
             decrypted_password = self.encryption_manager.decrypt(
@@ -1352,13 +1694,14 @@ class  MainWindow(QMainWindow):
 
         except Exception as e:
             logger.error(f"显示密码错误: {e}")
-            print(f"显示密码详细错误: {e}")
+            logger.error(f"显示密码详细错误: {e}")
             import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"解密密码失败: {str(e)}")
 
     def on_sync(self):
         """同步数据"""
+        self.rebuild_search_index()
         self.load_entries()
         self.status_bar.showMessage("数据已同步")
 
@@ -1374,13 +1717,80 @@ class  MainWindow(QMainWindow):
         # 更新锁定/解锁状态显示
         self.update_lock_action_text()
 
+    def on_import_passwords(self):
+        """从浏览器或 KeePass 导出的文件导入密码"""
+        if self.session_manager.is_locked:
+            QMessageBox.warning(self, "警告", "请先解锁应用程序")
+            return
+
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "导入密码", "",
+            "浏览器/KeePass 导出文件 (*.csv *.xml);;CSV 文件 (*.csv);;KeePass XML (*.xml)"
+        )
+        if not file_path:
+            return
+
+        from core.importers import ImporterError, detect_source, import_passwords
+        try:
+            source = detect_source(file_path)
+        except ImporterError as e:
+            QMessageBox.critical(self, "错误", str(e))
+            return
+        if source is None:
+            QMessageBox.warning(self, "警告", "无法识别的文件，请选择 Chrome / Edge / Firefox 导出的 CSV "
+                                            "或 KeePass 2.x 导出的 XML")
+            return
+
+        progress = QProgressDialog("正在导入密码...", None, 0, 0, self)
+        progress.setWindowTitle("导入")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.show()
+
+        def on_progress(done, total):
+            progress.setLabelText(f"正在导入密码... 已处理 {done} 条")
+            QApplication.processEvents()
+
+        try:
+            # 小批次，保证进度及时刷新
+            result = import_passwords(self.database_manager, self.encryption_manager,
+                                      self.session_manager.get_master_password(), file_path, source,
+                                      self.config_manager, batch_size=64, progress=on_progress,
+                                      fingerprint_key=self.session_manager.get_vault_key('fingerprint'))
+        except Exception as e:
+            logger.error(f"导入失败: {e}")
+            QMessageBox.critical(self, "错误", f"导入失败: {e}")
+            return
+        finally:
+            progress.close()
+
+        self.rebuild_search_index()
+        self.load_entries()
+        message = (f"导入 {result.imported} 条记录\n"
+                   f"跳过重复 {result.duplicates} 条，无效 {result.skipped} 条")
+        if result.new_categories:
+            message += f"\n新增分类: {', '.join(result.new_categories)}"
+        QMessageBox.information(self, "导入完成", message)
+
     def on_generate_password(self):
         """生成密码"""
         password = self.password_generator.generate_password()
         QMessageBox.information(self, "生成的密码", f"新密码:\n\n{password}")
 
+    def on_check_breaches(self):
+        """离线检查密码是否出现在泄露数据中"""
+        if self.session_manager.is_locked:
+            QMessageBox.warning(self, "警告", "请先解锁应用程序")
+            return
+
+        from gui.breach_check_dialog import BreachCheckDialog
+        dialog = BreachCheckDialog(self.database_manager, self.encryption_manager,
+                                   self.session_manager, self.config_manager, self)
+        dialog.exec()
+
     def on_settings(self):
         """打开设置"""
+        from gui.settings_dialog import SettingsDialog
         dialog = SettingsDialog(self.config_manager, self)
         if dialog.exec():
             # 检查是否需要重新连接数据库
@@ -1429,6 +1839,8 @@ class  MainWindow(QMainWindow):
             ui_config = self.config_manager.get_ui_config()
             self.resize(ui_config.get('window_width', 1000),
                         ui_config.get('window_height', 600))
+            # 详情显示方式可能已更改
+            self.update_details_display()
 
             security_config = self.config_manager.get_security_config()
             self.session_manager.auto_lock_minutes = security_config.get('auto_lock_minutes', 15)
@@ -1453,7 +1865,7 @@ class  MainWindow(QMainWindow):
                 self.config_manager.update_database_config(old_config)
 
         except Exception as e:
-            print(f"迁移失败: {e}")
+            logger.error(f"迁移失败: {e}")
             import traceback
             traceback.print_exc()
 
@@ -1464,17 +1876,21 @@ class  MainWindow(QMainWindow):
 
     def show_database_settings(self, show_welcome=False):
         """显示数据库设置对话框"""
+        from gui.settings_dialog import SettingsDialog
         dialog = SettingsDialog(self.config_manager, self)
         # 如果是首次使用，显示欢迎信息
         if show_welcome:
             dialog.setWindowTitle("首次设置 - 请选择数据库类型")
         if dialog.exec():
             # 保存配置后，重新连接数据库
-            print("设置已保存，重新连接数据库...")
+            logger.debug("设置已保存，重新连接数据库...")
             self.connect_to_database()
 
     def closeEvent(self, event):
         """关闭事件处理"""
+        if self._fuzzy_worker is not None and self._fuzzy_worker.isRunning():
+            self._fuzzy_worker.wait()
+
         if self.database_manager:
             self.database_manager.close()
 
@@ -1486,6 +1902,100 @@ class  MainWindow(QMainWindow):
 
         event.accept()
 
+    def on_find_reused_passwords(self):
+        """按密码指纹查找重复使用的密码"""
+        if self.session_manager.is_locked:
+            QMessageBox.warning(self, "警告", "请先解锁应用程序")
+            return
+
+        fingerprint_key = self.session_manager.get_vault_key('fingerprint')
+        if fingerprint_key is None and self.session_manager.derive_vault_keys(self.database_manager,
+                                                                              self.encryption_manager):
+            fingerprint_key = self.session_manager.get_vault_key('fingerprint')
+        if fingerprint_key is None:
+            QMessageBox.critical(self, "错误", "无法派生密码指纹密钥")
+            return
+
+        # 旧记录没有指纹，需要解密一次补全
+        if self.database_manager.get_entries_missing_fingerprint():
+            from core.fingerprints import backfill_fingerprints
+
+            progress = QProgressDialog("正在为已有记录生成密码指纹（仅首次）...", "取消", 0, 100, self)
+            progress.setWindowTitle("重复密码检查")
+            progress.setWindowModality(Qt.WindowModality.WindowModal)
+            progress.setMinimumDuration(0)
+            progress.show()
+            try:
+                backfill_fingerprints(
+                    self.database_manager, self.encryption_manager,
+                    self.session_manager.get_master_password(), fingerprint_key,
+                    progress=lambda done, total: progress.setValue(int(done * 100 / max(total, 1))),
+                    is_canceled=progress.wasCanceled)
+            finally:
+                progress.close()
+
+        from gui.reused_passwords_dialog import ReusedPasswordsDialog
+        dialog = ReusedPasswordsDialog(self.database_manager.find_reused_passwords(), self)
+        dialog.exec()
+
+    def on_audit_vault(self):
+        """密码健康检查（结果按记录缓存，再次检查只重新评估修改过的记录）"""
+        if self.session_manager.is_locked:
+            QMessageBox.warning(self, "警告", "请先解锁应用程序")
+            return
+
+        if self._vault_auditor is None:
+            from core.vault_audit import VaultAuditor
+            self._vault_auditor = VaultAuditor(self.encryption_manager)
+
+        from gui.audit_dialog import AuditDialog
+        dialog = AuditDialog(self.database_manager, self.session_manager, self._vault_auditor, self)
+        dialog.exec()
+
+    def on_toggle_metadata_encryption(self):
+        """开启或关闭元数据加密（转换所有已有记录）"""
+        if self.session_manager.is_locked:
+            QMessageBox.warning(self, "警告", "请先解锁应用程序")
+            return
+        if self.database_manager.metadata_crypto is None and not self.session_manager.derive_vault_keys(
+                self.database_manager, self.encryption_manager):
+            QMessageBox.critical(self, "错误", "无法派生元数据加密密钥")
+            return
+
+        enable = not self.database_manager.is_metadata_encrypted()
+        if enable:
+            message = ("开启后，网站名称、网址、用户名和备注在数据库中加密存储，"
+                       "搜索通过加密的索引令牌进行，只有解锁后才能看到这些信息。\n\n是否加密所有记录？")
+        else:
+            message = "关闭后，网站名称、网址、用户名和备注将以明文存储。\n\n是否解密所有记录？"
+        reply = QMessageBox.question(self, "加密网站信息", message,
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        progress = QProgressDialog("正在转换记录...", None, 0, 100, self)
+        progress.setWindowTitle("加密网站信息")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.show()
+
+        def report(done, total):
+            progress.setValue(done * 100 // max(total, 1))
+            QApplication.processEvents()
+
+        try:
+            success = self.database_manager.set_metadata_encryption(enable, report)
+        finally:
+            progress.close()
+
+        if not success:
+            QMessageBox.critical(self, "错误", "转换记录失败，数据库未做修改")
+            return
+        if self._detail_renderer is not None:
+            self._detail_renderer.invalidate()
+        self.rebuild_search_index()
+        self.load_entries()
+        QMessageBox.information(self, "加密网站信息", "已加密网站信息" if enable else "已取消加密网站信息")
+
     def on_manage_categories(self):
         """管理分类"""
         from .categories_dialog import CategoriesDialog
@@ -1519,13 +2029,18 @@ class  MainWindow(QMainWindow):
                 self.lock_application()
                 self.show_login_dialog()
             else:
+                # 所有记录已用新主密码重新加密，索引中的密文需要更新
+                self.rebuild_search_index()
+                self.load_entries()
                 QMessageBox.information(self, "成功",
                                         "主密码修改成功！\n"
                                         "请注意：某些操作可能需要重新登录后才能正常工作。")
 
     def check_menu_icon_availability(self):
         """检查菜单图标可用性"""
-        print("=== 菜单图标可用性检查 ===")
+        self.icon_manager.test_all_icons()
+
+        logger.debug("=== 菜单图标可用性检查 ===")
 
         # 定义需要的图标
         required_icons = {
@@ -1550,14 +2065,9 @@ class  MainWindow(QMainWindow):
             else:
                 missing.append(f"❌ {description} [{icon_name}]")
 
-        print("可用的图标:")
-        for item in available:
-            print(f"  {item}")
+        logger.debug("可用的图标: " + ", ".join(available))
 
         if missing:
-            print("\n缺失的图标:")
-            for item in missing:
-                print(f"  {item}")
-            print("\n建议: 使用Unicode字符作为备选方案")
+            logger.warning("缺失的图标（将使用Unicode字符作为备选）: " + ", ".join(missing))
         else:
-            print("\n所有图标都可用!")
\ No newline at end of file
+            logger.debug("所有图标都可用!")
\ No newline at end of file
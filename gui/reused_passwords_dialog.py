@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 18:55
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 重复密码对话框
+try:
+    from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                                 QTreeWidget, QTreeWidgetItem)
+except ImportError:
+    from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                                 QTreeWidget, QTreeWidgetItem)
+
+
+class ReusedPasswordsDialog(QDialog):
+    """按密码分组显示使用相同密码的记录"""
+
+    def __init__(self, groups, parent=None):
+        super().__init__(parent)
+        self.groups = groups
+        self.setup_ui()
+
+    def setup_ui(self):
+        """初始化UI"""
+        self.setWindowTitle("重复密码")
+        self.resize(560, 460)
+        self.setModal(True)
+
+        layout = QVBoxLayout(self)
+        if self.groups:
+            entry_count = sum(len(group) for group in self.groups)
+            summary = f"{len(self.groups)} 个密码被 {entry_count} 条记录重复使用，建议为每个网站设置不同的密码"
+        else:
+            summary = "没有发现重复使用的密码"
+        layout.addWidget(QLabel(summary))
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["网站名称", "用户名", "分类"])
+        for index, group in enumerate(self.groups, 1):
+            group_item = QTreeWidgetItem([f"密码 {index}（{len(group)} 条记录）", "", ""])
+            for entry in group:
+                group_item.addChild(QTreeWidgetItem([entry.website_name, entry.username, entry.category]))
+            self.tree.addTopLevelItem(group_item)
+        self.tree.expandAll()
+        self.tree.resizeColumnToContents(0)
+        layout.addWidget(self.tree)
+
+        button_layout = QHBoxLayout()
+        close_button = QPushButton("关闭")
+        close_button.clicked.connect(self.accept)
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
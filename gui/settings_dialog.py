@@ -9,15 +9,18 @@ try:
     from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                              QLineEdit, QPushButton, QMessageBox, QSpinBox,
                              QCheckBox, QTabWidget, QWidget, QFormLayout,
-                             QGroupBox, QTextEdit)  # 添加 QTextEdit 导入
+                             QGroupBox, QTextEdit, QFileDialog, QComboBox)  # 添加 QTextEdit 导入
+    from PyQt6.QtCore import QTimer
 except:
     from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                              QLineEdit, QPushButton, QMessageBox, QSpinBox,
                              QCheckBox, QTabWidget, QWidget, QFormLayout,
-                             QGroupBox, QTextEdit)
+                             QGroupBox, QTextEdit, QFileDialog, QComboBox)
+    from PyQt5.QtCore import QTimer
 
 from gui.categories_dialog import CategoriesDialog
 from gui.change_master_password_dialog import ChangeMasterPasswordDialog
+from core.perf_monitor import get_perf_monitor
 
 
 class SettingsDialog(QDialog):
@@ -56,10 +59,16 @@ class SettingsDialog(QDialog):
         self.categories_tab = QWidget()
         self.setup_categories_tab()
 
+        # 性能诊断
+        self.diagnostics_tab = QWidget()
+        self.setup_diagnostics_tab()
+
         self.tabs.addTab(self.db_tab, "数据库")
         self.tabs.addTab(self.security_tab, "安全")
         self.tabs.addTab(self.ui_tab, "界面")
         self.tabs.addTab(self.categories_tab, "分类")
+        self.tabs.addTab(self.diagnostics_tab, "诊断")
+        self.tabs.currentChanged.connect(self.on_tab_changed)
 
         layout.addWidget(self.tabs)
 
@@ -187,8 +196,15 @@ class SettingsDialog(QDialog):
         self.window_height = QSpinBox()
         self.window_height.setRange(400, 1500)
 
+        # 详情显示方式
+        self.detail_view = QComboBox()
+        self.detail_view.addItem("纯文本", "text")
+        self.detail_view.addItem("HTML模板", "template")
+        self.detail_view.addItem("原生控件（最快）", "widget")
+
         layout.addRow("窗口默认宽度:", self.window_width)
         layout.addRow("窗口默认高度:", self.window_height)
+        layout.addRow("详情显示方式:", self.detail_view)
 
     def setup_categories_tab(self):
         """设置分类选项卡"""
@@ -216,6 +232,106 @@ class SettingsDialog(QDialog):
         # 信号连接
         self.manage_categories_button.clicked.connect(self.on_manage_categories)
 
+    def setup_diagnostics_tab(self):
+        """设置性能诊断选项卡"""
+        layout = QVBoxLayout(self.diagnostics_tab)
+
+        summary_group = QGroupBox("概览")
+        summary_layout = QFormLayout(summary_group)
+        self.diag_unlock_label = QLabel("-")
+        self.diag_decrypt_label = QLabel("-")
+        self.diag_entries_label = QLabel("-")
+        self.diag_rss_label = QLabel("-")
+        summary_layout.addRow("最近解锁KDF耗时:", self.diag_unlock_label)
+        summary_layout.addRow("平均解密耗时:", self.diag_decrypt_label)
+        summary_layout.addRow("已加载条目数:", self.diag_entries_label)
+        summary_layout.addRow("进程内存(RSS):", self.diag_rss_label)
+        layout.addWidget(summary_group)
+
+        # 数据库查询、缓存命中率、启动阶段
+        self.diag_details = QTextEdit()
+        self.diag_details.setReadOnly(True)
+        layout.addWidget(self.diag_details)
+
+        button_layout = QHBoxLayout()
+        self.diag_refresh_button = QPushButton("刷新")
+        self.diag_export_button = QPushButton("导出性能快照...")
+        button_layout.addWidget(self.diag_refresh_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.diag_export_button)
+        layout.addLayout(button_layout)
+
+        # 诊断页可见时每秒刷新一次
+        self.diag_timer = QTimer(self)
+        self.diag_timer.timeout.connect(self.update_diagnostics)
+
+        # 信号连接
+        self.diag_refresh_button.clicked.connect(self.update_diagnostics)
+        self.diag_export_button.clicked.connect(self.on_export_snapshot)
+
+    def on_tab_changed(self, index):
+        """切换选项卡时启停诊断刷新"""
+        if self.tabs.widget(index) is self.diagnostics_tab:
+            self.update_diagnostics()
+            self.diag_timer.start(1000)
+        else:
+            self.diag_timer.stop()
+
+    def update_diagnostics(self):
+        """刷新诊断数据"""
+        monitor = get_perf_monitor()
+        snapshot = monitor.snapshot()
+        values = snapshot['values']
+        timings = snapshot['timings']
+
+        unlock_ms = values.get('last_unlock_kdf_ms')
+        self.diag_unlock_label.setText(f"{unlock_ms} ms" if unlock_ms is not None else "尚未解锁")
+
+        decrypt = timings.get('crypto.decrypt')
+        if decrypt:
+            self.diag_decrypt_label.setText(f"{decrypt['avg_ms']} ms（{decrypt['count']} 次）")
+        else:
+            self.diag_decrypt_label.setText("无记录")
+
+        self.diag_entries_label.setText(str(values.get('entries_loaded', 0)))
+        self.diag_rss_label.setText(f"{snapshot['rss_bytes'] / 1024 / 1024:.1f} MB")
+
+        lines = ["[数据库查询]", f"{'方法':<28}{'次数':>6}{'p50(ms)':>10}{'p95(ms)':>10}"]
+        for name, stat in sorted(monitor.get_timings('db').items()):
+            lines.append(f"{name:<28}{stat['count']:>6}{stat['p50_ms']:>10}{stat['p95_ms']:>10}")
+
+        lines.append("")
+        lines.append("[界面与加密]")
+        for name, stat in sorted(timings.items()):
+            if name.startswith('db.'):
+                continue
+            lines.append(f"{name:<28}{stat['count']:>6}{stat['p50_ms']:>10}{stat['p95_ms']:>10}")
+
+        lines.append("")
+        lines.append("[缓存命中率]")
+        for name, stat in sorted(snapshot['caches'].items()):
+            lines.append(f"{name:<16}{stat['hit_rate'] * 100:>7.1f}%  (命中 {stat['hits']} / 未命中 {stat['misses']})")
+
+        lines.append("")
+        lines.append("[启动阶段]")
+        for phase in snapshot['startup_phases']:
+            lines.append(f"{phase['name']:<28}+{phase['start_ms']:>9} ms  {phase['duration_ms']:>9} ms")
+
+        self.diag_details.setPlainText("\n".join(lines))
+
+    def on_export_snapshot(self):
+        """导出性能快照"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出性能快照", "passwdmgr_perf_snapshot.json", "JSON 文件 (*.json)"
+        )
+        if not file_path:
+            return
+
+        if get_perf_monitor().export_snapshot(file_path):
+            QMessageBox.information(self, "成功", f"性能快照已导出:\n{file_path}")
+        else:
+            QMessageBox.critical(self, "错误", "导出性能快照失败")
+
     def on_manage_categories(self):
         """打开分类管理对话框"""
         dialog = CategoriesDialog(self.config_manager, self)
@@ -257,6 +373,8 @@ class SettingsDialog(QDialog):
         ui_config = self.config_manager.get_ui_config()
         self.window_width.setValue(ui_config.get('window_width', 1000))
         self.window_height.setValue(ui_config.get('window_height', 600))
+        index = self.detail_view.findData(ui_config.get('detail_view', 'text'))
+        self.detail_view.setCurrentIndex(max(index, 0))
 
         # 分类设置（新增）
         self.update_categories_preview()
@@ -292,18 +410,21 @@ class SettingsDialog(QDialog):
         }
         self.config_manager.update_database_config(db_config)
 
-        # 保存安全配置
-        security_config = {
+        # 保存安全配置（保留对话框中没有的其他安全设置）
+        security_config = dict(self.config_manager.get_security_config())
+        security_config.update({
             'auto_lock_minutes': self.auto_lock_minutes.value(),
             'clear_clipboard_seconds': self.clear_clipboard_seconds.value()
-        }
+        })
         self.config_manager.update_security_config(security_config)
 
-        # 保存界面配置
-        ui_config = {
+        # 保存界面配置（保留对话框中没有的其他界面设置）
+        ui_config = dict(self.config_manager.get_ui_config())
+        ui_config.update({
             'window_width': self.window_width.value(),
-            'window_height': self.window_height.value()
-        }
+            'window_height': self.window_height.value(),
+            'detail_view': self.detail_view.currentData()
+        })
         self.config_manager.update_ui_config(ui_config)
 
         QMessageBox.information(self, "成功", "设置已保存，重启程序后生效")
@@ -9,11 +9,72 @@
 import sys
 import os
 import ctypes
+import atexit
 import logging
+
+# 启动时间线的参考时间点在此模块首次导入时确定，需尽早导入
+from core.startup_timeline import get_startup_timeline
+
+# 性能剖析需要在导入 Qt 和业务模块之前启动，才能覆盖启动过程
+from utils.profiler import parse_profile_args, start_profiler, stop_profiler
 try:
-    from PyQt6.QtWidgets import QApplication
-except:
-    from PyQt5.QtWidgets import QApplication
+    _profile_config, sys.argv[1:] = parse_profile_args(sys.argv[1:])
+except ValueError as e:
+    sys.stderr.write(f"用法错误: {e}\n")
+    sys.exit(2)
+if _profile_config:
+    start_profiler(**_profile_config)
+    atexit.register(stop_profiler)
+
+# 导入耗时统计（--import-report 或 PASSWDMGR_IMPORT_REPORT=1）
+if '--import-report' in sys.argv or os.environ.get('PASSWDMGR_IMPORT_REPORT'):
+    sys.argv = [arg for arg in sys.argv if arg != '--import-report']
+    from utils.import_timer import start_import_timer
+    start_import_timer()
+
+
+def parse_startup_args(argv, environ=None):
+    """解析启动报告参数
+
+    --startup-report[=文件]  启动完成后输出启动时间线（可同时写出JSON文件）
+    --startup-exit          启动完成后直接退出（用于启动耗时基准测试）
+    也可使用环境变量 PASSWDMGR_STARTUP_REPORT / PASSWDMGR_STARTUP_EXIT
+
+    返回 (选项字典, 去掉启动报告参数后的 argv)
+    """
+    environ = os.environ if environ is None else environ
+    report = environ.get('PASSWDMGR_STARTUP_REPORT') or None
+    exit_after_startup = environ.get('PASSWDMGR_STARTUP_EXIT', '') not in ('', '0', 'false', 'no')
+
+    remaining = []
+    for arg in argv:
+        if arg == '--startup-report':
+            report = report or '1'
+        elif arg.startswith('--startup-report='):
+            report = arg.split('=', 1)[1]
+        elif arg == '--startup-exit':
+            exit_after_startup = True
+        else:
+            remaining.append(arg)
+
+    print_report = bool(report) and report not in ('0', 'false', 'no')
+    report_path = report if print_report and report not in ('1', 'true', 'yes') else None
+    return {
+        'print_report': print_report,
+        'report_path': report_path,
+        'exit_after_startup': exit_after_startup
+    }, remaining
+
+
+_startup_options, sys.argv[1:] = parse_startup_args(sys.argv[1:])
+startup_timeline = get_startup_timeline()
+startup_timeline.configure(**_startup_options)
+
+with startup_timeline.phase('import_qt'):
+    try:
+        from PyQt6.QtWidgets import QApplication
+    except:
+        from PyQt5.QtWidgets import QApplication
 import traceback
 sys.excepthook = lambda exctype, value, tb: (
     print(''.join(traceback.format_exception(exctype, value, tb))),
@@ -23,19 +84,13 @@ sys.excepthook = lambda exctype, value, tb: (
 # 添加项目路径
 # sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from gui.main_window import MainWindow
+# 主窗口在 QApplication 创建后再导入，见 PasswordManagerApp.__init__
 from core.config_manager import ConfigManager
 from core.session_manager import SessionManager
 
-# 配置日志
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('password_manager.log'),
-        logging.StreamHandler()
-    ]
-)
+# 配置日志（先使用默认配置，读取 config.json 后再按其中的 logging 配置重建）
+from core.log_manager import setup_logging
+setup_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -53,25 +108,31 @@ sys.excepthook = excepthook
 class PasswordManagerApp:
     def __init__(self):
         try:
-            print("初始化应用程序...")
-            self.app = QApplication(sys.argv)
-            self.app.setApplicationName("Password Manager")
-            self.app.setApplicationVersion("1.0.0")
+            logger.info("初始化应用程序...")
+            with startup_timeline.phase('qapplication'):
+                self.app = QApplication(sys.argv)
+                self.app.setApplicationName("Password Manager")
+                self.app.setApplicationVersion("1.0.0")
 
             # 设置高 DPI 支持
             # self.app.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling, True)
             # self.app.setAttribute(Qt.ApplicationAttribute.AA_UseHighDpiPixmaps, True)
 
             # 初始化管理器
-            self.config_manager = ConfigManager()
+            with startup_timeline.phase('config_manager'):
+                self.config_manager = ConfigManager()
+                setup_logging(self.config_manager.get_logging_config())
             self.session_manager = SessionManager()
 
-            # 创建主窗口
-            self.main_window = MainWindow(
-                config_manager=self.config_manager,
-                session_manager=self.session_manager
-            )
-            print("应用程序初始化完成")
+            # 创建主窗口（数据库连接、图标检查等在首次绘制后进行）
+            with startup_timeline.phase('import_main_window'):
+                from gui.main_window import MainWindow
+            with startup_timeline.phase('main_window'):
+                self.main_window = MainWindow(
+                    config_manager=self.config_manager,
+                    session_manager=self.session_manager
+                )
+            logger.info("应用程序初始化完成")
 
         except Exception as e:
             print(f"应用程序初始化失败: {e}")
@@ -81,15 +142,27 @@ class PasswordManagerApp:
     def run(self):
         """运行应用程序"""
         try:
-            print("显示主窗口...")
+            logger.debug("显示主窗口...")
             self.main_window.show()
-            print("进入应用程序事件循环...")
+            self.report_imports()
+            logger.debug("进入应用程序事件循环...")
             return self.app.exec()
         except Exception as e:
             logger.error(f"应用程序运行错误: {e}")
             traceback.print_exc()
             return 1
 
+    def report_imports(self):
+        """输出导入耗时报告（仅在启用 --import-report 时）"""
+        from utils.import_timer import get_import_timer
+        import_timer = get_import_timer()
+        if import_timer is None:
+            return
+        import_timer.uninstall()
+        report = import_timer.report()
+        logger.info(report)
+        print(report)
+
 
 def main():
     """主函数"""
@@ -98,7 +171,9 @@ def main():
         if not os.path.exists('resources'):
             print("警告: resources 目录不存在")
         app = PasswordManagerApp()
-        sys.exit(app.run())
+        exit_code = app.run()
+        stop_profiler()
+        sys.exit(exit_code)
     except Exception as e:
         print(f"应用程序启动失败: {e}")
         traceback.print_exc()
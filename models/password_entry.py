@@ -25,6 +25,14 @@ class PasswordEntry:
     category: str = "默认"
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    password_fingerprint: Optional[str] = None  # 密码的 HMAC 指纹，用于查找重复密码
+    domain: Optional[str] = None  # 网址的可注册域名（写入时由数据库管理器计算）
+    usage_count: int = 0  # 复制/读取密码的次数，用于搜索结果排序
+    # 由网站名称计算的排序键和搜索键（见 utils/text_keys.py，写入时计算，不导出）
+    sort_key: Optional[str] = None
+    search_key: Optional[str] = None
+    pinyin_full: Optional[str] = None
+    pinyin_initials: Optional[str] = None
 
     def to_dict(self) -> dict:
         """转换为字典"""
@@ -37,7 +45,10 @@ class PasswordEntry:
             'notes': self.notes,
             'category': self.category,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'password_fingerprint': self.password_fingerprint,
+            'domain': self.domain,
+            'usage_count': self.usage_count
         }
 
     @classmethod
@@ -56,7 +67,14 @@ class PasswordEntry:
             notes=data.get('notes', ''),
             category=data.get('category', '默认'),
             created_at=created_at,
-            updated_at=updated_at
+            updated_at=updated_at,
+            password_fingerprint=data.get('password_fingerprint'),
+            domain=data.get('domain'),
+            usage_count=data.get('usage_count') or 0,
+            sort_key=data.get('sort_key'),
+            search_key=data.get('search_key'),
+            pinyin_full=data.get('pinyin_full'),
+            pinyin_initials=data.get('pinyin_initials')
         )
 
     @staticmethod
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 21:00
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 命令行客户端入口
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli.passwdmgr import main
+
+if __name__ == "__main__":
+    sys.exit(main())
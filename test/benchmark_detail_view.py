@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 15:20
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 详情显示方式基准测试（纯文本 / HTML模板 / 原生控件）
+# benchmark_detail_view.py
+"""
+模拟在列表中用方向键逐条浏览，比较三种详情显示方式每次切换的耗时:
+    python test/benchmark_detail_view.py [条目数] [轮数]
+
+    逐项替换   旧版模板路径（每次 str.replace + setHtml）
+    模板       DetailRenderer（预编译模板 + 按条目缓存的文档）
+    原生控件   DetailPanel（只更新变化的字段）
+    纯文本     setPlainText
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+try:
+    from PyQt6.QtWidgets import QApplication, QTextEdit
+except ImportError:
+    from PyQt5.QtWidgets import QApplication, QTextEdit
+
+from models.password_entry import PasswordEntry
+from core.resource_manager import get_resource_manager
+from gui.detail_renderer import DetailRenderer
+from gui.detail_panel import DetailPanel
+
+
+def make_entries(count):
+    """生成测试条目"""
+    now = datetime.now()
+    categories = ["工作", "个人", "金融", "社交", "邮箱"]
+    return [
+        PasswordEntry(
+            id=i + 1,
+            website_name=f"网站 {i}",
+            url=f"https://www.example{i}.com/login",
+            username=f"user{i}@example.com",
+            notes=f"第 {i} 条备注\n第二行" if i % 3 else "",
+            category=categories[i % len(categories)],
+            created_at=now - timedelta(days=i),
+            updated_at=now - timedelta(hours=i),
+        )
+        for i in range(count)
+    ]
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))]
+
+
+def measure(name, entries, rounds, show, app):
+    """逐条显示所有条目，返回每次切换耗时（毫秒）"""
+    timings = []
+    for _ in range(rounds):
+        for entry in entries:
+            start = time.perf_counter()
+            show(entry)
+            app.processEvents()
+            timings.append((time.perf_counter() - start) * 1000)
+    print(f"{name:<10} p50={percentile(timings, 50):7.3f} ms  p95={percentile(timings, 95):7.3f} ms  "
+          f"合计={sum(timings):9.1f} ms")
+    return timings
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    entries = make_entries(count)
+    template = get_resource_manager().get_template("detail_template.html")
+    renderer = DetailRenderer(template, cache_size=count)
+
+    text_edit = QTextEdit()
+    text_edit.resize(400, 600)
+    text_edit.show()
+    # 模板路径会替换编辑框的文档，单独使用一个编辑框
+    template_edit = QTextEdit()
+    template_edit.resize(400, 600)
+    template_edit.show()
+    panel = DetailPanel()
+    panel.resize(400, 600)
+    panel.show()
+
+    print(f"条目数: {count}，轮数: {rounds}（第一轮模板缓存为冷缓存）")
+
+    def show_replace(entry):
+        html = renderer.no_selection_html
+        html = html.replace('id="no-selection"', 'id="no-selection" style="display: none;"')
+        html = html.replace('id="detail-content" style="display: none;"', 'id="detail-content"')
+        for element_id, value in (('website-name', entry.website_name), ('url', entry.url),
+                                  ('username', entry.username), ('created-at', str(entry.created_at)),
+                                  ('updated-at', str(entry.updated_at)), ('notes', entry.notes)):
+            html = html.replace(f'id="{element_id}"></div>', f'id="{element_id}">{renderer.escape(value)}</div>')
+        html = html.replace('id="category"></span>', f'id="category">{renderer.escape(entry.category)}</span>')
+        text_edit.setHtml(html)
+
+    # 持有已显示文档的引用，避免缓存淘汰后被释放
+    documents = []
+
+    def show_template(entry):
+        document = renderer.document(entry)
+        documents.append(document)
+        template_edit.setDocument(document)
+
+    def show_plain(entry):
+        text_edit.setPlainText(f"{entry.website_name}\n{entry.url}\n{entry.username}\n"
+                               f"{entry.category}\n{entry.notes}")
+
+    measure("逐项替换", entries, rounds, show_replace, app)
+    measure("模板", entries, rounds, show_template, app)
+    measure("原生控件", entries, rounds, panel.set_entry, app)
+    measure("纯文本", entries, rounds, show_plain, app)
+
+
+if __name__ == "__main__":
+    main()
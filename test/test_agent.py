@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 21:40
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 代理协议与派生密钥缓存测试
+# test_agent.py
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli.agent import AgentError, default_socket_path, recv_message, send_message
+from core.encryption_manager import EncryptionManager
+
+
+def test_framing():
+    """长度前缀的 JSON 消息可以完整往返，过大的消息被拒绝"""
+    left, right = socket.socketpair()
+    with left, right:
+        message = {'op': 'get', 'target': '示例' * 1000, 'user': None, 'password': True}
+        send_message(left, message)
+        assert recv_message(right) == message
+
+        left.sendall((64 * 1024 * 1024).to_bytes(4, 'big'))
+        try:
+            recv_message(right)
+            assert False, "应拒绝过大的消息"
+        except AgentError:
+            pass
+    print("✓ 消息帧正确")
+
+
+def test_socket_path_per_config():
+    """不同配置文件对应不同的代理套接字"""
+    os.environ.pop('PASSWDMGR_AGENT_SOCK', None)
+    assert default_socket_path('a/config.json') != default_socket_path('b/config.json')
+    assert default_socket_path('config.json') == default_socket_path(os.path.abspath('config.json'))
+    print("✓ 套接字路径按配置区分")
+
+
+def test_key_cache():
+    """缓存的密钥与直接派生的一致，清空后重新派生"""
+    plain = EncryptionManager()
+    cached = EncryptionManager(key_cache_size=2)
+    salt = os.urandom(16)
+
+    start = time.perf_counter()
+    key = cached.derive_key('master', salt)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    again = cached.derive_key('master', salt)
+    second = time.perf_counter() - start
+    assert again == key == plain.derive_key('master', salt)
+    assert second < first / 10
+    assert cached.derive_key('other', salt) != key
+
+    for _ in range(3):
+        cached.derive_key('master', os.urandom(16))
+    assert len(cached._key_cache) == 2
+    cached.clear_key_cache()
+    assert not cached._key_cache
+    print(f"✓ 密钥缓存正确（首次 {first * 1000:.1f}ms，命中 {second * 1000:.3f}ms）")
+
+
+if __name__ == "__main__":
+    test_framing()
+    test_socket_path_per_config()
+    test_key_cache()
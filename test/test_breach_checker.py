@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 18:25
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 离线泄露密码数据集转换与查找测试
+# test_breach_checker.py
+import hashlib
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.breach_checker import HASH_NTLM, BreachCorpus, build_corpus, hash_password
+
+
+def test_ntlm_hash():
+    """NTLM 哈希（MD4 不可用时使用纯 Python 实现）"""
+    assert hash_password("password", HASH_NTLM).hex() == "8846f7eaee8fb117ad06bdd830b7586c"
+    print("✓ NTLM 哈希正确")
+
+
+def test_build_and_lookup():
+    """乱序输入经外部排序转换后，所有密码都能查到正确的次数"""
+    passwords = [f"password{i}" for i in range(5000)]
+    lines = [f"{hashlib.sha1(p.encode()).hexdigest().upper()}:{i + 1}\n" for i, p in enumerate(passwords)]
+    random.shuffle(lines)
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "hibp.txt")
+        output = os.path.join(directory, "hibp.pmbreach")
+        with open(source, "w") as f:
+            f.writelines(lines)
+
+        # 每段 700 条，强制产生多个有序段
+        assert build_corpus(source, output, run_records=700) == len(passwords)
+        assert sorted(os.listdir(directory)) == ["hibp.pmbreach", "hibp.txt"]
+
+        with BreachCorpus(output) as corpus:
+            for i, password in enumerate(passwords):
+                assert corpus.lookup(password) == i + 1, password
+            assert corpus.lookup("not-in-corpus") == 0
+    print("✓ 数据集转换与查找正确")
+
+
+if __name__ == "__main__":
+    test_ntlm_hash()
+    test_build_and_lookup()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 22:10
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 网址规范化与按域名查找测试
+# test_domain.py
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database_manager import DatabaseManager
+from models.password_entry import PasswordEntry
+from utils.validators import canonicalize_url, registrable_domain
+
+
+def test_canonicalize_url():
+    """协议、大小写、默认端口、用户信息、片段和国际化域名"""
+    assert canonicalize_url('https://Login.Example.COM:443/a?b=1#top') == 'https://login.example.com/a?b=1'
+    assert canonicalize_url('user:pw@example.com:8443') == 'https://example.com:8443/'
+    assert canonicalize_url('http://例子.中国') == 'http://xn--fsqu00a.xn--fiqs8s/'
+    assert canonicalize_url('not a url') is None
+    assert canonicalize_url('') is None
+    print("✓ 网址规范化正确")
+
+
+def test_registrable_domain():
+    """按公共后缀列表计算 eTLD+1"""
+    cases = {
+        'https://www.github.com/login': 'github.com',
+        'mail.google.com': 'google.com',
+        'https://www.bbc.co.uk/news': 'bbc.co.uk',
+        'shop.example.com.cn': 'example.com.cn',
+        'https://user.github.io/blog': 'user.github.io',
+        'a.b.kawasaki.jp': 'a.b.kawasaki.jp',
+        'www.city.kawasaki.jp': 'city.kawasaki.jp',
+        'http://192.168.1.1:8080/': '192.168.1.1',
+        'localhost:3000': 'localhost',
+        'https://登录.例子.中国': 'xn--fsqu00a.xn--fiqs8s',
+    }
+    for url, expected in cases.items():
+        assert registrable_domain(url) == expected, (url, registrable_domain(url))
+    print("✓ 可注册域名正确")
+
+
+def test_find_by_domain():
+    """写入时计算域名，按域名查找"""
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager = DatabaseManager()
+        assert database_manager.connect({'use_sqlite': True, 'sqlite_path': os.path.join(directory, 'test.db')})
+        for name, url in [('GitHub', 'https://github.com/login'), ('Gist', 'gist.github.com'),
+                          ('BBC', 'https://www.bbc.co.uk'), ('本地', '')]:
+            database_manager.add_entry(PasswordEntry(website_name=name, url=url, username='me',
+                                                     encrypted_password='x'))
+
+        names = [entry.website_name for entry in database_manager.find_by_domain('https://www.github.com/')]
+        assert names == ['Gist', 'GitHub']
+
+        entry = database_manager.find_by_domain('bbc.co.uk')[0]
+        entry.url = 'https://github.com/bbc'
+        database_manager.update_entry(entry)
+        assert len(database_manager.find_by_domain('github.com')) == 3
+        assert database_manager.find_by_domain('bbc.co.uk') == []
+        assert database_manager.find_by_domain('') == []
+        database_manager.close()
+    print("✓ 按域名查找正确")
+
+
+if __name__ == "__main__":
+    test_canonicalize_url()
+    test_registrable_domain()
+    test_find_by_domain()
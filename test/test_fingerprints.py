@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-20 04:20
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 密码指纹（重复密码检查）测试
+# test_fingerprints.py
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database_manager import DatabaseManager
+from core.encryption_manager import EncryptionManager
+from core.fingerprints import backfill_fingerprints
+from core.rekey import reencrypt_entries
+from models.password_entry import PasswordEntry
+
+MASTER_PASSWORD = "my_master_password"
+NEW_PASSWORD = "new_master_password"
+# 名称 -> 密码：GitHub/Gitee/GitLab 共用一个密码，招商银行/工商银行共用另一个
+PASSWORDS = {'GitHub': 'shared-1', 'Gitee': 'shared-1', 'GitLab': 'shared-1',
+             '招商银行': 'bank-pw', '工商银行': 'bank-pw', '微博': 'unique'}
+
+
+def connect(directory):
+    database_manager = DatabaseManager()
+    assert database_manager.connect({'use_sqlite': True, 'sqlite_path': os.path.join(directory, 'test.db')})
+    return database_manager
+
+
+def vault_keys(database_manager, encryption_manager, master_password=MASTER_PASSWORD):
+    return encryption_manager.derive_vault_keys(master_password, database_manager.get_vault_salt())
+
+
+def groups(database_manager):
+    return [sorted(entry.website_name for entry in group) for group in database_manager.find_reused_passwords()]
+
+
+def test_keys():
+    """子密钥互相独立，指纹由密钥和密码决定"""
+    encryption_manager = EncryptionManager()
+    keys = encryption_manager.derive_vault_keys(MASTER_PASSWORD, b's' * 16)
+    assert set(keys) == {'fingerprint', 'metadata', 'blind_index'}
+    assert len(set(keys.values())) == 3 and all(len(key) == 32 for key in keys.values())
+    assert keys == encryption_manager.derive_vault_keys(MASTER_PASSWORD, b's' * 16)
+    assert keys != encryption_manager.derive_vault_keys(MASTER_PASSWORD, b't' * 16)
+    assert keys != encryption_manager.derive_vault_keys(NEW_PASSWORD, b's' * 16)
+
+    key = keys['fingerprint']
+    fingerprint = EncryptionManager.fingerprint('password', key)
+    assert len(fingerprint) == 64 and fingerprint == EncryptionManager.fingerprint('password', key)
+    assert fingerprint != EncryptionManager.fingerprint('Password', key)
+    assert fingerprint != EncryptionManager.fingerprint('password', keys['metadata'])
+    print("✓ 子密钥与指纹正确")
+
+
+def test_reuse_groups():
+    """按指纹分组找出重复密码，不需要解密"""
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager = connect(directory)
+        encryption_manager = EncryptionManager()
+        key = vault_keys(database_manager, encryption_manager)['fingerprint']
+        for name, password in PASSWORDS.items():
+            # 密文是无法解密的占位值：分组只依赖指纹
+            assert database_manager.add_entry(PasswordEntry(
+                website_name=name, username='me', encrypted_password='not-decryptable',
+                password_fingerprint=EncryptionManager.fingerprint(password, key)))
+
+        assert groups(database_manager) == [['GitHub', 'GitLab', 'Gitee'], ['工商银行', '招商银行']]
+        github = database_manager.search_entries('github')[0]
+        assert sorted(entry.website_name for entry in database_manager.find_entries_by_fingerprint(
+            github.password_fingerprint, exclude_id=github.id)) == ['GitLab', 'Gitee']
+        assert database_manager.get_entries_missing_fingerprint() == []
+
+        plan = database_manager.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM password_entries WHERE password_fingerprint = 'x'").fetchall()
+        assert 'idx_password_fingerprint' in str([tuple(row) for row in plan])
+        database_manager.close()
+    print("✓ 重复密码按指纹分组")
+
+
+def test_migration_and_backfill():
+    """旧版本数据库新增指纹列，补全没有指纹的记录"""
+    encryption_manager = EncryptionManager()
+    with tempfile.TemporaryDirectory() as directory:
+        connection = sqlite3.connect(os.path.join(directory, 'test.db'))
+        connection.execute("""
+            CREATE TABLE password_entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, website_name TEXT NOT NULL, url TEXT,
+                username TEXT NOT NULL, encrypted_password TEXT NOT NULL, notes TEXT, category TEXT DEFAULT '默认',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        connection.executemany(
+            "INSERT INTO password_entries (website_name, username, encrypted_password, updated_at) "
+            "VALUES (?, 'me', ?, '2020-01-01 00:00:00')",
+            [(name, encryption_manager.encrypt(password, MASTER_PASSWORD)) for name, password in PASSWORDS.items()]
+            + [('损坏', 'broken')])
+        connection.commit()
+        connection.close()
+
+        database_manager = connect(directory)
+        columns = [row[1] for row in database_manager.connection.execute("PRAGMA table_info(password_entries)")]
+        assert 'password_fingerprint' in columns
+        # 已有列时不重复添加
+        cursor = database_manager.connection.cursor()
+        assert not database_manager._ensure_column(cursor, 'password_entries', 'password_fingerprint', 'VARCHAR(64)')
+        cursor.close()
+
+        assert len(database_manager.get_entries_missing_fingerprint()) == len(PASSWORDS) + 1
+        assert groups(database_manager) == []
+
+        key = vault_keys(database_manager, encryption_manager)['fingerprint']
+        progress = []
+        updated = backfill_fingerprints(database_manager, encryption_manager, MASTER_PASSWORD, key, batch_size=4,
+                                        progress=lambda done, total: progress.append((done, total)))
+        # 无法解密的记录跳过，其余补全
+        assert updated == len(PASSWORDS)
+        assert progress == [(4, 7), (7, 7)]
+        assert [name for _, name in database_manager.connection.execute(
+            "SELECT id, website_name FROM password_entries WHERE password_fingerprint IS NULL")] == ['损坏']
+        assert groups(database_manager) == [['GitHub', 'GitLab', 'Gitee'], ['工商银行', '招商银行']]
+        # 补全指纹不修改 updated_at
+        assert all(entry.updated_at.year == 2020 for entry in database_manager.search_entries())
+
+        # 取消时不再处理后续批次
+        database_manager.connection.execute("UPDATE password_entries SET password_fingerprint = NULL")
+        database_manager.commit()
+        assert backfill_fingerprints(database_manager, encryption_manager, MASTER_PASSWORD, key,
+                                     is_canceled=lambda: True) == 0
+        database_manager.close()
+    print("✓ 旧数据库迁移与指纹补全正确")
+
+
+def test_rekey():
+    """修改主密码后用新密钥重新计算指纹，分组不变"""
+    encryption_manager = EncryptionManager()
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager = connect(directory)
+        key = vault_keys(database_manager, encryption_manager)['fingerprint']
+        for name, password in PASSWORDS.items():
+            assert database_manager.add_entry(PasswordEntry(
+                website_name=name, username='me',
+                encrypted_password=encryption_manager.encrypt(password, MASTER_PASSWORD),
+                password_fingerprint=EncryptionManager.fingerprint(password, key)))
+        old_fingerprints = {entry.website_name: entry.password_fingerprint
+                            for entry in database_manager.search_entries()}
+
+        result = reencrypt_entries(database_manager, encryption_manager, MASTER_PASSWORD, NEW_PASSWORD)
+        assert result.reencrypted == len(PASSWORDS)
+        new_key = vault_keys(database_manager, encryption_manager, NEW_PASSWORD)['fingerprint']
+        assert result.vault_keys['fingerprint'] == new_key
+
+        entries = database_manager.search_entries()
+        for entry in entries:
+            assert entry.password_fingerprint == EncryptionManager.fingerprint(PASSWORDS[entry.website_name], new_key)
+            assert entry.password_fingerprint != old_fingerprints[entry.website_name]
+        assert groups(database_manager) == [['GitHub', 'GitLab', 'Gitee'], ['工商银行', '招商银行']]
+        assert database_manager.get_entries_missing_fingerprint() == []
+        database_manager.close()
+    print("✓ 修改主密码后指纹重新计算")
+
+
+if __name__ == "__main__":
+    test_keys()
+    test_reuse_groups()
+    test_migration_and_backfill()
+    test_rekey()
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 23:55
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 容错搜索与排序测试
+# test_fuzzy_search.py
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database_manager import DatabaseManager
+from core.fuzzy_search import FuzzyIndex, entry_terms, osa_distance, rank_entries
+from core.search_index import SearchIndex
+from models.password_entry import PasswordEntry
+
+
+def make_entry(entry_id, name, domain=None, usage_count=0):
+    return PasswordEntry(id=entry_id, website_name=name, domain=domain, usage_count=usage_count,
+                         encrypted_password='x')
+
+
+SITES = [
+    make_entry(1, 'GitHub', 'github.com', 3),
+    make_entry(2, 'Gitee', 'gitee.com'),
+    make_entry(3, '谷歌账号', 'google.com', 9),
+    make_entry(4, 'Bank of America', 'bankofamerica.com'),
+    make_entry(5, 'Amazon', 'amazon.co.uk'),
+]
+
+
+def test_osa_distance():
+    """编辑距离（相邻交换算一次）及上限"""
+    assert osa_distance('github', 'github', 2) == 0
+    assert osa_distance('githbu', 'github', 2) == 1
+    assert osa_distance('gogle', 'google', 2) == 1
+    assert osa_distance('gitehub', 'github', 2) == 1
+    assert osa_distance('gtihbu', 'github', 2) == 2
+    assert osa_distance('amazon', 'github', 2) == 3
+    assert osa_distance('abc', 'abcdef', 2) == 3
+    assert entry_terms(SITES[3]) == {'bank', 'america', 'bankofamerica'}
+    print("✓ 编辑距离正确")
+
+
+def test_lookup():
+    """常见拼写错误能找到对应记录"""
+    index = FuzzyIndex.build(SITES)
+    assert index.lookup('githbu') == {1: 1}
+    assert index.lookup('gogle') == {3: 1}
+    assert index.lookup('amazno') == {5: 1}
+    assert index.lookup('amercia') == {4: 1}
+    assert index.lookup('giithbu') == {1: 2}
+    assert index.lookup('gi') == {}
+    assert index.lookup('facebook') == {}
+
+    index.add(make_entry(6, 'GitLab', 'gitlab.com'))
+    index.add(make_entry(1, 'Codeberg', 'codeberg.org'))
+    index.remove(5)
+    assert index.lookup('gitlba') == {6: 1}
+    assert index.lookup('githbu') == {}
+    assert index.lookup('amazno') == {}
+    assert index.lookup('codebreg') == {1: 1}
+    print("✓ 容错匹配正确")
+
+
+def test_ranking():
+    """完全相同 > 前缀 > 子串 > 容错，同档内常用的在前"""
+    index = SearchIndex.build(SITES + [make_entry(6, 'GitHub Enterprise', 'ghe.io', 1),
+                                       make_entry(7, 'My GitHub', 'github.com', 20)])
+    assert [entry.id for entry in index.ranked_search('github')] == [7, 1, 6]
+    assert [entry.id for entry in index.ranked_search('githbu')] == [7, 1, 6]
+    assert [entry.id for entry in index.ranked_search('gogle')] == [3]
+    assert [entry.website_name for entry in index.ranked_search('git')] == ['My GitHub', 'GitHub',
+                                                                         'GitHub Enterprise', 'Gitee']
+    assert len(index.ranked_search('')) == 7
+
+    entries = [make_entry(1, 'Gitee', 'gitee.com'), make_entry(2, 'GitHub', 'github.com', 5)]
+    assert [entry.id for entry in rank_entries('git', entries)] == [2, 1]
+    print("✓ 排序正确")
+
+
+def test_background_build():
+    """后台构建完成前只做子串匹配，构建期间的增删改在完成时补上"""
+    index = SearchIndex.build(SITES, fuzzy=False)
+    snapshot = index.begin_fuzzy_build()
+    assert not index.fuzzy_ready
+    index.upsert(make_entry(6, 'GitLab', 'gitlab.com'))
+    index.remove(5)
+    assert index.ranked_search('githbu') == []
+    assert [entry.id for entry in index.ranked_search('gitla')] == [6]
+    assert not index.fuzzy_ready
+
+    index.finish_fuzzy_build(FuzzyIndex.build(snapshot))
+    assert index.fuzzy_ready
+    assert [entry.id for entry in index.ranked_search('githbu')] == [1]
+    assert [entry.id for entry in index.ranked_search('gitlba')] == [6]
+    assert index.ranked_search('amazno') == []
+
+    # 后台构建失败时退回到第一次搜索时构建
+    index.begin_fuzzy_build()
+    index.finish_fuzzy_build(None)
+    assert [entry.id for entry in index.ranked_search('gitlba')] == [6]
+    assert index.fuzzy_ready
+    print("✓ 后台构建容错索引正确")
+
+
+def test_record_usage():
+    """使用次数写入数据库，不修改更新时间"""
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager = DatabaseManager()
+        assert database_manager.connect({'use_sqlite': True, 'sqlite_path': os.path.join(directory, 'test.db')})
+        entry = PasswordEntry(website_name='GitHub', url='https://github.com', username='me',
+                              encrypted_password='x')
+        assert database_manager.add_entry(entry)
+        updated_at = database_manager.get_entry(entry.id).updated_at
+        assert database_manager.record_usage(entry.id)
+        assert database_manager.record_usage(entry.id)
+        stored = database_manager.get_entry(entry.id)
+        assert stored.usage_count == 2 and stored.updated_at == updated_at
+        database_manager.close()
+    print("✓ 使用次数正确")
+
+
+def test_lookup_speed():
+    """10 万条记录，容错查询应在 5 毫秒以内"""
+    rng = random.Random(1)
+
+    def word():
+        return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+
+    entries = [make_entry(i, f'{word().title()} {word()}', f'{word()}.com') for i in range(100000)]
+    index = SearchIndex.build(entries + SITES)
+    # 容错索引随索引一起构建，第一次容错查询不再现场构建
+    start = time.perf_counter()
+    assert index.ranked_search('githbu')[0].id == 1
+    first = time.perf_counter() - start
+    assert first < 0.005, first
+    for query in ('githbu', 'gogle', 'amazno'):
+        start = time.perf_counter()
+        for _ in range(20):
+            result = index.ranked_search(query)
+        elapsed = (time.perf_counter() - start) / 20
+        assert result[0].id in (1, 3, 5), query
+        assert elapsed < 0.005, (query, elapsed)
+    print(f"✓ 容错查询耗时 {elapsed * 1000:.2f}ms（首次 {first * 1000:.2f}ms）")
+
+
+if __name__ == "__main__":
+    test_osa_distance()
+    test_lookup()
+    test_ranking()
+    test_background_build()
+    test_record_usage()
+    test_lookup_speed()
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-20 03:30
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 浏览器与 KeePass 导入测试
+# test_importers.py
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database_manager import DatabaseManager
+from core.encryption_manager import EncryptionManager
+from core.importers import dedup_key, detect_source, import_passwords, normalize_url, read_entries
+from models.password_entry import PasswordEntry
+
+MASTER_PASSWORD = "my_master_password"
+
+CHROME_CSV = """name,url,username,password,note
+github.com,https://github.com/login?return_to=%2F,alice,pw1,工作账号
+,https://www.example.com:443/,bob,pw2,
+github.com,https://github.com/session,Alice,pw3,
+,,,,
+"""
+
+FIREFOX_CSV = """"url","username","password","httpRealm","formActionOrigin","guid","timeCreated","timeLastUsed","timePasswordChanged"
+"https://github.com","carol","pw4",,"https://github.com","{1}","1700000000000","1700000000000","1710000000000"
+"https://github.com","alice","pw5",,"https://github.com","{2}","1700000000000","1700000000000","1700000000000"
+"""
+
+KEEPASS_XML = """<?xml version="1.0" encoding="utf-8" standalone="yes"?>
+<KeePassFile>
+  <Meta><RecycleBinUUID>YmluYmluYmluYmluYmluYg==</RecycleBinUUID></Meta>
+  <Root>
+    <Group>
+      <UUID>cm9vdHJvb3Ryb290cm9vdA==</UUID>
+      <Name>Database</Name>
+      <Entry>
+        <String><Key>Title</Key><Value>路由器</Value></String>
+        <String><Key>UserName</Key><Value>admin</Value></String>
+        <String><Key>Password</Key><Value>router</Value></String>
+        <Times><CreationTime>2023-05-01T08:00:00Z</CreationTime>
+               <LastModificationTime>2024-01-02T03:04:05Z</LastModificationTime></Times>
+        <History><Entry><String><Key>Title</Key><Value>旧版本</Value></String></Entry></History>
+      </Entry>
+      <Entry>
+        <String><Key>Title</Key><Value>NAS</Value></String>
+        <String><Key>UserName</Key><Value>Admin</Value></String>
+        <String><Key>Password</Key><Value>nas</Value></String>
+      </Entry>
+      <Entry>
+        <String><Key>Title</Key><Value>nas</Value></String>
+        <String><Key>UserName</Key><Value>admin</Value></String>
+        <String><Key>Password</Key><Value>nas-copy</Value></String>
+      </Entry>
+      <Group>
+        <UUID>Z3JvdXBncm91cGdyb3VwZw==</UUID>
+        <Name>Homebanking</Name>
+        <Entry>
+          <String><Key>Title</Key><Value>招商银行</Value></String>
+          <String><Key>URL</Key><Value>cmbchina.com</Value></String>
+          <String><Key>UserName</Key><Value>alice</Value></String>
+          <String><Key>Password</Key><Value>bank</Value></String>
+          <String><Key>Notes</Key><Value>信用卡</Value></String>
+        </Entry>
+      </Group>
+      <Group>
+        <UUID>YmluYmluYmluYmluYmluYg==</UUID>
+        <Name>Recycle Bin</Name>
+        <Entry>
+          <String><Key>Title</Key><Value>已删除</Value></String>
+          <String><Key>UserName</Key><Value>x</Value></String>
+          <String><Key>Password</Key><Value>x</Value></String>
+        </Entry>
+      </Group>
+    </Group>
+  </Root>
+</KeePassFile>
+"""
+
+
+def write_file(directory, name, content):
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return path
+
+
+def make_vault(directory):
+    database_manager = DatabaseManager()
+    assert database_manager.connect({'use_sqlite': True, 'sqlite_path': os.path.join(directory, 'test.db')})
+    return database_manager, EncryptionManager()
+
+
+def snapshot(database_manager, encryption_manager):
+    entries = database_manager.search_entries()
+    passwords = encryption_manager.decrypt_many([entry.encrypted_password for entry in entries], MASTER_PASSWORD)
+    return {(entry.website_name, entry.url, entry.username, entry.category): password
+            for entry, password in zip(entries, passwords)}
+
+
+def test_dedup_key():
+    """按源和用户名查重，没有 URL 时加入标题"""
+    assert normalize_url('HTTPS://WWW.Example.com:443/login/?next=1#top') == 'https://www.example.com/login'
+    assert dedup_key('https://github.com/login', 'Alice') == dedup_key('github.com', 'alice ')
+    assert dedup_key('', 'admin', '路由器') != dedup_key('', 'admin', 'NAS')
+    assert dedup_key('', 'Admin', 'NAS') == dedup_key('', 'admin', 'nas')
+    assert dedup_key('', 'admin', '') is None
+    # 有 URL 时标题不参与查重
+    assert dedup_key('https://github.com', 'alice', 'GitHub') == dedup_key('https://github.com', 'alice', '')
+    print("✓ 查重键正确")
+
+
+def test_read():
+    """识别来源并解析各格式"""
+    with tempfile.TemporaryDirectory() as directory:
+        chrome = write_file(directory, 'chrome.csv', CHROME_CSV)
+        firefox = write_file(directory, 'firefox.csv', FIREFOX_CSV)
+        keepass = write_file(directory, 'keepass.xml', KEEPASS_XML)
+        assert [detect_source(path) for path in (chrome, firefox, keepass)] == ['chrome', 'firefox', 'keepass']
+
+        entries = list(read_entries(chrome))
+        assert [(e.website_name, e.url, e.username) for e in entries[:2]] == [
+            ('github.com', 'https://github.com/login', 'alice'), ('example.com', 'https://www.example.com', 'bob')]
+        assert entries[0].notes == '工作账号' and entries[0].decrypted_password == 'pw1'
+
+        entries = list(read_entries(firefox))
+        assert entries[0].website_name == 'github.com'
+        assert entries[0].updated_at == datetime(2024, 3, 9, 16, 0)
+
+        entries = list(read_entries(keepass))
+        assert [(e.website_name, e.username, e.category) for e in entries] == [
+            ('路由器', 'admin', '默认'), ('NAS', 'Admin', '默认'), ('nas', 'admin', '默认'),
+            ('招商银行', 'alice', '金融')]
+        assert entries[0].created_at == datetime(2023, 5, 1, 8, 0)
+        assert entries[0].updated_at == datetime(2024, 1, 2, 3, 4, 5)
+        assert entries[3].url == 'https://cmbchina.com' and entries[3].notes == '信用卡'
+    print("✓ Chrome / Firefox / KeePass 解析正确")
+
+
+def test_import():
+    """导入后去重：同站点同用户名只导入一次，没有 URL 的条目按标题区分"""
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager, encryption_manager = make_vault(directory)
+        # 已有一条没有 URL 的 admin 记录
+        existing = PasswordEntry(website_name='路由器', username='ADMIN', category='默认',
+                                 encrypted_password=encryption_manager.encrypt('old', MASTER_PASSWORD))
+        assert database_manager.add_entry(existing)
+
+        result = import_passwords(database_manager, encryption_manager, MASTER_PASSWORD,
+                                  write_file(directory, 'chrome.csv', CHROME_CSV))
+        assert (result.source, result.imported, result.duplicates, result.skipped) == ('chrome', 2, 1, 1)
+
+        result = import_passwords(database_manager, encryption_manager, MASTER_PASSWORD,
+                                  write_file(directory, 'firefox.csv', FIREFOX_CSV))
+        assert (result.imported, result.duplicates) == (1, 1)
+
+        result = import_passwords(database_manager, encryption_manager, MASTER_PASSWORD,
+                                  write_file(directory, 'keepass.xml', KEEPASS_XML))
+        # 路由器/admin 与已有记录重复，nas/admin 与 NAS/Admin 重复
+        assert (result.imported, result.duplicates, result.skipped) == (2, 2, 0)
+
+        passwords = snapshot(database_manager, encryption_manager)
+        assert passwords == {
+            ('路由器', '', 'ADMIN', '默认'): 'old',
+            ('github.com', 'https://github.com/login', 'alice', '默认'): 'pw1',
+            ('example.com', 'https://www.example.com', 'bob', '默认'): 'pw2',
+            ('github.com', 'https://github.com', 'carol', '默认'): 'pw4',
+            ('NAS', '', 'Admin', '默认'): 'nas',
+            ('招商银行', 'https://cmbchina.com', 'alice', '金融'): 'bank',
+        }
+
+        # 再次导入全部视为重复
+        result = import_passwords(database_manager, encryption_manager, MASTER_PASSWORD,
+                                  write_file(directory, 'keepass.xml', KEEPASS_XML))
+        assert (result.imported, result.duplicates) == (0, 4)
+        database_manager.close()
+    print("✓ 导入与查重正确")
+
+
+def test_url_less_entries():
+    """没有 URL、用户名相同但标题不同的条目都会导入"""
+    xml = KEEPASS_XML.replace(
+        '<Value>nas</Value></String>\n        <String><Key>UserName</Key>',
+        '<Value>打印机</Value></String>\n        <String><Key>UserName</Key>')
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager, encryption_manager = make_vault(directory)
+        result = import_passwords(database_manager, encryption_manager, MASTER_PASSWORD,
+                                  write_file(directory, 'keepass.xml', xml))
+        assert (result.imported, result.duplicates) == (4, 0)
+        assert sorted(e.website_name for e in database_manager.search_entries() if e.username.lower() == 'admin') \
+            == sorted(['路由器', 'NAS', '打印机'])
+        database_manager.close()
+    print("✓ 没有 URL 的同名用户条目全部导入")
+
+
+if __name__ == "__main__":
+    test_dedup_key()
+    test_read()
+    test_import()
+    test_url_less_entries()
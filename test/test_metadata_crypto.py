@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 22:50
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 元数据加密与盲索引测试
+# test_metadata_crypto.py
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database_manager import DatabaseManager
+from core.metadata_crypto import MetadataCrypto, entry_matches, ngrams, query_ngrams
+from models.password_entry import PasswordEntry
+
+VAULT_KEYS = {'fingerprint': b'f' * 32, 'metadata': b'm' * 32, 'blind_index': b'b' * 32}
+
+
+def test_ngrams():
+    """写入取 1~3 字符片段，查询取 3 字符片段"""
+    assert ngrams('GitH') == {'g', 'i', 't', 'h', 'gi', 'it', 'th', 'git', 'ith'}
+    assert query_ngrams('Hub') == {'hub'}
+    assert query_ngrams('github') == {'git', 'ith', 'thu', 'hub'}
+    assert query_ngrams('工作') == {'工作'}
+    assert query_ngrams('') == set()
+    # 查询片段一定是写入片段的子集
+    assert query_ngrams('ithu') <= ngrams('GitHub')
+    print("✓ 片段切分正确")
+
+
+def test_tokens():
+    """令牌由盲索引密钥决定，与密钥无关的内容无法比对"""
+    crypto = MetadataCrypto.from_vault_keys(VAULT_KEYS)
+    other = MetadataCrypto(b'm' * 32, b'c' * 32)
+    assert crypto.token('git') == crypto.token('git')
+    assert crypto.token('git') != other.token('git')
+    assert len(crypto.token('git')) == 16
+    assert len(crypto.domain_token('github.com')) == 32
+    assert crypto.domain_token('') is None
+    assert MetadataCrypto.from_vault_keys({'fingerprint': b'f' * 32}) is None
+
+    entry = PasswordEntry(website_name='GitHub', url='https://github.com', notes='', category='工作')
+    assert set(crypto.query_tokens('hub')) <= crypto.entry_tokens(entry)
+    assert set(crypto.query_tokens('工作')) <= crypto.entry_tokens(entry)
+    assert entry_matches(entry, 'GITHUB.COM')
+    assert not entry_matches(entry, 'gitlab')
+    print("✓ 盲索引令牌正确")
+
+
+def test_encrypted_search():
+    """开启元数据加密后数据库中不再有明文，搜索结果不变"""
+    try:
+        import cryptography  # noqa: F401
+    except ImportError:
+        print("- 未安装 cryptography，跳过加密测试")
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'test.db')
+        database_manager = DatabaseManager()
+        assert database_manager.connect({'use_sqlite': True, 'sqlite_path': path})
+        for name, url in [('GitHub', 'https://github.com/login'), ('Gitee', 'https://gitee.com'),
+                          ('工商银行', 'https://www.icbc.com.cn')]:
+            database_manager.add_entry(PasswordEntry(website_name=name, url=url, username='me',
+                                                     encrypted_password='x', category='工作'))
+        expected = [entry.website_name for entry in database_manager.search_entries('git')]
+
+        database_manager.set_metadata_keys(VAULT_KEYS)
+        assert database_manager.set_metadata_encryption(True)
+        assert database_manager.is_metadata_encrypted()
+        assert [entry.website_name for entry in database_manager.search_entries('git')] == expected
+        assert [entry.website_name for entry in database_manager.search_entries('银行')] == ['工商银行']
+        assert [entry.website_name for entry in database_manager.search_entries('gsyh')] == ['工商银行']
+        assert database_manager.search_entries('github.com')[0].username == 'me'
+        assert [entry.website_name for entry in database_manager.find_by_domain('github.com')] == ['GitHub']
+
+        database_manager.add_entry(PasswordEntry(website_name='GitLab', url='gitlab.com', encrypted_password='x'))
+        assert len(database_manager.search_entries('git')) == 3
+        database_manager.close()
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        assert b'GitHub' not in raw and b'gitlab.com' not in raw and b'gsyh' not in raw
+
+        # 盲索引版本变化时解锁后重建
+        database_manager = DatabaseManager()
+        assert database_manager.connect({'use_sqlite': True, 'sqlite_path': path})
+        database_manager.connection.execute("DELETE FROM blind_index")
+        database_manager.set_config_value('blind_index_version', '1')
+        database_manager.set_metadata_keys(VAULT_KEYS)
+        assert [entry.website_name for entry in database_manager.search_entries('gsyh')] == ['工商银行']
+        assert database_manager.set_metadata_encryption(False)
+        assert len(database_manager.search_entries('git')) == 3
+        database_manager.close()
+    print("✓ 加密后搜索正确")
+
+
+if __name__ == "__main__":
+    test_ngrams()
+    test_tokens()
+    test_encrypted_search()
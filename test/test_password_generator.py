@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 20:10
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 批量密码生成测试（卡方检验字符分布是否均匀）
+# test_password_generator.py
+import math
+import os
+import string
+import sys
+import tempfile
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.password_generator import (LOOKALIKE_CHARACTERS, POLICY_PRESETS, BulkPasswordGenerator,
+                                     PasswordGenerator, PasswordPolicy, generate_passwords)
+
+# 显著性水平 0.0001 对应的标准正态分位数
+Z_CRITICAL = 3.719
+
+
+def chi_square_critical(degrees):
+    """卡方分布上分位数（Wilson-Hilferty 近似）"""
+    h = 2 / (9 * degrees)
+    return degrees * (1 - h + Z_CRITICAL * math.sqrt(h)) ** 3
+
+
+def assert_uniform(counter, alphabet, label):
+    total = sum(counter.values())
+    expected = total / len(alphabet)
+    statistic = sum((counter.get(c, 0) - expected) ** 2 / expected for c in alphabet)
+    critical = chi_square_critical(len(alphabet) - 1)
+    assert set(counter) <= set(alphabet), label
+    assert statistic < critical, f"{label}: 卡方统计量 {statistic:.1f} 超过临界值 {critical:.1f}"
+    print(f"✓ {label}: 卡方统计量 {statistic:.1f} < {critical:.1f}")
+
+
+def test_uniform_characters():
+    """每个字符、每个位置的分布都均匀"""
+    alphabet = string.ascii_letters + string.digits
+    passwords = generate_passwords(40000, PasswordPolicy(length=16, use_symbols=False))
+    assert all(len(p) == 16 for p in passwords)
+    assert_uniform(Counter(''.join(passwords)), alphabet, "字母数字")
+    assert_uniform(Counter(p[0] for p in passwords), alphabet, "第一位")
+    assert_uniform(Counter(p[-1] for p in passwords), alphabet, "最后一位")
+
+
+def test_no_modulo_bias():
+    """字母表大小不整除 256 时没有取模偏差"""
+    alphabet = "abcdefg"
+    passwords = generate_passwords(50000, PasswordPolicy(length=20, alphabet=alphabet))
+    assert_uniform(Counter(''.join(passwords)), alphabet, "7 个字符")
+
+
+def test_minimums():
+    """有最少个数要求时每条密码都满足，且同类字符之间仍然均匀"""
+    policy = PasswordPolicy(length=8, min_lowercase=1, min_uppercase=1, min_digits=2, min_symbols=1)
+    passwords = BulkPasswordGenerator(policy).generate(30000)
+    for password in passwords:
+        assert sum(c.isdigit() for c in password) >= 2, password
+        assert any(c.islower() for c in password) and any(c.isupper() for c in password), password
+        assert any(c in policy.symbols for c in password), password
+    assert_uniform(Counter(c for p in passwords for c in p if c.isdigit()), string.digits, "数字")
+
+    readable = generate_passwords(1000, POLICY_PRESETS['readable'])
+    assert not set(''.join(readable)) & set(LOOKALIKE_CHARACTERS)
+    assert len(PasswordGenerator().generate_password(10, use_symbols=False)) == 10
+
+
+def test_invalid_policies():
+    """无法满足的规则直接报错"""
+    for policy in (PasswordPolicy(length=3, min_lowercase=2, min_digits=2),
+                   PasswordPolicy(use_digits=False, min_digits=1),
+                   PasswordPolicy(alphabet="a"),
+                   PasswordPolicy(use_lowercase=False, use_uppercase=False, use_symbols=False,
+                                  exclude=string.digits)):
+        try:
+            BulkPasswordGenerator(policy)
+        except ValueError:
+            continue
+        raise AssertionError(f"应当报错: {policy}")
+    print("✓ 无效规则被拒绝")
+
+
+def test_cli_output_file():
+    """-o 输出文件只允许所有者读写"""
+    from cli.gen import main
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'passwords.txt')
+        assert main(['-n', '1000', '-l', '16', '-o', file_path]) == 0
+        with open(file_path, 'rb') as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 1000 and all(len(line) == 16 for line in lines)
+        if os.name == 'posix':
+            assert os.stat(file_path).st_mode & 0o777 == 0o600
+    print("✓ 输出文件权限为 0600")
+
+
+if __name__ == "__main__":
+    test_uniform_characters()
+    test_no_modulo_bias()
+    test_minimums()
+    test_invalid_policies()
+    test_cli_output_file()
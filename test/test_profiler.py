@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-20 03:10
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 性能剖析器测试
+# test_profiler.py
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from utils.profiler import AppProfiler, parse_profile_args
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_parse_args():
+    """命令行、环境变量和无效模式"""
+    assert parse_profile_args(['--foo'], environ={}) == (None, ['--foo'])
+    config, remaining = parse_profile_args(['--profile', '--profile-op=unlock, search', '--profile-dir=out', 'x'],
+                                           environ={})
+    assert config == {'mode': 'sample', 'operations': ['unlock', 'search'], 'output_dir': 'out'}
+    assert remaining == ['x']
+    assert parse_profile_args(['--profile=cprofile'], environ={})[0]['mode'] == 'cprofile'
+    assert parse_profile_args([], environ={'PASSWDMGR_PROFILE': '1'})[0]['mode'] == 'sample'
+    assert parse_profile_args([], environ={'PASSWDMGR_PROFILE': '0'})[0] is None
+    assert parse_profile_args(['--profile=cprofile'], environ={'PASSWDMGR_PROFILE': 'sample'})[0]['mode'] == 'cprofile'
+    for argv, environ in ((['--profile=foo'], {}), ([], {'PASSWDMGR_PROFILE': 'bad'})):
+        try:
+            parse_profile_args(argv, environ=environ)
+        except ValueError:
+            continue
+        raise AssertionError(argv)
+
+    # 启动时模式无效: 输出用法错误并以非零状态退出，而不是抛出异常栈
+    result = subprocess.run([sys.executable, os.path.join(PROJECT_ROOT, 'main.py'), '--profile=foo'],
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 2, result.stderr
+    assert 'Traceback' not in result.stderr and 'foo' in result.stderr
+    print("✓ 剖析参数解析正确")
+
+
+def test_writers():
+    """折叠栈和 speedscope 输出"""
+    collapsed = {'main (main.py:1);unlock (a.py:10)': 300, 'main (main.py:1);search (b.py:20)': 100}
+    document = AppProfiler._speedscope_document(collapsed, 'demo')
+    assert document['$schema'].startswith('https://www.speedscope.app/')
+    frames = document['shared']['frames']
+    assert frames[0] == {'name': 'main', 'file': 'main.py', 'line': 1}
+    assert [frame['name'] for frame in frames] == ['main', 'unlock', 'search']
+    profile = document['profiles'][0]
+    assert profile['samples'] == [[0, 1], [0, 2]]
+    assert profile['weights'] == [300, 100] and profile['endValue'] == 400
+
+    for mode in ('sample', 'cprofile'):
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = AppProfiler(mode=mode, operations=['search'], output_dir=directory, interval=0.001)
+            profiler.start()
+            busy(0.02)
+            with profiler.operation('search'):
+                busy(0.1)
+            profiler.stop()
+            written = profiler.write_outputs()
+            suffixes = ['.collapsed', '.speedscope.json'] + (['.pstats'] if mode == 'cprofile' else [])
+            assert len(written) == len(suffixes)
+            assert all(any(path.endswith(suffix) for path in written) for suffix in suffixes)
+            assert all('_search_' in os.path.basename(path) for path in written)
+
+            collapsed_path = next(path for path in written if path.endswith('.collapsed'))
+            with open(collapsed_path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            assert lines, mode
+            for line in lines:
+                stack, value = line.rsplit(' ', 1)
+                assert int(value) > 0 and stack
+            # 只剖析 search 操作期间，busy 出现在栈中
+            assert any('busy' in line for line in lines), mode
+
+            speedscope_path = next(path for path in written if path.endswith('.speedscope.json'))
+            with open(speedscope_path, encoding='utf-8') as f:
+                document = json.load(f)
+            assert document['profiles'][0]['endValue'] == sum(int(line.rsplit(' ', 1)[1]) for line in lines)
+    print("✓ 折叠栈与 speedscope 输出正确")
+
+
+if __name__ == "__main__":
+    test_parse_args()
+    test_writers()
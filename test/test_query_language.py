@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-20 01:50
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 查询语言测试
+# test_query_language.py
+import os
+import sys
+import tempfile
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database_manager import DatabaseManager
+from core.query_language import (And, Not, Or, QuerySyntaxError, Term, compile_query, evaluate, parse_query,
+                                 parse_search, plan_query, resolve_date)
+from core.search_index import SearchIndex
+from models.password_entry import PasswordEntry
+
+ENTRIES = [
+    # 名称, 网址, 用户名, 分类, 备注, 更新时间
+    ('GitHub', 'https://github.com', 'alice', '工作', 'test account', '2024-03-01 09:00:00'),
+    ('Gitee', 'https://gitee.com', 'bob', '工作', '', '2025-06-01 09:00:00'),
+    ('GitLab', 'https://gitlab.com', 'alice@example.com', '工作', None, '2024-12-31 23:00:00'),
+    ('招商银行', 'https://www.cmbchina.com', 'alice', '金融', '信用卡', '2023-01-01 00:00:00'),
+    ('Bank of America', 'https://www.bankofamerica.com', 'Alice', '金融', '', '2025-01-01 00:00:00'),
+    ('微博', 'https://weibo.com', 'carol', '社交', '100%_real', '2025-02-01 00:00:00'),
+]
+
+QUERIES = [
+    'category:工作 user:alice site:git* updated:<2025-01-01 -notes:test',
+    'category:工作',
+    'cat:金融 OR category:社交',
+    'site:git*',
+    'site:zs*',
+    'site:=github',
+    'site:bank',
+    'user:alice',
+    'user:alice*',
+    '-user:alice',
+    'updated:<2025-01-01',
+    'updated:>2025-01-01',
+    'updated:>=2025-01-01',
+    'updated:<=2024-12-31',
+    'updated:=2024-12-31',
+    'domain:github.com',
+    'domain:=weibo.com',
+    'notes:100%_',
+    '-notes:test',
+    '(site:gitee OR site:github) -user:bob',
+    'git -category:工作',
+    '"site:bank of america"',
+    'url:https://www.* used:0',
+    'zsyh category:金融',
+]
+
+
+def make_database(directory):
+    database_manager = DatabaseManager()
+    assert database_manager.connect({'use_sqlite': True, 'sqlite_path': os.path.join(directory, 'test.db')})
+    for name, url, username, category, notes, updated_at in ENTRIES:
+        entry = PasswordEntry(website_name=name, url=url, username=username, category=category, notes=notes,
+                              encrypted_password='x')
+        assert database_manager.add_entry(entry)
+        database_manager.connection.execute("UPDATE password_entries SET updated_at = ? WHERE id = ?",
+                                            (updated_at, entry.id))
+    database_manager.commit()
+    return database_manager
+
+
+def test_parse():
+    """语法树、字段别名和语法错误"""
+    assert parse_query('category:工作 user:alice site:git* updated:<2025-01-01 -notes:test') == And((
+        Term('category', 'eq', '工作'), Term('username', 'contains', 'alice'), Term('website_name', 'prefix', 'git'),
+        Term('updated_at', 'lt', '2025-01-01'), Not(Term('notes', 'contains', 'test'))))
+    assert parse_query('a OR (b c)') == Or((Term(None, 'contains', 'a'),
+                                           And((Term(None, 'contains', 'b'), Term(None, 'contains', 'c')))))
+    assert parse_query('site:="Bank of America"') == Term('website_name', 'eq', 'Bank of America')
+    assert parse_query('https://github.com') == Term(None, 'contains', 'https://github.com')
+    assert parse_query('used:>=3') == Term('usage_count', 'ge', '3')
+
+    assert parse_search('github') is None
+    assert parse_search('bank of america') is None
+    assert parse_search('"unbalanced') is None
+    assert parse_search('category:工作') == Term('category', 'eq', '工作')
+    for text in ('site:', 'updated:<yesterday', 'used:>many', '(site:git', 'category:工作 )', '- ', 'site:git OR'):
+        try:
+            parse_query(text)
+        except QuerySyntaxError:
+            continue
+        raise AssertionError(text)
+    assert resolve_date('1y', date(2026, 10, 20)) == date(2025, 10, 20)
+    assert resolve_date('2w', date(2026, 10, 20)) == date(2026, 10, 6)
+    print("✓ 解析正确")
+
+
+def test_plan():
+    """索引等值 > 索引范围 > 比较 > 包含 > 排除，嵌套展开"""
+    plan = plan_query(parse_query('-notes:test git used:>1 updated:<1y site:git* (category:工作 user:=bob)'))
+    assert plan == And((
+        Term('category', 'eq', '工作'), Term('username', 'eq', 'bob'), Term('updated_at', 'lt', '1y'),
+        Term('website_name', 'prefix', 'git'), Term('usage_count', 'gt', '1'), Term(None, 'contains', 'git'),
+        Not(Term('notes', 'contains', 'test'))))
+    assert plan_query(parse_query('-(-site:git)')) == Term('website_name', 'contains', 'git')
+
+    compiled = compile_query(plan_query(parse_query('notes:100%_')))
+    assert compiled.params == ['%100!%!_%'] and compiled.exact
+    print("✓ 规划正确")
+
+
+def test_database():
+    """SQL 结果与内存求值、内存索引一致，并且走索引"""
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager = make_database(directory)
+        all_entries = database_manager.search_entries()
+        index = SearchIndex.build(all_entries)
+        for query in QUERIES:
+            node = plan_query(parse_query(query))
+            names = [entry.website_name for entry in database_manager.query_entries(query)]
+            assert names == [entry.website_name for entry in all_entries if evaluate(node, entry)], query
+            assert names == [entry.website_name for entry in index.query(query)], query
+
+        def names(query):
+            return [entry.website_name for entry in database_manager.query_entries(query)]
+
+        assert names('category:工作 user:alice site:git* updated:<2025-01-01 -notes:test') == ['GitLab']
+        assert names('site:zs*') == ['招商银行']
+        assert names('notes:100%_') == ['微博']
+        assert names('updated:>2025-01-01') == ['Gitee', '微博']
+        assert names('-user:alice') == ['Gitee', '微博']
+        assert names('category:工作') == ['Gitee', 'GitHub', 'GitLab']
+        assert len(database_manager.query_entries('category:工作', limit=2)) == 2
+
+        def plan(query):
+            compiled = compile_query(plan_query(parse_query(query)))
+            rows = database_manager.connection.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM password_entries WHERE {compiled.where}", compiled.params)
+            return str([tuple(row) for row in rows])
+
+        assert 'idx_category' in plan('category:工作 user:alice notes:test')
+        assert 'idx_username' in plan('user:alice* notes:test')
+        assert 'idx_search_key' in plan('site:git*')
+        assert 'idx_updated_at' in plan('updated:<2024-01-01')
+        database_manager.close()
+    print("✓ 数据库查询正确")
+
+
+if __name__ == "__main__":
+    test_parse()
+    test_plan()
+    test_database()
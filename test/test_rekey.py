@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-20 04:00
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 修改主密码（重新加密所有记录）测试
+# test_rekey.py
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database_manager import DatabaseManager
+from core.encryption_manager import EncryptionManager
+from core.rekey import RekeyError, reencrypt_entries
+from models.password_entry import PasswordEntry
+
+OLD_PASSWORD = "old_master_password"
+NEW_PASSWORD = "new_master_password"
+NAMES = ['GitHub', 'Gitee', '工商银行', '路由器']
+
+
+def make_vault(directory, metadata_encrypted=False):
+    database_manager = DatabaseManager()
+    assert database_manager.connect({'use_sqlite': True, 'sqlite_path': os.path.join(directory, 'test.db')})
+    encryption_manager = EncryptionManager()
+    vault_keys = encryption_manager.derive_vault_keys(OLD_PASSWORD, database_manager.get_vault_salt())
+    database_manager.set_metadata_keys(vault_keys)
+    for name in NAMES:
+        password = f'{name}-pw'
+        entry = PasswordEntry(website_name=name, url=f'https://{name}.com', username='me', notes='备注',
+                              encrypted_password=encryption_manager.encrypt(password, OLD_PASSWORD),
+                              password_fingerprint=encryption_manager.fingerprint(password,
+                                                                                  vault_keys['fingerprint']))
+        assert database_manager.add_entry(entry)
+    if metadata_encrypted:
+        assert database_manager.set_metadata_encryption(True)
+    return database_manager, encryption_manager
+
+
+def raw_rows(database_manager):
+    return [tuple(row) for row in database_manager.connection.execute(
+        "SELECT id, website_name, url, username, notes, encrypted_password, password_fingerprint, updated_at "
+        "FROM password_entries ORDER BY id")]
+
+
+def blind_index(database_manager):
+    rows = database_manager.connection.execute("SELECT token, entry_id FROM blind_index")
+    return sorted(tuple(row) for row in rows)
+
+
+def passwords(database_manager, encryption_manager, master_password):
+    return {entry.website_name: encryption_manager.decrypt(entry.encrypted_password, master_password)
+            for entry in database_manager.search_entries()}
+
+
+def cancel_after(count):
+    calls = []
+
+    def is_canceled():
+        calls.append(1)
+        return len(calls) > count
+    return is_canceled
+
+
+def test_plaintext_metadata():
+    """未开启元数据加密：取消时回滚，无法解密的记录跳过"""
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager, encryption_manager = make_vault(directory)
+        before = raw_rows(database_manager)
+
+        result = reencrypt_entries(database_manager, encryption_manager, OLD_PASSWORD, NEW_PASSWORD,
+                                   is_canceled=cancel_after(2))
+        assert result.canceled and result.reencrypted == 0
+        assert raw_rows(database_manager) == before
+
+        # 一条记录的密码已损坏：跳过，其余记录提交
+        database_manager.connection.execute("UPDATE password_entries SET encrypted_password = 'broken' "
+                                            "WHERE website_name = '路由器'")
+        database_manager.commit()
+        progress = []
+        result = reencrypt_entries(database_manager, encryption_manager, OLD_PASSWORD, NEW_PASSWORD,
+                                   progress=lambda done, total: progress.append((done, total)))
+        assert (result.total, result.reencrypted, result.failed) == (4, 3, ['路由器'])
+        assert progress[-1] == (4, 4)
+        database_manager.connection.execute("DELETE FROM password_entries WHERE website_name = '路由器'")
+        assert passwords(database_manager, encryption_manager, NEW_PASSWORD) == {
+            name: f'{name}-pw' for name in NAMES[:3]}
+        # 重新加密不修改 updated_at
+        assert [row[7] for row in raw_rows(database_manager)] == [row[7] for row in before[:3]]
+        database_manager.close()
+    print("✓ 未加密元数据：取消回滚，损坏的记录跳过")
+
+
+def test_encrypted_metadata():
+    """开启元数据加密：取消或任何一条失败都回滚并恢复原来的元数据密钥"""
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager, encryption_manager = make_vault(directory, metadata_encrypted=True)
+        old_crypto = database_manager.metadata_crypto
+        before, before_index = raw_rows(database_manager), blind_index(database_manager)
+
+        result = reencrypt_entries(database_manager, encryption_manager, OLD_PASSWORD, NEW_PASSWORD,
+                                   is_canceled=cancel_after(2))
+        assert result.canceled
+        assert database_manager.metadata_crypto is old_crypto
+        assert raw_rows(database_manager) == before and blind_index(database_manager) == before_index
+        assert [entry.website_name for entry in database_manager.search_entries('银行')] == ['工商银行']
+
+        database_manager.connection.execute(f"UPDATE password_entries SET encrypted_password = 'broken' "
+                                            f"WHERE id = {before[-1][0]}")
+        database_manager.commit()
+        before = raw_rows(database_manager)
+        try:
+            reencrypt_entries(database_manager, encryption_manager, OLD_PASSWORD, NEW_PASSWORD)
+        except RekeyError as e:
+            assert '路由器' in str(e)
+        else:
+            raise AssertionError("损坏的记录未导致回滚")
+        assert database_manager.metadata_crypto is old_crypto
+        assert raw_rows(database_manager) == before and blind_index(database_manager) == before_index
+        assert sorted(entry.website_name for entry in database_manager.search_entries()) == sorted(NAMES)
+
+        # 删除损坏的记录后成功：名称等用新密钥加密，盲索引令牌随之更新
+        database_manager.connection.execute(f"DELETE FROM password_entries WHERE id = {before[-1][0]}")
+        database_manager.connection.execute(f"DELETE FROM blind_index WHERE entry_id = {before[-1][0]}")
+        database_manager.commit()
+        result = reencrypt_entries(database_manager, encryption_manager, OLD_PASSWORD, NEW_PASSWORD)
+        assert (result.reencrypted, result.failed) == (3, [])
+        assert database_manager.metadata_crypto is not old_crypto
+        assert set(blind_index(database_manager)).isdisjoint(before_index)
+        assert passwords(database_manager, encryption_manager, NEW_PASSWORD) == {
+            name: f'{name}-pw' for name in NAMES[:3]}
+        assert [entry.website_name for entry in database_manager.search_entries('银行')] == ['工商银行']
+
+        # 用旧主密码派生的密钥已无法读出名称
+        database_manager.set_metadata_keys(
+            encryption_manager.derive_vault_keys(OLD_PASSWORD, database_manager.get_vault_salt()))
+        assert all(entry.website_name not in NAMES for entry in database_manager.search_entries())
+        database_manager.close()
+    print("✓ 加密元数据：取消或失败时整体回滚，成功后全部改用新密钥")
+
+
+if __name__ == "__main__":
+    test_plaintext_metadata()
+    test_encrypted_metadata()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 23:20
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 内存搜索索引测试
+# test_search_index.py
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database_manager import DatabaseManager
+from core.search_index import MIN_COMPACT_ROWS, SearchIndex
+from models.password_entry import PasswordEntry
+
+
+def make_entry(entry_id, name, url='', username='', category='默认', notes=''):
+    return PasswordEntry(id=entry_id, website_name=name, url=url, username=username,
+                         category=category, notes=notes, encrypted_password='x')
+
+
+def names(entries):
+    return [entry.website_name for entry in entries]
+
+
+def test_search():
+    """大小写无关的子串匹配，按网站名称排序"""
+    index = SearchIndex.build([
+        make_entry(1, 'GitHub', 'https://github.com', 'octocat', '工作'),
+        make_entry(2, 'Gitee', 'https://gitee.com', 'me'),
+        make_entry(3, '工商银行', 'https://www.icbc.com.cn', category='金融', notes='U盾'),
+        make_entry(4, 'Bank', notes='github backup codes'),
+    ])
+    assert len(index) == 4
+    assert names(index.search()) == ['Bank', 'Gitee', 'GitHub', '工商银行']
+    assert names(index.search('GIT')) == ['Bank', 'Gitee', 'GitHub']
+    assert names(index.search('octo')) == ['GitHub']
+    assert names(index.search('银行')) == ['工商银行']
+    assert names(index.search('u盾')) == ['工商银行']
+    assert names(index.search('g')) == ['Bank', 'Gitee', 'GitHub', '工商银行']
+    assert names(index.search('github', fields=('website_name',))) == ['GitHub']
+    assert names(index.search('git', limit=1)) == ['Bank']
+    assert index.search('gitlab') == []
+    print("✓ 内存搜索正确")
+
+
+def test_incremental_update():
+    """新增、修改、删除后的结果，以及空行过多时的重建"""
+    index = SearchIndex.build([make_entry(1, 'GitHub'), make_entry(2, 'Gitee')])
+    index.upsert(make_entry(3, 'GitLab'))
+    index.upsert(make_entry(1, 'Codeberg'))
+    index.remove(2)
+    index.remove(42)
+    assert names(index.search('git')) == ['GitLab']
+    assert names(index.search()) == ['Codeberg', 'GitLab']
+    assert index.get(1).website_name == 'Codeberg' and index.get(2) is None and 2 not in index
+
+    for i in range(MIN_COMPACT_ROWS * 2):
+        index.upsert(make_entry(3, f'GitLab {i}'))
+    assert len(index._entries) < MIN_COMPACT_ROWS * 2
+    assert names(index.search('gitlab')) == [f'GitLab {MIN_COMPACT_ROWS * 2 - 1}']
+    print("✓ 增量更新正确")
+
+
+def test_matches_database():
+    """与 search_entries 的结果一致（数据库不搜索用户名）"""
+    rng = random.Random(7)
+    words = ['git', 'hub', 'mail', 'bank', '银行', '工作', 'cloud', 'shop', 'Box', 'ABC']
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager = DatabaseManager()
+        assert database_manager.connect({'use_sqlite': True, 'sqlite_path': os.path.join(directory, 'test.db')})
+        database_manager.bulk_insert_entries([
+            PasswordEntry(website_name=''.join(rng.sample(words, 2)) + str(i),
+                          url=f'https://{rng.choice(words)}.example.com', username='user',
+                          notes=rng.choice(words), category=rng.choice(['默认', '工作', '金融']),
+                          encrypted_password='x')
+            for i in range(500)
+        ])
+        index = SearchIndex.build(database_manager.iter_entries())
+        for keyword in ['git', 'Hub', 'bank', '银行', 'abc', 'b', '42', 'example', 'nothing']:
+            expected = sorted(entry.id for entry in database_manager.search_entries(keyword))
+            assert sorted(entry.id for entry in index.search(keyword)) == expected, keyword
+        assert [entry.id for entry in index.search()] == [entry.id for entry in database_manager.search_entries()]
+        database_manager.close()
+    print("✓ 与数据库搜索结果一致")
+
+
+def test_search_speed():
+    """一万条记录，三字符以上的关键字应在毫秒以内"""
+    index = SearchIndex.build(make_entry(i, f'site{i:05d}', f'https://site{i}.example.com', f'user{i}')
+                              for i in range(10000))
+    start = time.perf_counter()
+    for _ in range(100):
+        result = index.search('site01234')
+    elapsed = (time.perf_counter() - start) / 100
+    assert names(result) == ['site01234']
+    assert elapsed < 0.001, elapsed
+    print(f"✓ 搜索耗时 {elapsed * 1e6:.0f}µs")
+
+
+if __name__ == "__main__":
+    test_search()
+    test_incremental_update()
+    test_matches_database()
+    test_search_speed()
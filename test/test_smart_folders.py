@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-20 02:40
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 智能文件夹测试
+# test_smart_folders.py
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database_manager import DatabaseManager
+from core.smart_folders import CONFIG_KEY, SmartFolder, load_folders, save_folders
+from core.search_index import SearchIndex
+from models.password_entry import PasswordEntry
+
+FOLDERS = [
+    SmartFolder('一年未更新的金融账号', 'category:金融 updated:<1y'),
+    SmartFolder('Git', 'site:git*'),
+]
+
+
+def make_entry(entry_id, name, category, updated_at):
+    return PasswordEntry(id=entry_id, website_name=name, username='me', category=category,
+                         encrypted_password='x', updated_at=updated_at)
+
+
+def names(entries):
+    return [entry.website_name for entry in entries]
+
+
+def test_config():
+    """定义保存在 user_config 中，无效的定义被跳过"""
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager = DatabaseManager()
+        assert database_manager.connect({'use_sqlite': True, 'sqlite_path': os.path.join(directory, 'test.db')})
+        assert load_folders(database_manager) == []
+        assert save_folders(database_manager, FOLDERS)
+        assert load_folders(database_manager) == FOLDERS
+
+        database_manager.set_config_value(
+            CONFIG_KEY, '[{"name": "坏的", "query": "site:"}, {"query": "x"}, {"name": "好的", "query": "x"}]')
+        assert load_folders(database_manager) == [SmartFolder('好的', 'x')]
+        database_manager.set_config_value(CONFIG_KEY, 'not json')
+        assert load_folders(database_manager) == []
+        database_manager.close()
+    print("✓ 智能文件夹定义读写正确")
+
+
+def test_incremental():
+    """新增、修改、删除记录时成员增量更新"""
+    now = datetime.now()
+    old = now - timedelta(days=400)
+    index = SearchIndex.build([
+        make_entry(1, '招商银行', '金融', old),
+        make_entry(2, '工商银行', '金融', now),
+        make_entry(3, 'GitHub', '工作', old),
+    ])
+    index.set_smart_folders(FOLDERS)
+    assert names(index.folder_entries('一年未更新的金融账号')) == ['招商银行']
+    assert index.folder_counts() == {'一年未更新的金融账号': 1, 'Git': 1}
+
+    index.upsert(make_entry(4, 'Bank', '金融', old))
+    index.upsert(make_entry(5, 'Gitee', '工作', now))
+    assert names(index.folder_entries('一年未更新的金融账号')) == ['Bank', '招商银行']
+    assert names(index.folder_entries('Git')) == ['Gitee', 'GitHub']
+
+    # 更新后移出文件夹、删除记录
+    index.upsert(make_entry(1, '招商银行', '金融', now))
+    index.remove(3)
+    assert names(index.folder_entries('一年未更新的金融账号')) == ['Bank']
+    assert names(index.folder_entries('Git')) == ['Gitee']
+
+    # 复制密码后使用次数增加
+    index.add_smart_folder(SmartFolder('常用', 'used:>0'))
+    assert index.folder_members('常用') == set()
+    entry = index.get(2)
+    entry.usage_count += 1
+    index.upsert(entry)
+    assert names(index.folder_entries('常用')) == ['工商银行']
+    assert index.folder_counts()['常用'] == 1
+    index.remove_smart_folder('常用')
+
+    # 新增、替换和删除文件夹
+    index.add_smart_folder(SmartFolder('Git', 'site:gitee'))
+    index.add_smart_folder(SmartFolder('银行', 'site:银行'))
+    assert names(index.folder_entries('银行')) == ['工商银行', '招商银行']
+    assert names(index.folder_entries('Git')) == ['Gitee']
+    index.remove_smart_folder('银行')
+    assert index.folder_entries('银行') == []
+    assert index.folder_members('不存在') == set()
+    print("✓ 成员增量更新正确")
+
+
+def test_relative_date():
+    """相对日期的文件夹跨天后重新求值"""
+    entry = make_entry(1, '招商银行', '金融', datetime.now() - timedelta(days=370))
+    index = SearchIndex.build([entry])
+    index.set_smart_folders(FOLDERS)
+    assert names(index.folder_entries('一年未更新的金融账号')) == ['招商银行']
+
+    # 模拟成员是 10 天前计算的（当时还不满一年），再次访问时按今天重新计算
+    materialized = index.smart_folders._folders['一年未更新的金融账号']
+    materialized.fill([entry], date.today() - timedelta(days=10))
+    assert materialized.members == set()
+    assert names(index.folder_entries('一年未更新的金融账号')) == ['招商银行']
+    print("✓ 相对日期文件夹跨天刷新正确")
+
+
+def test_speed():
+    """切换文件夹只取物化集合，不随条件复杂度变化"""
+    now = datetime.now()
+    entries = [make_entry(i, f'site{i:05d}', '金融' if i % 10 == 0 else '工作', now - timedelta(days=i % 800))
+               for i in range(1, 10001)]
+    index = SearchIndex.build(entries)
+    index.set_smart_folders(FOLDERS)
+
+    started = time.perf_counter()
+    for _ in range(100):
+        result = index.folder_entries('一年未更新的金融账号')
+    elapsed = (time.perf_counter() - started) / 100
+    assert len(result) == len([entry for entry in entries
+                               if entry.category == '金融' and (now - entry.updated_at).days > 366])
+
+    started = time.perf_counter()
+    for i in range(100):
+        index.upsert(make_entry(10001 + i, f'new{i}', '金融', now - timedelta(days=500)))
+    upsert = (time.perf_counter() - started) / 100
+    assert index.folder_counts()['一年未更新的金融账号'] == len(result) + 100
+    print(f"✓ 切换文件夹 {elapsed * 1000:.2f} ms，单条更新 {upsert * 1e6:.0f} µs（10000 条记录）")
+
+
+if __name__ == "__main__":
+    test_config()
+    test_incremental()
+    test_relative_date()
+    test_speed()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 13:30
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 启动耗时基准测试（超出预算即失败，可用于CI回归检查）
+# test_startup_benchmark.py
+"""
+在临时目录中以 offscreen 平台启动 main.py，启动完成（首次绘制、数据库已连接）后
+自动退出，读取启动报告并与预算比较。
+
+    PASSWDMGR_STARTUP_BUDGET_MS   启动总耗时预算（毫秒，默认 3000）
+    PASSWDMGR_STARTUP_RUNS        运行次数，取中位数（默认 3）
+"""
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(PROJECT_ROOT, 'main.py')
+
+
+def qt_available():
+    """检查是否安装了 PyQt6 / PyQt5"""
+    for module in ('PyQt6.QtWidgets', 'PyQt5.QtWidgets'):
+        try:
+            __import__(module)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+def run_startup(work_dir, timeout=60):
+    """启动一次程序，返回启动报告"""
+    report_path = os.path.join(work_dir, 'startup_report.json')
+    if os.path.exists(report_path):
+        os.remove(report_path)
+
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    env['PYTHONPATH'] = PROJECT_ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    result = subprocess.run(
+        [sys.executable, MAIN_SCRIPT, f'--startup-report={report_path}', '--startup-exit'],
+        cwd=work_dir, env=env, capture_output=True, timeout=timeout
+    )
+    if not os.path.exists(report_path):
+        raise AssertionError(f"未生成启动报告，退出码 {result.returncode}:\n"
+                             f"{result.stderr.decode('utf-8', 'replace')[-2000:]}")
+    with open(report_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_startup_benchmark():
+    """测试启动耗时是否在预算之内"""
+    if not qt_available():
+        print("未安装 PyQt，跳过启动基准测试")
+        return
+
+    budget_ms = float(os.environ.get('PASSWDMGR_STARTUP_BUDGET_MS', 3000))
+    runs = int(os.environ.get('PASSWDMGR_STARTUP_RUNS', 3))
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # 预先创建数据库文件，避免首次使用的提示框
+        sqlite3.connect(os.path.join(work_dir, 'password_manager.db')).close()
+
+        totals = []
+        for i in range(runs):
+            report = run_startup(work_dir)
+            totals.append(report['total_ms'])
+            print(f"第 {i + 1} 次启动: {report['total_ms']} ms")
+
+    # 输出最后一次的阶段明细，便于定位变慢的阶段
+    for phase in report['phases']:
+        print(f"  {phase['name']:<24}{phase['start_ms']:>10} ms{phase['duration_ms']:>10} ms")
+
+    median_ms = statistics.median(totals)
+    print(f"启动耗时中位数: {median_ms} ms（预算 {budget_ms} ms）")
+    assert median_ms <= budget_ms, f"启动耗时 {median_ms} ms 超出预算 {budget_ms} ms"
+    print("✓ 测试通过: 启动耗时在预算之内")
+
+
+if __name__ == "__main__":
+    test_startup_benchmark()
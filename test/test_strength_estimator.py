@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 19:40
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 密码强度估计测试
+# test_strength_estimator.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.strength_estimator import estimate_strength, get_strength_estimator
+
+
+def patterns(password, user_inputs=()):
+    return [match.pattern for match in estimate_strength(password, user_inputs)['sequence']]
+
+
+def test_common_patterns_are_weak():
+    """常见密码、键盘路径、日期、重复、序列和 l33t 变体都判为弱"""
+    for password in ["password", "P@ssw0rd", "drowssap", "qwerty123", "woaini1314",
+                     "19900101", "1990-01-01", "abcabcabc", "abcdefg", "asdfghjkl;"]:
+        result = estimate_strength(password)
+        assert result['level'] == "弱", (password, result['guesses_log10'])
+    assert patterns("asdfghjkl;") == ['spatial']
+    assert patterns("1990-01-01") == ['date']
+    assert patterns("abcabcabc") == ['repeat']
+    assert patterns("zyxwv") == ['sequence']
+    print("✓ 常见模式判为弱")
+
+
+def test_random_passwords_are_strong():
+    """随机密码按暴力破解计算"""
+    assert estimate_strength("k#9Lp2!x")['level'] == "强"
+    assert estimate_strength("Xy7#kQ2!vR9pL9@w")['level'] == "非常强"
+    print("✓ 随机密码判为强")
+
+
+def test_user_inputs():
+    """网站名、用户名出现在密码中时视为容易猜到"""
+    assert patterns("evergarden2020", ["evergarden"]) == ['dictionary', 'date']
+    print("✓ 账号相关的词被识别")
+
+
+def test_speed():
+    """每次估计应在 1 毫秒左右（输入时实时计算）"""
+    estimator = get_strength_estimator()
+    passwords = ["Tr0ub4dor&3", "correcthorsebattery", "zhangsan1990", "k#9Lp2!x"] * 250
+    estimator.estimate("warm up")
+    start = time.perf_counter()
+    estimator.estimate_many(passwords)
+    average_ms = (time.perf_counter() - start) * 1000 / len(passwords)
+    assert average_ms < 2, average_ms
+    print(f"✓ 平均耗时 {average_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    test_common_patterns_are_weak()
+    test_random_passwords_are_strong()
+    test_user_inputs()
+    test_speed()
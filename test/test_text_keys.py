@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-20 00:50
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 拼音搜索与排序键测试
+# test_text_keys.py
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database_manager import DatabaseManager
+from core.search_index import SearchIndex
+from models.password_entry import PasswordEntry
+from utils.text_keys import backend, normalize, pinyin_initials, search_key, sort_key
+
+NAMES = ['招商银行', 'GitHub', '阿里云', 'Baidu', '百度网盘', '中国银行', 'Apple', 'ＱＱ邮箱']
+EXPECTED_ORDER = ['Apple', '阿里云', 'Baidu', '百度网盘', 'GitHub', 'ＱＱ邮箱', '招商银行', '中国银行']
+
+
+def connect(directory):
+    database_manager = DatabaseManager()
+    assert database_manager.connect({'use_sqlite': True, 'sqlite_path': os.path.join(directory, 'test.db')})
+    return database_manager
+
+
+def test_keys():
+    """首字母、多音字、全角/半角"""
+    assert normalize('ＧｉｔＨｕｂ') == 'github'
+    assert search_key('ＱＱ邮箱') == 'qq邮箱'
+    assert 'zsyh' in pinyin_initials('招商银行').split()
+    assert 'zgyh' in pinyin_initials('中国 银行').split()
+    assert pinyin_initials('GitHub') is None
+    assert sorted(NAMES, key=sort_key) == EXPECTED_ORDER
+    print(f"✓ 排序键与首字母正确（{backend()}）")
+
+
+def test_database():
+    """数据库按排序键排序，按首字母和全角关键字搜索"""
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager = connect(directory)
+        for name in NAMES:
+            assert database_manager.add_entry(PasswordEntry(website_name=name, username='me',
+                                                            encrypted_password='x'))
+        assert [entry.website_name for entry in database_manager.search_entries()] == EXPECTED_ORDER
+        assert [entry.website_name for entry in database_manager.search_entries('zsyh')] == ['招商银行']
+        assert [entry.website_name for entry in database_manager.search_entries('ZSYX')] == ['招商银行']
+        assert [entry.website_name for entry in database_manager.search_entries('yh')] == ['招商银行', '中国银行']
+        assert [entry.website_name for entry in database_manager.search_entries('qq')] == ['ＱＱ邮箱']
+        assert [entry.website_name for entry in database_manager.search_entries('ｇｉｔ')] == ['GitHub']
+
+        # 内存索引与数据库一致
+        index = SearchIndex.build(database_manager.iter_entries())
+        assert [entry.website_name for entry in index.search()] == EXPECTED_ORDER
+        for keyword in ('zsyh', 'yh', 'qq', 'ｇｉｔ', '银行'):
+            assert ([entry.id for entry in index.search(keyword)]
+                    == [entry.id for entry in database_manager.search_entries(keyword)]), keyword
+        assert [entry.website_name for entry in index.ranked_search('zsyh')] == ['招商银行']
+
+        plan = database_manager.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM password_entries ORDER BY sort_key, website_name").fetchall()
+        assert 'idx_sort_key' in str([tuple(row) for row in plan])
+        database_manager.close()
+    print("✓ 数据库排序与拼音搜索正确")
+
+
+def test_backfill():
+    """旧版本数据库打开时补全排序键"""
+    with tempfile.TemporaryDirectory() as directory:
+        connection = sqlite3.connect(os.path.join(directory, 'test.db'))
+        connection.execute("""
+            CREATE TABLE password_entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, website_name TEXT NOT NULL, url TEXT,
+                username TEXT NOT NULL, encrypted_password TEXT NOT NULL, notes TEXT, category TEXT DEFAULT '默认',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        connection.executemany("INSERT INTO password_entries (website_name, username, encrypted_password, "
+                               "updated_at) VALUES (?, 'me', 'x', '2020-01-01 00:00:00')",
+                               [(name,) for name in NAMES])
+        connection.commit()
+        connection.close()
+
+        database_manager = connect(directory)
+        entries = database_manager.search_entries()
+        assert [entry.website_name for entry in entries] == EXPECTED_ORDER
+        assert all(entry.updated_at.year == 2020 for entry in entries)
+        assert database_manager.get_config_value('text_keys_backend') == backend()
+        assert [entry.website_name for entry in database_manager.search_entries('zgyh')] == ['中国银行']
+        database_manager.close()
+    print("✓ 旧数据库补全排序键正确")
+
+
+if __name__ == "__main__":
+    test_keys()
+    test_database()
+    test_backfill()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 19:10
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 密码健康检查测试
+# test_vault_audit.py
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.vault_audit import VaultAuditor
+from models.password_entry import PasswordEntry
+
+
+class CountingCipher:
+    """不加密的测试用加密管理器，记录解密次数"""
+
+    def __init__(self):
+        self.decrypted = 0
+
+    def decrypt(self, data, password):
+        if not data.startswith("plain:"):
+            raise ValueError("bad data")
+        self.decrypted += 1
+        return data[len("plain:"):]
+
+    def decrypt_many(self, items, password):
+        return [self.decrypt(item, password) for item in items]
+
+
+def make_entries(count, now):
+    entries = []
+    for i in range(count):
+        password = "123456" if i % 10 == 0 else f"Xy7#kQ2!vR{i}pL9@"
+        entries.append(PasswordEntry(
+            id=i + 1, website_name=f"site{i}", url="" if i % 7 == 0 else f"https://site{i}.com",
+            username=f"user{i}", encrypted_password=f"plain:{password}",
+            password_fingerprint=f"fp-{password}", updated_at=now - timedelta(days=i % 400)))
+    return entries
+
+
+def test_audit_issues():
+    """各检查项的统计"""
+    now = datetime(2026, 10, 19)
+    entries = make_entries(100, now)
+    entries.append(PasswordEntry(id=1000, website_name="broken", username="", url="https://x.com",
+                                 encrypted_password="garbage", updated_at=now))
+
+    report = VaultAuditor(CountingCipher()).audit(entries, "master", now=now)
+    assert report.total == 101
+    assert report.issue_counts['weak'] == 10
+    assert report.issue_counts['reused'] == 10
+    assert report.issue_counts['missing_url'] == 15
+    assert report.issue_counts['missing_username'] == 1
+    assert report.issue_counts['undecryptable'] == 1
+    assert 'old' not in report.issue_counts
+    print("✓ 检查项统计正确")
+
+
+def test_incremental_audit():
+    """第二次检查只解密修改过的记录，删除的记录不再出现"""
+    now = datetime(2026, 10, 19)
+    entries = make_entries(2000, now)
+    cipher = CountingCipher()
+    auditor = VaultAuditor(cipher)
+
+    auditor.audit(entries, "master", now=now)
+    assert cipher.decrypted == 2000
+
+    entries[1].encrypted_password = "plain:123456"
+    entries[1].password_fingerprint = "fp-123456"
+    entries[1].updated_at = now
+    del entries[-1]
+    report = auditor.audit(entries, "master", now=now)
+    assert cipher.decrypted == 2001
+    assert report.rescored == 1
+    assert report.issue_counts['weak'] == 201
+    assert report.total == 1999
+
+    auditor.invalidate()
+    auditor.audit(entries, "master", now=now)
+    assert cipher.decrypted == 2001 + 1999
+    print("✓ 增量检查正确")
+
+
+if __name__ == "__main__":
+    test_audit_issues()
+    test_incremental_audit()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 17:05
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 密码库导出/导入往返测试
+# test_vault_transfer.py
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database_manager import DatabaseManager
+from core.encryption_manager import EncryptionManager
+from core.vault_transfer import VaultTransferError, export_vault, import_vault
+from models.password_entry import PasswordEntry
+
+MASTER_PASSWORD = "my_master_password"
+
+
+def make_vault(directory, name, count=0):
+    """创建临时 SQLite 密码库并写入测试条目"""
+    database_manager = DatabaseManager()
+    database_manager.connect({'use_sqlite': True, 'sqlite_path': os.path.join(directory, name)})
+    encryption_manager = EncryptionManager()
+    passwords = [f'pw,"{i}"\n中文' for i in range(count)]
+    encrypted = encryption_manager.encrypt_many(passwords, MASTER_PASSWORD)
+    database_manager.bulk_insert_entries([
+        PasswordEntry(website_name=f"网站{i}", url=f"https://example{i}.com", username=f"user{i}",
+                      encrypted_password=encrypted[i], notes="第一行\n第二行", category="工作")
+        for i in range(count)
+    ])
+    return database_manager, encryption_manager
+
+
+def snapshot(database_manager, encryption_manager):
+    """按导出字段读取所有条目（解密后）"""
+    result = []
+    for entries in database_manager.iter_entries(batch_size=7):
+        passwords = encryption_manager.decrypt_many([e.encrypted_password for e in entries], MASTER_PASSWORD)
+        result.extend((e.website_name, e.url, e.username, p, e.notes, e.category, e.created_at)
+                      for e, p in zip(entries, passwords))
+    return result
+
+
+def test_round_trip():
+    """三种格式导出后导入到新库，内容应完全一致"""
+    with tempfile.TemporaryDirectory() as directory:
+        source, encryption_manager = make_vault(directory, 'source.db', count=25)
+        expected = snapshot(source, encryption_manager)
+
+        for fmt in ('jsonl', 'csv', 'vault'):
+            file_path = os.path.join(directory, f'backup.{fmt}')
+            progress = []
+            exported = export_vault(source, encryption_manager, MASTER_PASSWORD, file_path, fmt,
+                                    batch_size=10, progress=lambda done, total: progress.append((done, total)))
+            assert exported == 25
+            assert progress == [(10, 25), (20, 25), (25, 25)]
+            if os.name == 'posix':
+                # 导出文件只允许所有者读写
+                assert os.stat(file_path).st_mode & 0o777 == 0o600, fmt
+
+            target, _ = make_vault(directory, f'target_{fmt}.db')
+            imported = import_vault(target, encryption_manager, MASTER_PASSWORD, file_path, batch_size=10)
+            assert imported == 25
+            assert snapshot(target, encryption_manager) == expected, fmt
+            target.close()
+            print(f"✓ {fmt} 往返一致")
+
+        source.close()
+
+
+def test_archive_wrong_password():
+    """加密归档使用错误密码导入应失败"""
+    with tempfile.TemporaryDirectory() as directory:
+        source, encryption_manager = make_vault(directory, 'source.db', count=3)
+        file_path = os.path.join(directory, 'backup.pmvault')
+        export_vault(source, encryption_manager, MASTER_PASSWORD, file_path, 'vault',
+                     archive_password="archive_password")
+        target, _ = make_vault(directory, 'target.db')
+        try:
+            import_vault(target, encryption_manager, MASTER_PASSWORD, file_path)
+        except VaultTransferError:
+            print("✓ 错误的归档密码被拒绝")
+        else:
+            raise AssertionError("错误的归档密码未被拒绝")
+        assert target.count_entries() == 0
+        source.close()
+        target.close()
+
+
+def test_export_permissions():
+    """覆盖已存在的导出文件时也改为仅所有者可读写"""
+    if os.name != 'posix':
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        source, encryption_manager = make_vault(directory, 'source.db', count=2)
+        file_path = os.path.join(directory, 'backup.csv')
+        with open(file_path, 'w') as f:
+            f.write('旧内容' * 100)
+        os.chmod(file_path, 0o644)
+        export_vault(source, encryption_manager, MASTER_PASSWORD, file_path, 'csv')
+        assert os.stat(file_path).st_mode & 0o777 == 0o600
+        with open(file_path, encoding='utf-8') as f:
+            assert '旧内容' not in f.read()
+        source.close()
+    print("✓ 导出文件权限为 0600")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_archive_wrong_password()
+    test_export_permissions()
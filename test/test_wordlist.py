@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 20:35
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 词表与密码短语测试
+# test_wordlist.py
+import math
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.wordlist import WORDLIST_LANGUAGES, Wordlist, get_wordlist, write_wordlist
+from core.password_generator import PassphraseGenerator, PassphrasePolicy
+
+
+def test_roundtrip():
+    """写出后按下标读取，重复词只保留一个"""
+    words = ["apple", "密码", "zhongguo", "apple", "señal"]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "test.pmwords")
+        assert write_wordlist(words, path) == 4
+        with Wordlist(path) as wordlist:
+            assert len(wordlist) == 4
+            assert list(wordlist) == ["apple", "密码", "zhongguo", "señal"]
+            assert wordlist[1] == "密码"
+    print("✓ 词表读写正确")
+
+
+def test_builtin_wordlists():
+    """内置词表都能加载"""
+    for language in WORDLIST_LANGUAGES:
+        wordlist = get_wordlist(language)
+        assert len(wordlist) > 100, language
+        assert all(word and not word.isspace() for word in wordlist)
+    print("✓ 内置词表可用")
+
+
+def test_passphrase():
+    """词数、分隔符、大小写、数字和熵"""
+    policy = PassphrasePolicy(words=5, language='pinyin', separator='.', capitalization='title', digits=2)
+    generator = PassphraseGenerator(policy)
+    for passphrase in generator.generate(200):
+        parts = passphrase.split('.')
+        assert len(parts) == 5
+        assert all(part[0].isupper() for part in parts)
+        assert sum(c.isdigit() for c in passphrase) == 2
+
+    size = len(get_wordlist('pinyin'))
+    assert math.isclose(generator.entropy_bits, 5 * math.log2(size) + 2 * math.log2(50))
+    print(f"✓ 密码短语正确，熵 {generator.entropy_bits:.1f} 位")
+
+
+if __name__ == "__main__":
+    test_roundtrip()
+    test_builtin_wordlists()
+    test_passphrase()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 18:20
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 把 HIBP 密码哈希数据集转换为离线检查用的二进制文件
+"""
+用法:
+    python utils/build_breach_corpus.py pwned-passwords-sha1-ordered-by-hash.txt
+    python utils/build_breach_corpus.py hibp_ranges/ -o hibp.pmbreach
+    python utils/build_breach_corpus.py hibp.pmbreach --check password123
+"""
+import argparse
+import getpass
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.breach_checker import CORPUS_EXTENSION, BreachCorpus, BreachCorpusError, build_corpus, is_corpus_file
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='转换泄露密码数据集')
+    parser.add_argument('source', help='HIBP 文本文件、范围目录或已转换的 .pmbreach 文件')
+    parser.add_argument('-o', '--output', help=f'输出文件（默认与输入同名，扩展名为 {CORPUS_EXTENSION}）')
+    parser.add_argument('--check', nargs='?', const='', metavar='PASSWORD',
+                        help='转换后检查一个密码（不带参数时从终端读取）')
+    args = parser.parse_args(argv)
+
+    try:
+        corpus_path = args.source
+        if not is_corpus_file(corpus_path):
+            corpus_path = args.output or os.path.splitext(args.source.rstrip('/\\'))[0] + CORPUS_EXTENSION
+            start = time.perf_counter()
+
+            def progress(done, total):
+                print(f"\r已处理 {done} 条" + (f" / {total}" if total else ""), end='', file=sys.stderr)
+
+            count = build_corpus(args.source, corpus_path, progress)
+            print(f"\n转换完成: {count} 条记录 -> {corpus_path}，耗时 {time.perf_counter() - start:.1f} 秒",
+                  file=sys.stderr)
+
+        if args.check is not None:
+            password = args.check or getpass.getpass("要检查的密码: ")
+            with BreachCorpus(corpus_path) as corpus:
+                count = corpus.lookup(password)
+            print(f"已泄露 {count} 次" if count else "未发现泄露")
+    except BreachCorpusError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
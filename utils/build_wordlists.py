@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 20:35
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 把文本词表转换为密码短语用的二进制词表
+"""
+用法:
+    python utils/build_wordlists.py                       # 转换 resources/wordlists/*.txt
+    python utils/build_wordlists.py eff_large_wordlist.txt -o resources/wordlists/en.pmwords
+"""
+import argparse
+import glob
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.wordlist import WORDLIST_DIR, WORDLIST_EXTENSION, WordlistError, read_text_wordlist, write_wordlist
+
+
+def convert(source, output):
+    count = write_wordlist(read_text_wordlist(source), output)
+    print(f"{source} -> {output}: {count} 个词，每个词 {math.log2(count):.2f} 位熵")
+
+
+def main(argv=None):
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description='转换密码短语词表')
+    parser.add_argument('sources', nargs='*', help='文本词表（默认为 resources/wordlists/*.txt）')
+    parser.add_argument('-o', '--output', help=f'输出文件（只有一个输入时可用，默认扩展名改为 {WORDLIST_EXTENSION}）')
+    args = parser.parse_args(argv)
+
+    sources = args.sources or sorted(glob.glob(os.path.join(project_root, WORDLIST_DIR, '*.txt')))
+    if args.output and len(sources) != 1:
+        parser.error("指定 --output 时只能有一个输入文件")
+
+    try:
+        for source in sources:
+            convert(source, args.output or os.path.splitext(source)[0] + WORDLIST_EXTENSION)
+    except (OSError, WordlistError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
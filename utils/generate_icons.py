@@ -5,11 +5,16 @@
 # @Email   : violet20160719@163.com
 # @Python  : 3.12
 # @Desc    : 图标格式转换工具
+import json
 import os
 import shutil
 from pathlib import Path
 from PIL import Image
 
+# 图集中每个图标预先栅格化的尺寸（菜单、工具栏、窗口图标）
+ATLAS_SIZES = (16, 24, 32, 48, 64)
+ATLAS_SOURCE_EXTENSIONS = ('.svg', '.png', '.ico', '.jpg', '.jpeg')
+
 
 class IconManagerTool:
     def __init__(self):
@@ -160,6 +165,78 @@ class IconManagerTool:
             print("\n所有必需图标都已存在!")
 
 
+    def build_icon_atlas(self, sizes=ATLAS_SIZES):
+        """把图标目录中的所有图标预先栅格化为一张图集，并生成JSON索引
+
+        生成 resources/icons/atlas/icons.png 和 icons.json，IconManager
+        运行时只需读取这两个文件，不再逐个探测和解析SVG。
+        """
+        # SVG 栅格化需要 Qt（QtSvg 图像插件），无界面环境下使用 offscreen 平台
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        try:
+            from PyQt6.QtGui import QGuiApplication, QIcon, QImage, QPainter
+            from PyQt6.QtCore import Qt
+        except ImportError:
+            from PyQt5.QtGui import QGuiApplication, QIcon, QImage, QPainter
+            from PyQt5.QtCore import Qt
+
+        app = QGuiApplication.instance() or QGuiApplication([])
+
+        # 同名图标按扩展名优先级只取一个
+        sources = {}
+        for icon_file in sorted(self.icons_dir.iterdir()):
+            ext = icon_file.suffix.lower()
+            if not icon_file.is_file() or ext not in ATLAS_SOURCE_EXTENSIONS:
+                continue
+            current = sources.get(icon_file.stem)
+            if current is None or ATLAS_SOURCE_EXTENSIONS.index(ext) < ATLAS_SOURCE_EXTENSIONS.index(current.suffix.lower()):
+                sources[icon_file.stem] = icon_file
+
+        if not sources:
+            print("没有找到可加入图集的图标")
+            return None
+
+        # 每个图标占一行，各尺寸从左到右排列
+        row_height = max(sizes)
+        atlas = QImage(sum(sizes), row_height * len(sources), QImage.Format.Format_ARGB32_Premultiplied)
+        atlas.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(atlas)
+        index = {}
+        for row, (icon_name, icon_file) in enumerate(sorted(sources.items())):
+            icon = QIcon(str(icon_file))
+            if icon.isNull():
+                print(f"  ⚠️ 无法加载图标: {icon_file.name}")
+                continue
+            rects = {}
+            x = 0
+            y = row * row_height
+            for size in sizes:
+                painter.drawPixmap(x, y, icon.pixmap(size, size))
+                rects[str(size)] = [x, y, size, size]
+                x += size
+            index[icon_name] = {'source': icon_file.name, 'rects': rects}
+        painter.end()
+
+        atlas_dir = self.icons_dir / "atlas"
+        atlas_dir.mkdir(exist_ok=True)
+        image_path = atlas_dir / "icons.png"
+        index_path = atlas_dir / "icons.json"
+        atlas.save(str(image_path), "PNG")
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'image': image_path.name, 'sizes': list(sizes), 'icons': index},
+                      f, indent=2, ensure_ascii=False)
+
+        print(f"生成图标图集: {image_path.relative_to(self.project_root)}（{len(index)} 个图标）")
+        print(f"生成图集索引: {index_path.relative_to(self.project_root)}")
+        return index_path
+
+
+def build_icon_atlas():
+    """生成图标图集（供构建脚本调用）"""
+    return IconManagerTool().build_icon_atlas()
+
+
 def main():
     tool = IconManagerTool()
 
@@ -168,8 +245,9 @@ def main():
     print("2. 列出当前图标")
     print("3. 检查必需图标")
     print("4. 从源图像生成图标")
+    print("5. 生成图标图集")
 
-    choice = input("请选择操作 (1-4): ").strip()
+    choice = input("请选择操作 (1-5): ").strip()
 
     if choice == "1":
         tool.setup_icon_structure()
@@ -181,6 +259,8 @@ def main():
         source_path = input("输入源图像路径: ").strip()
         icon_name = input("输入图标名称: ").strip()
         tool.generate_icon_sizes(Path(source_path), icon_name)
+    elif choice == "5":
+        tool.build_icon_atlas()
     else:
         print("无效选择")
 
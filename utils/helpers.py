@@ -33,4 +33,19 @@ def sanitize_filename(filename: str) -> str:
     invalid_chars = '<>:"/\\|?*'
     for char in invalid_chars:
         filename = filename.replace(char, '_')
-    return filename
\ No newline at end of file
+    return filename
+
+def open_private_file(file_path: str, mode: str = 'w', **kwargs):
+    """以仅所有者可读写（0600）的权限创建并打开文件，用于写出明文密码等敏感数据
+
+    已存在的文件会被截断并改为 0600（os.open 的权限只在新建时生效）。
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(file_path, flags, 0o600)
+    try:
+        if hasattr(os, 'fchmod'):
+            os.fchmod(fd, 0o600)
+        return os.fdopen(fd, mode, **kwargs)
+    except Exception:
+        os.close(fd)
+        raise
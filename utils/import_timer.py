@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 11:20
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 导入耗时统计（类似 python -X importtime，打包后也可用）
+import builtins
+import sys
+import time
+import threading
+
+
+class ImportTimer:
+    """记录每个模块首次导入的耗时"""
+
+    def __init__(self):
+        self._original_import = None
+        self._stack = []
+        # 模块名 -> [累计耗时, 自身耗时]
+        self.records = {}
+        self.order = []
+
+    def install(self):
+        """替换内置 __import__ 开始统计"""
+        if self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        """恢复内置 __import__"""
+        if self._original_import is None:
+            return
+        builtins.__import__ = self._original_import
+        self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # 只统计主线程中的首次绝对导入，已加载模块直接放行
+        if (level != 0 or name in sys.modules
+                or threading.current_thread() is not threading.main_thread()):
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            if name not in self.records:
+                self.order.append(name)
+                self.records[name] = [elapsed, elapsed - children]
+
+    def report(self, top: int = 30) -> str:
+        """生成按累计耗时排序的报告"""
+        total = sum(self_time for _cumulative, self_time in self.records.values())
+        lines = [f"导入耗时报告（共 {len(self.records)} 个模块，合计 {total * 1000:.1f} ms）",
+                 f"{'累计(ms)':>10} {'自身(ms)':>10}  模块"]
+        ranked = sorted(self.records.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (cumulative, self_time) in ranked[:top]:
+            lines.append(f"{cumulative * 1000:>10.1f} {self_time * 1000:>10.1f}  {name}")
+        return "\n".join(lines)
+
+
+# 全局导入计时器实例（未启用时为 None）
+_import_timer = None
+
+
+def start_import_timer():
+    """创建并安装全局导入计时器"""
+    global _import_timer
+    if _import_timer is None:
+        _import_timer = ImportTimer()
+        _import_timer.install()
+    return _import_timer
+
+
+def get_import_timer():
+    """获取全局导入计时器（未启用时为 None）"""
+    return _import_timer
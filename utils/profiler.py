@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-19 10:02
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 内置性能剖析器（cProfile / 采样），输出 collapsed-stack 与 speedscope 格式
+"""
+使用方式:
+    python main.py --profile                 # 默认采样模式，剖析整个运行过程
+    python main.py --profile=cprofile        # cProfile 模式
+    python main.py --profile --profile-op=unlock,search   # 只剖析指定操作
+
+    也可以使用环境变量（打包后的 exe/AppImage 更方便）:
+    PASSWDMGR_PROFILE=sample|cprofile
+    PASSWDMGR_PROFILE_OPS=unlock,search,rekey
+    PASSWDMGR_PROFILE_DIR=输出目录（默认当前目录下的 profiles）
+
+退出时在输出目录生成:
+    *.collapsed       火焰图工具（flamegraph.pl / speedscope）可直接读取的折叠栈
+    *.speedscope.json speedscope 格式
+    *.pstats          cProfile 模式下额外输出的原始统计数据
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ('sample', 'cprofile')
+
+
+class AppProfiler:
+    """应用剖析器"""
+
+    def __init__(self, mode='sample', operations=None, output_dir=None, interval=0.005):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"不支持的剖析模式: {mode}")
+        self.mode = mode
+        # 为空表示剖析整个运行过程
+        self.operations = set(operations or [])
+        self.output_dir = output_dir or os.path.join(os.getcwd(), 'profiles')
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._active_depth = 0
+        self._stacks = Counter()
+        self._target_thread = threading.main_thread().ident
+        self._sampler = None
+        self._stop_event = threading.Event()
+        self._profile = None
+        self._started_at = None
+
+    # ---------- 启停 ----------
+
+    def start(self):
+        """启动剖析器"""
+        self._started_at = time.time()
+        if self.mode == 'cprofile':
+            import cProfile
+            self._profile = cProfile.Profile()
+        else:
+            self._sampler = threading.Thread(target=self._sample_loop,
+                                             name='passwdmgr-sampler', daemon=True)
+            self._sampler.start()
+
+        if not self.operations:
+            self._activate()
+
+        logger.info(f"性能剖析已启动: 模式={self.mode}, "
+                    f"操作={','.join(sorted(self.operations)) or '全部'}")
+
+    def stop(self):
+        """停止剖析器"""
+        while self._active_depth > 0:
+            self._deactivate()
+        if self._sampler:
+            self._stop_event.set()
+            self._sampler.join(timeout=1)
+            self._sampler = None
+
+    def _activate(self):
+        with self._lock:
+            self._active_depth += 1
+            if self._active_depth == 1 and self._profile is not None:
+                self._profile.enable()
+
+    def _deactivate(self):
+        with self._lock:
+            if self._active_depth == 0:
+                return
+            self._active_depth -= 1
+            if self._active_depth == 0 and self._profile is not None:
+                self._profile.disable()
+
+    @contextmanager
+    def operation(self, name):
+        """只在指定操作期间剖析"""
+        if self.operations and name not in self.operations:
+            yield
+            return
+        if not self.operations:
+            # 全程剖析时，操作边界无需处理
+            yield
+            return
+        self._activate()
+        try:
+            yield
+        finally:
+            self._deactivate()
+
+    # ---------- 采样 ----------
+
+    @staticmethod
+    def _frame_label(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample_loop(self):
+        while not self._stop_event.wait(self.interval):
+            if self._active_depth == 0:
+                continue
+            frame = sys._current_frames().get(self._target_thread)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_label(frame))
+                frame = frame.f_back
+            stack.reverse()
+            self._stacks[';'.join(stack)] += 1
+
+    # ---------- 输出 ----------
+
+    def _collapsed_from_samples(self):
+        """采样结果 -> 折叠栈（值为微秒）"""
+        weight = int(self.interval * 1_000_000)
+        return {stack: count * weight for stack, count in self._stacks.items()}
+
+    def _collapsed_from_pstats(self, stats):
+        """cProfile 结果 -> 折叠栈（值为微秒）
+
+        cProfile 只记录调用边而不是完整调用栈，这里沿调用边把每个函数的
+        累计时间按调用比例分摊到各条路径上，是常用的近似还原方法。
+        """
+        callees = {}
+        for func, (_cc, _nc, _tt, _ct, callers) in stats.items():
+            for caller, edge in callers.items():
+                callees.setdefault(caller, []).append((func, edge[3]))
+
+        def label(func):
+            filename, line, name = func
+            return f"{name} ({os.path.basename(filename)}:{line})"
+
+        collapsed = Counter()
+
+        def walk(func, weight, path, depth):
+            _cc, _nc, tt, ct, _callers = stats[func]
+            path = path + [label(func)]
+            if ct > 0:
+                self_time = weight * (tt / ct)
+                if self_time > 0:
+                    collapsed[';'.join(path)] += int(self_time * 1_000_000)
+            if depth >= 64:
+                return
+            for callee, edge_ct in callees.get(func, []):
+                if callee not in stats or ct <= 0:
+                    continue
+                child_weight = weight * (edge_ct / ct)
+                if child_weight < 1e-6 or label(callee) in path:
+                    continue
+                walk(callee, child_weight, path, depth + 1)
+
+        roots = [func for func, value in stats.items() if not value[4]]
+        for root in roots:
+            walk(root, stats[root][3], [], 0)
+        return dict(collapsed)
+
+    @staticmethod
+    def _speedscope_document(collapsed, name):
+        """折叠栈 -> speedscope 文件格式（sampled profile）"""
+        frames = []
+        frame_index = {}
+        samples = []
+        weights = []
+        for stack, value in collapsed.items():
+            indexes = []
+            for frame_name in stack.split(';'):
+                if frame_name not in frame_index:
+                    frame_index[frame_name] = len(frames)
+                    frame_name_only, _, location = frame_name.partition(' (')
+                    file_name, _, line = location.rstrip(')').rpartition(':')
+                    frames.append({
+                        'name': frame_name_only,
+                        'file': file_name,
+                        'line': int(line) if line.isdigit() else 0
+                    })
+                indexes.append(frame_index[frame_name])
+            samples.append(indexes)
+            weights.append(value)
+
+        total = sum(weights)
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'microseconds',
+                'startValue': 0,
+                'endValue': total,
+                'samples': samples,
+                'weights': weights
+            }],
+            'name': name,
+            'activeProfileIndex': 0,
+            'exporter': 'passwdmgr'
+        }
+
+    def write_outputs(self):
+        """写出剖析结果，返回生成的文件列表"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(self._started_at or time.time()))
+        suffix = f"_{'-'.join(sorted(self.operations))}" if self.operations else ''
+        base = os.path.join(self.output_dir, f"passwdmgr_{self.mode}{suffix}_{stamp}")
+        written = []
+
+        if self.mode == 'cprofile':
+            import pstats
+            if self._profile is None:
+                return written
+            self._profile.create_stats()
+            self._profile.dump_stats(base + '.pstats')
+            written.append(base + '.pstats')
+            collapsed = self._collapsed_from_pstats(pstats.Stats(self._profile).stats)
+        else:
+            collapsed = self._collapsed_from_samples()
+
+        with open(base + '.collapsed', 'w', encoding='utf-8') as f:
+            for stack, value in sorted(collapsed.items()):
+                if value > 0:
+                    f.write(f"{stack} {value}\n")
+        written.append(base + '.collapsed')
+
+        with open(base + '.speedscope.json', 'w', encoding='utf-8') as f:
+            json.dump(self._speedscope_document(collapsed, os.path.basename(base)), f)
+        written.append(base + '.speedscope.json')
+
+        for path in written:
+            logger.info(f"性能剖析结果已写入: {path}")
+        return written
+
+
+# 全局剖析器实例（未启用剖析时为 None）
+_profiler = None
+
+
+def parse_profile_args(argv, environ=None):
+    """从命令行和环境变量解析剖析配置
+
+    返回 (配置字典或None, 去掉剖析参数后的 argv)；剖析模式无效时抛出 ValueError
+    """
+    environ = os.environ if environ is None else environ
+    mode = environ.get('PASSWDMGR_PROFILE') or None
+    operations = environ.get('PASSWDMGR_PROFILE_OPS', '')
+    output_dir = environ.get('PASSWDMGR_PROFILE_DIR') or None
+
+    remaining = []
+    for arg in argv:
+        if arg == '--profile':
+            mode = mode or 'sample'
+        elif arg.startswith('--profile='):
+            mode = arg.split('=', 1)[1]
+        elif arg.startswith('--profile-op='):
+            operations = arg.split('=', 1)[1]
+        elif arg.startswith('--profile-dir='):
+            output_dir = arg.split('=', 1)[1]
+        else:
+            remaining.append(arg)
+
+    if mode in ('1', 'true', 'yes'):
+        mode = 'sample'
+    if not mode or mode in ('0', 'false', 'no'):
+        return None, remaining
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"不支持的剖析模式: {mode}（可选: {', '.join(PROFILE_MODES)}）")
+
+    return {
+        'mode': mode,
+        'operations': [op.strip() for op in operations.split(',') if op.strip()],
+        'output_dir': output_dir
+    }, remaining
+
+
+def start_profiler(mode='sample', operations=None, output_dir=None):
+    """创建并启动全局剖析器"""
+    global _profiler
+    _profiler = AppProfiler(mode=mode, operations=operations, output_dir=output_dir)
+    _profiler.start()
+    return _profiler
+
+
+def stop_profiler():
+    """停止全局剖析器并写出结果"""
+    global _profiler
+    if _profiler is None:
+        return []
+    profiler, _profiler = _profiler, None
+    profiler.stop()
+    try:
+        return profiler.write_outputs()
+    except Exception as e:
+        logger.error(f"写出性能剖析结果失败: {e}")
+        return []
+
+
+def get_profiler():
+    """获取全局剖析器实例（未启用时为 None）"""
+    return _profiler
+
+
+def profile_operation(name):
+    """标记一个可单独剖析的操作（unlock / search / rekey ...），未启用剖析时无开销"""
+    if _profiler is None:
+        return nullcontext()
+    return _profiler.operation(name)
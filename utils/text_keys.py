@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+#
+# @Created : 2026-10-20 00:20
+# @Author  : Evergarden
+# @Email   : violet20160719@163.com
+# @Python  : 3.12
+# @Desc    : 记录名称的排序键和搜索键（拼音、首字母、全角/半角归一）
+"""
+数据库中 ORDER BY website_name 按码位排序，中文名称的顺序没有意义，也无法用拼音搜索。
+写入时为网站名称预先计算以下几列（都有索引），排序和匹配在数据库中完成:
+
+    sort_key         排序键：汉字转为拼音，其余字符 NFKC 归一并转小写
+    search_key       NFKC 归一并转小写（全角"ＧｉｔＨｕｂ"与"github"相同）
+    pinyin_full      全拼，如 招商银行 -> zhaoshangyinhang
+    pinyin_initials  首字母，如 招商银行 -> zsyh
+
+多音字的各种读法都会展开（最多 MAX_VARIANTS 种，以空格分隔），"zsyh" 和 "zsyx" 都能找到招商银行。
+名称中没有汉字时两个拼音列为空。
+
+安装了 pypinyin 时使用其拼音数据；否则退回 GB2312：一级汉字（3755 个常用字）按拼音排列，
+由编码区间可以得到首字母，排序键用 首字母 + 编码，同一首字母内仍按拼音顺序；此时没有全拼。
+计算结果与所用的方式有关，backend() 变化后由数据库管理器重新计算所有明文记录。
+"""
+import bisect
+import logging
+import unicodedata
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# MySQL 的 utf8mb4 索引列长度上限
+KEY_MAX_LENGTH = 191
+MAX_VARIANTS = 4
+# 数据库中的列名，顺序与 text_keys 的返回值一致
+TEXT_KEY_COLUMNS = ('sort_key', 'search_key', 'pinyin_full', 'pinyin_initials')
+
+# GB2312 一级汉字中各首字母的起始编码（没有 i、u、v 开头的拼音）
+GB2312_INITIALS = (
+    (0xB0A1, 'a'), (0xB0C5, 'b'), (0xB2C1, 'c'), (0xB4EE, 'd'), (0xB6EA, 'e'), (0xB7A2, 'f'),
+    (0xB8C1, 'g'), (0xB9FE, 'h'), (0xBBF7, 'j'), (0xBFA6, 'k'), (0xC0AC, 'l'), (0xC2E8, 'm'),
+    (0xC4C3, 'n'), (0xC5B6, 'o'), (0xC5BE, 'p'), (0xC6DA, 'q'), (0xC8BB, 'r'), (0xC8F6, 's'),
+    (0xCBFA, 't'), (0xCDDA, 'w'), (0xCEF4, 'x'), (0xD1B9, 'y'), (0xD4D1, 'z'),
+)
+GB2312_LEVEL1_END = 0xD7F9
+_GB2312_STARTS = [start for start, _ in GB2312_INITIALS]
+
+# 常见多音字的其他读音首字母（GB2312 中每个字只出现一次，按第一个读音排列）
+POLYPHONE_INITIALS = {
+    '行': 'xh', '长': 'cz', '重': 'zc', '乐': 'ly', '朝': 'zc', '藏': 'cz', '解': 'jx', '厦': 'xs',
+    '单': 'ds', '曾': 'zc', '传': 'cz', '调': 'td', '都': 'dd', '会': 'hk', '校': 'xj', '省': 'sx',
+    '参': 'cs', '差': 'cc', '便': 'bp', '车': 'cj', '大': 'dd', '广': 'ga', '石': 'sd', '区': 'qo',
+}
+
+_pypinyin = None
+
+
+def _load_pypinyin():
+    """可选依赖 pypinyin，没有安装时返回 False"""
+    global _pypinyin
+    if _pypinyin is None:
+        try:
+            import pypinyin
+            _pypinyin = pypinyin
+        except ImportError:
+            logger.info("未安装 pypinyin，拼音只使用 GB2312 一级汉字的首字母")
+            _pypinyin = False
+    return _pypinyin
+
+
+def backend() -> str:
+    """当前使用的拼音数据（保存在数据库中，变化时重新计算所有记录的键）"""
+    return 'pypinyin' if _load_pypinyin() else 'gb2312'
+
+
+def normalize(text: Optional[str]) -> str:
+    """NFKC 归一（全角转半角、兼容字符转标准字符）并转小写"""
+    return unicodedata.normalize('NFKC', text or '').casefold()
+
+
+def normalize_query(keyword: Optional[str]) -> str:
+    """搜索关键字按与 search_key、拼音列相同的规则归一"""
+    return normalize(keyword).strip()[:KEY_MAX_LENGTH]
+
+
+def is_han(char: str) -> bool:
+    return '一' <= char <= '鿿' or '㐀' <= char <= '䶿' or '豈' <= char <= '﫿'
+
+
+def _gb2312_code(char: str) -> Optional[int]:
+    try:
+        raw = char.encode('gb2312')
+    except UnicodeEncodeError:
+        return None
+    return int.from_bytes(raw, 'big') if len(raw) == 2 else None
+
+
+def _gb2312_initial(char: str) -> Optional[str]:
+    code = _gb2312_code(char)
+    if code is None or not GB2312_INITIALS[0][0] <= code <= GB2312_LEVEL1_END:
+        return None
+    return GB2312_INITIALS[bisect.bisect_right(_GB2312_STARTS, code) - 1][1]
+
+
+def _readings(char: str) -> List[str]:
+    """一个汉字的全部读音（不带声调），没有 pypinyin 或查不到时为空"""
+    pypinyin = _load_pypinyin()
+    if not pypinyin:
+        return []
+    readings = pypinyin.pinyin(char, style=pypinyin.Style.NORMAL, heteronym=True, errors='ignore')
+    return [reading for reading in dict.fromkeys(readings[0]) if reading] if readings else []
+
+
+def _initials(char: str) -> List[str]:
+    readings = _readings(char)
+    if readings:
+        return list(dict.fromkeys(reading[0] for reading in readings))
+    initial = _gb2312_initial(char)
+    if initial is None:
+        return [char]
+    return list(dict.fromkeys(initial + POLYPHONE_INITIALS.get(char, '')))
+
+
+def _expand(options: List[List[str]]) -> str:
+    """各字的候选读音组合为最多 MAX_VARIANTS 个字符串，以空格分隔"""
+    variants = ['']
+    for choices in options:
+        variants = [variant + choice for variant in variants for choice in choices][:MAX_VARIANTS]
+    return ' '.join(variant[:KEY_MAX_LENGTH] for variant in variants)[:KEY_MAX_LENGTH]
+
+
+def sort_key(text: Optional[str]) -> str:
+    parts = []
+    for char in normalize(text):
+        if not is_han(char):
+            parts.append(char)
+            continue
+        readings = _readings(char)
+        if readings:
+            parts.append(readings[0])
+            continue
+        initial = _gb2312_initial(char)
+        # 排在同一首字母的英文名称之后，同一首字母内按 GB2312 编码（即拼音）排序
+        parts.append(f'{initial}{{{_gb2312_code(char):04x}' if initial else char)
+    return ''.join(parts)[:KEY_MAX_LENGTH]
+
+
+def search_key(text: Optional[str]) -> str:
+    return normalize(text)[:KEY_MAX_LENGTH]
+
+
+def pinyin_full(text: Optional[str]) -> Optional[str]:
+    """全拼（多音字展开），没有汉字或没有 pypinyin 时为 None"""
+    chars = ''.join(normalize(text).split())
+    if not any(is_han(char) for char in chars) or not _load_pypinyin():
+        return None
+    return _expand([(_readings(char) or [char]) if is_han(char) else [char] for char in chars])
+
+
+def pinyin_initials(text: Optional[str]) -> Optional[str]:
+    """拼音首字母（多音字展开），没有汉字时为 None"""
+    chars = ''.join(normalize(text).split())
+    if not any(is_han(char) for char in chars):
+        return None
+    return _expand([_initials(char) if is_han(char) else [char] for char in chars])
+
+
+def text_keys(text: Optional[str]) -> Tuple[str, str, Optional[str], Optional[str]]:
+    """(sort_key, search_key, pinyin_full, pinyin_initials)"""
+    return sort_key(text), search_key(text), pinyin_full(text), pinyin_initials(text)
+
+
+def apply_text_keys(entry) -> Tuple[str, str, Optional[str], Optional[str]]:
+    """按网站名称计算并设置记录的四个键"""
+    keys = text_keys(entry.website_name)
+    entry.sort_key, entry.search_key, entry.pinyin_full, entry.pinyin_initials = keys
+    return keys
+
+
+def entry_sort_key(entry) -> Tuple[str, str]:
+    """在 Python 中排序记录（解密后的记录、内存索引），与 ORDER BY sort_key, website_name 一致"""
+    key = entry.sort_key
+    if key is None:
+        key = sort_key(entry.website_name)
+    return key, entry.website_name or ''
@@ -5,7 +5,15 @@
 # @Updated: 2025/11/27 8:06
 # @Python:  3.12
 # @Description:
+import ipaddress
 import re
+import threading
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# 公共后缀列表（Public Suffix List 格式），计算可注册域名用
+PUBLIC_SUFFIX_LIST = 'resources/public_suffix_list.dat'
+DEFAULT_PORTS = {'http': 80, 'https': 443}
 
 
 def validate_url(url: str) -> bool:
@@ -15,7 +23,7 @@ def validate_url(url: str) -> bool:
 
     pattern = re.compile(
         r'^(https?://)?'  # http:// or https://
-        r'(([A-Z0-9]([A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain
+        r'(([A-Z0-9]([A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,63}|XN--[A-Z0-9-]{1,59})\.?|'  # domain
         r'localhost|'  # localhost
         r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ip
         r'(?::\d+)?'  # port
@@ -24,6 +32,128 @@ def validate_url(url: str) -> bool:
     return re.match(pattern, url) is not None
 
 
+def _to_ascii_host(host: str) -> str:
+    """主机名转为小写的 ASCII 形式（国际化域名按 IDNA 编码）"""
+    host = host.strip().rstrip('.').lower()
+    if host.isascii():
+        return host
+    return '.'.join(label.encode('idna').decode('ascii') if not label.isascii() else label
+                    for label in host.split('.'))
+
+
+def _split_url(url: str):
+    """解析网址，返回 (scheme, ASCII 主机名, 端口, 拆分结果)，无效时返回 None"""
+    url = (url or '').strip()
+    if not url:
+        return None
+    if '://' not in url:
+        url = 'https://' + url.lstrip('/')
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+        host = _to_ascii_host(parts.hostname or '')
+    except (ValueError, UnicodeError):
+        return None
+    if not host:
+        return None
+
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        # 非 IP 地址的主机名按 validate_url 的规则检查
+        if not validate_url(host):
+            return None
+    return parts.scheme.lower(), host, port, parts
+
+
+def canonicalize_url(url: str) -> Optional[str]:
+    """规范化网址：补全协议，主机名小写并 IDNA 编码，去掉默认端口、用户信息和片段
+
+    无效的网址返回 None。
+    """
+    split = _split_url(url)
+    if split is None:
+        return None
+    scheme, host, port, parts = split
+    netloc = f'[{host}]' if ':' in host else host
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        netloc += f':{port}'
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+
+class _PublicSuffixes:
+    """公共后缀规则（普通规则、通配规则 *.x 和例外规则 !x，均为 ASCII 形式）"""
+
+    def __init__(self, lines):
+        self.rules, self.wildcards, self.exceptions = set(), set(), set()
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('//'):
+                continue
+            rule = line.split()[0]
+            try:
+                if rule.startswith('!'):
+                    self.exceptions.add(_to_ascii_host(rule[1:]))
+                elif rule.startswith('*.'):
+                    self.wildcards.add(_to_ascii_host(rule[2:]))
+                else:
+                    self.rules.add(_to_ascii_host(rule))
+            except UnicodeError:
+                continue
+
+    def registrable_domain(self, host: str) -> Optional[str]:
+        labels = host.split('.')
+        # 从最长的候选开始，第一个命中的就是最长的规则
+        for i in range(len(labels)):
+            candidate = '.'.join(labels[i:])
+            if candidate in self.exceptions:
+                return candidate
+            if candidate in self.rules or '.'.join(labels[i + 1:]) in self.wildcards:
+                return '.'.join(labels[i - 1:]) if i > 0 else None
+        # 没有规则命中时顶级域就是公共后缀
+        return '.'.join(labels[-2:]) if len(labels) > 1 else None
+
+
+_public_suffixes = None
+_public_suffixes_lock = threading.Lock()
+
+
+def _get_public_suffixes() -> _PublicSuffixes:
+    global _public_suffixes
+    with _public_suffixes_lock:
+        if _public_suffixes is None:
+            from core.resource_manager import get_resource_manager
+            path = get_resource_manager().get_resource_path(PUBLIC_SUFFIX_LIST)
+            lines = []
+            if path:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        lines = f.readlines()
+                except OSError:
+                    pass
+            _public_suffixes = _PublicSuffixes(lines)
+        return _public_suffixes
+
+
+def registrable_domain(url: str) -> Optional[str]:
+    """网址的可注册域名（eTLD+1，小写，IDNA 编码），如 https://login.example.co.uk/ -> example.co.uk
+
+    IP 地址、localhost 以及本身就是公共后缀的主机名返回主机名本身，无效网址返回 None。
+    """
+    split = _split_url(url)
+    if split is None:
+        return None
+    host = split[1]
+    if '.' not in host:
+        return host
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    return _get_public_suffixes().registrable_domain(host) or host
+
+
 def validate_email(email: str) -> bool:
     """验证邮箱格式"""
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
@@ -31,27 +161,8 @@ def validate_email(email: str) -> bool:
 
 
 def validate_password_strength(password: str) -> dict:
-    """验证密码强度"""
-    checks = {
-        'length': len(password) >= 8,
-        'lowercase': any(c.islower() for c in password),
-        'uppercase': any(c.isupper() for c in password),
-        'digit': any(c.isdigit() for c in password),
-        'symbol': any(not c.isalnum() for c in password)
-    }
-
-    score = sum(checks.values())
-    if score == 5:
-        level = "非常强"
-    elif score >= 3:
-        level = "强"
-    elif score >= 2:
-        level = "中等"
-    else:
-        level = "弱"
-
-    return {
-        'score': score,
-        'level': level,
-        'checks': checks
-    }
\ No newline at end of file
+    """验证密码强度（score 为 0-4，见 core.strength_estimator）"""
+    from core.strength_estimator import character_checks, estimate_strength
+    result = estimate_strength(password)
+    result['checks'] = character_checks(password)
+    return result
\ No newline at end of file